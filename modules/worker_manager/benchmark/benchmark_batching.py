@@ -0,0 +1,167 @@
+"""
+Benchmark per-item and batched queue transfers.
+
+Runs the generator -> multiplier -> printer pipeline from the example with one process per stage,
+without printing. The generator sends a fixed number of items followed by an end marker.
+
+Run from the repository root:
+    python -m modules.worker_manager.benchmark.benchmark_batching
+"""
+
+import multiprocessing as mp
+import time
+
+from modules.worker_manager import queue_property_data
+from modules.worker_manager import queue_wrapper
+from modules.worker_manager.private import worker_sync_manager
+
+
+END_MARKER = None
+GET_TIMEOUT = 0.01
+
+
+def generator_stage(
+    item_count: int, batch_size: int, generator_to_multiplier_queue: queue_wrapper.QueueWrapper
+) -> None:
+    """
+    Sends numbers 0 to item_count - 1 then the end marker.
+    """
+    items = list(range(0, item_count)) + [END_MARKER]
+
+    if batch_size == 1:
+        for i in items:
+            generator_to_multiplier_queue.put(i)
+
+        return
+
+    for start in range(0, len(items), batch_size):
+        generator_to_multiplier_queue.put_many(items[start : start + batch_size])
+
+
+def multiplier_stage(
+    factor: int,
+    batch_size: int,
+    generator_to_multiplier_queue: queue_wrapper.QueueWrapper,
+    multiplier_to_printer_queue: queue_wrapper.QueueWrapper,
+) -> None:
+    """
+    Multiplies the input by a factor until the end marker.
+    """
+    if batch_size == 1:
+        while True:
+            _, i = generator_to_multiplier_queue.get()
+            if i is END_MARKER:
+                multiplier_to_printer_queue.put(END_MARKER)
+                return
+
+            multiplier_to_printer_queue.put(factor * i)
+
+    while True:
+        items = generator_to_multiplier_queue.get_many(batch_size, GET_TIMEOUT)
+        is_end = len(items) > 0 and items[-1] is END_MARKER
+        if is_end:
+            items.pop()
+
+        products = [factor * i for i in items]
+        if is_end:
+            products.append(END_MARKER)
+
+        multiplier_to_printer_queue.put_many(products)
+
+        if is_end:
+            return
+
+
+def printer_stage(batch_size: int, multiplier_to_printer_queue: queue_wrapper.QueueWrapper) -> None:
+    """
+    Formats the input until the end marker.
+    """
+    while True:
+        if batch_size == 1:
+            _, i = multiplier_to_printer_queue.get()
+            items = [i]
+        else:
+            items = multiplier_to_printer_queue.get_many(batch_size, GET_TIMEOUT)
+
+        for i in items:
+            if i is END_MARKER:
+                return
+
+            _ = f"Received: {i} from multiplier!"
+
+
+def run_pipeline(
+    mp_manager: worker_sync_manager.WorkerSyncManager,
+    backend: queue_property_data.QueueBackend,
+    queue_max_size: int,
+    item_count: int,
+    batch_size: int,
+) -> float:
+    """
+    Runs the pipeline once.
+
+    Return: Throughput in items per second.
+    """
+    queues = []
+    for name in ["generator_to_multiplier_queue", "multiplier_to_printer_queue"]:
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            name, queue_max_size, backend
+        )
+        assert result
+        assert queue_property is not None
+
+        result, queue = queue_wrapper.QueueWrapper.create(mp_manager, queue_property)
+        assert result
+        assert queue is not None
+
+        queues.append(queue)
+
+    processes = [
+        mp.Process(target=generator_stage, args=(item_count, batch_size, queues[0])),
+        mp.Process(target=multiplier_stage, args=(1_000, batch_size, queues[0], queues[1])),
+        mp.Process(target=printer_stage, args=(batch_size, queues[1])),
+    ]
+
+    start_time = time.perf_counter()
+    for process in processes:
+        process.start()
+
+    for process in processes:
+        process.join()
+
+    elapsed_time = time.perf_counter() - start_time
+
+    return item_count / elapsed_time
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    item_count = 20_000
+    queue_max_size = 256
+    batch_sizes = [1, 16, 64, 256]
+
+    print(f"Items: {item_count}, queue max size: {queue_max_size}")
+    print(f"{'backend':<16}{'batch size':>12}{'items/s':>14}")
+    with worker_sync_manager.WorkerSyncManager() as mp_manager:
+        # The stages are processes
+        for backend in [
+            queue_property_data.QueueBackend.MANAGER,
+            queue_property_data.QueueBackend.SHARED_MEMORY,
+        ]:
+            for batch_size in batch_sizes:
+                throughput = run_pipeline(
+                    mp_manager, backend, queue_max_size, item_count, batch_size
+                )
+                print(f"{backend.value:<16}{batch_size:>12}{throughput:>14.0f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main != 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
@@ -0,0 +1,132 @@
+"""
+Benchmark fan-out through a broadcast queue against a shared memory queue per consumer group.
+
+The producer sends each item to every group, either by putting a copy into the queue of each group,
+or by putting it once into a broadcast queue that each group subscribes to. Each group then gets all
+items. Everything runs in a single process, so the times are the cost of the copies without
+scheduling between processes.
+
+Run from the repository root:
+    python -m modules.worker_manager.benchmark.benchmark_broadcast
+"""
+
+import multiprocessing as mp
+import multiprocessing.managers
+import time
+
+from modules.worker_manager import queue_property_data
+from modules.worker_manager import queue_wrapper
+
+
+def time_fan_out(
+    producer_queues: list[queue_wrapper.QueueWrapper],
+    consumer_queues: list[queue_wrapper.QueueWrapper],
+    payload: bytes,
+    item_count: int,
+    repeat: int,
+) -> float:
+    """
+    Return: Mean seconds to send an item to every group and get it in each.
+    """
+    start_time = time.perf_counter()
+    for _ in range(0, repeat):
+        for _ in range(0, item_count):
+            for queue in producer_queues:
+                queue.put(payload)
+
+        for queue in consumer_queues:
+            queue.get_many(item_count, 0.0)
+
+    return (time.perf_counter() - start_time) / (repeat * item_count)
+
+
+def create_queue(
+    mp_manager: multiprocessing.managers.SyncManager,
+    backend: queue_property_data.QueueBackend,
+    slot_size: int,
+) -> tuple[True, queue_wrapper.QueueWrapper] | tuple[False, None]:
+    """
+    Return: Success, queue holding a batch of items.
+    """
+    result, queue_property = queue_property_data.QueuePropertyData.create(
+        "queue", 64, backend, slot_size
+    )
+    if not result:
+        return False, None
+
+    # Get Pylance to stop complaining
+    assert queue_property is not None
+
+    return queue_wrapper.QueueWrapper.create(mp_manager, queue_property)
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    item_count = 64
+    repeat = 20
+    payload_sizes = [1024, 65536, 1048576]
+    group_counts = [1, 2, 4, 8]
+
+    print(f"Items: {item_count}, repeat: {repeat}")
+    print(f"{'payload B':>10}{'groups':>8}{'copies us':>12}{'broadcast us':>14}")
+    with mp.Manager() as mp_manager:
+        for payload_size in payload_sizes:
+            payload = bytes(payload_size)
+            # Room for the pickle header
+            slot_size = payload_size + 1024
+
+            for group_count in group_counts:
+                queues = []
+                for _ in range(0, group_count):
+                    result, queue = create_queue(
+                        mp_manager, queue_property_data.QueueBackend.SHARED_MEMORY, slot_size
+                    )
+                    if not result:
+                        return -1
+
+                    # Get Pylance to stop complaining
+                    assert queue is not None
+
+                    queues.append(queue)
+
+                result, broadcast_queue = create_queue(
+                    mp_manager, queue_property_data.QueueBackend.BROADCAST, slot_size
+                )
+                if not result:
+                    return -1
+
+                # Get Pylance to stop complaining
+                assert broadcast_queue is not None
+
+                subscriber_queues = []
+                for i in range(0, group_count):
+                    result, subscriber_queue = broadcast_queue.subscribe(f"group_{i}")
+                    if not result:
+                        return -1
+
+                    # Get Pylance to stop complaining
+                    assert subscriber_queue is not None
+
+                    subscriber_queues.append(subscriber_queue)
+
+                copies_time = time_fan_out(queues, queues, payload, item_count, repeat)
+                broadcast_time = time_fan_out(
+                    [broadcast_queue], subscriber_queues, payload, item_count, repeat
+                )
+                print(
+                    f"{payload_size:>10}{group_count:>8}{copies_time * 1e6:>12.1f}"
+                    f"{broadcast_time * 1e6:>14.1f}",
+                    flush=True,
+                )
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main != 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
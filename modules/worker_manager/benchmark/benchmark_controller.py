@@ -0,0 +1,113 @@
+"""
+Benchmark worker controller creation time and manager server memory.
+
+Compares the controllers, which use a pipe per worker, with the previous control channel of two
+manager queues per worker. Reading the memory of the manager server requires Linux.
+
+Run from the repository root:
+    python -m modules.worker_manager.benchmark.benchmark_controller
+"""
+
+import multiprocessing as mp
+import multiprocessing.managers
+import time
+
+from modules.worker_manager import worker_controller
+
+
+CONTROLLER_MAX_SIZE = 5
+
+
+def get_rss(mp_manager: multiprocessing.managers.SyncManager) -> int:
+    """
+    Return: Resident set size of the manager server process in KiB.
+    """
+    # pylint: disable-next=protected-access
+    pid = mp_manager._process.pid  # type: ignore
+    with open(f"/proc/{pid}/status", encoding="utf-8") as file:
+        for line in file:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+
+    return 0
+
+
+def create_manager_queues(
+    mp_manager: multiprocessing.managers.SyncManager, worker_count: int
+) -> list[object]:
+    """
+    Previous control channel: two manager queues per worker.
+    """
+    channels: list[object] = []
+    for _ in range(0, worker_count):
+        channels.append(
+            (mp_manager.Queue(CONTROLLER_MAX_SIZE), mp_manager.Queue(CONTROLLER_MAX_SIZE))
+        )
+
+    return channels
+
+
+# Same signature as create_manager_queues()
+# pylint: disable=unused-argument
+def create_controllers(
+    mp_manager: multiprocessing.managers.SyncManager, worker_count: int
+) -> list[object]:
+    """
+    Current control channel: one controller per worker, independent of the manager.
+    """
+    channels: list[object] = []
+    for _ in range(0, worker_count):
+        result, controller = worker_controller.WorkerController.create(
+            CONTROLLER_MAX_SIZE, mp.get_context()
+        )
+        if not result:
+            return []
+
+        channels.append(controller)
+
+    return channels
+
+
+# pylint: enable=unused-argument
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    worker_counts = [10, 100, 1000]
+    channel_types = [
+        ("manager queues", create_manager_queues),
+        ("controllers", create_controllers),
+    ]
+
+    print(f"{'channel':<16}{'workers':>8}{'create ms':>11}{'manager RSS KiB':>17}{'delta':>9}")
+    for name, create_channels in channel_types:
+        for worker_count in worker_counts:
+            with mp.Manager() as mp_manager:
+                rss_before = get_rss(mp_manager)
+
+                start_time = time.perf_counter()
+                channels = create_channels(mp_manager, worker_count)
+                create_time = time.perf_counter() - start_time
+
+                if len(channels) != worker_count:
+                    return -1
+
+                rss_after = get_rss(mp_manager)
+
+                print(
+                    f"{name:<16}{worker_count:>8}{create_time * 1000:>11.1f}"
+                    f"{rss_after:>17}{rss_after - rss_before:>9}",
+                    flush=True,
+                )
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main != 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
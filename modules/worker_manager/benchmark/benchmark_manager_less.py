@@ -0,0 +1,164 @@
+"""
+Benchmark the worker manager with and without the manager server.
+
+Startup is the time to create the worker manager, which starts the manager server process unless it
+is disabled. Latency is the mean round trip of a single item from the main process through an echo
+worker and back, one item at a time, so it includes the proxy hop to the manager server for manager
+queues. Process and shared memory queues do not need the manager server.
+
+Run from the repository root:
+    python -m modules.worker_manager.benchmark.benchmark_manager_less
+"""
+
+import time
+
+from modules.worker_manager import queue_property_data
+from modules.worker_manager import queue_wrapper
+from modules.worker_manager import worker_controller
+from modules.worker_manager import worker_manager
+from modules.worker_manager import worker_property_data
+
+
+def echo_worker(
+    request: queue_wrapper.QueueWrapper,
+    response: queue_wrapper.QueueWrapper,
+    controller: worker_controller.WorkerController,
+) -> None:
+    """
+    Sends back each item until stopped.
+    """
+    while controller.check_pause_and_exit():
+        result, item = request.get(0.01)
+        if not result:
+            continue
+
+        response.put(item)
+
+
+def measure_startup(start_method: str, is_manager_server: bool, repeat: int) -> float | None:
+    """
+    Return: Mean seconds to create the worker manager, None on failure.
+    """
+    total_time = 0.0
+    for _ in range(0, repeat):
+        start_time = time.perf_counter()
+        result, _ = worker_manager.WorkerManager.create(
+            5, start_method, is_manager_server=is_manager_server
+        )
+        if not result:
+            return None
+
+        total_time += time.perf_counter() - start_time
+
+    return total_time / repeat
+
+
+def measure_latency(
+    start_method: str, backend: queue_property_data.QueueBackend, item_count: int
+) -> float | None:
+    """
+    Return: Mean seconds per round trip through the echo worker, None on failure.
+    """
+    is_manager_server = backend == queue_property_data.QueueBackend.MANAGER
+    result, manager = worker_manager.WorkerManager.create(
+        5, start_method, is_manager_server=is_manager_server
+    )
+    if not result:
+        return None
+
+    # Get Pylance to stop complaining
+    assert manager is not None
+
+    queue_properties = []
+    for name in ["request", "response"]:
+        result, queue_property = queue_property_data.QueuePropertyData.create(name, 1, backend)
+        if not result:
+            return None
+
+        # Get Pylance to stop complaining
+        assert queue_property is not None
+
+        queue_properties.append(queue_property)
+
+    if manager.add_queues(queue_properties) != 2:
+        return None
+
+    result, worker_property = worker_property_data.WorkerPropertyData.create(
+        1, echo_worker, (), ["request"], ["response"]
+    )
+    if not result:
+        return None
+
+    # Get Pylance to stop complaining
+    assert worker_property is not None
+
+    if manager.add_worker_groups([worker_property]) != 1:
+        return None
+
+    if not manager.start_all(60.0):
+        return None
+
+    # The worker manager does not hand out its queues
+    # pylint: disable-next=protected-access
+    names_to_queue = manager._WorkerManager__names_to_queue  # type: ignore
+    request_queue = names_to_queue["request"]
+    response_queue = names_to_queue["response"]
+
+    start_time = time.perf_counter()
+    for i in range(0, item_count):
+        request_queue.put(i)
+        response_queue.get()
+
+    latency = (time.perf_counter() - start_time) / item_count
+
+    manager.stop_all(5.0)
+
+    return latency
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    repeat = 5
+    item_count = 2000
+    start_methods = ["fork", "forkserver", "spawn"]
+
+    print(f"Startup, mean of {repeat}")
+    print(f"{'start method':<14}{'server ms':>12}{'no server ms':>14}")
+    for start_method in start_methods:
+        # The fork server is started by the first process of the program, not timed
+        measure_startup(start_method, True, 1)
+
+        server_time = measure_startup(start_method, True, repeat)
+        no_server_time = measure_startup(start_method, False, repeat)
+        if server_time is None or no_server_time is None:
+            return -1
+
+        print(
+            f"{start_method:<14}{server_time * 1000:>12.2f}{no_server_time * 1000:>14.2f}",
+            flush=True,
+        )
+
+    print(f"Round trip latency, mean of {item_count} items")
+    print(f"{'backend':<16}{'round trip us':>14}")
+    for backend in [
+        queue_property_data.QueueBackend.MANAGER,
+        queue_property_data.QueueBackend.PROCESS,
+        queue_property_data.QueueBackend.SHARED_MEMORY,
+    ]:
+        latency = measure_latency("fork", backend, item_count)
+        if latency is None:
+            return -1
+
+        print(f"{backend.value:<16}{latency * 1e6:>14.1f}", flush=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main != 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
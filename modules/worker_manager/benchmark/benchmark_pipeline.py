@@ -0,0 +1,153 @@
+"""
+Benchmark pipelines of different shapes.
+
+Starting from a baseline, one of depth, fan out, worker count, payload size and queue max size is
+varied at a time, for each queue backend. Each run reports throughput, p50 and p99 end-to-end
+latency, CPU utilisation and queue metrics. Results are written as JSON to track regressions.
+
+Run from the repository root:
+    python -m modules.worker_manager.benchmark.benchmark_pipeline [output path] [item count]
+"""
+
+import datetime
+import json
+import os
+import platform
+import sys
+
+from modules.worker_manager import queue_property_data
+from modules.worker_manager.benchmark.pipeline import pipeline_config_data
+from modules.worker_manager.benchmark.pipeline import pipeline_runner
+
+
+DEFAULT_OUTPUT_PATH = "pipeline_benchmark.json"
+DEFAULT_ITEM_COUNT = 5_000
+# Seconds to wait for a pipeline to finish
+RUN_TIMEOUT = 120.0
+
+BASELINE = {
+    "depth": 2,
+    "fan_out": 1,
+    "worker_count": 1,
+    "payload_size": 64,
+    "max_size": 64,
+}
+SWEEPS = {
+    "depth": [1, 2, 4],
+    "fan_out": [1, 2, 4],
+    "worker_count": [1, 2, 4],
+    "payload_size": [64, 4_096, 65_536],
+    "max_size": [8, 64, 512],
+}
+
+
+def get_shapes() -> list[dict]:
+    """
+    Return: Unique pipeline shapes of all sweeps, in order.
+    """
+    shapes = []
+    for parameter, values in SWEEPS.items():
+        for value in values:
+            shape = dict(BASELINE)
+            shape[parameter] = value
+            if shape not in shapes:
+                shapes.append(shape)
+
+    return shapes
+
+
+def run_shape(
+    shape: dict, backend: queue_property_data.QueueBackend, item_count: int
+) -> tuple[True, dict] | tuple[False, None]:
+    """
+    Run one pipeline.
+
+    Return: Success, result for JSON output.
+    """
+    result, config = pipeline_config_data.PipelineConfigData.create(
+        shape["depth"],
+        shape["fan_out"],
+        shape["worker_count"],
+        shape["payload_size"],
+        shape["max_size"],
+        item_count,
+        backend,
+    )
+    if not result:
+        return False, None
+
+    # Get Pylance to stop complaining
+    assert config is not None
+
+    result, runner = pipeline_runner.PipelineRunner.create(config)
+    if not result:
+        return False, None
+
+    # Get Pylance to stop complaining
+    assert runner is not None
+
+    result, run_result = runner.run(RUN_TIMEOUT)
+    if not result:
+        return False, None
+
+    # Get Pylance to stop complaining
+    assert run_result is not None
+
+    return True, {"config": dict(shape, item_count=item_count, backend=backend.value)} | run_result
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    output_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_OUTPUT_PATH
+    item_count = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_ITEM_COUNT
+
+    runs = []
+    print(
+        f"{'backend':<16}{'depth':>6}{'fan':>5}{'workers':>8}{'payload':>9}{'max':>6}"
+        f"{'items/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'cpu %':>7}"
+    )
+    for backend in [
+        queue_property_data.QueueBackend.MANAGER,
+        queue_property_data.QueueBackend.SHARED_MEMORY,
+    ]:
+        for shape in get_shapes():
+            result, run = run_shape(shape, backend, item_count)
+            if not result:
+                print(f"ERROR: Failed to run pipeline: {backend.value} {shape}")
+                return -1
+
+            # Get Pylance to stop complaining
+            assert run is not None
+
+            runs.append(run)
+            print(
+                f"{backend.value:<16}{shape['depth']:>6}{shape['fan_out']:>5}"
+                f"{shape['worker_count']:>8}{shape['payload_size']:>9}{shape['max_size']:>6}"
+                f"{run['throughput']:>10.0f}{run['latency_p50'] * 1000:>9.2f}"
+                f"{run['latency_p99'] * 1000:>9.2f}{run['cpu_utilisation'] * 100:>7.1f}",
+                flush=True,
+            )
+
+    output = {
+        "time": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "runs": runs,
+    }
+    with open(output_path, "w", encoding="utf-8") as file:
+        json.dump(output, file, indent=2)
+
+    print(f"Results: {output_path}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main != 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
@@ -0,0 +1,88 @@
+"""
+Benchmark priority queues against the FIFO queue.
+
+Each queue is filled with items of cycling priority levels and then emptied, in a single process, so
+the times are the cost of the ordering without scheduling between processes. The manager backend
+orders the items in the manager server process.
+
+Run from the repository root:
+    python -m modules.worker_manager.benchmark.benchmark_priority
+"""
+
+import time
+
+from modules.worker_manager import queue_property_data
+from modules.worker_manager import queue_wrapper
+from modules.worker_manager.private import worker_sync_manager
+
+
+def time_queue(queue: queue_wrapper.QueueWrapper, item_count: int, repeat: int) -> float:
+    """
+    Return: Mean seconds per put() and get().
+    """
+    priority_levels = queue.queue_property.priority_levels
+
+    start_time = time.perf_counter()
+    for _ in range(0, repeat):
+        for i in range(0, item_count):
+            queue.put(i, priority=i % priority_levels)
+
+        for _ in range(0, item_count):
+            queue.get()
+
+    return (time.perf_counter() - start_time) / (repeat * item_count)
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    item_count = 256
+    repeat = 20
+    # Priority levels, starvation limit
+    configs = [(1, None), (2, None), (8, None), (8, 16)]
+
+    print(f"Items: {item_count}, repeat: {repeat}")
+    print(f"{'backend':<16}{'levels':>8}{'starvation':>12}{'put+get us':>12}")
+    with worker_sync_manager.WorkerSyncManager() as mp_manager:
+        for backend in [
+            queue_property_data.QueueBackend.MANAGER,
+            queue_property_data.QueueBackend.IN_PROCESS,
+        ]:
+            for priority_levels, starvation_limit in configs:
+                result, queue_property = queue_property_data.QueuePropertyData.create(
+                    "queue",
+                    item_count,
+                    backend,
+                    priority_levels=priority_levels,
+                    starvation_limit=starvation_limit,
+                )
+                if not result:
+                    return -1
+
+                # Get Pylance to stop complaining
+                assert queue_property is not None
+
+                result, queue = queue_wrapper.QueueWrapper.create(mp_manager, queue_property)
+                if not result:
+                    return -1
+
+                # Get Pylance to stop complaining
+                assert queue is not None
+
+                mean_time = time_queue(queue, item_count, repeat)
+                print(
+                    f"{backend.value:<16}{priority_levels:>8}{str(starvation_limit):>12}"
+                    f"{mean_time * 1e6:>12.1f}",
+                    flush=True,
+                )
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main != 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
@@ -0,0 +1,164 @@
+"""
+Benchmark queue serializers across payload sizes.
+
+Each serializer round trips the payload through serialization alone and through a shared memory
+queue and a manager queue, in a single process, so the times are the transfer overhead without
+scheduling between processes. Bytes passthrough only supports bytes payloads and the custom
+serializer only supports arrays.
+
+Run from the repository root:
+    python -m modules.worker_manager.benchmark.benchmark_serializer
+"""
+
+import time
+
+import numpy as np
+
+from modules.worker_manager import queue_property_data
+from modules.worker_manager import queue_wrapper
+from modules.worker_manager.private import serializer
+from modules.worker_manager.private import worker_sync_manager
+
+
+# Room for the pickle and the frame lengths
+SLOT_OVERHEAD = 4096
+
+
+def encode_array(array: np.ndarray) -> bytes:
+    """
+    Custom encode: raw data of a flat byte array.
+    """
+    return array.tobytes()
+
+
+def decode_array(data: bytes) -> np.ndarray:
+    """
+    Custom decode: flat byte array.
+    """
+    return np.frombuffer(data, dtype=np.uint8)
+
+
+def create_property(
+    backend: queue_property_data.QueueBackend,
+    kind: queue_property_data.SerializerKind,
+    payload_size: int,
+) -> queue_property_data.QueuePropertyData | None:
+    """
+    Queue property for one payload.
+    """
+    encode = None
+    decode = None
+    if kind == queue_property_data.SerializerKind.CUSTOM:
+        encode = encode_array
+        decode = decode_array
+
+    result, queue_property = queue_property_data.QueuePropertyData.create(
+        "queue", 1, backend, payload_size + SLOT_OVERHEAD, kind, encode, decode
+    )
+    if not result:
+        return None
+
+    return queue_property
+
+
+def time_serializer(
+    queue_property: queue_property_data.QueuePropertyData, payload: object, repeat: int
+) -> float:
+    """
+    Return: Mean seconds per dumps() and loads(), with frames copied once like in a queue.
+    """
+    result, item_serializer = serializer.Serializer.create(
+        queue_property.serializer_kind, queue_property.encode, queue_property.decode
+    )
+    assert result
+    assert item_serializer is not None
+
+    start_time = time.perf_counter()
+    for _ in range(0, repeat):
+        frames = [bytearray(frame) for frame in item_serializer.dumps(payload)]
+        item_serializer.loads(frames)
+
+    return (time.perf_counter() - start_time) / repeat
+
+
+def time_queue(queue: queue_wrapper.QueueWrapper, payload: object, repeat: int) -> float:
+    """
+    Return: Mean seconds per put() and get().
+    """
+    start_time = time.perf_counter()
+    for _ in range(0, repeat):
+        queue.put(payload)
+        queue.get()
+
+    return (time.perf_counter() - start_time) / repeat
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    payload_sizes = [1_024, 65_536, 1_048_576, 16_777_216]
+    payload_types = {
+        "bytes": [
+            queue_property_data.SerializerKind.PICKLE,
+            queue_property_data.SerializerKind.PICKLE_OUT_OF_BAND,
+            queue_property_data.SerializerKind.BYTES,
+        ],
+        "array": [
+            queue_property_data.SerializerKind.PICKLE,
+            queue_property_data.SerializerKind.PICKLE_OUT_OF_BAND,
+            queue_property_data.SerializerKind.CUSTOM,
+        ],
+    }
+
+    print(
+        f"{'payload':<8}{'size':>10}{'serializer':>20}"
+        f"{'serialize us':>14}{'shm queue us':>14}{'manager us':>12}"
+    )
+    with worker_sync_manager.WorkerSyncManager() as mp_manager:
+        for payload_size in payload_sizes:
+            # Fewer repetitions for large payloads
+            repeat = max(10, min(2_000, 100_000_000 // payload_size))
+            for payload_type, kinds in payload_types.items():
+                payload: object = np.ones(payload_size, dtype=np.uint8)
+                if payload_type == "bytes":
+                    payload = bytes(payload_size)
+
+                for kind in kinds:
+                    times = []
+                    for backend in [
+                        queue_property_data.QueueBackend.MANAGER,
+                        queue_property_data.QueueBackend.SHARED_MEMORY,
+                    ]:
+                        queue_property = create_property(backend, kind, payload_size)
+                        if queue_property is None:
+                            return -1
+
+                        result, queue = queue_wrapper.QueueWrapper.create(
+                            mp_manager, queue_property
+                        )
+                        if not result:
+                            return -1
+
+                        # Get Pylance to stop complaining
+                        assert queue is not None
+
+                        times.append(time_queue(queue, payload, repeat))
+
+                    serialize_time = time_serializer(queue_property, payload, repeat)
+                    print(
+                        f"{payload_type:<8}{payload_size:>10}{kind.value:>20}"
+                        f"{serialize_time * 1e6:>14.1f}"
+                        f"{times[1] * 1e6:>14.1f}{times[0] * 1e6:>12.1f}",
+                        flush=True,
+                    )
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main != 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
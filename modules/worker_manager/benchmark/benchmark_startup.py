@@ -0,0 +1,161 @@
+"""
+Benchmark worker startup latency for each start method.
+
+The worker module imports NumPy, which stands in for heavy imports such as models. With spawn, each
+worker imports it again. With forkserver, it is preloaded once into the fork server. Thread
+workers are measured for comparison.
+
+Run from the repository root:
+    python -m modules.worker_manager.benchmark.benchmark_startup
+"""
+
+import subprocess
+import sys
+import time
+
+# Heavy import paid by every worker that is not forked from a process that already has it
+# pylint: disable-next=unused-import
+import numpy as np
+
+from modules.worker_manager import worker_controller
+from modules.worker_manager import worker_manager
+from modules.worker_manager import worker_property_data
+
+
+PRELOAD_MODULES = ["numpy"]
+
+
+def idle_worker(period: float, controller: worker_controller.WorkerController) -> None:
+    """
+    Sleeps until stopped.
+    """
+    while controller.check_pause_and_exit():
+        time.sleep(period)
+
+
+def measure_startup(
+    start_method: str,
+    preload_modules: list[str] | None,
+    execution_mode: worker_property_data.ExecutionMode,
+    worker_count: int,
+) -> tuple[True, float, float] | tuple[False, None, None]:
+    """
+    Start a group of idle workers and stop it.
+
+    Return: Success, seconds to create the manager, seconds until all workers were ready.
+    """
+    start_time = time.perf_counter()
+    result, manager = worker_manager.WorkerManager.create(5, start_method, preload_modules)
+    if not result:
+        return False, None, None
+
+    # Get Pylance to stop complaining
+    assert manager is not None
+
+    manager_time = time.perf_counter() - start_time
+
+    result, worker_property = worker_property_data.WorkerPropertyData.create(
+        worker_count, idle_worker, (0.1,), [], [], execution_mode=execution_mode
+    )
+    if not result:
+        return False, None, None
+
+    # Get Pylance to stop complaining
+    assert worker_property is not None
+
+    if manager.add_worker_groups([worker_property]) != 1:
+        return False, None, None
+
+    result = manager.start_all(60.0)
+    if not result:
+        return False, None, None
+
+    result, startup_time = manager.get_startup_time()
+    if not result:
+        return False, None, None
+
+    manager.stop_all(5.0)
+
+    return True, manager_time, startup_time
+
+
+def run_mode(
+    start_method: str,
+    preload_modules: list[str] | None,
+    execution_mode: worker_property_data.ExecutionMode,
+) -> bool:
+    """
+    Print the startup latency of one start method for each worker count.
+
+    Return: Success.
+    """
+    worker_counts = [1, 8]
+
+    name = start_method
+    if preload_modules is not None:
+        name += " + preload"
+
+    if execution_mode == worker_property_data.ExecutionMode.THREAD:
+        name = "thread"
+
+    for worker_count in worker_counts:
+        result, manager_time, startup_time = measure_startup(
+            start_method, preload_modules, execution_mode, worker_count
+        )
+        if not result:
+            print(f"ERROR: Failed to measure {name}")
+            return False
+
+        # Get Pylance to stop complaining
+        assert manager_time is not None
+        assert startup_time is not None
+
+        print(
+            f"{name:<24}{worker_count:>8}{manager_time * 1000:>12.1f}"
+            f"{startup_time * 1000:>10.1f}{startup_time * 1000 / worker_count:>11.1f}",
+            flush=True,
+        )
+
+    return True
+
+
+def main() -> int:
+    """
+    Main function.
+
+    The fork server is started once per program and keeps its preloaded modules, so each mode is
+    measured in a new interpreter.
+    """
+    if len(sys.argv) == 4:
+        preload_modules = PRELOAD_MODULES if sys.argv[2] == "preload" else None
+        execution_mode = worker_property_data.ExecutionMode(sys.argv[3])
+        result = run_mode(sys.argv[1], preload_modules, execution_mode)
+        return 0 if result else -1
+
+    modes = [
+        ("fork", "none", "process"),
+        ("spawn", "none", "process"),
+        ("forkserver", "none", "process"),
+        ("forkserver", "preload", "process"),
+        ("fork", "none", "thread"),
+    ]
+
+    print(f"{'start method':<24}{'workers':>8}{'manager ms':>12}{'ready ms':>10}{'ms/worker':>11}")
+    for start_method, preload, execution_mode in modes:
+        completed = subprocess.run(
+            [sys.executable, "-m", __spec__.name, start_method, preload, execution_mode],
+            check=False,
+        )
+        if completed.returncode != 0:
+            return -1
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main != 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    if len(sys.argv) == 1:
+        print("Done!")
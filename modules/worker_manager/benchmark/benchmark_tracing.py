@@ -0,0 +1,112 @@
+"""
+Benchmark the cost of tracing items through a chain of queues.
+
+Each item is put into the first queue and relayed through the rest by the same thread, like a chain
+of workers, so the times are the cost per hop without scheduling between processes. Tracing is
+disabled, or enabled with several sample rates.
+
+Run from the repository root:
+    python -m modules.worker_manager.benchmark.benchmark_tracing
+"""
+
+import contextvars
+import tempfile
+import time
+
+from modules.worker_manager import queue_property_data
+from modules.worker_manager import queue_wrapper
+from modules.worker_manager.private import tracer
+
+
+def relay_items(queues: list[queue_wrapper.QueueWrapper], item_count: int) -> None:
+    """
+    Put each item into the first queue and relay it through the others.
+    """
+    for i in range(0, item_count):
+        queues[0].put(i)
+        for source, destination in zip(queues, queues[1:]):
+            _, item = source.get()
+            destination.put(item)
+
+        queues[-1].get()
+
+
+def time_chain(
+    item_tracer: tracer.Tracer | None, queue_count: int, item_count: int
+) -> float | None:
+    """
+    Return: Mean seconds per hop, None on failure.
+    """
+    queues = []
+    for i in range(0, queue_count):
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            f"queue_{i}", 1, queue_property_data.QueueBackend.IN_PROCESS
+        )
+        if not result:
+            return None
+
+        # Get Pylance to stop complaining
+        assert queue_property is not None
+
+        result, queue = queue_wrapper.QueueWrapper.create(
+            None, queue_property, item_tracer=item_tracer
+        )
+        if not result:
+            return None
+
+        # Get Pylance to stop complaining
+        assert queue is not None
+
+        queues.append(queue)
+
+    start_time = time.perf_counter()
+    # New context so the items put are sampled like at a source
+    contextvars.Context().run(relay_items, queues, item_count)
+    hop_time = (time.perf_counter() - start_time) / (item_count * queue_count)
+
+    if item_tracer is not None and not item_tracer.flush():
+        return None
+
+    return hop_time
+
+
+def main() -> int:
+    """
+    Main function.
+    """
+    queue_count = 4
+    item_count = 20000
+    sample_rates = [0.0, 0.01, 1.0]
+
+    print(f"Queues: {queue_count}, items: {item_count}")
+    print(f"{'sample rate':<14}{'hop us':>10}")
+    disabled_time = time_chain(None, queue_count, item_count)
+    if disabled_time is None:
+        return -1
+
+    print(f"{'disabled':<14}{disabled_time * 1e6:>10.2f}", flush=True)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for sample_rate in sample_rates:
+            result, item_tracer = tracer.Tracer.create(directory, sample_rate)
+            if not result:
+                return -1
+
+            # Get Pylance to stop complaining
+            assert item_tracer is not None
+
+            hop_time = time_chain(item_tracer, queue_count, item_count)
+            if hop_time is None:
+                return -1
+
+            print(f"{sample_rate:<14}{hop_time * 1e6:>10.2f}", flush=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    result_main = main()
+    if result_main != 0:
+        print(f"ERROR: Status code: {result_main}")
+
+    print("Done!")
@@ -0,0 +1,101 @@
+"""
+Pipeline configuration data.
+"""
+
+from ... import queue_property_data
+
+
+class PipelineConfigData:
+    """
+    Shape of a benchmark pipeline.
+
+    A source sends each item to every branch. A branch is a chain of stages, each with its own
+    workers, connected by queues. The last stage of each branch is the sink.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        depth: int,
+        fan_out: int,
+        worker_count: int,
+        payload_size: int,
+        max_size: int,
+        item_count: int,
+        backend: queue_property_data.QueueBackend,
+    ) -> tuple[True, "PipelineConfigData"] | tuple[False, None]:
+        """
+        depth: Number of stages in each branch, including the sink. Must be greater than 0.
+        fan_out: Number of branches. Must be greater than 0.
+        worker_count: Number of workers in each stage. Must be greater than 0.
+        payload_size: Bytes of payload in each item. Must not be negative.
+        max_size: Maximum number of items that can be held in each queue. Must be greater than 0.
+        item_count: Number of items sent by the source. Must be greater than 0.
+        backend: Backend of the queues. The stages are processes, so not in-process.
+
+        Return: Success, object.
+        """
+        if depth <= 0:
+            print("ERROR: Depth must be greater than 0")
+            return False, None
+
+        if fan_out <= 0:
+            print("ERROR: Fan out must be greater than 0")
+            return False, None
+
+        if worker_count <= 0:
+            print("ERROR: Worker count must be greater than 0")
+            return False, None
+
+        if payload_size < 0:
+            print("ERROR: Payload size cannot be negative")
+            return False, None
+
+        if max_size <= 0:
+            print("ERROR: Queue max size must be greater than 0")
+            return False, None
+
+        if item_count <= 0:
+            print("ERROR: Item count must be greater than 0")
+            return False, None
+
+        if backend == queue_property_data.QueueBackend.IN_PROCESS:
+            print("ERROR: In-process queues cannot connect processes")
+            return False, None
+
+        return True, PipelineConfigData(
+            cls.__create_key,
+            depth,
+            fan_out,
+            worker_count,
+            payload_size,
+            max_size,
+            item_count,
+            backend,
+        )
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        depth: int,
+        fan_out: int,
+        worker_count: int,
+        payload_size: int,
+        max_size: int,
+        item_count: int,
+        backend: queue_property_data.QueueBackend,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is PipelineConfigData.__create_key, "Use create() method"
+
+        self.depth = depth
+        self.fan_out = fan_out
+        self.worker_count = worker_count
+        self.payload_size = payload_size
+        self.max_size = max_size
+        self.item_count = item_count
+        self.backend = backend
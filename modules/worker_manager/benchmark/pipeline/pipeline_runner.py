@@ -0,0 +1,303 @@
+"""
+Builds and runs a benchmark pipeline.
+"""
+
+import multiprocessing as mp
+import multiprocessing.context
+import multiprocessing.managers
+import multiprocessing.process
+import os
+import resource
+import time
+
+from . import pipeline_config_data
+from . import pipeline_stages
+from ... import queue_property_data
+from ... import queue_wrapper
+from ... import worker_controller
+from ...private import process_wrapper
+from ...private import worker_sync_manager
+
+
+CONTROLLER_MAX_SIZE = 5
+# Bytes added to the payload for the pickled item in a shared memory slot
+SLOT_OVERHEAD = 256
+# Seconds for workers to exit on request after the pipeline is done or has timed out
+STOP_TIMEOUT = 5.0
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """
+    Nearest rank percentile.
+
+    sorted_values: Values in ascending order. Must not be empty.
+    fraction: Between 0 and 1.
+    """
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def get_children_cpu_time() -> float:
+    """
+    Return: User and system seconds of all child processes that have been joined.
+    """
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+class PipelineRunner:
+    """
+    Runs a pipeline once in child processes. The manager server is started for the run, so that its
+    CPU time is included.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        config: pipeline_config_data.PipelineConfigData,
+        mp_context: multiprocessing.context.BaseContext | None = None,
+    ) -> tuple[True, "PipelineRunner"] | tuple[False, None]:
+        """
+        config: Shape of the pipeline.
+        mp_context: Multiprocessing context of the workers. None is the default context.
+
+        Return: Success, object.
+        """
+        if mp_context is None:
+            mp_context = mp.get_context()
+
+        return True, PipelineRunner(cls.__create_key, config, mp_context)
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        config: pipeline_config_data.PipelineConfigData,
+        mp_context: multiprocessing.context.BaseContext,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is PipelineRunner.__create_key, "Use create() method"
+
+        self.__config = config
+        self.__mp_context = mp_context
+
+        self.__workers: list[
+            tuple[multiprocessing.process.BaseProcess, worker_controller.WorkerController]
+        ] = []
+
+    def run(self, timeout: float) -> tuple[True, dict] | tuple[False, None]:
+        """
+        Send the items through the pipeline.
+
+        timeout: Seconds to wait for the sinks.
+
+        Return: Success, result for JSON output.
+        """
+        self.__workers = []
+
+        cpu_time_start = get_children_cpu_time()
+        wall_time_start = time.perf_counter()
+
+        with worker_sync_manager.WorkerSyncManager(ctx=self.__mp_context) as mp_manager:
+            result, run_result = self.__run_with_manager(mp_manager, timeout)
+
+        wall_time = time.perf_counter() - wall_time_start
+        cpu_time = get_children_cpu_time() - cpu_time_start
+
+        if not result:
+            return False, None
+
+        # Get Pylance to stop complaining
+        assert run_result is not None
+
+        run_result["cpu_time"] = cpu_time
+        run_result["cpu_utilisation"] = cpu_time / (wall_time * (os.cpu_count() or 1))
+
+        return True, run_result
+
+    def __run_with_manager(
+        self, mp_manager: multiprocessing.managers.SyncManager, timeout: float
+    ) -> tuple[True, dict] | tuple[False, None]:
+        """
+        Build the pipeline, run it, and stop the workers.
+        """
+        result, result_queue = self.__create_queue(mp_manager, "result", True)
+        if not result:
+            return False, None
+
+        # Get Pylance to stop complaining
+        assert result_queue is not None
+
+        start_event = self.__mp_context.Event()
+
+        result, queues = self.__create_branches(mp_manager, result_queue)
+        if not result:
+            return False, None
+
+        # Get Pylance to stop complaining
+        assert queues is not None
+
+        result = self.__start_worker(
+            pipeline_stages.source_stage,
+            (
+                self.__config.item_count,
+                self.__config.payload_size,
+                self.__config.worker_count,
+                start_event,
+                [branch[0] for branch in queues],
+            ),
+        )
+        if not result:
+            self.__stop_workers()
+            return False, None
+
+        for worker, controller in self.__workers:
+            if not controller.is_ready(timeout):
+                print(f"ERROR: Worker did not start: {worker.exitcode}")
+                self.__stop_workers()
+                return False, None
+
+        sink_count = self.__config.fan_out * self.__config.worker_count
+        latencies: list[float] = []
+
+        start_time = time.perf_counter()
+        start_event.set()
+
+        for _ in range(0, sink_count):
+            remaining = max(start_time + timeout - time.perf_counter(), 0.0)
+            result, sink_latencies = result_queue.get(remaining)
+            if not result:
+                print("ERROR: Pipeline timed out")
+                self.__stop_workers()
+                return False, None
+
+            latencies += sink_latencies
+
+        elapsed_time = time.perf_counter() - start_time
+
+        names_to_metrics = {}
+        for branch in queues:
+            for queue in branch:
+                result, metrics = queue.get_metrics()
+                if result:
+                    names_to_metrics[queue.queue_property.name] = vars(metrics)
+
+        self.__stop_workers()
+
+        latencies.sort()
+        return True, {
+            "items_delivered": len(latencies),
+            "elapsed_time": elapsed_time,
+            "throughput": len(latencies) / elapsed_time,
+            "latency_p50": percentile(latencies, 0.50),
+            "latency_p99": percentile(latencies, 0.99),
+            "queues": names_to_metrics,
+        }
+
+    def __create_branches(
+        self,
+        mp_manager: multiprocessing.managers.SyncManager,
+        result_queue: queue_wrapper.QueueWrapper,
+    ) -> tuple[True, list[list[queue_wrapper.QueueWrapper]]] | tuple[False, None]:
+        """
+        Create the queues and start the workers of each branch.
+
+        Return: Success, input queue of each stage of each branch.
+        """
+        queues = []
+        for branch_index in range(0, self.__config.fan_out):
+            branch = []
+            for stage_index in range(0, self.__config.depth):
+                result, queue = self.__create_queue(
+                    mp_manager, f"branch_{branch_index}_stage_{stage_index}", False
+                )
+                if not result:
+                    return False, None
+
+                branch.append(queue)
+
+            queues.append(branch)
+
+            for stage_index, input_queue in enumerate(branch):
+                if stage_index == len(branch) - 1:
+                    target = pipeline_stages.sink_stage
+                    output_queue = result_queue
+                else:
+                    target = pipeline_stages.relay_stage
+                    output_queue = branch[stage_index + 1]
+
+                for _ in range(0, self.__config.worker_count):
+                    if not self.__start_worker(target, (input_queue, output_queue)):
+                        self.__stop_workers()
+                        return False, None
+
+        return True, queues
+
+    def __create_queue(
+        self, mp_manager: multiprocessing.managers.SyncManager, name: str, is_result: bool
+    ) -> tuple[True, queue_wrapper.QueueWrapper] | tuple[False, None]:
+        """
+        Create a queue of the configured backend. The result queue is a manager queue with room
+        for every sink, since the latencies of a sink do not fit in a slot.
+        """
+        if is_result:
+            result, queue_property = queue_property_data.QueuePropertyData.create(
+                name, self.__config.fan_out * self.__config.worker_count
+            )
+        else:
+            result, queue_property = queue_property_data.QueuePropertyData.create(
+                name,
+                self.__config.max_size,
+                self.__config.backend,
+                self.__config.payload_size + SLOT_OVERHEAD,
+            )
+
+        if not result:
+            return False, None
+
+        # Get Pylance to stop complaining
+        assert queue_property is not None
+
+        return queue_wrapper.QueueWrapper.create(mp_manager, queue_property, self.__mp_context)
+
+    def __start_worker(self, target: "(...) -> object", arguments: tuple) -> bool:  # type: ignore
+        """
+        Start a worker with its own controller.
+
+        Return: Success.
+        """
+        result, controller = worker_controller.WorkerController.create(
+            CONTROLLER_MAX_SIZE, self.__mp_context
+        )
+        if not result:
+            return False
+
+        # Get Pylance to stop complaining
+        assert controller is not None
+
+        worker = self.__mp_context.Process(
+            target=process_wrapper.run_worker, args=(target, arguments, controller)
+        )
+        worker.start()
+        self.__workers.append((worker, controller))
+
+        return True
+
+    def __stop_workers(self) -> None:
+        """
+        Ask the workers to exit and join them, so their CPU time is counted.
+        """
+        for _, controller in self.__workers:
+            controller.request_exit()
+
+        deadline = time.monotonic() + STOP_TIMEOUT
+        for worker, _ in self.__workers:
+            worker.join(max(deadline - time.monotonic(), 0.0))
+            if worker.is_alive():
+                worker.kill()
+                worker.join()
+
+        self.__workers = []
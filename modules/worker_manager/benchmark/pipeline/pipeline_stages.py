@@ -0,0 +1,104 @@
+"""
+Workers of the benchmark pipeline.
+
+Items are (send time from time.monotonic(), payload). The source ends each branch with one end
+marker per worker of the first stage, and each worker forwards one end marker when it exits. Queues
+are FIFO, so the last end marker arrives after all items.
+"""
+
+import multiprocessing.synchronize
+import time
+
+from ... import queue_wrapper
+from ... import worker_controller
+
+
+END_MARKER = None
+# Seconds to wait on a queue before checking the controller again
+QUEUE_TIMEOUT = 0.1
+
+
+def put_until_exit(
+    queue: queue_wrapper.QueueWrapper,
+    item: object,
+    controller: worker_controller.WorkerController,
+) -> bool:
+    """
+    Put an item, checking the controller while the queue is full.
+
+    Return: False if the worker should exit.
+    """
+    while controller.check_pause_and_exit():
+        if queue.put(item, QUEUE_TIMEOUT):
+            return True
+
+    return False
+
+
+def source_stage(
+    item_count: int,
+    payload_size: int,
+    end_marker_count: int,
+    start_event: multiprocessing.synchronize.Event,
+    branch_queues: list[queue_wrapper.QueueWrapper],
+    controller: worker_controller.WorkerController,
+) -> None:
+    """
+    Sends item_count items to every branch after the start event, then the end markers.
+    """
+    payload = bytes(payload_size)
+
+    start_event.wait()
+
+    for _ in range(0, item_count):
+        item = (time.monotonic(), payload)
+        for queue in branch_queues:
+            if not put_until_exit(queue, item, controller):
+                return
+
+    for queue in branch_queues:
+        for _ in range(0, end_marker_count):
+            if not put_until_exit(queue, END_MARKER, controller):
+                return
+
+
+def relay_stage(
+    input_queue: queue_wrapper.QueueWrapper,
+    output_queue: queue_wrapper.QueueWrapper,
+    controller: worker_controller.WorkerController,
+) -> None:
+    """
+    Forwards items until an end marker.
+    """
+    while controller.check_pause_and_exit():
+        result, item = input_queue.get(QUEUE_TIMEOUT)
+        if not result:
+            continue
+
+        if not put_until_exit(output_queue, item, controller):
+            return
+
+        if item is END_MARKER:
+            return
+
+
+def sink_stage(
+    input_queue: queue_wrapper.QueueWrapper,
+    result_queue: queue_wrapper.QueueWrapper,
+    controller: worker_controller.WorkerController,
+) -> None:
+    """
+    Records the latency of each item until an end marker, then sends the latencies in seconds.
+    """
+    latencies = []
+    while controller.check_pause_and_exit():
+        result, item = input_queue.get(QUEUE_TIMEOUT)
+        if not result:
+            continue
+
+        if item is END_MARKER:
+            put_until_exit(result_queue, latencies, controller)
+            return
+
+        send_time, _ = item
+        latencies.append(time.monotonic() - send_time)
@@ -0,0 +1,57 @@
+"""
+Test pipeline runner.
+"""
+
+import pytest
+
+from modules.worker_manager import queue_property_data
+from modules.worker_manager.benchmark.pipeline import pipeline_config_data
+from modules.worker_manager.benchmark.pipeline import pipeline_runner
+
+
+class TestPipelineConfigData:
+    """
+    Test PipelineConfigData.create() method.
+    """
+
+    def test_depth_zero(self) -> None:
+        """
+        Zero depth.
+        """
+        result, config = pipeline_config_data.PipelineConfigData.create(
+            0, 1, 1, 0, 1, 1, queue_property_data.QueueBackend.MANAGER
+        )
+
+        assert not result
+        assert config is None
+
+
+class TestRun:
+    """
+    Test run() method.
+    """
+
+    @pytest.mark.parametrize(
+        "backend",
+        [queue_property_data.QueueBackend.MANAGER, queue_property_data.QueueBackend.SHARED_MEMORY],
+    )
+    def test_normal(self, backend: queue_property_data.QueueBackend) -> None:
+        """
+        Every item reaches every branch.
+        """
+        result, config = pipeline_config_data.PipelineConfigData.create(2, 2, 2, 16, 4, 50, backend)
+        assert result
+        assert config is not None
+
+        result, runner = pipeline_runner.PipelineRunner.create(config)
+        assert result
+        assert runner is not None
+
+        result, run_result = runner.run(30.0)
+
+        assert result
+        assert run_result is not None
+        assert run_result["items_delivered"] == 100
+        assert 0.0 < run_result["latency_p50"] <= run_result["latency_p99"]
+        assert run_result["cpu_time"] > 0.0
+        assert len(run_result["queues"]) == 4
@@ -2,6 +2,8 @@
 Example.
 """
 
+import time
+
 from modules.worker_manager import queue_property_data
 from modules.worker_manager import worker_manager
 from modules.worker_manager import worker_property_data
@@ -18,8 +20,11 @@ def add_queues_to_manager(manager: worker_manager.WorkerManager, queue_max_size:
 
     Return: Success.
     """
+    # Number the items into the multipliers, which finish them out of order
     result, generator_to_multiplier_queue_property = queue_property_data.QueuePropertyData.create(
-        "generator_to_multiplier_queue", queue_max_size
+        "generator_to_multiplier_queue",
+        queue_max_size,
+        sequence_mode=queue_property_data.SequenceMode.STAMP,
     )
     if not result:
         return False
@@ -27,8 +32,11 @@ def add_queues_to_manager(manager: worker_manager.WorkerManager, queue_max_size:
     # Get Pylance to stop complaining
     assert generator_to_multiplier_queue_property is not None
 
+    # The printer receives the products in the order of the numbers
     result, multiplier_to_printer_queue_property = queue_property_data.QueuePropertyData.create(
-        "multiplier_to_printer_queue", queue_max_size
+        "multiplier_to_printer_queue",
+        queue_max_size,
+        sequence_mode=queue_property_data.SequenceMode.REORDER,
     )
     if not result:
         return False
@@ -80,8 +88,9 @@ def add_worker_groups_to_manager(manager: worker_manager.WorkerManager, worker_c
     # Get Pylance to stop complaining
     assert multiplier_worker_properties is not None
 
+    # Reorder queues have a single consumer
     result, printer_worker_properties = worker_property_data.WorkerPropertyData.create(
-        worker_count,
+        1,
         printer_worker.printer_worker,
         ("Received: ", " from multipier!"),
         ["multiplier_to_printer_queue"],
@@ -112,6 +121,9 @@ def main() -> int:
     """
     queue_max_size = 5
     worker_count_per_group = 2
+    ready_timeout = 10.0
+    run_time = 1.0
+    stop_timeout = 1.0
 
     result, manager = worker_manager.WorkerManager.create(queue_max_size)
     if not result:
@@ -128,6 +140,35 @@ def main() -> int:
     if not result:
         return -1
 
+    result = manager.start_all(ready_timeout)
+    if not result:
+        return -1
+
+    result, startup_time = manager.get_startup_time()
+    if result:
+        print(f"Workers ready after {startup_time:.3f} s")
+
+    time.sleep(run_time)
+
+    result, pause_time = manager.pause_group("multiplier_worker", stop_timeout)
+    if result:
+        print(f"Multipliers paused after {pause_time:.3f} s")
+
+    time.sleep(run_time)
+
+    result, resume_time = manager.resume_group("multiplier_worker", stop_timeout)
+    if result:
+        print(f"Multipliers resumed after {resume_time:.3f} s")
+
+    time.sleep(run_time)
+
+    # Items already in the queues are printed before the workers exit
+    result, drain_time = manager.drain_all(stop_timeout)
+    if not result:
+        print("WARNING: Some workers were stopped before they drained")
+    else:
+        print(f"Workers drained after {drain_time:.3f} s")
+
     return 0
 
 
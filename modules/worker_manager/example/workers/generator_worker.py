@@ -24,12 +24,16 @@ def generator_worker(
     controller: Worker controller.
     """
     end = 10
+    timeout = 0.1
 
     i = start % end
-    while True:
-        print(f"Generator: {i}")
+    while controller.check_pause_and_exit():
+        # Time out so that the controller is checked while the queue is full
+        result = generator_to_multiplier_queue.put(i, timeout)
+        if not result:
+            continue
 
-        generator_to_multiplier_queue.queue.put(i)
+        print(f"Generator: {i}")
 
         i += 1
         i %= end
@@ -24,11 +24,19 @@ def multiplier_worker(
 
     controller: Worker controller.
     """
-    while True:
-        i = generator_to_multiplier_queue.queue.get()
+    timeout = 0.1
+
+    while controller.check_pause_and_exit():
+        # Time out so that the controller is checked while the queue is empty
+        result, i = generator_to_multiplier_queue.get(timeout)
+        if not result:
+            continue
 
         product = factor * i
 
         print(f"Multiplier: {product} = {factor} * {i}")
 
-        multiplier_to_printer_queue.queue.put(product)
+        while controller.check_pause_and_exit():
+            result = multiplier_to_printer_queue.put(product, timeout)
+            if result:
+                break
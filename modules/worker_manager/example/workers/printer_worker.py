@@ -25,8 +25,13 @@ def printer_worker(
 
     controller: Worker controller.
     """
-    while True:
-        i = multiplier_to_printer_queue.queue.get()
+    timeout = 0.1
+
+    while controller.check_pause_and_exit():
+        # Time out so that the controller is checked while the queue is empty
+        result, i = multiplier_to_printer_queue.get(timeout)
+        if not result:
+            continue
 
         print_str = prefix + str(i) + suffix
 
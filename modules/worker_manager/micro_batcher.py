@@ -0,0 +1,122 @@
+"""
+Micro-batching of queue items.
+"""
+
+import collections.abc
+import time
+
+from . import queue_wrapper
+from . import worker_controller
+
+
+class MicroBatcher:
+    """
+    Collects items of an input queue into batches for the target function of a worker.
+
+    A batch is complete once it holds max_batch_size items, or max_wait_time seconds after its
+    first item was got. The worker controller is checked between gets, so a partial batch is
+    yielded as soon as the worker should exit or pause, and when the input queue ends during a
+    drain.
+    The size of each batch is recorded in the batch size histogram of the queue metrics.
+    """
+
+    # Maximum seconds between checks of the worker controller
+    POLL_PERIOD = 0.1
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        input_queue: queue_wrapper.QueueWrapper,
+        max_batch_size: int,
+        max_wait_time: float,
+    ) -> tuple[True, "MicroBatcher"] | tuple[False, None]:
+        """
+        input_queue: Queue to get items from.
+        max_batch_size: Maximum number of items in a batch. Must be greater than 0.
+        max_wait_time: Seconds from the first item of a batch until it is yielded, even if it is
+            not full. Must not be negative.
+
+        Return: Success, object.
+        """
+        if max_batch_size <= 0:
+            print("ERROR: Max batch size must be greater than 0")
+            return False, None
+
+        if max_wait_time < 0.0:
+            print("ERROR: Max wait time must not be negative")
+            return False, None
+
+        return True, MicroBatcher(cls.__create_key, input_queue, max_batch_size, max_wait_time)
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        input_queue: queue_wrapper.QueueWrapper,
+        max_batch_size: int,
+        max_wait_time: float,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is MicroBatcher.__create_key, "Use create() method"
+
+        self.__input_queue = input_queue
+        self.__max_batch_size = max_batch_size
+        self.__max_wait_time = max_wait_time
+
+    def batches(
+        self, controller: worker_controller.WorkerController
+    ) -> collections.abc.Iterator[list[object]]:
+        """
+        Called by the worker instead of its own loop, checks the worker controller between gets.
+
+        controller: Worker controller of the worker.
+
+        Return: Batches of items in order, never empty. Ends when the worker should exit, after
+            yielding the partial batch.
+        """
+        batch: list[object] = []
+        # Time from time.monotonic() when the batch is yielded even if it is not full
+        deadline = 0.0
+        while True:
+            # Items are not held past the max wait time while the worker is paused
+            if len(batch) > 0 and controller.is_pause_requested():
+                yield self.__flush(batch)
+                batch = []
+
+            if not controller.check_pause_and_exit():
+                break
+
+            if len(batch) == 0:
+                result, item = self.__input_queue.get(MicroBatcher.POLL_PERIOD)
+                if not result:
+                    continue
+
+                batch.append(item)
+                deadline = time.monotonic() + self.__max_wait_time
+
+            remaining = max(deadline - time.monotonic(), 0.0)
+            batch += self.__input_queue.get_many(
+                self.__max_batch_size - len(batch), min(remaining, MicroBatcher.POLL_PERIOD)
+            )
+
+            if len(batch) < self.__max_batch_size and time.monotonic() < deadline:
+                continue
+
+            yield self.__flush(batch)
+            batch = []
+
+        # Flush on shutdown
+        if len(batch) > 0:
+            yield self.__flush(batch)
+
+    def __flush(self, batch: list[object]) -> list[object]:
+        """
+        Record the size of the batch.
+
+        Return: The batch.
+        """
+        self.__input_queue.add_batch(len(batch))
+        return batch
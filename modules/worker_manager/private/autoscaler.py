@@ -0,0 +1,86 @@
+"""
+Autoscaler.
+"""
+
+from .. import scaling_policy_data
+
+
+class Autoscaler:
+    """
+    Decides when a worker group scales, from samples of its input queue depth.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls, scaling_policy: scaling_policy_data.ScalingPolicyData
+    ) -> tuple[True, "Autoscaler"] | tuple[False, None]:
+        """
+        scaling_policy: Scaling policy.
+
+        Return: Success, object.
+        """
+        return True, Autoscaler(cls.__create_key, scaling_policy)
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        scaling_policy: scaling_policy_data.ScalingPolicyData,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is Autoscaler.__create_key, "Use create() method"
+
+        self.__scaling_policy = scaling_policy
+
+        self.__samples_above = 0
+        self.__samples_below = 0
+        self.__last_event_time: float | None = None
+
+    def update(self, depth: int, worker_count: int, now: float) -> int:
+        """
+        Add a sample.
+
+        depth: Total number of items in the input queues.
+        worker_count: Current number of workers.
+        now: Time of the sample from time.monotonic().
+
+        Return: Change in the number of workers: 1, -1, or 0.
+        """
+        depth_per_worker = depth / max(worker_count, 1)
+        if depth_per_worker > self.__scaling_policy.scale_up_depth:
+            self.__samples_above += 1
+            self.__samples_below = 0
+        elif depth_per_worker <= self.__scaling_policy.scale_down_depth:
+            self.__samples_below += 1
+            self.__samples_above = 0
+        else:
+            self.__samples_above = 0
+            self.__samples_below = 0
+
+        if (
+            self.__last_event_time is not None
+            and now - self.__last_event_time < self.__scaling_policy.cooldown
+        ):
+            return 0
+
+        change = 0
+        if (
+            self.__samples_above >= self.__scaling_policy.sample_count
+            and worker_count < self.__scaling_policy.max_count
+        ):
+            change = 1
+        elif (
+            self.__samples_below >= self.__scaling_policy.sample_count
+            and worker_count > self.__scaling_policy.min_count
+        ):
+            change = -1
+
+        if change != 0:
+            self.__samples_above = 0
+            self.__samples_below = 0
+            self.__last_event_time = now
+
+        return change
@@ -0,0 +1,513 @@
+"""
+Broadcast queue backed by a shared memory ring buffer.
+"""
+
+import multiprocessing as mp
+import multiprocessing.context
+import multiprocessing.shared_memory
+import multiprocessing.synchronize
+import os
+import queue
+import struct
+import time
+import weakref
+
+from . import serializer
+from . import shared_memory_queue
+
+
+# Ring buffer layout and its synchronization
+# pylint: disable-next=too-many-instance-attributes
+class BroadcastQueue:
+    """
+    Bounded multi-producer queue where every subscriber receives every item.
+
+    Items are serialized once into the slots of a shared memory ring buffer. Each subscriber has its
+    own read cursor, and the consumers of a subscriber share its items like with a regular queue. A
+    slot is reused once all subscribers have read it, so a put waits for space in the slowest
+    subscriber, and a subscriber only waits for its own items. Items put while there are no
+    subscribers are not received.
+
+    A condition variable in shared memory is used for blocking. Subscribing is done under its lock,
+    so a subscriber can be added while items are put, and receives the items put afterwards.
+
+    The interface matches SharedMemoryQueue. The get methods are only supported by the queues of
+    subscribers, from subscribe().
+
+    Like multiprocessing queues, the object can only be passed to a child process as an argument
+    when the process is started.
+    """
+
+    # Header: tail index, total bytes written, number of subscribers so far
+    __HEADER_FORMAT = "=QQQ"
+    __HEADER_SIZE = struct.calcsize(__HEADER_FORMAT)
+    # Subscriber: whether it is subscribed, head index, total bytes read
+    __SUBSCRIBER_FORMAT = "=QQQ"
+    __SUBSCRIBER_SIZE = struct.calcsize(__SUBSCRIBER_FORMAT)
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        max_size: int,
+        slot_size: int,
+        max_subscriber_count: int,
+        mp_context: multiprocessing.context.BaseContext | None = None,
+        item_serializer: serializer.Serializer | None = None,
+    ) -> tuple[True, "BroadcastQueue"] | tuple[False, None]:
+        """
+        max_size: Maximum number of items that a subscriber can be behind. Must be greater than 0.
+        slot_size: Maximum size of a serialized item in bytes, including 4 bytes per frame.
+            Must be greater than 0.
+        max_subscriber_count: Maximum number of subscribers over the lifetime of the queue. Must
+            be greater than 0.
+        mp_context: Multiprocessing context of the processes using the queue. None is the default
+            context.
+        item_serializer: Serializer of the items. None is pickle.
+
+        Return: Success, object.
+        """
+        if max_size <= 0:
+            print("ERROR: Queue max size must be greater than 0")
+            return False, None
+
+        if slot_size <= 0:
+            print("ERROR: Slot size must be greater than 0")
+            return False, None
+
+        if max_subscriber_count <= 0:
+            print("ERROR: Max subscriber count must be greater than 0")
+            return False, None
+
+        size = (
+            cls.__HEADER_SIZE
+            + max_subscriber_count * cls.__SUBSCRIBER_SIZE
+            + max_size * (shared_memory_queue.LENGTH_SIZE + slot_size)
+        )
+        try:
+            shared_memory = mp.shared_memory.SharedMemory(create=True, size=size)
+        except OSError as e:
+            print(f"ERROR: Failed to allocate shared memory: {e}")
+            return False, None
+
+        struct.pack_into(cls.__HEADER_FORMAT, shared_memory.buf, 0, 0, 0, 0)
+        for subscriber in range(0, max_subscriber_count):
+            offset = cls.__HEADER_SIZE + subscriber * cls.__SUBSCRIBER_SIZE
+            struct.pack_into(cls.__SUBSCRIBER_FORMAT, shared_memory.buf, offset, 0, 0, 0)
+
+        if mp_context is None:
+            mp_context = mp.get_context()
+
+        if item_serializer is None:
+            result, item_serializer = serializer.Serializer.create()
+            if not result:
+                print("ERROR: Failed to create serializer")
+                shared_memory.close()
+                shared_memory.unlink()
+                return False, None
+
+            # Get Pylance to stop complaining
+            assert item_serializer is not None
+
+        return True, BroadcastQueue(
+            cls.__create_key,
+            shared_memory,
+            max_size,
+            slot_size,
+            max_subscriber_count,
+            item_serializer,
+            mp_context.Condition(),
+            None,
+            None,
+        )
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        shared_memory: mp.shared_memory.SharedMemory,
+        max_size: int,
+        slot_size: int,
+        max_subscriber_count: int,
+        item_serializer: serializer.Serializer,
+        condition: multiprocessing.synchronize.Condition,
+        subscriber: int | None,
+        publisher: "BroadcastQueue | None",
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is BroadcastQueue.__create_key, "Use create() method"
+
+        self.__shared_memory = shared_memory
+        self.__max_size = max_size
+        self.__slot_size = slot_size
+        self.__max_subscriber_count = max_subscriber_count
+        self.__serializer = item_serializer
+        self.__condition = condition
+        self.__subscriber = subscriber
+
+        # Subscribers in the creating process keep the shared memory of the queue open
+        self.__publisher = publisher
+        self.__finalizer = None
+        if publisher is None:
+            self.__finalizer = weakref.finalize(
+                self, BroadcastQueue.__release, shared_memory, os.getpid()
+            )
+
+    @staticmethod
+    def __release(shared_memory: mp.shared_memory.SharedMemory, owner_pid: int) -> None:
+        """
+        Close the shared memory, and unlink it if this is the creating process.
+        """
+        shared_memory.close()
+        if os.getpid() == owner_pid:
+            shared_memory.unlink()
+
+    def __getstate__(self) -> dict:
+        """
+        Pickle by shared memory name, the child process attaches to the same buffer.
+        """
+        return {
+            "name": self.__shared_memory.name,
+            "max_size": self.__max_size,
+            "slot_size": self.__slot_size,
+            "max_subscriber_count": self.__max_subscriber_count,
+            "serializer": self.__serializer,
+            "condition": self.__condition,
+            "subscriber": self.__subscriber,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Attach to the shared memory of the parent.
+        """
+        self.__shared_memory = mp.shared_memory.SharedMemory(name=state["name"])
+        self.__max_size = state["max_size"]
+        self.__slot_size = state["slot_size"]
+        self.__max_subscriber_count = state["max_subscriber_count"]
+        self.__serializer = state["serializer"]
+        self.__condition = state["condition"]
+        self.__subscriber = state["subscriber"]
+
+        # Owner PID of 0 never matches, so attached processes only close
+        self.__publisher = None
+        self.__finalizer = weakref.finalize(self, BroadcastQueue.__release, self.__shared_memory, 0)
+
+    def subscribe(self) -> tuple[True, "BroadcastQueue"] | tuple[False, None]:
+        """
+        Add a subscriber, which receives the items put from now on.
+
+        Return: Success, queue of the subscriber.
+        """
+        buffer = self.__shared_memory.buf
+        with self.__condition:
+            tail, write_bytes, subscriber_count = struct.unpack_from(
+                BroadcastQueue.__HEADER_FORMAT, buffer, 0
+            )
+            if subscriber_count >= self.__max_subscriber_count:
+                print(f"ERROR: Broadcast queue has {subscriber_count} subscribers already")
+                return False, None
+
+            struct.pack_into(
+                BroadcastQueue.__SUBSCRIBER_FORMAT,
+                buffer,
+                self.__subscriber_offset(subscriber_count),
+                1,
+                tail,
+                0,
+            )
+            struct.pack_into(
+                BroadcastQueue.__HEADER_FORMAT, buffer, 0, tail, write_bytes, subscriber_count + 1
+            )
+
+        return True, BroadcastQueue(
+            BroadcastQueue.__create_key,
+            self.__shared_memory,
+            self.__max_size,
+            self.__slot_size,
+            self.__max_subscriber_count,
+            self.__serializer,
+            self.__condition,
+            subscriber_count,
+            self if self.__publisher is None else self.__publisher,
+        )
+
+    def unsubscribe(self, subscriber: int) -> None:
+        """
+        Remove a subscriber, its items no longer hold back the producers.
+
+        subscriber: Index of the subscriber, from get_subscriber().
+        """
+        buffer = self.__shared_memory.buf
+        with self.__condition:
+            _, head, read_bytes = self.__read_subscriber(subscriber)
+            struct.pack_into(
+                BroadcastQueue.__SUBSCRIBER_FORMAT,
+                buffer,
+                self.__subscriber_offset(subscriber),
+                0,
+                head,
+                read_bytes,
+            )
+            self.__condition.notify_all()
+
+    def get_subscriber(self) -> int | None:
+        """
+        Return: Index of the subscriber of this queue, None if it is not a subscriber.
+        """
+        return self.__subscriber
+
+    def __subscriber_offset(self, subscriber: int) -> int:
+        """
+        Byte offset of the cursor of the subscriber.
+        """
+        return BroadcastQueue.__HEADER_SIZE + subscriber * BroadcastQueue.__SUBSCRIBER_SIZE
+
+    def __slot_offset(self, index: int) -> int:
+        """
+        Byte offset of the slot for the ring buffer index.
+        """
+        stride = shared_memory_queue.LENGTH_SIZE + self.__slot_size
+        return (
+            BroadcastQueue.__HEADER_SIZE
+            + self.__max_subscriber_count * BroadcastQueue.__SUBSCRIBER_SIZE
+            + (index % self.__max_size) * stride
+        )
+
+    def __read_subscriber(self, subscriber: int) -> tuple[bool, int, int]:
+        """
+        Return: Whether it is subscribed, head index, total bytes read.
+        """
+        is_subscribed, head, read_bytes = struct.unpack_from(
+            BroadcastQueue.__SUBSCRIBER_FORMAT,
+            self.__shared_memory.buf,
+            self.__subscriber_offset(subscriber),
+        )
+        return is_subscribed == 1, head, read_bytes
+
+    def __read_subscribers(self) -> list[tuple[int, int, int]]:
+        """
+        Return: Index, head index, total bytes read of each subscriber that is subscribed.
+        """
+        _, _, subscriber_count = struct.unpack_from(
+            BroadcastQueue.__HEADER_FORMAT, self.__shared_memory.buf, 0
+        )
+
+        subscribers = []
+        for subscriber in range(0, subscriber_count):
+            is_subscribed, head, read_bytes = self.__read_subscriber(subscriber)
+            if is_subscribed:
+                subscribers.append((subscriber, head, read_bytes))
+
+        return subscribers
+
+    def __get_depths(self) -> dict[int, int]:
+        """
+        Return: Number of items each subscriber has not read.
+        """
+        tail, _, _ = struct.unpack_from(BroadcastQueue.__HEADER_FORMAT, self.__shared_memory.buf, 0)
+        return {subscriber: tail - head for subscriber, head, _ in self.__read_subscribers()}
+
+    def __write(
+        self, frames_list: list[list[memoryview]], block: bool, deadline: float | None
+    ) -> int:
+        """
+        Write the frames of each item into consecutive slots as space frees up.
+
+        Return: Number of items written.
+        """
+        buffer = self.__shared_memory.buf
+
+        count = 0
+        with self.__condition:
+            while count < len(frames_list):
+                free_count = self.__max_size - max(self.__get_depths().values(), default=0)
+                if free_count <= 0:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if not block or (remaining is not None and remaining <= 0.0):
+                        break
+
+                    self.__condition.wait(remaining)
+                    continue
+
+                tail, write_bytes, subscriber_count = struct.unpack_from(
+                    BroadcastQueue.__HEADER_FORMAT, buffer, 0
+                )
+                for frames in frames_list[count : count + free_count]:
+                    write_bytes += shared_memory_queue.write_slot(
+                        buffer, self.__slot_offset(tail), frames
+                    )
+                    tail += 1
+                    count += 1
+
+                struct.pack_into(
+                    BroadcastQueue.__HEADER_FORMAT, buffer, 0, tail, write_bytes, subscriber_count
+                )
+                self.__condition.notify_all()
+
+        return count
+
+    def __read(self, max_items: int, block: bool, deadline: float | None) -> list[list[memoryview]]:
+        """
+        Read the frames of up to max_items items of the subscriber, waiting for at least 1.
+
+        Return: Frames of each item, as views of a single writable copy of the slot.
+        """
+        subscriber = self.__subscriber
+        if subscriber is None:
+            raise ValueError("Only subscribers of a broadcast queue can get")
+
+        buffer = self.__shared_memory.buf
+        with self.__condition:
+            while True:
+                tail, _, _ = struct.unpack_from(BroadcastQueue.__HEADER_FORMAT, buffer, 0)
+                is_subscribed, head, read_bytes = self.__read_subscriber(subscriber)
+                if tail > head:
+                    break
+
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if not block or (remaining is not None and remaining <= 0.0):
+                    return []
+
+                self.__condition.wait(remaining)
+
+            frames_list = []
+            for _ in range(0, min(tail - head, max_items)):
+                frames, byte_count = shared_memory_queue.read_slot(buffer, self.__slot_offset(head))
+                frames_list.append(frames)
+                head += 1
+                read_bytes += byte_count
+
+            struct.pack_into(
+                BroadcastQueue.__SUBSCRIBER_FORMAT,
+                buffer,
+                self.__subscriber_offset(subscriber),
+                1 if is_subscribed else 0,
+                head,
+                read_bytes,
+            )
+            self.__condition.notify_all()
+
+        return frames_list
+
+    def put(self, item: object, block: bool = True, timeout: float | None = None) -> None:
+        """
+        Put an item for all subscribers. Raises queue.Full on timeout or if non-blocking and a
+        subscriber is full.
+        """
+        frames = shared_memory_queue.serialize(self.__serializer, item, self.__slot_size)
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        if self.__write([frames], block, deadline) == 0:
+            raise queue.Full
+
+    def get(self, block: bool = True, timeout: float | None = None) -> object:
+        """
+        Remove and return an item of the subscriber. Raises queue.Empty on timeout or if
+        non-blocking and empty.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        frames_list = self.__read(1, block, deadline)
+        if len(frames_list) == 0:
+            raise queue.Empty
+
+        return self.__serializer.loads(frames_list[0])
+
+    def put_many(self, items: list, block: bool = True, timeout: float | None = None) -> int:
+        """
+        Put items for all subscribers in order, as many as fit until the timeout.
+
+        Return: Number of items put.
+        """
+        frames_list = [
+            shared_memory_queue.serialize(self.__serializer, item, self.__slot_size)
+            for item in items
+        ]
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        return self.__write(frames_list, block, deadline)
+
+    def get_many(
+        self, max_items: int, block: bool = True, timeout: float | None = None
+    ) -> list[object]:
+        """
+        Remove and return up to max_items items of the subscriber, waiting until the timeout for
+        the batch to fill.
+
+        Return: Items in order, can be fewer than max_items or empty.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        items = []
+        while len(items) < max_items:
+            frames_list = self.__read(max_items - len(items), block, deadline)
+            if len(frames_list) == 0:
+                break
+
+            items += [self.__serializer.loads(frames) for frames in frames_list]
+
+        return items
+
+    def put_nowait(self, item: object) -> None:
+        """
+        Equivalent to put(item, False).
+        """
+        self.put(item, False)
+
+    def get_nowait(self) -> object:
+        """
+        Equivalent to get(False).
+        """
+        return self.get(False)
+
+    def qsize(self) -> int:
+        """
+        Approximate number of items of the subscriber, or of the subscriber furthest behind if
+        this is not a subscriber.
+        """
+        depths = self.__get_depths()
+        if self.__subscriber is None:
+            return max(depths.values(), default=0)
+
+        return depths.get(self.__subscriber, 0)
+
+    def get_subscriber_depths(self) -> dict[int, int]:
+        """
+        Return: Approximate number of items of each subscriber.
+        """
+        return self.__get_depths()
+
+    def get_byte_counts(self) -> tuple[int, int]:
+        """
+        Return: Total serialized bytes put and got by the subscriber, or by all subscribers if this
+            is not a subscriber.
+        """
+        _, write_bytes, _ = struct.unpack_from(
+            BroadcastQueue.__HEADER_FORMAT, self.__shared_memory.buf, 0
+        )
+        if self.__subscriber is None:
+            return write_bytes, sum(read_bytes for _, _, read_bytes in self.__read_subscribers())
+
+        _, _, read_bytes = self.__read_subscriber(self.__subscriber)
+        return write_bytes, read_bytes
+
+    def empty(self) -> bool:
+        """
+        Approximate emptiness.
+        """
+        return self.qsize() == 0
+
+    def full(self) -> bool:
+        """
+        Approximate fullness.
+        """
+        return self.qsize() >= self.__max_size
+
+    def close(self) -> None:
+        """
+        Release the shared memory in this process. The queue must not be used afterwards.
+        """
+        if self.__finalizer is not None:
+            self.__finalizer()
@@ -0,0 +1,98 @@
+"""
+End of stream counter.
+"""
+
+import multiprocessing as mp
+import multiprocessing.context
+
+
+class EndOfStream:
+    """
+    Marker a worker puts into each of its output queues when it exits during a drain.
+    The methods of QueueWrapper count markers instead of returning them.
+    """
+
+
+class EndOfStreamCounter:
+    """
+    Number of end of stream markers a queue expects during a drain and has received so far, in
+    shared memory.
+
+    The generation changes each time the workers are started again, so that a queue found ended
+    in the last drain is not ended in the new run.
+    """
+
+    # Expected count when no drain has begun
+    __NOT_DRAINING = -1
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls, mp_context: multiprocessing.context.BaseContext | None = None
+    ) -> tuple[True, "EndOfStreamCounter"] | tuple[False, None]:
+        """
+        mp_context: Multiprocessing context of the processes using the queue. None is the default
+            context.
+
+        Return: Success, object.
+        """
+        if mp_context is None:
+            mp_context = mp.get_context()
+
+        return True, EndOfStreamCounter(cls.__create_key, mp_context)
+
+    def __init__(
+        self, class_private_create_key: object, mp_context: multiprocessing.context.BaseContext
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is EndOfStreamCounter.__create_key, "Use create() method"
+
+        self.__expected_count = mp_context.RawValue("i", EndOfStreamCounter.__NOT_DRAINING)
+        self.__received_count = mp_context.RawValue("i", 0)
+        self.__generation = mp_context.RawValue("i", 0)
+        self.__lock = mp_context.Lock()
+
+    def begin(self, producer_count: int) -> None:
+        """
+        Called by the worker manager when a drain begins.
+
+        producer_count: Number of workers that send a marker.
+        """
+        with self.__lock:
+            self.__received_count.value = 0
+            self.__expected_count.value = producer_count
+
+    def reset(self) -> None:
+        """
+        Called by the worker manager before workers start, to end the last drain.
+        """
+        with self.__lock:
+            self.__received_count.value = 0
+            self.__expected_count.value = EndOfStreamCounter.__NOT_DRAINING
+            self.__generation.value += 1
+
+    def get_generation(self) -> int:
+        """
+        Return: Number of resets so far.
+        """
+        return self.__generation.value
+
+    def add(self) -> None:
+        """
+        Called when a consumer receives a marker.
+        """
+        with self.__lock:
+            self.__received_count.value += 1
+
+    def is_complete(self) -> bool:
+        """
+        Return: Whether a drain has begun and all producers have sent their marker.
+        """
+        expected_count = self.__expected_count.value
+        if expected_count == EndOfStreamCounter.__NOT_DRAINING:
+            return False
+
+        return self.__received_count.value >= expected_count
@@ -0,0 +1,330 @@
+"""
+Queue partitioned by key.
+"""
+
+import contextvars
+import itertools
+import multiprocessing as mp
+import multiprocessing.context
+import pickle
+import queue
+import time
+import zlib
+
+from . import worker_sync_manager
+
+
+# Seconds of each wait on one partition while a consumer owns several
+PARTITION_POLL_PERIOD = 0.01
+
+# Index of the consumer among the consumers of partitioned queues, per thread and per asyncio task.
+# None gets from all partitions.
+CONSUMER_INDEX: contextvars.ContextVar[int | None] = contextvars.ContextVar(
+    "consumer_index", default=None
+)
+
+
+def set_consumer_index(index: int | None) -> None:
+    """
+    Called in the worker before the target function runs.
+
+    index: Index of the worker in its group. None gets from all partitions.
+    """
+    CONSUMER_INDEX.set(index)
+
+
+def set_sub_consumer_index(index: int, count: int) -> None:
+    """
+    Called in each thread or asyncio task of a worker that runs several, so that each is a consumer
+    of its own. Consumer i of a worker with n threads or tasks becomes consumer i + n * (its index
+    in the worker).
+
+    index: Index of the thread or asyncio task in the worker.
+    count: Number of threads or asyncio tasks in the worker.
+    """
+    worker_index = CONSUMER_INDEX.get()
+    if worker_index is not None:
+        CONSUMER_INDEX.set(worker_index * count + index)
+
+
+def get_consumer_index() -> int | None:
+    """
+    Return: Index of the consumer in this thread or asyncio task, None if not set.
+    """
+    return CONSUMER_INDEX.get()
+
+
+def get_partition(key: object, partition_count: int) -> int:
+    """
+    Stable across processes, unlike hash() of strings.
+
+    key: Integer, string, bytes, or another picklable object.
+
+    Return: Partition of the key.
+    """
+    if isinstance(key, int):
+        return key % partition_count
+
+    if isinstance(key, str):
+        data = key.encode()
+    elif isinstance(key, bytes):
+        data = key
+    else:
+        data = pickle.dumps(key)
+
+    return zlib.crc32(data) % partition_count
+
+
+class PartitionedQueue:
+    """
+    Bounded queue made of sub-queues, one per partition. Items are put as (key, item) tuples and
+    got as the item.
+
+    The key of an item selects its partition, so items with the same key stay in order. Items
+    without a key (None) are spread over the partitions. With n consumers, consumer i gets from the
+    partitions p with p % n == i, so a key is only received by one consumer at a time. A consumer
+    that owns one partition waits on it directly, one that owns several polls them in turn.
+
+    The interface matches the underlying queues of QueueWrapper, and each partition holds up to
+    the max size of the queue.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        partitions: list,
+        mp_context: multiprocessing.context.BaseContext | None = None,
+    ) -> tuple[True, "PartitionedQueue"] | tuple[False, None]:
+        """
+        partitions: Sub-queues with the interface of queue.Queue. Must not be empty.
+        mp_context: Multiprocessing context of the processes using the queue. None is the default
+            context.
+
+        Return: Success, object.
+        """
+        if len(partitions) == 0:
+            print("ERROR: Partitioned queue requires at least 1 partition")
+            return False, None
+
+        if mp_context is None:
+            mp_context = mp.get_context()
+
+        return True, PartitionedQueue(cls.__create_key, partitions, mp_context)
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        partitions: list,
+        mp_context: multiprocessing.context.BaseContext,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is PartitionedQueue.__create_key, "Use create() method"
+
+        self.__partitions = partitions
+
+        # Written by the worker manager while the consumers are paused
+        self.__consumer_count = mp_context.RawValue("i", 1)
+        self.__put_counts = mp_context.Array("q", len(partitions))
+
+        # Per process, for items without a key
+        self.__next_partitions = itertools.count()
+
+    def __getstate__(self) -> dict:
+        """
+        The counter of partitions for items without a key is not picklable.
+        """
+        state = self.__dict__.copy()
+        del state["_PartitionedQueue__next_partitions"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Start a new counter of partitions for items without a key.
+        """
+        self.__dict__.update(state)
+        self.__next_partitions = itertools.count()
+
+    def set_consumer_count(self, count: int) -> None:
+        """
+        Called by the worker manager while no consumer is holding an item.
+
+        count: Number of consumers. Must be greater than 0.
+        """
+        self.__consumer_count.value = count
+
+    def get_partition_count(self) -> int:
+        """
+        Return: Number of partitions.
+        """
+        return len(self.__partitions)
+
+    def get_partition_put_counts(self) -> list[int]:
+        """
+        Return: Items put into each partition by all processes.
+        """
+        with self.__put_counts.get_lock():
+            return self.__put_counts[:]
+
+    def get_partition_depths(self) -> list[int]:
+        """
+        Return: Approximate number of items in each partition.
+        """
+        return [partition.qsize() for partition in self.__partitions]
+
+    def get_byte_counts(self) -> tuple[int, int] | tuple[None, None]:
+        """
+        Return: Total serialized bytes put into and got from all partitions, None if the
+            partitions do not measure them.
+        """
+        if not all(hasattr(partition, "get_byte_counts") for partition in self.__partitions):
+            return None, None
+
+        byte_counts = [partition.get_byte_counts() for partition in self.__partitions]
+        return sum(count[0] for count in byte_counts), sum(count[1] for count in byte_counts)
+
+    def __get_partition(self, key: object) -> int:
+        """
+        Return: Partition of the key, the next partition in turn for None.
+        """
+        if key is None:
+            return next(self.__next_partitions) % len(self.__partitions)
+
+        return get_partition(key, len(self.__partitions))
+
+    def __get_owned_partitions(self) -> list:
+        """
+        Return: Partitions of the consumer in this thread or asyncio task.
+        """
+        index = get_consumer_index()
+        if index is None:
+            return self.__partitions
+
+        consumer_count = self.__consumer_count.value
+        if index >= consumer_count:
+            return []
+
+        return self.__partitions[index::consumer_count]
+
+    def put(
+        self, item: tuple[object, object], block: bool = True, timeout: float | None = None
+    ) -> None:
+        """
+        Put a (key, item) tuple into the partition of the key. Raises queue.Full on timeout or if
+        non-blocking and the partition is full.
+        """
+        key, item = item
+        partition = self.__get_partition(key)
+        self.__partitions[partition].put(item, block, timeout)
+
+        with self.__put_counts.get_lock():
+            self.__put_counts[partition] += 1
+
+    def get(self, block: bool = True, timeout: float | None = None) -> object:
+        """
+        Remove and return an item from the partitions of the consumer. Raises queue.Empty on
+        timeout or if non-blocking and the partitions are empty.
+        """
+        partitions = self.__get_owned_partitions()
+        if len(partitions) == 1:
+            return partitions[0].get(block, timeout)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            for partition in partitions:
+                try:
+                    return partition.get(False)
+                except queue.Empty:
+                    pass
+
+            if not block:
+                raise queue.Empty
+
+            # More consumers than partitions
+            if len(partitions) == 0:
+                wait_time = PARTITION_POLL_PERIOD
+                if deadline is not None:
+                    wait_time = min(wait_time, max(deadline - time.monotonic(), 0.0))
+
+                time.sleep(wait_time)
+
+            # Wait on each partition in turn
+            for partition in partitions:
+                wait_time = PARTITION_POLL_PERIOD
+                if deadline is not None:
+                    wait_time = min(wait_time, max(deadline - time.monotonic(), 0.0))
+
+                try:
+                    return partition.get(True, wait_time)
+                except queue.Empty:
+                    pass
+
+            if deadline is not None and time.monotonic() >= deadline:
+                raise queue.Empty
+
+    def put_many(self, items: list, block: bool = True, timeout: float | None = None) -> int:
+        """
+        Put (key, item) tuples in order, as many as fit until the timeout.
+
+        Return: Number of items put.
+        """
+        return worker_sync_manager.put_in_order(self.put, items, block, timeout)
+
+    def get_many(
+        self, max_items: int, block: bool = True, timeout: float | None = None
+    ) -> list[object]:
+        """
+        Remove and return up to max_items items from the partitions of the consumer, waiting until
+        the timeout for the batch to fill.
+
+        Return: Items in order within each partition, can be fewer than max_items or empty.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        items: list[object] = []
+        while len(items) < max_items:
+            # Take what is ready in all partitions first
+            for partition in self.__get_owned_partitions():
+                while len(items) < max_items:
+                    try:
+                        items.append(partition.get(False))
+                    except queue.Empty:
+                        break
+
+            if len(items) == max_items or not block:
+                break
+
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+            try:
+                items.append(self.get(True, remaining))
+            except queue.Empty:
+                break
+
+        return items
+
+    def put_nowait(self, item: tuple[object, object]) -> None:
+        """
+        Equivalent to put(item, False).
+        """
+        self.put(item, False)
+
+    def get_nowait(self) -> object:
+        """
+        Equivalent to get(False).
+        """
+        return self.get(False)
+
+    def qsize(self) -> int:
+        """
+        Approximate number of items in all partitions.
+        """
+        return sum(self.get_partition_depths())
+
+    def empty(self) -> bool:
+        """
+        Approximate emptiness of all partitions.
+        """
+        return self.qsize() == 0
@@ -5,8 +5,11 @@ Process property data.
 import inspect
 
 from .. import queue_wrapper
+from .. import worker_property_data
 
 
+# One attribute per property of the process
+# pylint: disable-next=too-many-instance-attributes
 class ProcessPropertyData:
     """
     Properties to start a worker.
@@ -21,6 +24,12 @@ class ProcessPropertyData:
         target_arguments: tuple,
         input_queues: list[queue_wrapper.QueueWrapper],
         output_queues: list[queue_wrapper.QueueWrapper],
+        cpu_set: list[int] | None = None,
+        affinity_mode: worker_property_data.AffinityMode = worker_property_data.AffinityMode.SPREAD,
+        concurrency: int = 1,
+        execution_mode: worker_property_data.ExecutionMode = worker_property_data.ExecutionMode.PROCESS,
+        thread_count: int = 1,
+        profile_directory: str | None = None,
     ) -> tuple[True, "ProcessPropertyData"] | tuple[False, None]:
         """
         target_function: Function to run. The function signature is expected to be:
@@ -42,6 +51,12 @@ class ProcessPropertyData:
         target_arguments: Arguments for the function. Can be empty.
         input_queues: Input queues. Can be empty.
         output_queues: Output queues. Can be empty.
+        cpu_set: CPUs the workers run on. None does not set the affinity.
+        affinity_mode: How the workers are placed on the CPU set.
+        concurrency: Number of concurrent calls of a coroutine target function in each worker.
+        execution_mode: What each worker runs in.
+        thread_count: Number of threads in each worker process.
+        profile_directory: Directory for the profiles of the workers. None does not profile.
 
         Return: Success, object.
         """
@@ -53,7 +68,17 @@ class ProcessPropertyData:
             return False, None
 
         return True, ProcessPropertyData(
-            cls.__create_key, target_function, target_arguments, input_queues, output_queues
+            cls.__create_key,
+            target_function,
+            target_arguments,
+            input_queues,
+            output_queues,
+            cpu_set,
+            affinity_mode,
+            concurrency,
+            execution_mode,
+            thread_count,
+            profile_directory,
         )
 
     def __init__(
@@ -63,6 +88,12 @@ class ProcessPropertyData:
         target_arguments: tuple,
         input_queues: list[queue_wrapper.QueueWrapper],
         output_queues: list[queue_wrapper.QueueWrapper],
+        cpu_set: list[int] | None,
+        affinity_mode: worker_property_data.AffinityMode,
+        concurrency: int,
+        execution_mode: worker_property_data.ExecutionMode,
+        thread_count: int,
+        profile_directory: str | None,
     ) -> None:
         """
         Private constructor, use create() method.
@@ -73,6 +104,12 @@ class ProcessPropertyData:
         self.__target_arguments = target_arguments
         self.__input_queues = input_queues
         self.__output_queues = output_queues
+        self.__cpu_set = cpu_set
+        self.__affinity_mode = affinity_mode
+        self.__concurrency = concurrency
+        self.__execution_mode = execution_mode
+        self.__thread_count = thread_count
+        self.__profile_directory = profile_directory
 
     @staticmethod
     def __is_signature_match(
@@ -163,6 +200,18 @@ class ProcessPropertyData:
         """
         return self.__target_function
 
+    def get_input_queues(self) -> list[queue_wrapper.QueueWrapper]:
+        """
+        Return: Input queues.
+        """
+        return self.__input_queues
+
+    def get_output_queues(self) -> list[queue_wrapper.QueueWrapper]:
+        """
+        Return: Output queues.
+        """
+        return self.__output_queues
+
     def get_arguments(self) -> tuple:
         """
         Return: Tuple of all arguments to be passed to the target function, except for the worker controller.
@@ -172,3 +221,41 @@ class ProcessPropertyData:
         )
 
         return arguments
+
+    def get_concurrency(self) -> int:
+        """
+        Return: Number of concurrent calls of a coroutine target function in each worker.
+        """
+        return self.__concurrency
+
+    def get_execution_mode(self) -> worker_property_data.ExecutionMode:
+        """
+        Return: What each worker runs in.
+        """
+        return self.__execution_mode
+
+    def get_thread_count(self) -> int:
+        """
+        Return: Number of threads in each worker process.
+        """
+        return self.__thread_count
+
+    def get_profile_directory(self) -> str | None:
+        """
+        Return: Directory for the profiles of the workers. None does not profile.
+        """
+        return self.__profile_directory
+
+    def get_worker_cpu_set(self, index: int) -> list[int] | None:
+        """
+        index: Index of the worker in its group.
+
+        Return: CPUs the worker runs on. None does not set the affinity.
+        """
+        if self.__cpu_set is None:
+            return None
+
+        if self.__affinity_mode == worker_property_data.AffinityMode.SPREAD:
+            return [self.__cpu_set[index % len(self.__cpu_set)]]
+
+        return list(self.__cpu_set)
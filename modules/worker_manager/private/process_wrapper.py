@@ -2,12 +2,182 @@
 Process.
 """
 
-import multiprocessing as mp
+import asyncio
+import contextvars
+import inspect
+import multiprocessing.context
+import multiprocessing.process
+import os
+import sys
+import threading
+import time
 
+from . import partitioned_queue
 from . import process_property_data
+from . import profiler
+from . import tracer
+from .. import queue_wrapper
 from .. import worker_controller
 
 
+# Seconds between liveness checks while waiting for a worker to be ready
+READY_POLL_PERIOD = 0.01
+# Seconds to wait for space for an end of stream marker before checking the controller again
+END_OF_STREAM_PUT_TIMEOUT = 0.1
+
+
+def run_worker(
+    target_function: "(...) -> object",  # type: ignore
+    arguments: tuple,
+    controller: worker_controller.WorkerController,
+    cpu_set: list[int] | None = None,
+    input_queues: list[queue_wrapper.QueueWrapper] | None = None,
+    output_queues: list[queue_wrapper.QueueWrapper] | None = None,
+    concurrency: int = 1,
+    thread_count: int = 1,
+    worker_index: int | None = None,
+    profile_directory: str | None = None,
+) -> None:
+    """
+    Entry point of the worker process or thread.
+
+    target_function: Function to run. A coroutine function is run in a new event loop.
+    arguments: Arguments for the function, except for the worker controller.
+    controller: Worker controller.
+    cpu_set: CPUs to pin the process to. None does not set the affinity.
+    input_queues: Input queues in arguments, for draining.
+    output_queues: Output queues in arguments, which get an end of stream marker if the worker
+        exits during a drain.
+    concurrency: Number of concurrent calls of a coroutine function.
+    thread_count: Number of threads calling the function, which share the controller.
+    worker_index: Index of the worker in its group, for the partitions of the input queues. None
+        gets from all partitions.
+    profile_directory: Directory for the profile of each thread calling the function. None does not
+        profile.
+    """
+    if cpu_set is not None:
+        try:
+            os.sched_setaffinity(0, cpu_set)
+        except OSError as e:
+            # Exit with an error, so that the start fails or the supervisor restarts the worker
+            print(f"ERROR: Failed to set CPU affinity to {cpu_set}: {e}")
+            sys.exit(1)
+
+    if input_queues is not None:
+        controller.set_input_queues(input_queues)
+
+    queue_wrapper.QueueWrapper.reset_context()
+    partitioned_queue.set_consumer_index(worker_index)
+    tracer.set_worker_name(target_function.__name__)
+
+    controller.notify_ready()
+
+    try:
+        if thread_count == 1:
+            profiler.run_profiled(
+                profile_directory, run_target, target_function, arguments, controller, concurrency
+            )
+        else:
+            run_threads(
+                target_function, arguments, controller, concurrency, thread_count, profile_directory
+            )
+    finally:
+        if output_queues is not None:
+            send_end_of_stream(output_queues, controller)
+
+        # Queues of a process share its tracer
+        for queue in (input_queues or []) + (output_queues or []):
+            queue.flush_trace()
+
+
+def run_target(
+    target_function: "(...) -> object",  # type: ignore
+    arguments: tuple,
+    controller: worker_controller.WorkerController,
+    concurrency: int,
+) -> None:
+    """
+    Call the function, or run the coroutine function in a new event loop.
+    """
+    if inspect.iscoroutinefunction(target_function):
+        asyncio.run(run_concurrently(target_function, arguments, controller, concurrency))
+    else:
+        target_function(*arguments, controller)
+
+
+def run_threads(
+    target_function: "(...) -> object",  # type: ignore
+    arguments: tuple,
+    controller: worker_controller.WorkerController,
+    concurrency: int,
+    thread_count: int,
+    profile_directory: str | None,
+) -> None:
+    """
+    Run the function in threads until all return. If a thread raises, the other threads are asked
+    to exit and the first exception is raised again.
+    """
+    exceptions: list[BaseException] = []
+
+    def run_thread(index: int) -> None:
+        partitioned_queue.set_sub_consumer_index(index, thread_count)
+        try:
+            profiler.run_profiled(
+                profile_directory, run_target, target_function, arguments, controller, concurrency
+            )
+        # Raised again in the calling thread
+        # pylint: disable-next=broad-exception-caught
+        except BaseException as e:
+            exceptions.append(e)
+            controller.request_exit()
+
+    # Each thread runs in a copy of the context, which holds the worker index
+    threads = [
+        threading.Thread(target=contextvars.copy_context().run, args=(run_thread, i))
+        for i in range(0, thread_count)
+    ]
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    if len(exceptions) > 0:
+        raise exceptions[0]
+
+
+async def run_concurrently(
+    target_function: "(...) -> object",  # type: ignore
+    arguments: tuple,
+    controller: worker_controller.WorkerController,
+    concurrency: int,
+) -> None:
+    """
+    Run calls of the coroutine function concurrently until all return. Raises the first exception
+    of a call, the other calls are cancelled when the event loop closes.
+    """
+
+    async def run_call(index: int) -> None:
+        # Each call is a task with a copy of the context
+        partitioned_queue.set_sub_consumer_index(index, concurrency)
+        await target_function(*arguments, controller)
+
+    await asyncio.gather(*[run_call(i) for i in range(0, concurrency)])
+
+
+def send_end_of_stream(
+    output_queues: list[queue_wrapper.QueueWrapper], controller: worker_controller.WorkerController
+) -> None:
+    """
+    Put an end of stream marker into each output queue if a drain was requested. Gives up if the
+    worker manager requests an exit instead.
+    """
+    for queue in output_queues:
+        while controller.is_draining():
+            if queue.put_end_of_stream(END_OF_STREAM_PUT_TIMEOUT):
+                break
+
+
 class ProcessWrapper:
     """
     Wrapper for an underlying process and other information.
@@ -20,40 +190,228 @@ class ProcessWrapper:
         cls,
         process_property: process_property_data.ProcessPropertyData,
         controller: worker_controller.WorkerController,
+        mp_context: multiprocessing.context.BaseContext,
+        cpu_set: list[int] | None = None,
+        worker_index: int | None = None,
     ) -> tuple[True, "ProcessWrapper"] | tuple[False, None]:
         """
         process_property: Process data of the process to be created.
         controller: Worker controller.
+        mp_context: Multiprocessing context to create the process with.
+        cpu_set: CPUs the process is pinned to when it starts. None does not set the affinity.
+        worker_index: Index of the worker in its group, for the partitions of the input queues.
+            None gets from all partitions.
 
         Return: Success, object.
         """
+        result, worker = cls.__create_process(
+            process_property, controller, mp_context, cpu_set, worker_index
+        )
+        if not result:
+            return False, None
 
+        # Get Pylance to stop complaining
+        assert worker is not None
+
+        return True, ProcessWrapper(
+            cls.__create_key,
+            worker,
+            process_property,
+            controller,
+            mp_context,
+            cpu_set,
+            worker_index,
+        )
+
+    @staticmethod
+    def __create_process(
+        process_property: process_property_data.ProcessPropertyData,
+        controller: worker_controller.WorkerController,
+        mp_context: multiprocessing.context.BaseContext,
+        cpu_set: list[int] | None,
+        worker_index: int | None,
+    ) -> tuple[True, multiprocessing.process.BaseProcess] | tuple[False, None]:
+        """
+        Create the underlying process.
+
+        Return: Success, process.
+        """
         target_function = process_property.get_target_function()
-        arguments = process_property.get_arguments() + (controller,)
+        arguments = process_property.get_arguments()
 
         try:
-            worker = mp.Process(target=target_function, args=arguments)
+            worker = mp_context.Process(
+                target=run_worker,
+                args=(
+                    target_function,
+                    arguments,
+                    controller,
+                    cpu_set,
+                    process_property.get_input_queues(),
+                    process_property.get_output_queues(),
+                    process_property.get_concurrency(),
+                    process_property.get_thread_count(),
+                    worker_index,
+                    process_property.get_profile_directory(),
+                ),
+            )
         # Catching all exceptions for library call
         # pylint: disable-next=broad-exception-caught
         except Exception as e:
             print(f"ERROR: Failed to create worker process: {e}")
             return False, None
 
-        return True, ProcessWrapper(cls.__create_key, worker, controller)
+        return True, worker
 
     def __init__(
         self,
         class_private_create_key: object,
-        worker: mp.Process,
+        worker: multiprocessing.process.BaseProcess,
+        process_property: process_property_data.ProcessPropertyData,
         controller: worker_controller.WorkerController,
+        mp_context: multiprocessing.context.BaseContext,
+        cpu_set: list[int] | None,
+        worker_index: int | None,
     ) -> None:
         """
         Private constructor, use create() method.
         """
         assert class_private_create_key is ProcessWrapper.__create_key, "Use create() method"
 
-        # TODO: Start using these
-        # pylint: disable=unused-private-member
         self.__worker = worker
+        self.__process_property = process_property
         self.__controller = controller
-        # pylint: enable=unused-private-member
+        self.__mp_context = mp_context
+        self.__cpu_set = cpu_set
+        self.__worker_index = worker_index
+
+        self.__is_started = False
+
+    def get_controller(self) -> worker_controller.WorkerController:
+        """
+        Return: Worker controller.
+        """
+        return self.__controller
+
+    def get_cpu_set(self) -> list[int] | None:
+        """
+        Return: CPUs the process is pinned to. None if the affinity is not set.
+        """
+        return self.__cpu_set
+
+    def get_start_method(self) -> str:
+        """
+        Return: Start method of the multiprocessing context.
+        """
+        return self.__mp_context.get_start_method()
+
+    def start(self) -> bool:
+        """
+        Start the process. A process that has exited is replaced by a new one.
+
+        Return: Success.
+        """
+        if self.is_alive():
+            print(f"ERROR: Worker is already running: {self.__worker.pid}")
+            return False
+
+        if self.__is_started:
+            result, worker = ProcessWrapper.__create_process(
+                self.__process_property,
+                self.__controller,
+                self.__mp_context,
+                self.__cpu_set,
+                self.__worker_index,
+            )
+            if not result:
+                return False
+
+            # Get Pylance to stop complaining
+            assert worker is not None
+
+            self.__worker = worker
+
+        self.__controller.reset()
+
+        try:
+            self.__worker.start()
+        # Catching all exceptions for library call
+        # pylint: disable-next=broad-exception-caught
+        except Exception as e:
+            print(f"ERROR: Failed to start worker process: {e}")
+            return False
+
+        self.__is_started = True
+
+        return True
+
+    def wait_ready(self, deadline: float | None) -> bool:
+        """
+        Wait for the worker to call the target function.
+
+        deadline: Time from time.monotonic() to stop waiting at. None waits while the process is
+            alive.
+
+        Return: Whether the worker is ready.
+        """
+        if not self.__is_started:
+            return False
+
+        while True:
+            timeout = READY_POLL_PERIOD
+            if deadline is not None:
+                timeout = min(timeout, max(deadline - time.monotonic(), 0.0))
+
+            if self.__controller.is_ready(timeout):
+                return True
+
+            if not self.__worker.is_alive():
+                print(f"ERROR: Worker exited before it was ready: {self.__worker.exitcode}")
+                return False
+
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+    def is_alive(self) -> bool:
+        """
+        Return: Whether the process is running.
+        """
+        return self.__is_started and self.__worker.is_alive()
+
+    def get_exitcode(self) -> int | None:
+        """
+        Return: Exit code of the process, None if it has not exited or has not been started.
+        """
+        if not self.__is_started:
+            return None
+
+        return self.__worker.exitcode
+
+    def join(self, timeout: float | None) -> bool:
+        """
+        Wait for the process to exit.
+
+        timeout: Seconds to wait. None waits forever.
+
+        Return: Whether the process has exited.
+        """
+        if not self.__is_started:
+            return True
+
+        self.__worker.join(timeout)
+
+        return not self.__worker.is_alive()
+
+    def terminate(self) -> None:
+        """
+        Send SIGTERM to the process.
+        """
+        if self.is_alive():
+            self.__worker.terminate()
+
+    def kill(self) -> None:
+        """
+        Send SIGKILL to the process.
+        """
+        if self.is_alive():
+            self.__worker.kill()
@@ -0,0 +1,115 @@
+"""
+Profiling of workers with cProfile.
+"""
+
+import cProfile
+import glob
+import os
+import pstats
+import threading
+import uuid
+
+
+# Files written by each worker thread, merged by merge_profiles()
+PROFILE_FILE_PATTERN = "profile_*.prof"
+
+
+def create_group_directory(directory: str, name: str) -> tuple[True, str] | tuple[False, None]:
+    """
+    Create the directory for the profiles of a worker group, so that groups can share a directory.
+
+    directory: Directory of the profiles of all groups.
+    name: Name of the worker group.
+
+    Return: Success, directory of the group.
+    """
+    group_directory = os.path.join(directory, name)
+    try:
+        os.makedirs(group_directory, exist_ok=True)
+    except OSError as e:
+        print(f"ERROR: Failed to create profile directory: {e}")
+        return False, None
+
+    return True, group_directory
+
+
+def clear_profiles(directory: str) -> None:
+    """
+    Remove the profiles of an earlier run of a worker group.
+
+    directory: Directory of the profiles of the worker group.
+    """
+    for path in glob.glob(os.path.join(directory, PROFILE_FILE_PATTERN)):
+        try:
+            os.remove(path)
+        except OSError as e:
+            print(f"WARNING: Failed to remove profile file {path}: {e}")
+
+
+def run_profiled(
+    directory: str | None, function: "(...) -> object", *arguments: object  # type: ignore
+) -> None:
+    """
+    Call the function in this thread, profiled if there is a directory. The profile is written to
+    a new file in the directory when the function returns or raises.
+
+    directory: Directory of the profiles of the worker group. None does not profile.
+    function: Function to call.
+    arguments: Arguments for the function.
+    """
+    if directory is None:
+        function(*arguments)
+        return
+
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    # Python 3.12 and later allow one profiler at a time in each process
+    except ValueError as e:
+        print(f"WARNING: Failed to profile worker, running without profiling: {e}")
+        function(*arguments)
+        return
+
+    try:
+        function(*arguments)
+    finally:
+        profile.disable()
+
+        path = os.path.join(
+            directory,
+            f"profile_{os.getpid()}_{threading.get_native_id()}_{uuid.uuid4().hex}.prof",
+        )
+        try:
+            profile.dump_stats(path)
+        except OSError as e:
+            print(f"ERROR: Failed to write profile: {e}")
+
+
+def merge_profiles(directory: str) -> tuple[True, pstats.Stats] | tuple[False, None]:
+    """
+    Merge the profiles written by all workers of a group.
+
+    directory: Directory of the profiles of the worker group.
+
+    Return: Success, statistics of all profiles.
+    """
+    stats = None
+    for path in sorted(glob.glob(os.path.join(directory, PROFILE_FILE_PATTERN))):
+        try:
+            file_stats = pstats.Stats(path)
+        # Catching all exceptions for library call
+        # pylint: disable-next=broad-exception-caught
+        except Exception as e:
+            print(f"WARNING: Skipping profile file {path}: {e}")
+            continue
+
+        if stats is None:
+            stats = file_stats
+        else:
+            stats.add(file_stats)
+
+    if stats is None:
+        print(f"ERROR: No profiles in: {directory}")
+        return False, None
+
+    return True, stats
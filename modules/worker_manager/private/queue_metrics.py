@@ -0,0 +1,199 @@
+"""
+Queue metrics.
+"""
+
+import multiprocessing as mp
+import multiprocessing.context
+import multiprocessing.synchronize
+import os
+
+from .. import queue_metrics_data
+
+
+class QueueMetrics:
+    """
+    Counters of a queue in shared memory, updated by every process that uses the queue.
+
+    Updates do not go through the multiprocessing manager. The counters are split into stripes,
+    each with its own lock, and each process updates the stripe picked by its process ID, so
+    producers and consumers in different processes rarely wait for each other. Reads add up the
+    stripes. The occupancy of the reorder buffer is only written by its single consumer, without a
+    lock.
+    """
+
+    # Indices into the counters of a stripe
+    __PUT_COUNT = 0
+    __GET_COUNT = 1
+    __PUT_BLOCKED_TIME = 2
+    __GET_BLOCKED_TIME = 3
+    __DROP_COUNT = 4
+    __REORDER_RELEASE_COUNT = 5
+    __REORDER_WAIT_TIME = 6
+    __REORDER_SKIP_COUNT = 7
+    # Followed by the buckets of the batch size histogram
+    __BATCH_SIZE_BUCKETS = 8
+    __COUNTER_COUNT = __BATCH_SIZE_BUCKETS + queue_metrics_data.BATCH_SIZE_BUCKET_COUNT
+
+    __STRIPE_COUNT = 8
+
+    # Indices into the occupancy of the reorder buffer
+    __REORDER_OCCUPANCY = 0
+    __REORDER_MAX_OCCUPANCY = 1
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls, mp_context: multiprocessing.context.BaseContext | None = None
+    ) -> tuple[True, "QueueMetrics"] | tuple[False, None]:
+        """
+        mp_context: Multiprocessing context of the processes using the queue. None is the default
+            context.
+
+        Return: Success, object.
+        """
+        if mp_context is None:
+            mp_context = mp.get_context()
+
+        return True, QueueMetrics(cls.__create_key, mp_context)
+
+    def __init__(
+        self, class_private_create_key: object, mp_context: multiprocessing.context.BaseContext
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is QueueMetrics.__create_key, "Use create() method"
+
+        # Doubles hold integer counts exactly up to 2^53
+        self.__counters = mp_context.RawArray(
+            "d", QueueMetrics.__STRIPE_COUNT * QueueMetrics.__COUNTER_COUNT
+        )
+        self.__locks = [mp_context.Lock() for _ in range(0, QueueMetrics.__STRIPE_COUNT)]
+        self.__reorder_occupancy = mp_context.RawArray("q", 2)
+
+    def __get_stripe(self) -> tuple[int, multiprocessing.synchronize.Lock]:
+        """
+        Return: Index of the first counter of the stripe of this process, lock of the stripe.
+        """
+        stripe = os.getpid() % QueueMetrics.__STRIPE_COUNT
+        return stripe * QueueMetrics.__COUNTER_COUNT, self.__locks[stripe]
+
+    def __add_stripes(self) -> list[float]:
+        """
+        Return: Counters added up over all stripes.
+        """
+        counters = [0.0] * QueueMetrics.__COUNTER_COUNT
+        for stripe, lock in enumerate(self.__locks):
+            start = stripe * QueueMetrics.__COUNTER_COUNT
+            with lock:
+                stripe_counters = self.__counters[start : start + QueueMetrics.__COUNTER_COUNT]
+
+            counters = [total + value for total, value in zip(counters, stripe_counters)]
+
+        return counters
+
+    def add_put(self, count: int, blocked_time: float) -> None:
+        """
+        Record items put.
+
+        count: Number of items put.
+        blocked_time: Seconds waited for space.
+        """
+        start, lock = self.__get_stripe()
+        with lock:
+            self.__counters[start + QueueMetrics.__PUT_COUNT] += count
+            self.__counters[start + QueueMetrics.__PUT_BLOCKED_TIME] += blocked_time
+
+    def add_get(self, count: int, blocked_time: float) -> None:
+        """
+        Record items got.
+
+        count: Number of items got.
+        blocked_time: Seconds waited for items.
+        """
+        start, lock = self.__get_stripe()
+        with lock:
+            self.__counters[start + QueueMetrics.__GET_COUNT] += count
+            self.__counters[start + QueueMetrics.__GET_BLOCKED_TIME] += blocked_time
+
+    def add_drop(self, count: int) -> None:
+        """
+        Record items dropped by the overflow policy.
+
+        count: Number of items dropped.
+        """
+        if count == 0:
+            return
+
+        start, lock = self.__get_stripe()
+        with lock:
+            self.__counters[start + QueueMetrics.__DROP_COUNT] += count
+
+    def add_batch(self, size: int) -> None:
+        """
+        Record a batch formed by a consumer.
+
+        size: Number of items in the batch. Must be greater than 0.
+        """
+        bucket = min(size.bit_length() - 1, queue_metrics_data.BATCH_SIZE_BUCKET_COUNT - 1)
+
+        start, lock = self.__get_stripe()
+        with lock:
+            self.__counters[start + QueueMetrics.__BATCH_SIZE_BUCKETS + bucket] += 1
+
+    def set_reorder_occupancy(self, occupancy: int) -> None:
+        """
+        Record the number of items in the reorder buffer of the consumer. Called with the lock of
+        the reorder buffer held.
+
+        occupancy: Number of items in the reorder buffer.
+        """
+        self.__reorder_occupancy[QueueMetrics.__REORDER_OCCUPANCY] = occupancy
+        self.__reorder_occupancy[QueueMetrics.__REORDER_MAX_OCCUPANCY] = max(
+            self.__reorder_occupancy[QueueMetrics.__REORDER_MAX_OCCUPANCY], occupancy
+        )
+
+    def add_reorder_release(self, wait_time: float, skip_count: int) -> None:
+        """
+        Record an item released by the reorder buffer.
+
+        wait_time: Seconds the item was held back.
+        skip_count: Number of missing sequence numbers skipped to release the item.
+        """
+        start, lock = self.__get_stripe()
+        with lock:
+            self.__counters[start + QueueMetrics.__REORDER_RELEASE_COUNT] += 1
+            self.__counters[start + QueueMetrics.__REORDER_WAIT_TIME] += wait_time
+            self.__counters[start + QueueMetrics.__REORDER_SKIP_COUNT] += skip_count
+
+    def read(self) -> tuple[int, int, float, float, int, list[int]]:
+        """
+        Return: Items put, items got, seconds blocked on put, seconds blocked on get, items
+            dropped, batch size histogram.
+        """
+        counters = self.__add_stripes()
+
+        return (
+            int(counters[QueueMetrics.__PUT_COUNT]),
+            int(counters[QueueMetrics.__GET_COUNT]),
+            counters[QueueMetrics.__PUT_BLOCKED_TIME],
+            counters[QueueMetrics.__GET_BLOCKED_TIME],
+            int(counters[QueueMetrics.__DROP_COUNT]),
+            [int(count) for count in counters[QueueMetrics.__BATCH_SIZE_BUCKETS :]],
+        )
+
+    def read_reorder(self) -> tuple[int, int, int, float, int]:
+        """
+        Return: Items in the reorder buffer, maximum items in the reorder buffer, items released,
+            seconds items were held back, sequence numbers skipped.
+        """
+        counters = self.__add_stripes()
+
+        return (
+            self.__reorder_occupancy[QueueMetrics.__REORDER_OCCUPANCY],
+            self.__reorder_occupancy[QueueMetrics.__REORDER_MAX_OCCUPANCY],
+            int(counters[QueueMetrics.__REORDER_RELEASE_COUNT]),
+            counters[QueueMetrics.__REORDER_WAIT_TIME],
+            int(counters[QueueMetrics.__REORDER_SKIP_COUNT]),
+        )
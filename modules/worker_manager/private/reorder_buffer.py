@@ -0,0 +1,186 @@
+"""
+Reorder buffer.
+"""
+
+import collections
+import heapq
+import multiprocessing as mp
+import multiprocessing.context
+import threading
+
+from . import queue_metrics
+
+
+# Heap, ready items, and gap state
+# pylint: disable-next=too-many-instance-attributes
+class ReorderBuffer:
+    """
+    Items got from a queue that the consumer holds back until they can be released in sequence
+    number order.
+
+    An item is released once all smaller numbers have been released. A missing number is skipped
+    after the gap timeout, when the buffer is full, or when flushing at the end of the stream. Items
+    without a number, or with a number that was already released or skipped, are released on
+    arrival. The occupancy and the time items are held are recorded in the metrics of the queue.
+
+    Each process has its own buffer, so a queue with a reorder buffer has a single consumer. The
+    next number is in shared memory, so a consumer that is restarted continues after the last number
+    released instead of waiting for the numbers from 0.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        capacity: int,
+        gap_timeout: float,
+        metrics: queue_metrics.QueueMetrics,
+        mp_context: multiprocessing.context.BaseContext | None = None,
+    ) -> tuple[True, "ReorderBuffer"] | tuple[False, None]:
+        """
+        capacity: Maximum number of items held back. Must be greater than 0.
+        gap_timeout: Seconds to wait for a missing number. Must not be negative.
+        metrics: Metrics of the queue.
+        mp_context: Multiprocessing context of the processes using the queue. None is the default
+            context.
+
+        Return: Success, object.
+        """
+        if capacity <= 0:
+            print("ERROR: Reorder buffer capacity must be greater than 0")
+            return False, None
+
+        if gap_timeout < 0.0:
+            print("ERROR: Reorder gap timeout must not be negative")
+            return False, None
+
+        if mp_context is None:
+            mp_context = mp.get_context()
+
+        return True, ReorderBuffer(cls.__create_key, capacity, gap_timeout, metrics, mp_context)
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        capacity: int,
+        gap_timeout: float,
+        metrics: queue_metrics.QueueMetrics,
+        mp_context: multiprocessing.context.BaseContext,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is ReorderBuffer.__create_key, "Use create() method"
+
+        self.__capacity = capacity
+        self.__gap_timeout = gap_timeout
+        self.__metrics = metrics
+
+        # Only the consumer writes it
+        self.__next_sequence = mp_context.RawValue("q", 0)
+        # Heap of sequence number, arrival order, arrival time, item
+        self.__held_items: list[tuple[int, int, float, object]] = []
+        self.__arrival_count = 0
+        # Sequence number and item, released on arrival
+        self.__ready_items: collections.deque[tuple[int | None, object]] = collections.deque()
+        # Time from time.monotonic() since the next number has been missing
+        self.__gap_start_time: float | None = None
+
+        # The executor threads of get_async() share the buffer
+        self.__lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        """
+        The lock is not picklable.
+        """
+        state = self.__dict__.copy()
+        del state["_ReorderBuffer__lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Create a new lock in this process.
+        """
+        self.__dict__.update(state)
+        self.__lock = threading.Lock()
+
+    def get_occupancy(self) -> int:
+        """
+        Return: Number of items in the buffer.
+        """
+        return len(self.__held_items) + len(self.__ready_items)
+
+    def get_gap_deadline(self) -> float | None:
+        """
+        Return: Time from time.monotonic() the missing number is skipped at, None if no number is
+            missing.
+        """
+        gap_start_time = self.__gap_start_time
+        if gap_start_time is None:
+            return None
+
+        return gap_start_time + self.__gap_timeout
+
+    def add(self, sequence: int | None, item: object, now: float) -> None:
+        """
+        Hold an item got from the queue.
+
+        sequence: Sequence number of the item. None is released on arrival.
+        now: Time from time.monotonic().
+        """
+        with self.__lock:
+            if sequence is None or sequence < self.__next_sequence.value:
+                self.__ready_items.append((sequence, item))
+            else:
+                heapq.heappush(self.__held_items, (sequence, self.__arrival_count, now, item))
+                self.__arrival_count += 1
+
+            self.__metrics.set_reorder_occupancy(self.get_occupancy())
+
+    def pop(
+        self, now: float, is_flush: bool
+    ) -> tuple[True, tuple[int | None, object]] | tuple[False, None]:
+        """
+        Release the next item.
+
+        now: Time from time.monotonic().
+        is_flush: Whether missing numbers are skipped without waiting, because no more items will
+            arrive.
+
+        Return: Success, sequence number and item. False if the buffer is empty or waiting for a
+            missing number.
+        """
+        with self.__lock:
+            if len(self.__ready_items) > 0:
+                released = self.__ready_items.popleft()
+                self.__metrics.add_reorder_release(0.0, 0)
+                self.__metrics.set_reorder_occupancy(self.get_occupancy())
+                return True, released
+
+            if len(self.__held_items) == 0:
+                self.__gap_start_time = None
+                return False, None
+
+            skip_count = 0
+            sequence = self.__held_items[0][0]
+            next_sequence = self.__next_sequence.value
+            if sequence > next_sequence:
+                if self.__gap_start_time is None:
+                    self.__gap_start_time = now
+
+                is_gap_expired = now - self.__gap_start_time >= self.__gap_timeout
+                is_full = len(self.__held_items) >= self.__capacity
+                if not (is_flush or is_gap_expired or is_full):
+                    return False, None
+
+                skip_count = sequence - next_sequence
+
+            sequence, _, arrival_time, item = heapq.heappop(self.__held_items)
+            self.__next_sequence.value = max(next_sequence, sequence + 1)
+            self.__gap_start_time = None
+
+            self.__metrics.add_reorder_release(now - arrival_time, skip_count)
+            self.__metrics.set_reorder_occupancy(self.get_occupancy())
+
+            return True, (sequence, item)
@@ -0,0 +1,59 @@
+"""
+Sequence counter.
+"""
+
+import multiprocessing as mp
+import multiprocessing.context
+
+
+class SequenceCounter:
+    """
+    Next sequence number of a queue, in shared memory.
+
+    Producers take their numbers before they put, and only hold the lock while taking them, so a put
+    that blocks or a producer that is killed does not stop the others. The numbers are then close
+    to the order the items enter the queue, and a put that fails leaves a gap, which a reorder
+    buffer skips after its gap timeout.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls, mp_context: multiprocessing.context.BaseContext | None = None
+    ) -> tuple[True, "SequenceCounter"] | tuple[False, None]:
+        """
+        mp_context: Multiprocessing context of the processes using the queue. None is the default
+            context.
+
+        Return: Success, object.
+        """
+        if mp_context is None:
+            mp_context = mp.get_context()
+
+        return True, SequenceCounter(cls.__create_key, mp_context)
+
+    def __init__(
+        self, class_private_create_key: object, mp_context: multiprocessing.context.BaseContext
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is SequenceCounter.__create_key, "Use create() method"
+
+        self.__next_sequence = mp_context.RawValue("q", 0)
+        self.__lock = mp_context.Lock()
+
+    def take(self, count: int) -> int:
+        """
+        Use up the next numbers.
+
+        count: Number of items to number.
+
+        Return: First sequence number of the items.
+        """
+        with self.__lock:
+            first_sequence = self.__next_sequence.value
+            self.__next_sequence.value += count
+
+        return first_sequence
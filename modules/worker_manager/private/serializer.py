@@ -0,0 +1,107 @@
+"""
+Serializer.
+"""
+
+from collections.abc import Callable
+import pickle
+
+from .. import queue_property_data
+from . import end_of_stream_counter
+
+
+class Serializer:
+    """
+    Converts items to a list of buffers (frames) and back.
+
+    Pickle out of band writes the pickle into the first frame and each large buffer of the item
+    into its own frame, so the buffers are copied once from the item into the queue. The other
+    kinds use a single frame. End of stream markers are an empty list of frames for all kinds.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        kind: queue_property_data.SerializerKind = queue_property_data.SerializerKind.PICKLE,
+        encode: Callable[[object], bytes] | None = None,
+        decode: Callable[[bytes], object] | None = None,
+    ) -> tuple[True, "Serializer"] | tuple[False, None]:
+        """
+        kind: How items are converted to bytes.
+        encode: Converts an item to bytes-like. Only used by the custom serializer.
+        decode: Converts bytes back to an item. Only used by the custom serializer.
+
+        Return: Success, object.
+        """
+        if kind == queue_property_data.SerializerKind.CUSTOM and (encode is None or decode is None):
+            print("ERROR: Custom serializer requires encode and decode")
+            return False, None
+
+        return True, Serializer(cls.__create_key, kind, encode, decode)
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        kind: queue_property_data.SerializerKind,
+        encode: Callable[[object], bytes] | None,
+        decode: Callable[[bytes], object] | None,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is Serializer.__create_key, "Use create() method"
+
+        self.kind = kind
+        self.__encode = encode
+        self.__decode = decode
+
+    def dumps(self, item: object) -> list[memoryview]:
+        """
+        Serialize an item. Raises TypeError if the bytes serializer gets an item that is not
+        bytes-like.
+
+        Return: Frames as contiguous byte views.
+        """
+        if isinstance(item, end_of_stream_counter.EndOfStream):
+            return []
+
+        match self.kind:
+            case queue_property_data.SerializerKind.PICKLE_OUT_OF_BAND:
+                buffers: list[pickle.PickleBuffer] = []
+                data = pickle.dumps(item, protocol=5, buffer_callback=buffers.append)
+                return [memoryview(data)] + [buffer.raw() for buffer in buffers]
+            case queue_property_data.SerializerKind.BYTES:
+                return [memoryview(item).cast("B")]  # type: ignore
+            case queue_property_data.SerializerKind.CUSTOM:
+                # Get Pylance to stop complaining
+                assert self.__encode is not None
+
+                return [memoryview(self.__encode(item)).cast("B")]
+            case _:
+                return [memoryview(pickle.dumps(item, protocol=pickle.HIGHEST_PROTOCOL))]
+
+    def loads(self, frames: list) -> object:
+        """
+        Deserialize an item.
+
+        frames: Bytes-like frames from dumps(). Objects such as NumPy arrays from out of band
+            frames share memory with the frames.
+
+        Return: Item.
+        """
+        if len(frames) == 0:
+            return end_of_stream_counter.EndOfStream()
+
+        match self.kind:
+            case queue_property_data.SerializerKind.PICKLE_OUT_OF_BAND:
+                return pickle.loads(frames[0], buffers=frames[1:])
+            case queue_property_data.SerializerKind.BYTES:
+                return bytes(frames[0])
+            case queue_property_data.SerializerKind.CUSTOM:
+                # Get Pylance to stop complaining
+                assert self.__decode is not None
+
+                return self.__decode(bytes(frames[0]))
+            case _:
+                return pickle.loads(frames[0])
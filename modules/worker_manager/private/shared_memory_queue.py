@@ -0,0 +1,429 @@
+"""
+Queue backed by a shared memory ring buffer.
+"""
+
+import multiprocessing as mp
+import multiprocessing.context
+import multiprocessing.shared_memory
+import multiprocessing.synchronize
+import os
+import queue
+import struct
+import time
+import weakref
+
+from . import serializer
+
+
+# Slot prefix: number of frames, then the length of each frame
+LENGTH_FORMAT = "=I"
+LENGTH_SIZE = struct.calcsize(LENGTH_FORMAT)
+
+
+def serialize(
+    item_serializer: serializer.Serializer, item: object, slot_size: int
+) -> list[memoryview]:
+    """
+    Serialize the item and check it fits in a slot.
+
+    slot_size: Maximum size of a serialized item in bytes, including 4 bytes per frame.
+
+    Return: Frames of the item.
+    """
+    frames = item_serializer.dumps(item)
+    size = sum(frame.nbytes + LENGTH_SIZE for frame in frames)
+    if size > slot_size:
+        raise ValueError(f"Item of {size} bytes exceeds slot size {slot_size}")
+
+    return frames
+
+
+def write_slot(buffer: memoryview, offset: int, frames: list[memoryview]) -> int:
+    """
+    Write the frame lengths and the frames of an item into the slot at the byte offset.
+
+    Return: Number of bytes of the frames.
+    """
+    lengths = [frame.nbytes for frame in frames]
+    struct.pack_into(f"={len(frames) + 1}I", buffer, offset, len(frames), *lengths)
+    data_offset = offset + (len(frames) + 1) * LENGTH_SIZE
+    for frame in frames:
+        buffer[data_offset : data_offset + frame.nbytes] = frame
+        data_offset += frame.nbytes
+
+    return sum(lengths)
+
+
+def read_slot(buffer: memoryview, offset: int) -> tuple[list[memoryview], int]:
+    """
+    Read the frames of an item from the slot at the byte offset.
+
+    Return: Frames of the item as views of a single writable copy of the slot, number of bytes of
+        the frames.
+    """
+    (frame_count,) = struct.unpack_from(LENGTH_FORMAT, buffer, offset)
+    lengths = struct.unpack_from(f"={frame_count}I", buffer, offset + LENGTH_SIZE)
+    data_offset = offset + (frame_count + 1) * LENGTH_SIZE
+    data = memoryview(bytearray(buffer[data_offset : data_offset + sum(lengths)]))
+
+    frames = []
+    frame_offset = 0
+    for length in lengths:
+        frames.append(data[frame_offset : frame_offset + length])
+        frame_offset += length
+
+    return frames, sum(lengths)
+
+
+# Shared memory layout and its synchronization
+# pylint: disable-next=too-many-instance-attributes
+class SharedMemoryQueue:
+    """
+    Bounded multi-producer multi-consumer FIFO queue.
+
+    Items are serialized into fixed size slots of a shared memory ring buffer, so a transfer does
+    not go through the multiprocessing manager server. Semaphores are used for blocking. The frames
+    of the serializer are written into the slot directly, and a get copies the slot out once.
+
+    The interface matches the queue proxies from multiprocessing managers: put(), get(),
+    put_nowait(), get_nowait(), qsize(), empty(), full(). Batches of items are moved with
+    put_many() and get_many() under a single lock acquisition.
+
+    Like multiprocessing queues, the object can only be passed to a child process as an argument
+    when the process is started.
+    """
+
+    # Header: head index, tail index, total bytes written, total bytes read
+    __HEADER_FORMAT = "=QQQQ"
+    __HEADER_SIZE = struct.calcsize(__HEADER_FORMAT)
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        max_size: int,
+        slot_size: int,
+        mp_context: multiprocessing.context.BaseContext | None = None,
+        item_serializer: serializer.Serializer | None = None,
+    ) -> tuple[True, "SharedMemoryQueue"] | tuple[False, None]:
+        """
+        max_size: Maximum number of items that can be held in the queue. Must be greater than 0.
+        slot_size: Maximum size of a serialized item in bytes, including 4 bytes per frame.
+            Must be greater than 0.
+        mp_context: Multiprocessing context of the processes using the queue. None is the default
+            context.
+        item_serializer: Serializer of the items. None is pickle.
+
+        Return: Success, object.
+        """
+        if max_size <= 0:
+            print("ERROR: Queue max size must be greater than 0")
+            return False, None
+
+        if slot_size <= 0:
+            print("ERROR: Slot size must be greater than 0")
+            return False, None
+
+        stride = LENGTH_SIZE + slot_size
+        try:
+            shared_memory = mp.shared_memory.SharedMemory(
+                create=True, size=cls.__HEADER_SIZE + max_size * stride
+            )
+        except OSError as e:
+            print(f"ERROR: Failed to allocate shared memory: {e}")
+            return False, None
+
+        struct.pack_into(cls.__HEADER_FORMAT, shared_memory.buf, 0, 0, 0, 0, 0)
+
+        if mp_context is None:
+            mp_context = mp.get_context()
+
+        if item_serializer is None:
+            result, item_serializer = serializer.Serializer.create()
+            if not result:
+                print("ERROR: Failed to create serializer")
+                shared_memory.close()
+                shared_memory.unlink()
+                return False, None
+
+            # Get Pylance to stop complaining
+            assert item_serializer is not None
+
+        return True, SharedMemoryQueue(
+            cls.__create_key, shared_memory, max_size, slot_size, mp_context, item_serializer
+        )
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        shared_memory: mp.shared_memory.SharedMemory,
+        max_size: int,
+        slot_size: int,
+        mp_context: multiprocessing.context.BaseContext,
+        item_serializer: serializer.Serializer,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is SharedMemoryQueue.__create_key, "Use create() method"
+
+        self.__shared_memory = shared_memory
+        self.__max_size = max_size
+        self.__slot_size = slot_size
+        self.__serializer = item_serializer
+
+        self.__lock = mp_context.Lock()
+        self.__free_slots = mp_context.Semaphore(max_size)
+        self.__used_slots = mp_context.Semaphore(0)
+
+        # Only the creating process releases the shared memory
+        self.__finalizer = weakref.finalize(
+            self, SharedMemoryQueue.__release, shared_memory, os.getpid()
+        )
+
+    @staticmethod
+    def __release(shared_memory: mp.shared_memory.SharedMemory, owner_pid: int) -> None:
+        """
+        Close the shared memory, and unlink it if this is the creating process.
+        """
+        shared_memory.close()
+        if os.getpid() == owner_pid:
+            shared_memory.unlink()
+
+    def __getstate__(self) -> dict:
+        """
+        Pickle by shared memory name, the child process attaches to the same buffer.
+        """
+        return {
+            "name": self.__shared_memory.name,
+            "max_size": self.__max_size,
+            "slot_size": self.__slot_size,
+            "serializer": self.__serializer,
+            "lock": self.__lock,
+            "free_slots": self.__free_slots,
+            "used_slots": self.__used_slots,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Attach to the shared memory of the parent.
+        """
+        self.__shared_memory = mp.shared_memory.SharedMemory(name=state["name"])
+        self.__max_size = state["max_size"]
+        self.__slot_size = state["slot_size"]
+        self.__serializer = state["serializer"]
+        self.__lock = state["lock"]
+        self.__free_slots = state["free_slots"]
+        self.__used_slots = state["used_slots"]
+
+        # Owner PID of 0 never matches, so attached processes only close
+        self.__finalizer = weakref.finalize(
+            self, SharedMemoryQueue.__release, self.__shared_memory, 0
+        )
+
+    def __slot_offset(self, index: int) -> int:
+        """
+        Byte offset of the slot for the ring buffer index.
+        """
+        stride = LENGTH_SIZE + self.__slot_size
+        return SharedMemoryQueue.__HEADER_SIZE + (index % self.__max_size) * stride
+
+    @staticmethod
+    def __acquire(
+        semaphore: multiprocessing.synchronize.Semaphore, block: bool, timeout: float | None
+    ) -> bool:
+        """
+        Acquire with the same blocking rules as queue.Queue.
+        """
+        if not block:
+            return semaphore.acquire(False)
+
+        if timeout is None:
+            return semaphore.acquire()
+
+        if timeout < 0:
+            raise ValueError("'timeout' must be a non-negative number")
+
+        return semaphore.acquire(timeout=timeout)
+
+    def __write(self, frames_list: list[list[memoryview]]) -> None:
+        """
+        Write the frames of each item into consecutive slots. Caller must have acquired a free
+        slot for each.
+        """
+        buffer = self.__shared_memory.buf
+        with self.__lock:
+            head, tail, write_bytes, read_bytes = struct.unpack_from(
+                SharedMemoryQueue.__HEADER_FORMAT, buffer, 0
+            )
+            for frames in frames_list:
+                write_bytes += write_slot(buffer, self.__slot_offset(tail), frames)
+                tail += 1
+
+            struct.pack_into(
+                SharedMemoryQueue.__HEADER_FORMAT, buffer, 0, head, tail, write_bytes, read_bytes
+            )
+
+        for _ in range(0, len(frames_list)):
+            self.__used_slots.release()
+
+    def __read(self, count: int) -> list[list[memoryview]]:
+        """
+        Read the frames of each item from consecutive slots. Caller must have acquired a used slot
+        for each.
+
+        Return: Frames of each item, as views of a single writable copy of the slot.
+        """
+        frames_list = []
+        buffer = self.__shared_memory.buf
+        with self.__lock:
+            head, tail, write_bytes, read_bytes = struct.unpack_from(
+                SharedMemoryQueue.__HEADER_FORMAT, buffer, 0
+            )
+            for _ in range(0, count):
+                frames, byte_count = read_slot(buffer, self.__slot_offset(head))
+                frames_list.append(frames)
+                head += 1
+                read_bytes += byte_count
+
+            struct.pack_into(
+                SharedMemoryQueue.__HEADER_FORMAT, buffer, 0, head, tail, write_bytes, read_bytes
+            )
+
+        for _ in range(0, count):
+            self.__free_slots.release()
+
+        return frames_list
+
+    def put(self, item: object, block: bool = True, timeout: float | None = None) -> None:
+        """
+        Put an item into the queue. Raises queue.Full on timeout or if non-blocking and full.
+        """
+        frames = serialize(self.__serializer, item, self.__slot_size)
+
+        if not SharedMemoryQueue.__acquire(self.__free_slots, block, timeout):
+            raise queue.Full
+
+        self.__write([frames])
+
+    def get(self, block: bool = True, timeout: float | None = None) -> object:
+        """
+        Remove and return an item from the queue. Raises queue.Empty on timeout or if
+        non-blocking and empty.
+        """
+        if not SharedMemoryQueue.__acquire(self.__used_slots, block, timeout):
+            raise queue.Empty
+
+        frames = self.__read(1)[0]
+
+        return self.__serializer.loads(frames)
+
+    def put_many(self, items: list, block: bool = True, timeout: float | None = None) -> int:
+        """
+        Put items into the queue in order, as many as fit until the timeout.
+
+        Return: Number of items put.
+        """
+        frames_list = [serialize(self.__serializer, item, self.__slot_size) for item in items]
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        count = 0
+        while count < len(frames_list):
+            if not SharedMemoryQueue.__acquire_until(self.__free_slots, block, deadline):
+                break
+
+            # Take any other free slots without waiting
+            end = count + 1
+            while end < len(frames_list) and self.__free_slots.acquire(False):
+                end += 1
+
+            self.__write(frames_list[count:end])
+            count = end
+
+        return count
+
+    def get_many(
+        self, max_items: int, block: bool = True, timeout: float | None = None
+    ) -> list[object]:
+        """
+        Remove and return up to max_items items, waiting until the timeout for the batch to fill.
+
+        Return: Items in order, can be fewer than max_items or empty.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        items = []
+        while len(items) < max_items:
+            if not SharedMemoryQueue.__acquire_until(self.__used_slots, block, deadline):
+                break
+
+            # Take any other used slots without waiting
+            count = 1
+            while len(items) + count < max_items and self.__used_slots.acquire(False):
+                count += 1
+
+            items += [self.__serializer.loads(frames) for frames in self.__read(count)]
+
+        return items
+
+    @staticmethod
+    def __acquire_until(
+        semaphore: multiprocessing.synchronize.Semaphore, block: bool, deadline: float | None
+    ) -> bool:
+        """
+        Acquire until the deadline. Tries once without waiting if the deadline has passed.
+        """
+        if not block or deadline is None:
+            return SharedMemoryQueue.__acquire(semaphore, block, None)
+
+        remaining = max(deadline - time.monotonic(), 0.0)
+        return SharedMemoryQueue.__acquire(semaphore, True, remaining)
+
+    def put_nowait(self, item: object) -> None:
+        """
+        Equivalent to put(item, False).
+        """
+        self.put(item, False)
+
+    def get_nowait(self) -> object:
+        """
+        Equivalent to get(False).
+        """
+        return self.get(False)
+
+    def qsize(self) -> int:
+        """
+        Approximate number of items in the queue.
+        """
+        head, tail, _, _ = struct.unpack_from(
+            SharedMemoryQueue.__HEADER_FORMAT, self.__shared_memory.buf, 0
+        )
+        return tail - head
+
+    def get_byte_counts(self) -> tuple[int, int]:
+        """
+        Return: Total serialized bytes put into and got from the queue by all processes.
+        """
+        _, _, write_bytes, read_bytes = struct.unpack_from(
+            SharedMemoryQueue.__HEADER_FORMAT, self.__shared_memory.buf, 0
+        )
+        return write_bytes, read_bytes
+
+    def empty(self) -> bool:
+        """
+        Approximate emptiness.
+        """
+        return self.qsize() == 0
+
+    def full(self) -> bool:
+        """
+        Approximate fullness.
+        """
+        return self.qsize() >= self.__max_size
+
+    def close(self) -> None:
+        """
+        Release the shared memory in this process. The queue must not be used afterwards.
+        """
+        self.__finalizer()
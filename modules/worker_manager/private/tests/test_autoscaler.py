@@ -0,0 +1,77 @@
+"""
+Test autoscaler.
+"""
+
+import pytest
+
+from modules.worker_manager import scaling_policy_data
+from modules.worker_manager.private import autoscaler
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+@pytest.fixture
+def scaler() -> autoscaler.Autoscaler:  # type: ignore
+    """
+    Autoscaler between 1 and 3 workers, with 2 samples of hysteresis and 1 second of cooldown.
+    """
+    result, scaling_policy = scaling_policy_data.ScalingPolicyData.create(1, 3, 4.0, 1.0, 2, 1.0)
+    assert result
+    assert scaling_policy is not None
+
+    result, scaler = autoscaler.Autoscaler.create(scaling_policy)
+    assert result
+    assert scaler is not None
+
+    yield scaler  # type: ignore
+
+
+class TestUpdate:
+    """
+    Test update() method.
+    """
+
+    def test_scale_up(self, scaler: autoscaler.Autoscaler) -> None:
+        """
+        Depth above threshold for enough samples.
+        """
+        assert scaler.update(10, 1, 0.0) == 0
+        assert scaler.update(10, 1, 0.1) == 1
+
+    def test_hysteresis(self, scaler: autoscaler.Autoscaler) -> None:
+        """
+        Depth inside the band resets the sample count.
+        """
+        assert scaler.update(10, 1, 0.0) == 0
+        assert scaler.update(2, 1, 0.1) == 0
+        assert scaler.update(10, 1, 0.2) == 0
+        assert scaler.update(10, 1, 0.3) == 1
+
+    def test_cooldown(self, scaler: autoscaler.Autoscaler) -> None:
+        """
+        No scaling until the cooldown has passed.
+        """
+        assert scaler.update(20, 1, 0.0) == 0
+        assert scaler.update(20, 1, 0.1) == 1
+        assert scaler.update(20, 2, 0.2) == 0
+        assert scaler.update(20, 2, 0.3) == 0
+        assert scaler.update(20, 2, 1.2) == 1
+
+    def test_scale_down(self, scaler: autoscaler.Autoscaler) -> None:
+        """
+        Depth at or below threshold for enough samples.
+        """
+        assert scaler.update(0, 2, 0.0) == 0
+        assert scaler.update(2, 2, 0.1) == -1
+
+    def test_bounds(self, scaler: autoscaler.Autoscaler) -> None:
+        """
+        No scaling beyond the minimum and maximum.
+        """
+        assert scaler.update(100, 3, 0.0) == 0
+        assert scaler.update(100, 3, 0.1) == 0
+        assert scaler.update(0, 1, 5.0) == 0
+        assert scaler.update(0, 1, 5.1) == 0
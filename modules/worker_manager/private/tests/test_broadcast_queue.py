@@ -0,0 +1,202 @@
+"""
+Test broadcast queue.
+"""
+
+import multiprocessing as mp
+import queue
+
+import pytest
+
+from modules.worker_manager.private import broadcast_queue
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture
+def publisher() -> broadcast_queue.BroadcastQueue:  # type: ignore
+    """
+    Broadcast queue of 3 items for up to 2 subscribers.
+    """
+    result, publisher = broadcast_queue.BroadcastQueue.create(3, 64, 2)
+    assert result
+    assert publisher is not None
+
+    yield publisher  # type: ignore
+
+    publisher.close()
+
+
+def subscribe(publisher: broadcast_queue.BroadcastQueue) -> broadcast_queue.BroadcastQueue:
+    """
+    Return: Queue of a new subscriber.
+    """
+    result, subscriber = publisher.subscribe()
+    assert result
+    assert subscriber is not None
+
+    return subscriber
+
+
+def consumer(subscriber: broadcast_queue.BroadcastQueue, count: int, results: mp.Queue) -> None:
+    """
+    Get count items from the subscriber and send them back.
+    """
+    results.put([subscriber.get(timeout=5) for _ in range(0, count)])
+
+
+class TestCreate:
+    """
+    Test create() method.
+    """
+
+    def test_max_size_zero(self) -> None:
+        """
+        Zero max_size.
+        """
+        result, publisher = broadcast_queue.BroadcastQueue.create(0, 64, 2)
+
+        assert not result
+        assert publisher is None
+
+    def test_max_subscriber_count_zero(self) -> None:
+        """
+        Zero max_subscriber_count.
+        """
+        result, publisher = broadcast_queue.BroadcastQueue.create(3, 64, 0)
+
+        assert not result
+        assert publisher is None
+
+
+class TestSubscribe:
+    """
+    Test subscribe() and unsubscribe() methods.
+    """
+
+    def test_every_subscriber(self, publisher: broadcast_queue.BroadcastQueue) -> None:
+        """
+        Each subscriber gets every item in order.
+        """
+        first = subscribe(publisher)
+        second = subscribe(publisher)
+
+        assert publisher.put_many(["a", "b", "c"]) == 3
+
+        assert first.get_many(3, timeout=0.0) == ["a", "b", "c"]
+        assert second.get(timeout=0.0) == "a"
+        assert publisher.get_subscriber_depths() == {0: 0, 1: 2}
+        assert publisher.qsize() == 2
+
+    def test_late_subscriber(self, publisher: broadcast_queue.BroadcastQueue) -> None:
+        """
+        A subscriber only gets the items put after it subscribed.
+        """
+        publisher.put("dropped")
+        subscriber = subscribe(publisher)
+        publisher.put("a")
+
+        assert subscriber.get(timeout=0.0) == "a"
+        assert subscriber.empty()
+
+    def test_max_subscriber_count(self, publisher: broadcast_queue.BroadcastQueue) -> None:
+        """
+        Subscribers are not reused after unsubscribing.
+        """
+        first = subscribe(publisher)
+        subscribe(publisher)
+        publisher.unsubscribe(first.get_subscriber())  # type: ignore
+
+        result, subscriber = publisher.subscribe()
+
+        assert not result
+        assert subscriber is None
+
+    def test_publisher_get(self, publisher: broadcast_queue.BroadcastQueue) -> None:
+        """
+        Only subscribers can get.
+        """
+        with pytest.raises(ValueError):
+            publisher.get(timeout=0.0)
+
+
+class TestBackpressure:
+    """
+    Test that puts wait for the slowest subscriber.
+    """
+
+    def test_slowest_subscriber(self, publisher: broadcast_queue.BroadcastQueue) -> None:
+        """
+        A full subscriber blocks the producers until it gets.
+        """
+        fast = subscribe(publisher)
+        slow = subscribe(publisher)
+
+        assert publisher.put_many([0, 1, 2], timeout=0.0) == 3
+        assert fast.get_many(3, timeout=0.0) == [0, 1, 2]
+
+        with pytest.raises(queue.Full):
+            publisher.put(3, timeout=0.0)
+
+        assert slow.get(timeout=0.0) == 0
+
+        publisher.put(3, timeout=0.0)
+
+        assert fast.get(timeout=0.0) == 3
+        assert fast.qsize() == 0
+        assert slow.qsize() == 3
+
+    def test_unsubscribe(self, publisher: broadcast_queue.BroadcastQueue) -> None:
+        """
+        An unsubscribed subscriber no longer blocks the producers.
+        """
+        subscribe(publisher)
+        slow = subscribe(publisher)
+        publisher.put_many([0, 1, 2])
+
+        publisher.unsubscribe(slow.get_subscriber())  # type: ignore
+
+        assert publisher.full()
+
+        publisher.unsubscribe(0)
+
+        assert publisher.put_many([3, 4, 5, 6], timeout=0.0) == 4
+
+    def test_no_subscribers(self, publisher: broadcast_queue.BroadcastQueue) -> None:
+        """
+        Items put without subscribers are not kept.
+        """
+        assert publisher.put_many(list(range(0, 10)), timeout=0.0) == 10
+        assert publisher.empty()
+
+
+class TestCrossProcess:
+    """
+    Test subscribers in child processes.
+    """
+
+    def test_normal(self, publisher: broadcast_queue.BroadcastQueue) -> None:
+        """
+        Subscribers in child processes each get every item in order.
+        """
+        count = 20
+        results = mp.Queue()
+        processes = [
+            mp.Process(target=consumer, args=(subscribe(publisher), count, results))
+            for _ in range(0, 2)
+        ]
+        for process in processes:
+            process.start()
+
+        for i in range(0, count):
+            publisher.put(i, timeout=5)
+
+        received = [results.get(timeout=10) for _ in processes]
+        for process in processes:
+            process.join()
+
+        assert received == [list(range(0, count))] * 2
+        write_bytes, read_bytes = publisher.get_byte_counts()
+        assert read_bytes == 2 * write_bytes
@@ -0,0 +1,145 @@
+"""
+Test partitioned queue.
+"""
+
+import contextvars
+import queue
+import time
+
+import pytest
+
+from modules.worker_manager.private import partitioned_queue
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture
+def keyed_queue() -> partitioned_queue.PartitionedQueue:  # type: ignore
+    """
+    Queue with 4 partitions of max size 5.
+    """
+    result, keyed_queue = partitioned_queue.PartitionedQueue.create(
+        [queue.Queue(5) for _ in range(0, 4)]
+    )
+    assert result
+    assert keyed_queue is not None
+
+    yield keyed_queue  # type: ignore
+
+
+def run_as_consumer(index: int | None, function: "(...) -> object") -> object:  # type: ignore
+    """
+    Call the function in a context with the consumer index.
+    """
+
+    def run() -> object:
+        partitioned_queue.set_consumer_index(index)
+        return function()
+
+    return contextvars.copy_context().run(run)
+
+
+class TestCreate:
+    """
+    Test create() method.
+    """
+
+    def test_no_partitions(self) -> None:
+        """
+        At least 1 partition.
+        """
+        result, keyed_queue = partitioned_queue.PartitionedQueue.create([])
+
+        assert not result
+        assert keyed_queue is None
+
+
+class TestGetPartition:
+    """
+    Test get_partition() function.
+    """
+
+    def test_stable(self) -> None:
+        """
+        Same partition for equal keys of each type.
+        """
+        assert partitioned_queue.get_partition(6, 4) == 2
+        assert partitioned_queue.get_partition("device", 4) == partitioned_queue.get_partition(
+            "device", 4
+        )
+        assert partitioned_queue.get_partition(b"device", 4) == partitioned_queue.get_partition(
+            "device", 4
+        )
+        assert partitioned_queue.get_partition(("a", 1), 4) == partitioned_queue.get_partition(
+            ("a", 1), 4
+        )
+
+    def test_spread(self) -> None:
+        """
+        Keys are spread over all partitions.
+        """
+        partitions = {partitioned_queue.get_partition(f"session {i}", 4) for i in range(0, 100)}
+
+        assert partitions == {0, 1, 2, 3}
+
+
+class TestPutGet:
+    """
+    Test routing of items to consumers.
+    """
+
+    def test_order_per_key(self, keyed_queue: partitioned_queue.PartitionedQueue) -> None:
+        """
+        Items of a key are got in order.
+        """
+        for i in range(0, 4):
+            keyed_queue.put(("a", ("a", i)))
+            keyed_queue.put(("b", ("b", i)))
+
+        items = keyed_queue.get_many(8, False)
+
+        assert [item for item in items if item[0] == "a"] == [("a", i) for i in range(0, 4)]
+        assert [item for item in items if item[0] == "b"] == [("b", i) for i in range(0, 4)]
+        assert keyed_queue.qsize() == 0
+        assert keyed_queue.get_partition_put_counts()[partitioned_queue.get_partition("a", 4)] >= 4
+
+    def test_consumers(self, keyed_queue: partitioned_queue.PartitionedQueue) -> None:
+        """
+        Each consumer only gets the items of its partitions.
+        """
+        keyed_queue.set_consumer_count(2)
+        keyed_queue.put_many([(key, key) for key in range(0, 4)])
+
+        assert run_as_consumer(0, lambda: keyed_queue.get_many(4, False)) == [0, 2]
+        assert run_as_consumer(1, lambda: keyed_queue.get_many(4, False)) == [1, 3]
+        assert keyed_queue.get_partition_depths() == [0, 0, 0, 0]
+
+    def test_consumer_without_partitions(
+        self, keyed_queue: partitioned_queue.PartitionedQueue
+    ) -> None:
+        """
+        Consumers beyond the consumer count wait without getting items.
+        """
+        keyed_queue.set_consumer_count(2)
+        keyed_queue.put((2, 2))
+
+        start_time = time.monotonic()
+        with pytest.raises(queue.Empty):
+            run_as_consumer(2, lambda: keyed_queue.get(True, 0.05))
+
+        assert time.monotonic() - start_time >= 0.05
+        assert run_as_consumer(0, lambda: keyed_queue.get(True, 0.05)) == 2
+
+    def test_full_partition(self, keyed_queue: partitioned_queue.PartitionedQueue) -> None:
+        """
+        Each partition holds up to its max size.
+        """
+        assert keyed_queue.put_many([(0, i) for i in range(0, 6)], False) == 5
+        with pytest.raises(queue.Full):
+            keyed_queue.put((4, 5), False)
+
+        keyed_queue.put((1, 5), False)
+        assert keyed_queue.get_partition_depths() == [5, 1, 0, 0]
@@ -9,6 +9,7 @@ import pytest
 from modules.worker_manager import queue_property_data
 from modules.worker_manager import queue_wrapper
 from modules.worker_manager import worker_controller
+from modules.worker_manager import worker_property_data
 from modules.worker_manager.private import process_property_data
 
 
@@ -218,3 +219,45 @@ class TestCreate:
 
         assert not result
         assert worker is None
+
+
+class TestGetWorkerCpuSet:
+    """
+    Test get_worker_cpu_set() method.
+    """
+
+    def test_none(self) -> None:
+        """
+        No CPU set.
+        """
+        result, process_property = process_property_data.ProcessPropertyData.create(
+            stub1, (), [], []
+        )
+        assert result
+        assert process_property is not None
+
+        assert process_property.get_worker_cpu_set(0) is None
+
+    def test_spread(self) -> None:
+        """
+        Workers are pinned round-robin.
+        """
+        result, process_property = process_property_data.ProcessPropertyData.create(
+            stub1, (), [], [], [2, 5], worker_property_data.AffinityMode.SPREAD
+        )
+        assert result
+        assert process_property is not None
+
+        assert [process_property.get_worker_cpu_set(i) for i in range(0, 3)] == [[2], [5], [2]]
+
+    def test_block(self) -> None:
+        """
+        Workers share the whole set.
+        """
+        result, process_property = process_property_data.ProcessPropertyData.create(
+            stub1, (), [], [], [2, 5], worker_property_data.AffinityMode.BLOCK
+        )
+        assert result
+        assert process_property is not None
+
+        assert [process_property.get_worker_cpu_set(i) for i in range(0, 2)] == [[2, 5], [2, 5]]
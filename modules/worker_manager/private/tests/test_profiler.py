@@ -0,0 +1,131 @@
+"""
+Test profiler.
+"""
+
+import os
+import threading
+
+from modules.worker_manager.private import profiler
+
+
+def busy_function(count: int) -> None:
+    """
+    Function to find in the profile.
+    """
+    sum(range(0, count))
+
+
+def get_call_count(stats: object, function_name: str) -> int:
+    """
+    Return: Number of calls of the function in the statistics.
+    """
+    return sum(
+        call_count
+        for (_, _, name), (_, call_count, _, _, _) in stats.stats.items()  # type: ignore
+        if name == function_name
+    )
+
+
+class TestCreateGroupDirectory:
+    """
+    Test create_group_directory() function.
+    """
+
+    def test_normal(self, tmp_path: str) -> None:
+        """
+        Each group has its own directory.
+        """
+        result, directory = profiler.create_group_directory(str(tmp_path), "group")
+
+        assert result
+        assert directory == os.path.join(tmp_path, "group")
+        assert os.path.isdir(directory)
+
+
+class TestClearProfiles:
+    """
+    Test clear_profiles() function.
+    """
+
+    def test_normal(self, tmp_path: str) -> None:
+        """
+        Only profiles are removed.
+        """
+        profiler.run_profiled(str(tmp_path), busy_function, 1000)
+        other_path = os.path.join(tmp_path, "other.txt")
+        with open(other_path, "w", encoding="utf-8") as file:
+            file.write("other")
+
+        profiler.clear_profiles(str(tmp_path))
+
+        assert os.listdir(tmp_path) == ["other.txt"]
+
+
+class TestRunProfiled:
+    """
+    Test run_profiled() function.
+    """
+
+    def test_not_profiled(self, tmp_path: str) -> None:
+        """
+        The function is called without writing a profile.
+        """
+        results = []
+
+        profiler.run_profiled(None, results.append, 1)
+
+        assert results == [1]
+        assert len(os.listdir(tmp_path)) == 0
+
+    def test_threads(self, tmp_path: str) -> None:
+        """
+        Each thread writes its own profile, and the merged profile has the calls of all threads.
+        """
+        threads = [
+            threading.Thread(
+                target=profiler.run_profiled, args=(str(tmp_path), busy_function, 1000)
+            )
+            for _ in range(0, 2)
+        ]
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        assert len(os.listdir(tmp_path)) == 2
+
+        result, stats = profiler.merge_profiles(str(tmp_path))
+
+        assert result
+        assert stats is not None
+        assert get_call_count(stats, "busy_function") == 2
+
+
+class TestMergeProfiles:
+    """
+    Test merge_profiles() function.
+    """
+
+    def test_empty(self, tmp_path: str) -> None:
+        """
+        No profiles to merge.
+        """
+        result, stats = profiler.merge_profiles(str(tmp_path))
+
+        assert not result
+        assert stats is None
+
+    def test_invalid_file(self, tmp_path: str) -> None:
+        """
+        Files that are not profiles are skipped.
+        """
+        profiler.run_profiled(str(tmp_path), busy_function, 1000)
+        with open(os.path.join(tmp_path, "profile_invalid.prof"), "wb") as file:
+            file.write(b"invalid")
+
+        result, stats = profiler.merge_profiles(str(tmp_path))
+
+        assert result
+        assert stats is not None
+        assert get_call_count(stats, "busy_function") == 1
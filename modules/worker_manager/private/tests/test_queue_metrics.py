@@ -0,0 +1,70 @@
+"""
+Test queue metrics.
+"""
+
+import multiprocessing as mp
+
+from modules.worker_manager.private import queue_metrics
+
+
+def put_items(metrics: queue_metrics.QueueMetrics, count: int) -> None:
+    """
+    Record items put one at a time, like a producer process.
+    """
+    for _ in range(0, count):
+        metrics.add_put(1, 0.001)
+
+
+class TestRead:
+    """
+    Test read() and read_reorder() methods.
+    """
+
+    def test_processes(self) -> None:
+        """
+        Updates of several processes are added up.
+        """
+        mp_context = mp.get_context()
+        result, metrics = queue_metrics.QueueMetrics.create(mp_context)
+        assert result
+        assert metrics is not None
+
+        processes = [
+            mp_context.Process(target=put_items, args=(metrics, 1000)) for _ in range(0, 10)
+        ]
+        for process in processes:
+            process.start()
+
+        put_items(metrics, 1000)
+        metrics.add_get(5, 0.5)
+        metrics.add_batch(4)
+
+        for process in processes:
+            process.join()
+            assert process.exitcode == 0
+
+        put_count, get_count, put_blocked_time, get_blocked_time, drop_count, histogram = (
+            metrics.read()
+        )
+
+        assert put_count == 11000
+        assert get_count == 5
+        assert abs(put_blocked_time - 11.0) < 1e-6
+        assert get_blocked_time == 0.5
+        assert drop_count == 0
+        assert histogram[2] == 1
+
+    def test_reorder_occupancy(self) -> None:
+        """
+        The maximum occupancy is kept after the buffer empties.
+        """
+        result, metrics = queue_metrics.QueueMetrics.create()
+        assert result
+        assert metrics is not None
+
+        for occupancy in [1, 3, 0]:
+            metrics.set_reorder_occupancy(occupancy)
+
+        metrics.add_reorder_release(0.5, 2)
+
+        assert metrics.read_reorder() == (0, 3, 1, 0.5, 2)
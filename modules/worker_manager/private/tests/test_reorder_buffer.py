@@ -0,0 +1,138 @@
+"""
+Test reorder buffer.
+"""
+
+import pytest
+
+from modules.worker_manager.private import queue_metrics
+from modules.worker_manager.private import reorder_buffer
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture
+def metrics() -> queue_metrics.QueueMetrics:  # type: ignore
+    """
+    Queue metrics.
+    """
+    result, metrics = queue_metrics.QueueMetrics.create()
+    assert result
+    assert metrics is not None
+
+    yield metrics  # type: ignore
+
+
+@pytest.fixture
+def buffer(metrics: queue_metrics.QueueMetrics) -> reorder_buffer.ReorderBuffer:  # type: ignore
+    """
+    Buffer of 3 items with a gap timeout of 1 second.
+    """
+    result, buffer = reorder_buffer.ReorderBuffer.create(3, 1.0, metrics)
+    assert result
+    assert buffer is not None
+
+    yield buffer  # type: ignore
+
+
+def pop_all(buffer: reorder_buffer.ReorderBuffer, now: float) -> list[object]:
+    """
+    Return: Items released until the buffer waits.
+    """
+    items = []
+    while True:
+        result, released = buffer.pop(now, False)
+        if not result:
+            return items
+
+        # Get Pylance to stop complaining
+        assert released is not None
+
+        items.append(released[1])
+
+
+class TestCreate:
+    """
+    Test create() method.
+    """
+
+    def test_capacity_zero(self, metrics: queue_metrics.QueueMetrics) -> None:
+        """
+        Capacity must be greater than 0.
+        """
+        result, buffer = reorder_buffer.ReorderBuffer.create(0, 1.0, metrics)
+
+        assert not result
+        assert buffer is None
+
+
+class TestReorder:
+    """
+    Test add() and pop() methods.
+    """
+
+    def test_out_of_order(
+        self, buffer: reorder_buffer.ReorderBuffer, metrics: queue_metrics.QueueMetrics
+    ) -> None:
+        """
+        Items are released once the smaller numbers have arrived.
+        """
+        buffer.add(1, "b", 0.0)
+        buffer.add(2, "c", 0.0)
+
+        assert len(pop_all(buffer, 0.1)) == 0
+        assert buffer.get_occupancy() == 2
+
+        buffer.add(0, "a", 0.2)
+
+        assert pop_all(buffer, 0.5) == ["a", "b", "c"]
+        assert buffer.get_occupancy() == 0
+
+        occupancy, max_occupancy, release_count, wait_time, skip_count = metrics.read_reorder()
+        assert occupancy == 0
+        assert max_occupancy == 3
+        assert release_count == 3
+        assert wait_time == pytest.approx(0.3 + 0.5 + 0.5)
+        assert skip_count == 0
+
+    def test_gap_timeout(
+        self, buffer: reorder_buffer.ReorderBuffer, metrics: queue_metrics.QueueMetrics
+    ) -> None:
+        """
+        A missing number is skipped after the gap timeout, and released on arrival afterwards.
+        """
+        buffer.add(0, "a", 0.0)
+        buffer.add(2, "c", 0.0)
+
+        assert pop_all(buffer, 0.0) == ["a"]
+        assert buffer.get_gap_deadline() == 1.0
+        assert len(pop_all(buffer, 0.5)) == 0
+        assert pop_all(buffer, 1.0) == ["c"]
+        assert buffer.get_gap_deadline() is None
+
+        buffer.add(1, "b", 1.5)
+
+        assert pop_all(buffer, 1.5) == ["b"]
+        assert metrics.read_reorder()[4] == 1
+
+    def test_full(self, buffer: reorder_buffer.ReorderBuffer) -> None:
+        """
+        A full buffer skips missing numbers without waiting.
+        """
+        for sequence, item in [(3, "d"), (1, "b"), (2, "c")]:
+            buffer.add(sequence, item, 0.0)
+
+        assert pop_all(buffer, 0.0) == ["b", "c", "d"]
+
+    def test_flush(self, buffer: reorder_buffer.ReorderBuffer) -> None:
+        """
+        Flushing releases all items in order.
+        """
+        buffer.add(2, "c", 0.0)
+        buffer.add(None, "x", 0.0)
+
+        assert buffer.pop(0.0, False) == (True, (None, "x"))
+        assert buffer.pop(0.0, False) == (False, None)
+        assert buffer.pop(0.0, True) == (True, (2, "c"))
@@ -0,0 +1,110 @@
+"""
+Test serializer.
+"""
+
+import numpy as np
+import pytest
+
+from modules.worker_manager import queue_property_data
+from modules.worker_manager.private import end_of_stream_counter
+from modules.worker_manager.private import serializer
+
+
+def create_serializer(kind: queue_property_data.SerializerKind) -> serializer.Serializer:
+    """
+    Serializer of the kind, the custom serializer encodes strings as UTF-8.
+    """
+    encode = None
+    decode = None
+    if kind == queue_property_data.SerializerKind.CUSTOM:
+        encode = str.encode
+        decode = bytes.decode
+
+    result, item_serializer = serializer.Serializer.create(kind, encode, decode)
+    assert result
+    assert item_serializer is not None
+
+    return item_serializer
+
+
+class TestCreate:
+    """
+    Test create() method.
+    """
+
+    def test_custom_missing_encode(self) -> None:
+        """
+        Custom serializer without encode.
+        """
+        result, item_serializer = serializer.Serializer.create(
+            queue_property_data.SerializerKind.CUSTOM, None, bytes.decode
+        )
+
+        assert not result
+        assert item_serializer is None
+
+
+class TestDumpsLoads:
+    """
+    Test dumps() and loads() methods.
+    """
+
+    @pytest.mark.parametrize(
+        "kind, item",
+        [
+            (queue_property_data.SerializerKind.PICKLE, {"a": [1, 2]}),
+            (queue_property_data.SerializerKind.PICKLE_OUT_OF_BAND, {"a": [1, 2]}),
+            (queue_property_data.SerializerKind.BYTES, b"abc"),
+            (queue_property_data.SerializerKind.CUSTOM, "abc"),
+        ],
+    )
+    def test_round_trip(self, kind: queue_property_data.SerializerKind, item: object) -> None:
+        """
+        Item is unchanged.
+        """
+        item_serializer = create_serializer(kind)
+
+        frames = item_serializer.dumps(item)
+
+        assert len(frames) == 1
+        assert item_serializer.loads(frames) == item
+
+    def test_out_of_band(self) -> None:
+        """
+        Array data is a separate frame and the result shares memory with it.
+        """
+        item_serializer = create_serializer(queue_property_data.SerializerKind.PICKLE_OUT_OF_BAND)
+        array = np.arange(1, 1001, dtype=np.int64)
+
+        frames = item_serializer.dumps({"array": array})
+
+        assert len(frames) == 2
+        assert frames[1].nbytes == array.nbytes
+
+        data = bytearray(frames[1])
+        item = item_serializer.loads([frames[0], data])
+
+        assert np.array_equal(item["array"], array)  # type: ignore
+        data[0:8] = bytes(8)
+        assert item["array"][0] == 0  # type: ignore
+
+    def test_bytes_not_bytes_like(self) -> None:
+        """
+        Bytes serializer only accepts bytes-like items.
+        """
+        item_serializer = create_serializer(queue_property_data.SerializerKind.BYTES)
+
+        with pytest.raises(TypeError):
+            item_serializer.dumps(1)
+
+    @pytest.mark.parametrize("kind", list(queue_property_data.SerializerKind))
+    def test_end_of_stream(self, kind: queue_property_data.SerializerKind) -> None:
+        """
+        Markers have no frames.
+        """
+        item_serializer = create_serializer(kind)
+
+        frames = item_serializer.dumps(end_of_stream_counter.EndOfStream())
+
+        assert len(frames) == 0
+        assert isinstance(item_serializer.loads(frames), end_of_stream_counter.EndOfStream)
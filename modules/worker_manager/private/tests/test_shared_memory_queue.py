@@ -0,0 +1,206 @@
+"""
+Test shared memory queue.
+"""
+
+import multiprocessing as mp
+import queue
+
+import numpy as np
+import pytest
+
+from modules.worker_manager import queue_property_data
+from modules.worker_manager.private import serializer
+from modules.worker_manager.private import shared_memory_queue
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+@pytest.fixture
+def shared_queue() -> shared_memory_queue.SharedMemoryQueue:  # type: ignore
+    """
+    Shared memory queue.
+    """
+    result, shared_queue = shared_memory_queue.SharedMemoryQueue.create(3, 64)
+    assert result
+    assert shared_queue is not None
+
+    yield shared_queue  # type: ignore
+
+    shared_queue.close()
+
+
+def producer(shared_queue: shared_memory_queue.SharedMemoryQueue, count: int) -> None:
+    """
+    Put count integers into the queue.
+    """
+    for i in range(0, count):
+        shared_queue.put(i)
+
+
+class TestCreate:
+    """
+    Test create() method.
+    """
+
+    def test_normal(self) -> None:
+        """
+        Normal.
+        """
+        result, shared_queue = shared_memory_queue.SharedMemoryQueue.create(5, 64)
+
+        assert result
+        assert shared_queue is not None
+
+        shared_queue.close()
+
+    def test_max_size_zero(self) -> None:
+        """
+        Zero max_size.
+        """
+        result, shared_queue = shared_memory_queue.SharedMemoryQueue.create(0, 64)
+
+        assert not result
+        assert shared_queue is None
+
+    def test_slot_size_zero(self) -> None:
+        """
+        Zero slot_size.
+        """
+        result, shared_queue = shared_memory_queue.SharedMemoryQueue.create(5, 0)
+
+        assert not result
+        assert shared_queue is None
+
+
+class TestPutGet:
+    """
+    Test put() and get() methods.
+    """
+
+    def test_fifo(self, shared_queue: shared_memory_queue.SharedMemoryQueue) -> None:
+        """
+        Items come out in insertion order.
+        """
+        shared_queue.put("a")
+        shared_queue.put({"b": 2})
+        shared_queue.put(3)
+
+        assert shared_queue.qsize() == 3
+        assert shared_queue.full()
+        assert shared_queue.get() == "a"
+        assert shared_queue.get() == {"b": 2}
+        assert shared_queue.get() == 3
+        assert shared_queue.empty()
+
+    def test_wrap_around(self, shared_queue: shared_memory_queue.SharedMemoryQueue) -> None:
+        """
+        Ring buffer index wraps around the slots.
+        """
+        for i in range(0, 10):
+            shared_queue.put(i)
+            assert shared_queue.get() == i
+
+    def test_full(self, shared_queue: shared_memory_queue.SharedMemoryQueue) -> None:
+        """
+        Non-blocking and timed put on a full queue.
+        """
+        for i in range(0, 3):
+            shared_queue.put_nowait(i)
+
+        with pytest.raises(queue.Full):
+            shared_queue.put_nowait(3)
+
+        with pytest.raises(queue.Full):
+            shared_queue.put(3, timeout=0.01)
+
+    def test_empty(self, shared_queue: shared_memory_queue.SharedMemoryQueue) -> None:
+        """
+        Non-blocking and timed get on an empty queue.
+        """
+        with pytest.raises(queue.Empty):
+            shared_queue.get_nowait()
+
+        with pytest.raises(queue.Empty):
+            shared_queue.get(timeout=0.01)
+
+    def test_item_too_large(self, shared_queue: shared_memory_queue.SharedMemoryQueue) -> None:
+        """
+        Item does not fit in a slot.
+        """
+        with pytest.raises(ValueError):
+            shared_queue.put(b"x" * 100)
+
+        assert shared_queue.empty()
+
+    def test_cross_process(self, shared_queue: shared_memory_queue.SharedMemoryQueue) -> None:
+        """
+        Items put by a child process arrive in order.
+        """
+        count = 20
+        process = mp.Process(target=producer, args=(shared_queue, count))
+        process.start()
+
+        items = [shared_queue.get(timeout=5) for _ in range(0, count)]
+        process.join()
+
+        assert items == list(range(0, count))
+
+
+class TestSerializer:
+    """
+    Test queues with a serializer.
+    """
+
+    def test_out_of_band(self) -> None:
+        """
+        Arrays put by a child process arrive writable.
+        """
+        result, item_serializer = serializer.Serializer.create(
+            queue_property_data.SerializerKind.PICKLE_OUT_OF_BAND
+        )
+        assert result
+        assert item_serializer is not None
+
+        result, shared_queue = shared_memory_queue.SharedMemoryQueue.create(
+            3, 1024, None, item_serializer
+        )
+        assert result
+        assert shared_queue is not None
+
+        array = np.arange(0, 100, dtype=np.int32)
+        process = mp.Process(target=shared_queue.put, args=(array,))
+        process.start()
+
+        item = shared_queue.get(timeout=5)
+        process.join()
+
+        assert np.array_equal(item, array)  # type: ignore
+        assert item.flags.writeable  # type: ignore
+        # Array data and at least the pickle
+        assert shared_queue.get_byte_counts()[1] > array.nbytes
+
+        shared_queue.close()
+
+
+class TestByteCounts:
+    """
+    Test get_byte_counts() method.
+    """
+
+    def test_normal(self, shared_queue: shared_memory_queue.SharedMemoryQueue) -> None:
+        """
+        Pickled sizes of the items put and got.
+        """
+        assert shared_queue.get_byte_counts() == (0, 0)
+
+        shared_queue.put(b"abc")
+        shared_queue.put_many([1, 2])
+        put_bytes, get_bytes = shared_queue.get_byte_counts()
+        assert put_bytes > 0
+        assert get_bytes == 0
+
+        shared_queue.get_many(3)
+        assert shared_queue.get_byte_counts() == (put_bytes, put_bytes)
@@ -0,0 +1,165 @@
+"""
+Test tracer.
+"""
+
+import json
+import multiprocessing as mp
+import os
+import pickle
+
+import pytest
+
+from modules.worker_manager.private import tracer
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture
+def item_tracer(tmp_path: str) -> tracer.Tracer:  # type: ignore
+    """
+    Tracer that samples every item.
+    """
+    result, item_tracer = tracer.Tracer.create(str(tmp_path), 1.0)
+    assert result
+    assert item_tracer is not None
+
+    yield item_tracer  # type: ignore
+
+
+def record_in_child(item_tracer: tracer.Tracer) -> None:
+    """
+    Record an event and write the buffer, like a worker process.
+    """
+    item_tracer.add_process("queue", 2, 2.0, 2.5)
+    item_tracer.flush()
+
+
+def load_events(directory: str, output_path: str) -> list[dict]:
+    """
+    Return: Events of all trace files in the directory.
+    """
+    assert tracer.merge_traces(directory, output_path)
+
+    with open(output_path, encoding="utf-8") as file:
+        return json.load(file)["traceEvents"]
+
+
+class TestCreate:
+    """
+    Test create() method.
+    """
+
+    def test_sample_rate_out_of_range(self, tmp_path: str) -> None:
+        """
+        Sample rate above 1.0.
+        """
+        result, item_tracer = tracer.Tracer.create(str(tmp_path), 1.5)
+
+        assert not result
+        assert item_tracer is None
+
+
+class TestClearTraces:
+    """
+    Test clear_traces() function.
+    """
+
+    def test_worker(self, item_tracer: tracer.Tracer, tmp_path: str) -> None:
+        """
+        Only the trace files of the worker group are removed.
+        """
+        for name in ["worker", "worker_2"]:
+            tracer.WORKER_NAME.set(name)
+            item_tracer.add_wait("queue", 1, 1.0, 1.5)
+            assert item_tracer.flush()
+
+        tracer.WORKER_NAME.set("main")
+
+        tracer.clear_traces(str(tmp_path), "worker")
+
+        files = os.listdir(tmp_path)
+        assert len(files) == 1
+        assert files[0].startswith("trace_worker_2-")
+
+        tracer.clear_traces(str(tmp_path), None)
+
+        assert len(os.listdir(tmp_path)) == 0
+
+
+class TestSample:
+    """
+    Test sample() method.
+    """
+
+    def test_all(self, item_tracer: tracer.Tracer) -> None:
+        """
+        Every item is traced with its own ID.
+        """
+        trace_ids = {item_tracer.sample() for _ in range(0, 100)}
+
+        assert tracer.UNTRACED not in trace_ids
+        assert len(trace_ids) == 100
+
+    def test_none(self, tmp_path: str) -> None:
+        """
+        No item is traced.
+        """
+        result, item_tracer = tracer.Tracer.create(str(tmp_path), 0.0)
+        assert result
+        assert item_tracer is not None
+
+        assert all(item_tracer.sample() == tracer.UNTRACED for _ in range(0, 100))
+
+
+class TestExport:
+    """
+    Test flush() and merge_traces().
+    """
+
+    def test_merge(self, item_tracer: tracer.Tracer, tmp_path: str) -> None:
+        """
+        Events of several buffers are merged into one timeline.
+        """
+        # Copy with its own buffer, like in a worker process
+        worker_tracer = pickle.loads(pickle.dumps(item_tracer))
+
+        item_tracer.add_wait("queue", 1, 1.0, 1.5)
+        worker_tracer.add_process("queue", 1, 1.5, 2.0)
+        worker_tracer.add_process("queue", 2, 2.0, 2.5)
+
+        assert item_tracer.flush()
+        assert worker_tracer.flush()
+        # Nothing left to write
+        assert item_tracer.flush()
+        assert len(os.listdir(tmp_path)) == 2
+
+        events = load_events(str(tmp_path), os.path.join(tmp_path, "merged.json"))
+
+        assert sorted(event["ph"] for event in events) == ["X", "X", "b", "e"]
+        wait_begin = next(event for event in events if event["ph"] == "b")
+        assert wait_begin["name"] == "queue"
+        assert wait_begin["ts"] == 1.0e6
+        process = next(event for event in events if event.get("args", {}).get("trace_id") == "0x2")
+        assert process["name"] == "main"
+        assert process["dur"] == pytest.approx(0.5e6)
+
+    def test_fork(self, item_tracer: tracer.Tracer, tmp_path: str) -> None:
+        """
+        A forked process does not write the events of its parent again.
+        """
+        item_tracer.add_wait("queue", 1, 1.0, 1.5)
+
+        process = mp.get_context("fork").Process(target=record_in_child, args=(item_tracer,))
+        process.start()
+        process.join()
+        assert process.exitcode == 0
+
+        assert item_tracer.flush()
+
+        events = load_events(str(tmp_path), os.path.join(tmp_path, "merged.json"))
+
+        assert sorted(event["ph"] for event in events) == ["X", "b", "e"]
+        assert len({event["pid"] for event in events}) == 2
@@ -0,0 +1,62 @@
+"""
+Test worker sync manager queues.
+"""
+
+import queue
+
+import pytest
+
+from modules.worker_manager.private import worker_sync_manager
+
+
+class TestPriorityBatchQueue:
+    """
+    Test PriorityBatchQueue.
+    """
+
+    def test_order(self) -> None:
+        """
+        Higher levels first, FIFO within a level.
+        """
+        priority_queue = worker_sync_manager.PriorityBatchQueue(10, 3)
+
+        priority_queue.put((0, "a"))
+        priority_queue.put((2, "b"))
+        priority_queue.put((1, "c"))
+        priority_queue.put((2, "d"))
+        priority_queue.put((0, "e"))
+
+        assert priority_queue.qsize() == 5
+        assert priority_queue.get_many(5, False) == ["b", "d", "c", "a", "e"]
+
+    def test_full(self) -> None:
+        """
+        Max size is across all levels.
+        """
+        priority_queue = worker_sync_manager.PriorityBatchQueue(2, 2)
+
+        assert priority_queue.put_many([(0, "a"), (1, "b"), (1, "c")], False) == 2
+        with pytest.raises(queue.Full):
+            priority_queue.put((1, "c"), False)
+
+    def test_starvation_limit(self) -> None:
+        """
+        A passed over level is served once the limit is reached.
+        """
+        priority_queue = worker_sync_manager.PriorityBatchQueue(20, 2, 2)
+
+        priority_queue.put_many([(0, "low 0"), (0, "low 1")])
+        priority_queue.put_many([(1, i) for i in range(0, 6)])
+
+        assert priority_queue.get_many(8, False) == [0, 1, "low 0", 2, 3, "low 1", 4, 5]
+
+    def test_no_starvation_limit(self) -> None:
+        """
+        Lower levels wait for higher levels to empty.
+        """
+        priority_queue = worker_sync_manager.PriorityBatchQueue(20, 2)
+
+        priority_queue.put((0, "low"))
+        priority_queue.put_many([(1, i) for i in range(0, 6)])
+
+        assert priority_queue.get_many(7, False) == [0, 1, 2, 3, 4, 5, "low"]
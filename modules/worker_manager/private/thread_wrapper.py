@@ -0,0 +1,203 @@
+"""
+Thread.
+"""
+
+import threading
+import time
+
+from . import process_property_data
+from . import process_wrapper
+from .. import worker_controller
+
+
+class ThreadWrapper:
+    """
+    Wrapper for an underlying thread in the process of the worker manager, with the same interface
+    as ProcessWrapper.
+
+    Threads cannot be terminated, so terminate() and kill() only request an exit. The exit code is
+    0 if the target function returned, the code of SystemExit, or 1 if it raised another exception.
+    """
+
+    # Exit code of a thread whose target function raised
+    __EXCEPTION_EXIT_CODE = 1
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        process_property: process_property_data.ProcessPropertyData,
+        controller: worker_controller.WorkerController,
+        cpu_set: list[int] | None = None,
+        worker_index: int | None = None,
+    ) -> tuple[True, "ThreadWrapper"] | tuple[False, None]:
+        """
+        process_property: Process data of the thread to be created.
+        controller: Worker controller.
+        cpu_set: CPUs the thread is pinned to when it starts. None does not set the affinity.
+        worker_index: Index of the worker in its group, for the partitions of the input queues.
+            None gets from all partitions.
+
+        Return: Success, object.
+        """
+        return True, ThreadWrapper(
+            cls.__create_key, process_property, controller, cpu_set, worker_index
+        )
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        process_property: process_property_data.ProcessPropertyData,
+        controller: worker_controller.WorkerController,
+        cpu_set: list[int] | None,
+        worker_index: int | None,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is ThreadWrapper.__create_key, "Use create() method"
+
+        self.__process_property = process_property
+        self.__controller = controller
+        self.__cpu_set = cpu_set
+        self.__worker_index = worker_index
+
+        self.__worker: threading.Thread | None = None
+        self.__exitcode: int | None = None
+
+    def __run(self) -> None:
+        """
+        Entry point of the thread.
+        """
+        exitcode = ThreadWrapper.__EXCEPTION_EXIT_CODE
+        try:
+            process_wrapper.run_worker(
+                self.__process_property.get_target_function(),
+                self.__process_property.get_arguments(),
+                self.__controller,
+                self.__cpu_set,
+                self.__process_property.get_input_queues(),
+                self.__process_property.get_output_queues(),
+                self.__process_property.get_concurrency(),
+                worker_index=self.__worker_index,
+                profile_directory=self.__process_property.get_profile_directory(),
+            )
+            exitcode = 0
+        except SystemExit as e:
+            if e.code is None:
+                exitcode = 0
+            elif isinstance(e.code, int):
+                exitcode = e.code
+        finally:
+            self.__exitcode = exitcode
+
+    def get_controller(self) -> worker_controller.WorkerController:
+        """
+        Return: Worker controller.
+        """
+        return self.__controller
+
+    def get_cpu_set(self) -> list[int] | None:
+        """
+        Return: CPUs the thread is pinned to. None if the affinity is not set.
+        """
+        return self.__cpu_set
+
+    def get_start_method(self) -> str:
+        """
+        Return: "thread".
+        """
+        return "thread"
+
+    def start(self) -> bool:
+        """
+        Start the thread. A thread that has exited is replaced by a new one.
+
+        Return: Success.
+        """
+        if self.is_alive():
+            print("ERROR: Worker thread is already running")
+            return False
+
+        self.__controller.reset()
+        self.__exitcode = None
+
+        # Daemon so that a hung worker does not keep the program alive
+        self.__worker = threading.Thread(target=self.__run, daemon=True)
+        try:
+            self.__worker.start()
+        except RuntimeError as e:
+            print(f"ERROR: Failed to start worker thread: {e}")
+            self.__worker = None
+            return False
+
+        return True
+
+    def wait_ready(self, deadline: float | None) -> bool:
+        """
+        Wait for the worker to call the target function.
+
+        deadline: Time from time.monotonic() to stop waiting at. None waits while the thread is
+            alive.
+
+        Return: Whether the worker is ready.
+        """
+        if self.__worker is None:
+            return False
+
+        while True:
+            timeout = process_wrapper.READY_POLL_PERIOD
+            if deadline is not None:
+                timeout = min(timeout, max(deadline - time.monotonic(), 0.0))
+
+            if self.__controller.is_ready(timeout):
+                return True
+
+            if not self.__worker.is_alive():
+                print(f"ERROR: Worker exited before it was ready: {self.__exitcode}")
+                return False
+
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+    def is_alive(self) -> bool:
+        """
+        Return: Whether the thread is running.
+        """
+        return self.__worker is not None and self.__worker.is_alive()
+
+    def get_exitcode(self) -> int | None:
+        """
+        Return: Exit code of the thread, None if it has not exited or has not been started.
+        """
+        return self.__exitcode
+
+    def join(self, timeout: float | None) -> bool:
+        """
+        Wait for the thread to exit.
+
+        timeout: Seconds to wait. None waits forever.
+
+        Return: Whether the thread has exited.
+        """
+        if self.__worker is None:
+            return True
+
+        self.__worker.join(timeout)
+
+        return not self.__worker.is_alive()
+
+    def terminate(self) -> None:
+        """
+        Threads cannot be terminated, request an exit instead.
+        """
+        if self.is_alive():
+            print("WARNING: Worker thread cannot be terminated, requesting exit")
+            self.__controller.request_exit()
+
+    def kill(self) -> None:
+        """
+        Threads cannot be killed, request an exit instead.
+        """
+        self.terminate()
@@ -0,0 +1,291 @@
+"""
+Sampled tracing of items through the queues, in Chrome trace format.
+"""
+
+import contextvars
+import glob
+import json
+import os
+import random
+import threading
+import uuid
+import weakref
+
+
+# Name of the worker running in this thread or asyncio task, for the spans of its items
+WORKER_NAME: contextvars.ContextVar[str] = contextvars.ContextVar("worker_name", default="main")
+
+# Trace ID of items that are not traced
+UNTRACED = 0
+
+# Files written by each process, merged by merge_traces(). Named after the worker, which cannot
+# contain the separator.
+TRACE_FILE_PATTERN = "trace_*.json"
+TRACE_FILE_SEPARATOR = "-"
+
+
+def set_worker_name(name: str) -> None:
+    """
+    Called in the worker before the target function runs.
+
+    name: Name of the worker group.
+    """
+    WORKER_NAME.set(name)
+
+
+def clear_traces(directory: str, worker_name: str | None) -> None:
+    """
+    Remove the trace files of an earlier run.
+
+    directory: Directory of the trace files.
+    worker_name: Name of the worker group whose files are removed. None removes the files of all
+        processes.
+    """
+    pattern = TRACE_FILE_PATTERN
+    if worker_name is not None:
+        pattern = f"trace_{worker_name}{TRACE_FILE_SEPARATOR}*.json"
+
+    for path in glob.glob(os.path.join(directory, pattern)):
+        try:
+            os.remove(path)
+        except OSError as e:
+            print(f"WARNING: Failed to remove trace file {path}: {e}")
+
+
+def merge_traces(directory: str, output_path: str) -> bool:
+    """
+    Merge the trace files written by all processes into one timeline that can be opened in
+    chrome://tracing or Perfetto.
+
+    directory: Directory of the trace files.
+    output_path: Path of the merged file.
+
+    Return: Success.
+    """
+    events = []
+    for path in sorted(glob.glob(os.path.join(directory, TRACE_FILE_PATTERN))):
+        try:
+            with open(path, encoding="utf-8") as file:
+                events += json.load(file)["traceEvents"]
+        except (OSError, ValueError, KeyError) as e:
+            print(f"WARNING: Skipping trace file {path}: {e}")
+
+    try:
+        with open(output_path, "w", encoding="utf-8") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+    except OSError as e:
+        print(f"ERROR: Failed to write trace: {e}")
+        return False
+
+    return True
+
+
+class TracedItem:
+    """
+    Item in a queue with the trace it belongs to.
+    """
+
+    def __init__(self, trace_id: int, put_time: float, item: object) -> None:
+        """
+        trace_id: ID of the trace, from the item it was derived from or from Tracer.sample().
+        put_time: Time from time.monotonic() when it was put.
+        item: Encoded item.
+        """
+        self.trace_id = trace_id
+        self.put_time = put_time
+        self.item = item
+
+
+class Tracer:
+    """
+    Buffer of the trace events of this process, written to a file of its own by flush().
+
+    Items are sampled when a producer that has not got an item puts them, and the trace is carried
+    to the items put after getting a traced item. Each hop records the time the item waited in the
+    queue, and the time the worker spent on it until its next get. Times are from time.monotonic(),
+    which all processes share.
+    """
+
+    # Tracers of this process. A forked process copies them without pickling, so their buffers are
+    # emptied in the child by clear_after_fork().
+    __tracers: "weakref.WeakSet[Tracer]" = weakref.WeakSet()
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls, directory: str, sample_rate: float
+    ) -> tuple[True, "Tracer"] | tuple[False, None]:
+        """
+        directory: Directory for the trace files of all processes. Created if it does not exist.
+        sample_rate: Fraction of the items put by sources that are traced, from 0.0 to 1.0.
+
+        Return: Success, object.
+        """
+        if not 0.0 <= sample_rate <= 1.0:
+            print("ERROR: Trace sample rate must be from 0.0 to 1.0")
+            return False, None
+
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except OSError as e:
+            print(f"ERROR: Failed to create trace directory: {e}")
+            return False, None
+
+        return True, Tracer(cls.__create_key, directory, sample_rate)
+
+    def __init__(
+        self, class_private_create_key: object, directory: str, sample_rate: float
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is Tracer.__create_key, "Use create() method"
+
+        self.__directory = directory
+        self.__sample_rate = sample_rate
+
+        self.__events: list[dict] = []
+        # Threads and asyncio tasks of workers share the buffer
+        self.__lock = threading.Lock()
+
+        Tracer.__tracers.add(self)
+
+    @staticmethod
+    def clear_after_fork() -> None:
+        """
+        Called in a forked process, so that it does not write the events of its parent again.
+        """
+        for item_tracer in Tracer.__tracers:
+            item_tracer.clear()
+
+    def clear(self) -> None:
+        """
+        Empty the buffer without writing it. The lock is replaced, since in a forked process it may
+        have been held by another thread of the parent.
+        """
+        self.__events = []
+        self.__lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        """
+        Each process starts with an empty buffer, and the lock is not picklable.
+        """
+        return {"directory": self.__directory, "sample_rate": self.__sample_rate}
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Create the buffer in this process.
+        """
+        self.__directory = state["directory"]
+        self.__sample_rate = state["sample_rate"]
+
+        self.__events = []
+        self.__lock = threading.Lock()
+
+        Tracer.__tracers.add(self)
+
+    def get_directory(self) -> str:
+        """
+        Return: Directory of the trace files.
+        """
+        return self.__directory
+
+    def sample(self) -> int:
+        """
+        Decide whether to trace a new item.
+
+        Return: ID of a new trace, UNTRACED if the item is not sampled.
+        """
+        if random.random() >= self.__sample_rate:
+            return UNTRACED
+
+        # Random after fork too, the random module reseeds in the child
+        return random.getrandbits(63) or 1
+
+    def add_wait(self, queue_name: str, trace_id: int, put_time: float, get_time: float) -> None:
+        """
+        Record the time an item waited in a queue, as an async span of the trace.
+        """
+        pid = os.getpid()
+        trace = f"0x{trace_id:x}"
+        self.__add(
+            {
+                "name": queue_name,
+                "cat": "queue",
+                "ph": "b",
+                "id": trace,
+                "ts": put_time * 1e6,
+                "pid": pid,
+                "tid": 0,
+                "args": {"trace_id": trace},
+            }
+        )
+        self.__add(
+            {
+                "name": queue_name,
+                "cat": "queue",
+                "ph": "e",
+                "id": trace,
+                "ts": get_time * 1e6,
+                "pid": pid,
+                "tid": 0,
+            }
+        )
+
+    def add_process(
+        self, queue_name: str, trace_id: int, start_time: float, end_time: float
+    ) -> None:
+        """
+        Record the time the worker of this thread spent on an item got from a queue.
+        """
+        self.__add(
+            {
+                "name": WORKER_NAME.get(),
+                "cat": "process",
+                "ph": "X",
+                "ts": start_time * 1e6,
+                "dur": (end_time - start_time) * 1e6,
+                "pid": os.getpid(),
+                "tid": threading.get_native_id(),
+                "args": {"trace_id": f"0x{trace_id:x}", "queue": queue_name},
+            }
+        )
+
+    def __add(self, event: dict) -> None:
+        """
+        Append an event to the buffer.
+        """
+        with self.__lock:
+            self.__events.append(event)
+
+    def flush(self) -> bool:
+        """
+        Write the buffered events to a new file in the trace directory and empty the buffer.
+
+        Return: Success.
+        """
+        with self.__lock:
+            events = self.__events
+            self.__events = []
+
+        if len(events) == 0:
+            return True
+
+        file_name = TRACE_FILE_SEPARATOR.join(
+            [WORKER_NAME.get(), str(os.getpid()), uuid.uuid4().hex]
+        )
+        path = os.path.join(self.__directory, f"trace_{file_name}.json")
+        try:
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump({"traceEvents": events}, file)
+        except OSError as e:
+            print(f"ERROR: Failed to write trace file: {e}")
+            return False
+
+        return True
+
+
+# Not available on platforms that do not fork
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=Tracer.clear_after_fork)
@@ -2,16 +2,51 @@
 Worker group.
 """
 
-import multiprocessing.managers
+import concurrent.futures
+import multiprocessing.context
+import time
 
+from . import autoscaler
 from . import process_property_data
 from . import process_wrapper
+from . import thread_wrapper
+from .. import queue_wrapper
+from .. import scaling_event_data
+from .. import scaling_policy_data
 from .. import worker_controller
+from .. import worker_property_data
 
 
+# Upper bound of threads used to start processes concurrently
+MAX_START_THREADS = 32
+# Seconds between checks while waiting for workers to acknowledge a command
+ACKNOWLEDGE_POLL_PERIOD = 0.001
+# Seconds to wait for terminated workers to exit before they are killed
+TERMINATE_TIMEOUT = 1.0
+# Seconds before the first restart of a failed worker, doubled on each consecutive failure
+RESTART_BACKOFF_BASE = 0.1
+# Upper bound of the restart delay. A worker healthy for this long after a restart is no longer
+# considered to be failing.
+RESTART_BACKOFF_MAX = 10.0
+# Seconds to wait for the workers to pause while the partitions of their input queues are
+# reassigned
+REBALANCE_TIMEOUT = 1.0
+
+# Workers run in processes or in threads of this process
+Worker = process_wrapper.ProcessWrapper | thread_wrapper.ThreadWrapper
+
+
+# Workers, scaling, and supervision state, each with its own operations
+# pylint: disable-next=too-many-instance-attributes,too-many-public-methods
 class WorkerGroup:
     """
-    Processes with the same target function.
+    Workers with the same target function, which are processes or threads.
+
+    Each thread and coroutine call of a worker is a consumer of partitioned input queues, and
+    consumer i of n gets from the partitions p with p % n == i. When
+    workers are added or retired while the group is running, the workers are paused while the
+    partitions are reassigned. This keeps the order of each key as long as the target function only
+    checks the worker controller between items, so that no paused worker is holding an item.
     """
 
     __create_key = object()
@@ -21,14 +56,16 @@ class WorkerGroup:
         cls,
         count: int,
         process_property: process_property_data.ProcessPropertyData,
-        mp_manager: multiprocessing.managers.SyncManager,
         controller_max_size: int,
+        mp_context: multiprocessing.context.BaseContext,
+        scaling_policy: scaling_policy_data.ScalingPolicyData | None,
     ) -> tuple[True, "WorkerGroup"] | tuple[False, None]:
         """
         count: Number of workers.
         process_property: Property data of the worker.
-        mp_manager: For the worker controller.
         controller_max_size: For the worker controller.
+        mp_context: Multiprocessing context to create the workers with.
+        scaling_policy: Scaling policy of the group. None is a fixed number of workers.
 
         Return: Success, object.
         """
@@ -37,56 +74,578 @@ class WorkerGroup:
             return False, None
 
         # It is okay to drop these process handles since the workers have not been started.
-        workers: list[process_wrapper.ProcessWrapper] = []
-        for _ in range(0, count):
-            result, controller = worker_controller.WorkerController.create(
-                mp_manager, controller_max_size
+        workers: list[Worker] = []
+        for index in range(0, count):
+            result, worker = cls.__create_worker(
+                process_property, index, controller_max_size, mp_context
             )
             if not result:
-                print(
-                    f"ERROR: Failed to create worker controller for: {process_property.get_target_function()}"
-                )
                 return False, None
 
             # Get Pylance to stop complaining
-            assert controller is not None
+            assert worker is not None
 
-            result, worker = process_wrapper.ProcessWrapper.create(process_property, controller)
+            workers.append(worker)
+
+        group_autoscaler = None
+        if scaling_policy is not None:
+            result, group_autoscaler = autoscaler.Autoscaler.create(scaling_policy)
             if not result:
                 print(
-                    f"ERROR: Failed to create process for: {process_property.get_target_function()}"
+                    f"ERROR: Failed to create autoscaler for: {process_property.get_target_function()}"
                 )
                 return False, None
 
-            # Get Pylance to stop complaining
-            assert worker is not None
+        return True, WorkerGroup(
+            cls.__create_key,
+            workers,
+            process_property,
+            controller_max_size,
+            mp_context,
+            group_autoscaler,
+        )
 
-            workers.append(worker)
+    @staticmethod
+    def __create_worker(
+        process_property: process_property_data.ProcessPropertyData,
+        index: int,
+        controller_max_size: int,
+        mp_context: multiprocessing.context.BaseContext,
+    ) -> tuple[True, Worker] | tuple[False, None]:
+        """
+        Create a worker and its controller.
 
-        return True, WorkerGroup(
-            cls.__create_key, workers, count, process_property, mp_manager, controller_max_size
+        index: Index of the worker in the group, for its CPU set and partitions.
+
+        Return: Success, worker.
+        """
+        result, controller = worker_controller.WorkerController.create(
+            controller_max_size, mp_context
         )
+        if not result:
+            print(
+                f"ERROR: Failed to create worker controller for: {process_property.get_target_function()}"
+            )
+            return False, None
+
+        # Get Pylance to stop complaining
+        assert controller is not None
+
+        cpu_set = process_property.get_worker_cpu_set(index)
+        if process_property.get_execution_mode() == worker_property_data.ExecutionMode.THREAD:
+            result, worker = thread_wrapper.ThreadWrapper.create(
+                process_property, controller, cpu_set, index
+            )
+        else:
+            result, worker = process_wrapper.ProcessWrapper.create(
+                process_property, controller, mp_context, cpu_set, index
+            )
+
+        if not result:
+            print(f"ERROR: Failed to create worker for: {process_property.get_target_function()}")
+            return False, None
+
+        # Get Pylance to stop complaining
+        assert worker is not None
+
+        return True, worker
 
     def __init__(
         self,
         class_private_create_key: object,
-        workers: list[process_wrapper.ProcessWrapper],
-        count: int,
+        workers: list[Worker],
         process_property: process_property_data.ProcessPropertyData,
-        mp_manager: multiprocessing.managers.SyncManager,
         controller_max_size: int,
+        mp_context: multiprocessing.context.BaseContext,
+        group_autoscaler: autoscaler.Autoscaler | None,
     ) -> None:
         """
         Private constructor, use create() method.
         """
         assert class_private_create_key is WorkerGroup.__create_key, "Use create() method"
 
-        # TODO: Start using these
-        # pylint: disable=unused-private-member
         self.__workers = workers
 
-        self.__count = count
         self.__process_property = process_property
-        self.__mp_manager = mp_manager
         self.__controller_max_size = controller_max_size
-        # pylint: enable=unused-private-member
+        self.__mp_context = mp_context
+        self.__autoscaler = group_autoscaler
+
+        self.__is_running = False
+
+        self.__restart_count = 0
+        # Consecutive failures, scheduled restart time, and last restart time of failing workers
+        self.__failure_counts: dict[Worker, int] = {}
+        self.__restart_times: dict[Worker, float] = {}
+        self.__last_restart_times: dict[Worker, float] = {}
+
+        self.__set_partition_consumer_count()
+
+    def get_name(self) -> str:
+        """
+        Return: Name of the group, which is the name of the target function.
+        """
+        return self.__process_property.get_target_function().__name__
+
+    def get_profile_directory(self) -> str | None:
+        """
+        Return: Directory of the profiles of the workers. None if the group is not profiled.
+        """
+        return self.__process_property.get_profile_directory()
+
+    def get_workers(self) -> list[Worker]:
+        """
+        Return: Workers of the group.
+        """
+        return self.__workers
+
+    def start(self, ready_timeout: float | None) -> bool:
+        """
+        Start all workers of the group and wait for them to be ready.
+
+        ready_timeout: Seconds to wait for all workers to be ready. None waits while they are
+            alive.
+
+        Return: Success.
+        """
+        self.__is_running = True
+
+        return WorkerGroup.start_workers(self.__workers, ready_timeout)
+
+    def stop(self, timeout: float) -> bool:
+        """
+        Stop all workers of the group.
+
+        timeout: Seconds to wait for the workers to exit on request before they are terminated.
+
+        Return: Whether all workers exited on request before the timeout.
+        """
+        self.__is_running = False
+
+        return WorkerGroup.stop_workers(self.__workers, timeout)
+
+    def pause(self, timeout: float) -> bool:
+        """
+        Pause all workers of the group at their next check.
+
+        timeout: Seconds to wait for the workers to acknowledge.
+
+        Return: Whether all running workers paused before the timeout.
+        """
+        for worker in self.__workers:
+            worker.get_controller().request_pause()
+
+        return WorkerGroup.wait_for_state(
+            self.__workers, worker_controller.WorkerState.PAUSED, timeout
+        )
+
+    def resume(self, timeout: float) -> bool:
+        """
+        Resume all paused workers of the group.
+
+        timeout: Seconds to wait for the workers to acknowledge.
+
+        Return: Whether all running workers resumed before the timeout.
+        """
+        for worker in self.__workers:
+            worker.get_controller().request_resume()
+
+        return WorkerGroup.wait_for_state(
+            self.__workers, worker_controller.WorkerState.RUNNING, timeout
+        )
+
+    def join(self, timeout: float | None) -> bool:
+        """
+        Wait for all workers of the group to exit.
+
+        timeout: Seconds to wait. None waits forever.
+
+        Return: Whether all workers have exited.
+        """
+        return WorkerGroup.join_workers(self.__workers, timeout)
+
+    def set_running(self, is_running: bool) -> None:
+        """
+        Set whether the group is running, for workers started or stopped outside of start() and
+        stop().
+        """
+        self.__is_running = is_running
+
+    def get_output_queues(self) -> list[queue_wrapper.QueueWrapper]:
+        """
+        Return: Output queues of the workers.
+        """
+        return self.__process_property.get_output_queues()
+
+    def get_depth(self) -> int:
+        """
+        Return: Total number of items in the input queues.
+        """
+        return sum(queue.get_depth() for queue in self.__process_property.get_input_queues())
+
+    def add_worker(self) -> bool:
+        """
+        Add a worker, which is started if the group is running.
+
+        Return: Success.
+        """
+        result, worker = WorkerGroup.__create_worker(
+            self.__process_property,
+            len(self.__workers),
+            self.__controller_max_size,
+            self.__mp_context,
+        )
+        if not result:
+            return False
+
+        # Get Pylance to stop complaining
+        assert worker is not None
+
+        if not self.__is_running:
+            self.__workers.append(worker)
+            self.__set_partition_consumer_count()
+            return True
+
+        is_resumed = False
+        if self.__is_partitioned():
+            result, is_resumed = self.__pause_for_rebalance()
+            if not result:
+                return False
+
+        # The new worker does not own partitions until the consumer count is set
+        result = worker.start()
+        if result:
+            self.__workers.append(worker)
+            self.__set_partition_consumer_count()
+        else:
+            print(f"ERROR: Failed to start added worker for: {self.get_name()}")
+
+        if is_resumed:
+            self.resume(REBALANCE_TIMEOUT)
+
+        return result
+
+    def retire_worker(self, timeout: float) -> bool:
+        """
+        Stop and remove the most recently added worker. The last worker is never retired.
+
+        timeout: Seconds to wait for the worker to exit on request before it is terminated.
+
+        Return: Success.
+        """
+        if len(self.__workers) <= 1:
+            print(f"ERROR: Cannot retire the last worker of: {self.get_name()}")
+            return False
+
+        is_resumed = False
+        if self.__is_running and self.__is_partitioned():
+            result, is_resumed = self.__pause_for_rebalance()
+            if not result:
+                return False
+
+        worker = self.__workers.pop()
+        WorkerGroup.stop_workers([worker], timeout)
+        self.__set_partition_consumer_count()
+
+        if is_resumed:
+            self.resume(REBALANCE_TIMEOUT)
+
+        self.__failure_counts.pop(worker, None)
+        self.__restart_times.pop(worker, None)
+        self.__last_restart_times.pop(worker, None)
+
+        return True
+
+    def autoscale(
+        self, now: float, retire_timeout: float
+    ) -> tuple[True, scaling_event_data.ScalingEventData] | tuple[False, None]:
+        """
+        Sample the depth of the input queues and scale the group according to its policy.
+        Only running groups with a scaling policy are scaled.
+
+        now: Time of the sample from time.monotonic().
+        retire_timeout: Seconds to wait for a retired worker to exit on request before it is terminated.
+
+        Return: Success, scaling event. False if the group did not scale.
+        """
+        if self.__autoscaler is None or not self.__is_running:
+            return False, None
+
+        depth = self.get_depth()
+        old_count = len(self.__workers)
+
+        change = self.__autoscaler.update(depth, old_count, now)
+        if change > 0:
+            result = self.add_worker()
+        elif change < 0:
+            result = self.retire_worker(retire_timeout)
+        else:
+            return False, None
+
+        if not result:
+            return False, None
+
+        return scaling_event_data.ScalingEventData.create(
+            self.get_name(), now, old_count, len(self.__workers), depth
+        )
+
+    def supervise(self, now: float, heartbeat_timeout: float | None) -> int:
+        """
+        Restart workers that crashed or stopped responding, with exponential backoff.
+        Only running groups are supervised. Workers that exited with code 0 are not restarted.
+
+        now: Time from time.monotonic().
+        heartbeat_timeout: Seconds without a check of the controller after which a running worker
+            is terminated and restarted. Paused workers are exempt. None only restarts workers that
+            exited.
+
+        Return: Number of workers restarted.
+        """
+        if not self.__is_running:
+            return 0
+
+        restart_count = 0
+        for worker in self.__workers:
+            if worker.is_alive():
+                if not self.__is_hung(worker, now, heartbeat_timeout):
+                    self.__restart_times.pop(worker, None)
+                    self.__reset_failures(worker, now)
+                    continue
+
+                print(f"WARNING: Worker of {self.get_name()} stopped responding, terminating")
+                worker.terminate()
+                if not worker.join(TERMINATE_TIMEOUT):
+                    worker.kill()
+
+                # Threads cannot be killed
+                if not worker.join(TERMINATE_TIMEOUT):
+                    print(f"ERROR: Worker of {self.get_name()} did not exit, not restarting")
+                    continue
+
+            elif worker.get_exitcode() in (None, 0):
+                continue
+
+            if worker not in self.__restart_times:
+                failure_count = self.__failure_counts.get(worker, 0) + 1
+                self.__failure_counts[worker] = failure_count
+
+                delay = min(RESTART_BACKOFF_BASE * 2 ** (failure_count - 1), RESTART_BACKOFF_MAX)
+                self.__restart_times[worker] = now + delay
+                print(
+                    f"WARNING: Worker of {self.get_name()} failed with exit code "
+                    f"{worker.get_exitcode()}, restarting in {delay} s"
+                )
+
+            if now < self.__restart_times[worker]:
+                continue
+
+            # A failed start is scheduled again with a longer delay
+            del self.__restart_times[worker]
+            if not worker.start():
+                print(f"ERROR: Failed to restart worker of: {self.get_name()}")
+                continue
+
+            self.__last_restart_times[worker] = now
+            self.__restart_count += 1
+            restart_count += 1
+
+        return restart_count
+
+    def get_restart_count(self) -> int:
+        """
+        Return: Number of times workers of the group were restarted by supervise().
+        """
+        return self.__restart_count
+
+    def __is_partitioned(self) -> bool:
+        """
+        Return: Whether any input queue of the group is partitioned.
+        """
+        return any(
+            queue.queue_property.partition_count > 1
+            for queue in self.__process_property.get_input_queues()
+        )
+
+    def __set_partition_consumer_count(self) -> None:
+        """
+        Divide the partitions of the input queues among the threads and coroutine calls of the
+        workers.
+        """
+        consumer_count = (
+            len(self.__workers)
+            * self.__process_property.get_thread_count()
+            * self.__process_property.get_concurrency()
+        )
+        for queue in self.__process_property.get_input_queues():
+            queue.set_partition_consumer_count(consumer_count)
+
+    def __pause_for_rebalance(self) -> tuple[True, bool] | tuple[False, None]:
+        """
+        Pause the workers before the partitions are reassigned. Resumes them on failure.
+
+        Return: Success, whether the workers must be resumed afterwards. A group that was already
+            paused stays paused.
+        """
+        if all(
+            worker.get_controller().get_state() == worker_controller.WorkerState.PAUSED
+            for worker in self.__workers
+            if worker.is_alive()
+        ):
+            return True, False
+
+        if self.pause(REBALANCE_TIMEOUT):
+            return True, True
+
+        print(f"ERROR: Workers of {self.get_name()} did not pause to reassign partitions")
+        self.resume(REBALANCE_TIMEOUT)
+        return False, None
+
+    def __reset_failures(self, worker: Worker, now: float) -> None:
+        """
+        Forget the failures of a worker that has been healthy since its last restart for long
+        enough.
+        """
+        last_restart_time = self.__last_restart_times.get(worker)
+        if last_restart_time is None or now - last_restart_time < RESTART_BACKOFF_MAX:
+            return
+
+        del self.__last_restart_times[worker]
+        self.__failure_counts.pop(worker, None)
+
+    @staticmethod
+    def __is_hung(worker: Worker, now: float, heartbeat_timeout: float | None) -> bool:
+        """
+        Return: Whether the running worker has not checked its controller within the timeout.
+        """
+        if heartbeat_timeout is None:
+            return False
+
+        controller = worker.get_controller()
+        if controller.get_state() == worker_controller.WorkerState.PAUSED:
+            return False
+
+        return now - controller.get_heartbeat() > heartbeat_timeout
+
+    @staticmethod
+    def start_workers(workers: list[Worker], ready_timeout: float | None) -> bool:
+        """
+        Start the workers concurrently and wait for them to be ready.
+
+        Forking is already cheap and is unsafe from multiple threads, so workers are only started
+        from a thread pool with the spawn and forkserver start methods.
+
+        workers: Workers to start.
+        ready_timeout: Seconds to wait for all workers to be ready. None waits while they are
+            alive.
+
+        Return: Success.
+        """
+        if len(workers) == 0:
+            return True
+
+        deadline = None if ready_timeout is None else time.monotonic() + ready_timeout
+
+        if all(worker.get_start_method() == "fork" for worker in workers):
+            results = [worker.start() for worker in workers]
+        else:
+            thread_count = min(len(workers), MAX_START_THREADS)
+            with concurrent.futures.ThreadPoolExecutor(thread_count) as executor:
+                results = list(executor.map(lambda worker: worker.start(), workers))
+
+        if not all(results):
+            print("ERROR: Failed to start all workers")
+            return False
+
+        for worker in workers:
+            if not worker.wait_ready(deadline):
+                print("ERROR: Workers not ready")
+                return False
+
+        return True
+
+    @staticmethod
+    def stop_workers(workers: list[Worker], timeout: float) -> bool:
+        """
+        Request the workers to exit. Workers that have not exited before the timeout are
+        terminated, and then killed.
+
+        workers: Workers to stop.
+        timeout: Seconds to wait for the workers to exit on request.
+
+        Return: Whether all workers exited on request before the timeout.
+        """
+        for worker in workers:
+            worker.get_controller().request_exit()
+
+        is_all_exited = WorkerGroup.join_workers(workers, timeout)
+        if is_all_exited:
+            return True
+
+        for worker in workers:
+            if worker.is_alive():
+                print("WARNING: Terminating worker that did not exit on request")
+                worker.terminate()
+
+        is_all_exited = WorkerGroup.join_workers(workers, TERMINATE_TIMEOUT)
+        if is_all_exited:
+            return False
+
+        for worker in workers:
+            if worker.is_alive():
+                print("WARNING: Killing worker that did not exit")
+                worker.kill()
+
+        # Threads cannot be killed
+        if not WorkerGroup.join_workers(workers, TERMINATE_TIMEOUT):
+            print("ERROR: Workers did not exit")
+
+        return False
+
+    @staticmethod
+    def wait_for_state(
+        workers: list[Worker],
+        state: worker_controller.WorkerState,
+        timeout: float,
+    ) -> bool:
+        """
+        Wait for all running workers to acknowledge the state.
+
+        workers: Workers to wait for.
+        state: State to wait for.
+        timeout: Seconds to wait.
+
+        Return: Whether all running workers acknowledged the state before the timeout.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            if all(
+                worker.get_controller().get_state() == state
+                for worker in workers
+                if worker.is_alive()
+            ):
+                return True
+
+            if time.monotonic() >= deadline:
+                return False
+
+            time.sleep(ACKNOWLEDGE_POLL_PERIOD)
+
+    @staticmethod
+    def join_workers(workers: list[Worker], timeout: float | None) -> bool:
+        """
+        Wait for the workers to exit.
+
+        workers: Workers to wait for.
+        timeout: Seconds to wait in total. None waits forever.
+
+        Return: Whether all workers have exited.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        is_all_exited = True
+        for worker in workers:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+            if not worker.join(remaining):
+                is_all_exited = False
+
+        return is_all_exited
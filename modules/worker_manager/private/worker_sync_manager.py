@@ -0,0 +1,155 @@
+"""
+Multiprocessing manager with batch capable queues.
+"""
+
+import collections
+import multiprocessing.managers
+import queue
+import time
+
+
+def put_in_order(
+    put: "(object, bool, float | None) -> None",  # type: ignore
+    items: list,
+    block: bool,
+    timeout: float | None,
+) -> int:
+    """
+    Put items one at a time with a shared timeout, stopping at the first that does not fit.
+
+    put: Put method of a queue, raises queue.Full.
+
+    Return: Number of items put.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    count = 0
+    for item in items:
+        remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+        try:
+            put(item, block, remaining)
+        except queue.Full:
+            break
+
+        count += 1
+
+    return count
+
+
+class BatchQueue(queue.Queue):
+    """
+    Queue in the manager server process that can move a batch of items in one proxy call.
+    """
+
+    def put_many(self, items: list, block: bool = True, timeout: float | None = None) -> int:
+        """
+        Put items into the queue in order, as many as fit until the timeout.
+
+        Return: Number of items put.
+        """
+        return put_in_order(self.put, items, block, timeout)
+
+    def get_many(
+        self, max_items: int, block: bool = True, timeout: float | None = None
+    ) -> list[object]:
+        """
+        Remove and return up to max_items items, waiting until the timeout for the batch to fill.
+
+        Return: Items in order, can be fewer than max_items or empty.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        items = []
+        while len(items) < max_items:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+            try:
+                items.append(self.get(block, remaining))
+            except queue.Empty:
+                break
+
+        return items
+
+
+class PriorityBatchQueue(BatchQueue):
+    """
+    BatchQueue with priority levels. Items are put as (priority, item) tuples and got as the item.
+
+    Items of a higher level are got first, in FIFO order within a level. With a starvation limit,
+    a level holding items that has been passed over by that many gets is served next, so bulk
+    items keep moving while urgent items arrive.
+    """
+
+    def __init__(
+        self, maxsize: int = 0, priority_levels: int = 1, starvation_limit: int | None = None
+    ) -> None:
+        """
+        maxsize: Maximum number of items across all levels. 0 is unbounded.
+        priority_levels: Number of levels, from 0 to priority_levels - 1.
+        starvation_limit: Number of gets that can pass over a level holding items. None is no
+            limit.
+        """
+        # Used by _init(), which is called by the base constructor
+        self.__priority_levels = priority_levels
+        self.__starvation_limit = starvation_limit
+
+        super().__init__(maxsize)
+
+    # Queue internals, called with the mutex held
+    # pylint: disable=invalid-name
+
+    def _init(self, maxsize: int) -> None:
+        """
+        One deque per level.
+        """
+        self.queue = [collections.deque() for _ in range(0, self.__priority_levels)]
+        # Gets that passed over each level while it held items
+        self.__skip_counts = [0] * self.__priority_levels
+
+    def _qsize(self) -> int:
+        """
+        Number of items across all levels.
+        """
+        return sum(len(level) for level in self.queue)
+
+    def _put(self, item: tuple[int, object]) -> None:
+        """
+        Append to the level of the item.
+        """
+        priority, item = item
+        self.queue[priority].append(item)
+
+    def _get(self) -> object:
+        """
+        Pop from the highest level, unless a level is starved.
+        """
+        level = None
+        if self.__starvation_limit is not None:
+            for i in range(len(self.queue) - 1, -1, -1):
+                if len(self.queue[i]) > 0 and self.__skip_counts[i] >= self.__starvation_limit:
+                    level = i
+                    break
+
+        if level is None:
+            level = next(i for i in range(len(self.queue) - 1, -1, -1) if len(self.queue[i]) > 0)
+
+        if self.__starvation_limit is not None:
+            for i, items in enumerate(self.queue):
+                if i != level and len(items) > 0:
+                    self.__skip_counts[i] += 1
+
+            self.__skip_counts[level] = 0
+
+        return self.queue[level].popleft()
+
+    # pylint: enable=invalid-name
+
+
+class WorkerSyncManager(multiprocessing.managers.SyncManager):
+    """
+    SyncManager where Queue() creates a BatchQueue and PriorityQueue() creates a
+    PriorityBatchQueue.
+    """
+
+
+WorkerSyncManager.register("Queue", BatchQueue)
+WorkerSyncManager.register("PriorityQueue", PriorityBatchQueue)
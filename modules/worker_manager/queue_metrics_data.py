@@ -0,0 +1,159 @@
+"""
+Queue metrics data.
+"""
+
+# Buckets of the batch size histogram: bucket i counts batches of 2^i to 2^(i + 1) - 1 items, and
+# the last bucket also counts larger batches
+BATCH_SIZE_BUCKET_COUNT = 16
+
+
+# One attribute per metric
+# pylint: disable-next=too-many-instance-attributes
+class QueueMetricsData:
+    """
+    Snapshot of the counters of a queue, accumulated by all processes since the queue was created.
+
+    Only transfers through the methods of QueueWrapper are counted, not through its underlying
+    queue.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        name: str,
+        put_count: int,
+        get_count: int,
+        put_bytes: int | None,
+        get_bytes: int | None,
+        depth: int,
+        put_blocked_time: float,
+        get_blocked_time: float,
+        drop_count: int,
+        batch_size_histogram: list[int],
+        partition_put_counts: list[int] | None,
+        partition_depths: list[int] | None,
+        reorder_occupancy: int | None,
+        reorder_max_occupancy: int | None,
+        reorder_release_count: int | None,
+        reorder_wait_time: float | None,
+        reorder_skip_count: int | None,
+        subscriber_depths: dict[str, int] | None,
+    ) -> tuple[True, "QueueMetricsData"] | tuple[False, None]:
+        """
+        name: Name of the queue.
+        put_count: Number of items put.
+        get_count: Number of items got.
+        put_bytes: Pickled size of the items put. None if the backend does not measure it.
+        get_bytes: Pickled size of the items got. None if the backend does not measure it.
+        depth: Approximate number of items in the queue when sampled.
+        put_blocked_time: Seconds producers waited for space in a full queue.
+        get_blocked_time: Seconds consumers waited for items from an empty queue.
+        drop_count: Number of items dropped by the overflow policy of the queue.
+        batch_size_histogram: Number of batches formed by consumers with MicroBatcher, in
+            BATCH_SIZE_BUCKET_COUNT power of 2 buckets of the batch size.
+        partition_put_counts: Number of items put into each partition. None if the queue is not
+            partitioned.
+        partition_depths: Approximate number of items in each partition when sampled. None if the
+            queue is not partitioned.
+        reorder_occupancy: Number of items in the reorder buffer of the consumer when sampled. None
+            if the queue does not reorder, same for the other reorder metrics.
+        reorder_max_occupancy: Maximum number of items in the reorder buffer.
+        reorder_release_count: Number of items released by the reorder buffer.
+        reorder_wait_time: Seconds items were held back by the reorder buffer, in total.
+        reorder_skip_count: Number of missing sequence numbers skipped by the reorder buffer.
+        subscriber_depths: Approximate number of items each subscriber has not got when sampled, by
+            subscriber name. None if the queue is not a broadcast queue.
+
+        Return: Success, object.
+        """
+        # Busiest partition relative to an even spread of the keys
+        partition_skew = None
+        if partition_put_counts is not None:
+            partition_skew = 1.0
+            total_put_count = sum(partition_put_counts)
+            if total_put_count > 0:
+                partition_skew = (
+                    max(partition_put_counts) * len(partition_put_counts) / total_put_count
+                )
+
+        # Latency added by the reorder buffer
+        reorder_mean_wait_time = None
+        if reorder_release_count is not None and reorder_wait_time is not None:
+            reorder_mean_wait_time = 0.0
+            if reorder_release_count > 0:
+                reorder_mean_wait_time = reorder_wait_time / reorder_release_count
+
+        return True, QueueMetricsData(
+            cls.__create_key,
+            name,
+            put_count,
+            get_count,
+            put_bytes,
+            get_bytes,
+            depth,
+            put_blocked_time,
+            get_blocked_time,
+            drop_count,
+            batch_size_histogram,
+            partition_put_counts,
+            partition_depths,
+            partition_skew,
+            reorder_occupancy,
+            reorder_max_occupancy,
+            reorder_wait_time,
+            reorder_mean_wait_time,
+            reorder_skip_count,
+            subscriber_depths,
+        )
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        name: str,
+        put_count: int,
+        get_count: int,
+        put_bytes: int | None,
+        get_bytes: int | None,
+        depth: int,
+        put_blocked_time: float,
+        get_blocked_time: float,
+        drop_count: int,
+        batch_size_histogram: list[int],
+        partition_put_counts: list[int] | None,
+        partition_depths: list[int] | None,
+        partition_skew: float | None,
+        reorder_occupancy: int | None,
+        reorder_max_occupancy: int | None,
+        reorder_wait_time: float | None,
+        reorder_mean_wait_time: float | None,
+        reorder_skip_count: int | None,
+        subscriber_depths: dict[str, int] | None,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is QueueMetricsData.__create_key, "Use create() method"
+
+        self.name = name
+        self.put_count = put_count
+        self.get_count = get_count
+        self.put_bytes = put_bytes
+        self.get_bytes = get_bytes
+        self.depth = depth
+        self.put_blocked_time = put_blocked_time
+        self.get_blocked_time = get_blocked_time
+        self.drop_count = drop_count
+        self.batch_size_histogram = batch_size_histogram
+        self.partition_put_counts = partition_put_counts
+        self.partition_depths = partition_depths
+        # Items put into the busiest partition divided by the mean, 1.0 is no skew
+        self.partition_skew = partition_skew
+        self.reorder_occupancy = reorder_occupancy
+        self.reorder_max_occupancy = reorder_max_occupancy
+        self.reorder_wait_time = reorder_wait_time
+        # Seconds each released item was held back on average
+        self.reorder_mean_wait_time = reorder_mean_wait_time
+        self.reorder_skip_count = reorder_skip_count
+        self.subscriber_depths = subscriber_depths
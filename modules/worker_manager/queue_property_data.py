@@ -2,21 +2,159 @@
 Queue property data.
 """
 
+from collections.abc import Callable
+import enum
 
+
+class QueueBackend(enum.Enum):
+    """
+    Underlying queue implementation.
+    """
+
+    # Queue proxy of the multiprocessing manager server
+    MANAGER = "manager"
+    # Multiprocessing queue, items are pickled by a feeder thread of the producer and sent through a
+    # pipe, so they can be received shortly after the put returns, and a process waits on exit
+    # until its items are in the pipe. Does not need the manager server. Not supported on macOS,
+    # where the depth of the queue is not available.
+    PROCESS = "process"
+    # Ring buffer in shared memory
+    SHARED_MEMORY = "shared_memory"
+    # Queue of the process of the worker manager, items are not serialized. Only for thread workers.
+    IN_PROCESS = "in_process"
+    # Ring buffer in shared memory that each worker group with it as an input queue reads in full,
+    # with its own read cursor
+    BROADCAST = "broadcast"
+
+
+class SerializerKind(enum.Enum):
+    """
+    How items are converted to bytes when they cross the queue.
+    """
+
+    # Pickle with the highest protocol, buffers are copied into the pickle
+    PICKLE = "pickle"
+    # Pickle protocol 5, large buffers such as NumPy arrays are written out of band without an
+    # intermediate copy
+    PICKLE_OUT_OF_BAND = "pickle_out_of_band"
+    # Items are bytes-like and sent as is, they are received as bytes
+    BYTES = "bytes"
+    # Encode and decode functions supplied by the user
+    CUSTOM = "custom"
+
+
+class OverflowPolicy(enum.Enum):
+    """
+    What a put does when the queue is full.
+    """
+
+    # Wait for space until the timeout of the put
+    BLOCK = "block"
+    # Wait for space at most the overflow timeout, then drop the new item
+    BLOCK_TIMEOUT = "block_timeout"
+    # Drop the new item without waiting
+    DROP_NEWEST = "drop_newest"
+    # Drop the oldest items in the queue to make space without waiting
+    DROP_OLDEST = "drop_oldest"
+    # Drop all items in the queue, so it holds only the newest item
+    LATEST_VALUE = "latest_value"
+
+
+class SequenceMode(enum.Enum):
+    """
+    Whether items carry sequence numbers, to restore the source order after a parallel stage.
+    """
+
+    # Items are not numbered
+    NONE = "none"
+    # Puts number the items in the order they enter the queue
+    STAMP = "stamp"
+    # Puts keep the number of the item last got from a numbered queue, and gets release the items
+    # in number order through a reorder buffer
+    REORDER = "reorder"
+
+
+# One attribute per property of the queue
+# pylint: disable-next=too-many-instance-attributes
 class QueuePropertyData:
     """
     Properties about the queue.
     """
 
+    DEFAULT_SLOT_SIZE = 4096
+    DEFAULT_REORDER_BUFFER_SIZE = 64
+    DEFAULT_REORDER_GAP_TIMEOUT = 1.0
+    DEFAULT_MAX_SUBSCRIBER_COUNT = 8
+
     __create_key = object()
 
     @classmethod
     def create(
-        cls, name: str, max_size: int
+        cls,
+        name: str,
+        max_size: int,
+        backend: QueueBackend = QueueBackend.MANAGER,
+        slot_size: int = DEFAULT_SLOT_SIZE,
+        serializer_kind: SerializerKind = SerializerKind.PICKLE,
+        encode: Callable[[object], bytes] | None = None,
+        decode: Callable[[bytes], object] | None = None,
+        overflow_policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        overflow_timeout: float | None = None,
+        priority_levels: int = 1,
+        starvation_limit: int | None = None,
+        partition_count: int = 1,
+        sequence_mode: SequenceMode = SequenceMode.NONE,
+        reorder_buffer_size: int = DEFAULT_REORDER_BUFFER_SIZE,
+        reorder_gap_timeout: float = DEFAULT_REORDER_GAP_TIMEOUT,
+        max_subscriber_count: int = DEFAULT_MAX_SUBSCRIBER_COUNT,
     ) -> tuple[True, "QueuePropertyData"] | tuple[False, None]:
         """
         name: Name of the queue. Must not be empty string.
         max_size: Maximum number of items that can be held in the queue. Must be greater than 0.
+        backend: Underlying queue implementation.
+        slot_size: Maximum size of a serialized item in bytes, including 4 bytes per buffer.
+            Must be greater than 0. Only used by the shared memory and broadcast backends.
+        serializer_kind: How items are converted to bytes.
+        encode: Converts an item to bytes-like. Required for the custom serializer, otherwise must
+            be None. Must be picklable, such as a module level function.
+        decode: Converts bytes back to an item. Required for the custom serializer, otherwise must
+            be None. Must be picklable, such as a module level function.
+        overflow_policy: What a put does when the queue is full. Only puts through the methods of
+            QueueWrapper follow the policy, end of stream markers are never dropped. The process
+            and broadcast backends do not support the drop oldest and latest value policies.
+        overflow_timeout: Seconds a put waits before the item is dropped. Required for the block
+            with timeout policy, otherwise must be None. Must not be negative.
+        priority_levels: Number of priority levels. Must be greater than 0. 1 is a FIFO queue,
+            otherwise items of a higher level are received first, in FIFO order within a level.
+            Only supported by the manager and in-process backends, and not by the drop oldest and
+            latest value policies.
+        starvation_limit: Number of gets that can pass over a level holding items before it is
+            served next. Must be greater than 0. None is no limit. Only used with more than 1
+            priority level.
+        partition_count: Number of partitions. Must be greater than 0. 1 is a single queue,
+            otherwise the put methods of QueueWrapper take a key, and items with the same key go to
+            the same partition and stay in order. The partitions are divided among the threads and
+            coroutine calls of the workers of the group with this input queue, so set it to at
+            least the maximum number of workers times the threads and concurrency of each.
+            Each partition holds up to max_size items. The order of a key is only kept while the
+            group is resized if its workers check the worker controller between items. Not
+            supported with priority levels, nor by the broadcast backend, nor by the drop oldest
+            and latest value policies.
+        sequence_mode: Whether items carry sequence numbers. Stamp the queue into a parallel
+            stage and reorder the queue out of it, which must be the input of a single worker.
+            Sequence numbers are carried from get() and get_async() to the puts that follow in the
+            same thread or asyncio task, and items put without one are released on arrival. The
+            shared memory and broadcast backends only support it with the pickle serializers, and
+            the broadcast backend does not support reorder.
+        reorder_buffer_size: Maximum number of items held back by the reorder buffer. Must be
+            greater than 0. When it is full, missing sequence numbers are skipped. Only used by
+            reorder.
+        reorder_gap_timeout: Seconds the reorder buffer waits for a missing sequence number, such
+            as an item dropped by a worker, before skipping it. Must not be negative. Only used by
+            reorder.
+        max_subscriber_count: Maximum number of worker groups that read a broadcast queue over its
+            lifetime, including groups that were removed. Must be greater than 0. Only used by the
+            broadcast backend.
 
         Return: Success, object.
         """
@@ -28,9 +166,142 @@ class QueuePropertyData:
             print("ERROR: Queue max size must be greater than 0")
             return False, None
 
-        return True, QueuePropertyData(cls.__create_key, name, max_size)
+        if slot_size <= 0:
+            print("ERROR: Slot size must be greater than 0")
+            return False, None
+
+        is_custom = serializer_kind == SerializerKind.CUSTOM
+        if is_custom and (encode is None or decode is None):
+            print("ERROR: Custom serializer requires encode and decode")
+            return False, None
+
+        if not is_custom and (encode is not None or decode is not None):
+            print("ERROR: Encode and decode are only used by the custom serializer")
+            return False, None
+
+        is_block_timeout = overflow_policy == OverflowPolicy.BLOCK_TIMEOUT
+        if is_block_timeout and (overflow_timeout is None or overflow_timeout < 0.0):
+            print("ERROR: Block with timeout requires an overflow timeout of at least 0")
+            return False, None
+
+        if not is_block_timeout and overflow_timeout is not None:
+            print("ERROR: Overflow timeout is only used by block with timeout")
+            return False, None
+
+        if priority_levels <= 0:
+            print("ERROR: Priority levels must be greater than 0")
+            return False, None
+
+        is_priority = priority_levels > 1
+        if is_priority and backend not in [QueueBackend.MANAGER, QueueBackend.IN_PROCESS]:
+            print(f"ERROR: Priority levels are not supported by backend: {backend}")
+            return False, None
+
+        if is_priority and overflow_policy in [
+            OverflowPolicy.DROP_OLDEST,
+            OverflowPolicy.LATEST_VALUE,
+        ]:
+            print(f"ERROR: Priority levels are not supported by overflow policy: {overflow_policy}")
+            return False, None
+
+        if starvation_limit is not None and (not is_priority or starvation_limit <= 0):
+            print("ERROR: Starvation limit must be greater than 0 with more than 1 priority level")
+            return False, None
+
+        if partition_count <= 0:
+            print("ERROR: Partition count must be greater than 0")
+            return False, None
+
+        is_partitioned = partition_count > 1
+        if is_partitioned and backend == QueueBackend.BROADCAST:
+            print("ERROR: Partitions are not supported by the broadcast backend")
+            return False, None
+
+        if is_partitioned and is_priority:
+            print("ERROR: Partitions are not supported with priority levels")
+            return False, None
+
+        if is_partitioned and overflow_policy in [
+            OverflowPolicy.DROP_OLDEST,
+            OverflowPolicy.LATEST_VALUE,
+        ]:
+            print(f"ERROR: Partitions are not supported by overflow policy: {overflow_policy}")
+            return False, None
+
+        is_shared_memory = backend in [QueueBackend.SHARED_MEMORY, QueueBackend.BROADCAST]
+        if (
+            sequence_mode != SequenceMode.NONE
+            and is_shared_memory
+            and serializer_kind not in [SerializerKind.PICKLE, SerializerKind.PICKLE_OUT_OF_BAND]
+        ):
+            print(
+                f"ERROR: Sequence numbers are not supported by backend {backend} with serializer: {serializer_kind}"
+            )
+            return False, None
+
+        if sequence_mode == SequenceMode.REORDER and backend == QueueBackend.BROADCAST:
+            print("ERROR: Reorder is not supported by the broadcast backend")
+            return False, None
+
+        if reorder_buffer_size <= 0:
+            print("ERROR: Reorder buffer size must be greater than 0")
+            return False, None
+
+        if reorder_gap_timeout < 0.0:
+            print("ERROR: Reorder gap timeout must not be negative")
+            return False, None
+
+        if backend in [QueueBackend.PROCESS, QueueBackend.BROADCAST] and overflow_policy in [
+            OverflowPolicy.DROP_OLDEST,
+            OverflowPolicy.LATEST_VALUE,
+        ]:
+            print(f"ERROR: Backend {backend} does not support overflow policy: {overflow_policy}")
+            return False, None
+
+        if max_subscriber_count <= 0:
+            print("ERROR: Max subscriber count must be greater than 0")
+            return False, None
+
+        return True, QueuePropertyData(
+            cls.__create_key,
+            name,
+            max_size,
+            backend,
+            slot_size,
+            serializer_kind,
+            encode,
+            decode,
+            overflow_policy,
+            overflow_timeout,
+            priority_levels,
+            starvation_limit,
+            partition_count,
+            sequence_mode,
+            reorder_buffer_size,
+            reorder_gap_timeout,
+            max_subscriber_count,
+        )
 
-    def __init__(self, class_private_create_key: object, name: str, max_size: int) -> None:
+    def __init__(
+        self,
+        class_private_create_key: object,
+        name: str,
+        max_size: int,
+        backend: QueueBackend,
+        slot_size: int,
+        serializer_kind: SerializerKind,
+        encode: Callable[[object], bytes] | None,
+        decode: Callable[[bytes], object] | None,
+        overflow_policy: OverflowPolicy,
+        overflow_timeout: float | None,
+        priority_levels: int,
+        starvation_limit: int | None,
+        partition_count: int,
+        sequence_mode: SequenceMode,
+        reorder_buffer_size: int,
+        reorder_gap_timeout: float,
+        max_subscriber_count: int,
+    ) -> None:
         """
         Private constructor, use create() method.
         """
@@ -38,3 +309,17 @@ class QueuePropertyData:
 
         self.name = name
         self.max_size = max_size
+        self.backend = backend
+        self.slot_size = slot_size
+        self.serializer_kind = serializer_kind
+        self.encode = encode
+        self.decode = decode
+        self.overflow_policy = overflow_policy
+        self.overflow_timeout = overflow_timeout
+        self.priority_levels = priority_levels
+        self.starvation_limit = starvation_limit
+        self.partition_count = partition_count
+        self.sequence_mode = sequence_mode
+        self.reorder_buffer_size = reorder_buffer_size
+        self.reorder_gap_timeout = reorder_gap_timeout
+        self.max_subscriber_count = max_subscriber_count
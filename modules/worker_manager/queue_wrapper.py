@@ -2,37 +2,287 @@
 Queue.
 """
 
+import asyncio
+import collections
+import contextvars
+import functools
+import multiprocessing as mp
+import multiprocessing.context
 import multiprocessing.managers
+import multiprocessing.queues
+import queue
+import time
 
+from . import queue_metrics_data
 from . import queue_property_data
+from .private import broadcast_queue
+from .private import end_of_stream_counter
+from .private import partitioned_queue
+from .private import queue_metrics
+from .private import reorder_buffer
+from .private import sequence_counter
+from .private import serializer
+from .private import shared_memory_queue
+from .private import tracer
+from .private import worker_sync_manager
 
 
+# Holds the state of each queue feature
+# pylint: disable-next=too-many-instance-attributes
 class QueueWrapper:
     """
     Wrapper for an underlying queue proxy and other information.
+
+    Workers can use the underlying queue directly, or the methods of this class. Only transfers
+    through the methods of this class are counted in the metrics.
+
+    The shared memory backend serializes with the serializer of the queue property. The manager
+    and process backends pickle the item in the underlying queue, so for other serializers the
+    methods of this class send the frames as a list of byte arrays, and the underlying queue must
+    not be used directly. The in-process backend does not serialize.
+
+    Queues with more than 1 priority level take the priority as an argument of the put methods.
+    The underlying queue takes (priority, item) tuples and returns the item. Likewise, queues with
+    more than 1 partition take the key, and the underlying queue takes (key, item) tuples. Queues
+    with sequence numbers hold (sequence number, item) tuples, and reorder queues release the items
+    got in sequence number order through a reorder buffer in the process of the consumer.
+
+    Broadcast queues are only got from through the queues of their subscribers, from subscribe().
+    Each subscriber has its own end of stream counter and shares the metrics of the queue, so the
+    get count is the total of all subscribers.
+
+    With a tracer, items put by a thread or asyncio task that has not got an item are sampled, and
+    the trace is carried like sequence numbers to the items put after getting a traced item. Traced
+    items hold a TracedItem in the underlying queue, so the trace is not carried by shared memory
+    and broadcast queues with serializers other than pickle.
+
+    Coroutine workers use put_async() and get_async(). These wait in threads of the default
+    executor of the event loop, so many coroutines can wait on the queue without blocking the loop.
     """
 
+    # Seconds of each wait in an executor thread, so timeouts and cancellation are seen
+    ASYNC_WAIT_PERIOD = 0.05
+
+    # Overflow policies that wait for space
+    __WAITING_POLICIES = (
+        queue_property_data.OverflowPolicy.BLOCK,
+        queue_property_data.OverflowPolicy.BLOCK_TIMEOUT,
+    )
+    # Overflow policies that make space by dropping items in the queue
+    __REPLACING_POLICIES = (
+        queue_property_data.OverflowPolicy.DROP_OLDEST,
+        queue_property_data.OverflowPolicy.LATEST_VALUE,
+    )
+
+    # Keys and generations of the queues a get found ended, per thread and per asyncio task, so a
+    # coroutine or thread that is still holding an item does not exit during a drain
+    __ended_queue_keys: contextvars.ContextVar[frozenset[tuple[object, int]]] = (
+        contextvars.ContextVar("ended_queue_keys", default=frozenset())
+    )
+
+    # Sequence number of the item last got by get() or get_async() from a queue with sequence
+    # numbers, per thread and per asyncio task, for the puts into reorder queues that follow
+    __current_sequence: contextvars.ContextVar[int | None] = contextvars.ContextVar(
+        "current_sequence", default=None
+    )
+
+    # Trace ID, get time and queue name of the item last got, per thread and per asyncio task, for
+    # the puts that follow. None if nothing has been got, so the items put are sampled.
+    __current_trace: contextvars.ContextVar[tuple[int, float, str] | None] = contextvars.ContextVar(
+        "current_trace", default=None
+    )
+
     __create_key = object()
 
     @classmethod
     def create(
         cls,
-        mp_manager: multiprocessing.managers.SyncManager,
+        mp_manager: multiprocessing.managers.SyncManager | None,
         queue_property: queue_property_data.QueuePropertyData,
+        mp_context: multiprocessing.context.BaseContext | None = None,
+        item_tracer: tracer.Tracer | None = None,
     ) -> tuple[True, "QueueWrapper"] | tuple[False, None]:
         """
         queue_property: Queue property data.
-        mp_manager: Python multiprocessing manager.
+        mp_manager: Python multiprocessing manager. Only required by the manager backend.
+        mp_context: Multiprocessing context of the processes using the queue. None is the default
+            context.
+        item_tracer: Tracer of the items. None does not trace.
 
         Return: Success, object.
         """
-        return True, QueueWrapper(cls.__create_key, mp_manager, queue_property)
+        result, item_serializer = serializer.Serializer.create(
+            queue_property.serializer_kind, queue_property.encode, queue_property.decode
+        )
+        if not result:
+            print(f"ERROR: Failed to create serializer: {queue_property.name}")
+            return False, None
+
+        # Get Pylance to stop complaining
+        assert item_serializer is not None
+
+        # Serializer used by the wrapper on top of the underlying queue
+        frame_serializer = None
+        if (
+            queue_property.backend
+            in [queue_property_data.QueueBackend.MANAGER, queue_property_data.QueueBackend.PROCESS]
+            and queue_property.serializer_kind != queue_property_data.SerializerKind.PICKLE
+        ):
+            frame_serializer = item_serializer
+
+        # One underlying queue per partition
+        partitions = []
+        for _ in range(0, queue_property.partition_count):
+            result, partition = cls.__create_underlying_queue(
+                mp_manager, queue_property, mp_context, item_serializer
+            )
+            if not result:
+                return False, None
+
+            partitions.append(partition)
+
+        underlying_queue = partitions[0]
+        if queue_property.partition_count > 1:
+            result, underlying_queue = partitioned_queue.PartitionedQueue.create(
+                partitions, mp_context
+            )
+            if not result:
+                print(f"ERROR: Failed to create partitioned queue: {queue_property.name}")
+                return False, None
+
+        result, metrics = queue_metrics.QueueMetrics.create(mp_context)
+        if not result:
+            print(f"ERROR: Failed to create queue metrics: {queue_property.name}")
+            return False, None
+
+        # Get Pylance to stop complaining
+        assert metrics is not None
+
+        result, end_of_stream = end_of_stream_counter.EndOfStreamCounter.create(mp_context)
+        if not result:
+            print(f"ERROR: Failed to create end of stream counter: {queue_property.name}")
+            return False, None
+
+        # Get Pylance to stop complaining
+        assert end_of_stream is not None
+
+        counter = None
+        if queue_property.sequence_mode == queue_property_data.SequenceMode.STAMP:
+            result, counter = sequence_counter.SequenceCounter.create(mp_context)
+            if not result:
+                print(f"ERROR: Failed to create sequence counter: {queue_property.name}")
+                return False, None
+
+        buffer = None
+        if queue_property.sequence_mode == queue_property_data.SequenceMode.REORDER:
+            result, buffer = reorder_buffer.ReorderBuffer.create(
+                queue_property.reorder_buffer_size,
+                queue_property.reorder_gap_timeout,
+                metrics,
+                mp_context,
+            )
+            if not result:
+                print(f"ERROR: Failed to create reorder buffer: {queue_property.name}")
+                return False, None
+
+        return True, QueueWrapper(
+            cls.__create_key,
+            queue_property,
+            underlying_queue,
+            metrics,
+            end_of_stream,
+            frame_serializer,
+            counter,
+            buffer,
+            item_tracer,
+        )
+
+    @staticmethod
+    def __create_underlying_queue(
+        mp_manager: multiprocessing.managers.SyncManager | None,
+        queue_property: queue_property_data.QueuePropertyData,
+        mp_context: multiprocessing.context.BaseContext | None,
+        item_serializer: serializer.Serializer,
+    ) -> tuple[True, object] | tuple[False, None]:
+        """
+        Create a queue of the backend.
+
+        Return: Success, underlying queue.
+        """
+        match queue_property.backend:
+            case queue_property_data.QueueBackend.MANAGER:
+                if mp_manager is None:
+                    print(f"ERROR: Manager queue requires a manager server: {queue_property.name}")
+                    return False, None
+
+                if queue_property.priority_levels == 1:
+                    return True, mp_manager.Queue(queue_property.max_size)
+
+                if not hasattr(mp_manager, "PriorityQueue"):
+                    print(
+                        f"ERROR: Priority queue requires a WorkerSyncManager: {queue_property.name}"
+                    )
+                    return False, None
+
+                return True, mp_manager.PriorityQueue(
+                    queue_property.max_size,
+                    queue_property.priority_levels,
+                    queue_property.starvation_limit,
+                )
+            case queue_property_data.QueueBackend.PROCESS:
+                if mp_context is None:
+                    mp_context = mp.get_context()
+
+                return True, mp_context.Queue(queue_property.max_size)
+            case queue_property_data.QueueBackend.SHARED_MEMORY:
+                result, underlying_queue = shared_memory_queue.SharedMemoryQueue.create(
+                    queue_property.max_size,
+                    queue_property.slot_size,
+                    mp_context,
+                    item_serializer,
+                )
+                if not result:
+                    print(f"ERROR: Failed to create shared memory queue: {queue_property.name}")
+                    return False, None
+
+                return True, underlying_queue
+            case queue_property_data.QueueBackend.BROADCAST:
+                result, underlying_queue = broadcast_queue.BroadcastQueue.create(
+                    queue_property.max_size,
+                    queue_property.slot_size,
+                    queue_property.max_subscriber_count,
+                    mp_context,
+                    item_serializer,
+                )
+                if not result:
+                    print(f"ERROR: Failed to create broadcast queue: {queue_property.name}")
+                    return False, None
+
+                return True, underlying_queue
+            case queue_property_data.QueueBackend.IN_PROCESS:
+                if queue_property.priority_levels == 1:
+                    return True, queue.Queue(queue_property.max_size)
+
+                return True, worker_sync_manager.PriorityBatchQueue(
+                    queue_property.max_size,
+                    queue_property.priority_levels,
+                    queue_property.starvation_limit,
+                )
+            case _:
+                print(f"ERROR: Unknown queue backend: {queue_property.backend}")
+                return False, None
 
     def __init__(
         self,
         class_private_create_key: object,
-        mp_manager: multiprocessing.managers.SyncManager,
         queue_property: queue_property_data.QueuePropertyData,
+        underlying_queue: "multiprocessing.managers.BaseProxy | multiprocessing.queues.Queue | shared_memory_queue.SharedMemoryQueue | queue.Queue | partitioned_queue.PartitionedQueue | broadcast_queue.BroadcastQueue",
+        metrics: queue_metrics.QueueMetrics,
+        end_of_stream: end_of_stream_counter.EndOfStreamCounter,
+        frame_serializer: serializer.Serializer | None,
+        counter: sequence_counter.SequenceCounter | None,
+        buffer: reorder_buffer.ReorderBuffer | None,
+        item_tracer: tracer.Tracer | None,
     ) -> None:
         """
         Private constructor, use create() method.
@@ -40,4 +290,1046 @@ class QueueWrapper:
         assert class_private_create_key is QueueWrapper.__create_key, "Use create() method"
 
         self.queue_property = queue_property
-        self.queue = mp_manager.Queue(queue_property.max_size)
+        self.queue = underlying_queue
+
+        self.__metrics = metrics
+        self.__end_of_stream = end_of_stream
+        self.__frame_serializer = frame_serializer
+        self.__is_priority = queue_property.priority_levels > 1
+        self.__is_partitioned = queue_property.partition_count > 1
+        self.__is_sequenced = queue_property.sequence_mode != queue_property_data.SequenceMode.NONE
+        self.__sequence_counter = counter
+        self.__reorder_buffer = buffer
+        self.__tracer = item_tracer
+        # Shared memory queues only hold traced items with the pickle serializers
+        self.__is_trace_carried = queue_property.backend not in [
+            queue_property_data.QueueBackend.SHARED_MEMORY,
+            queue_property_data.QueueBackend.BROADCAST,
+        ] or queue_property.serializer_kind in [
+            queue_property_data.SerializerKind.PICKLE,
+            queue_property_data.SerializerKind.PICKLE_OUT_OF_BAND,
+        ]
+        # Unlike id(), not reused by another queue after this one is freed. A new object in each
+        # process the queue is passed to.
+        self.__end_of_stream_key = object()
+        # Subscriber index and end of stream counter of each subscriber of a broadcast queue
+        self.__names_to_subscriber: dict[
+            str, tuple[int, end_of_stream_counter.EndOfStreamCounter]
+        ] = {}
+
+        # Sequence number, item and trace of the items got by waits of get_async() that were
+        # cancelled, for the gets that follow
+        self.__pending_items: collections.deque[
+            tuple[tuple[int | None, object], tuple[int, float, str] | None]
+        ] = collections.deque()
+
+        # Manager queues created by a plain SyncManager do not have batch methods
+        self.__is_batch_native = hasattr(underlying_queue, "put_many") and hasattr(
+            underlying_queue, "get_many"
+        )
+
+    def get_depth(self) -> int:
+        """
+        Return: Approximate number of items in the queue.
+        """
+        return self.queue.qsize()
+
+    def get_metrics(self) -> tuple[True, queue_metrics_data.QueueMetricsData] | tuple[False, None]:
+        """
+        Sample the counters of the queue.
+
+        Return: Success, metrics.
+        """
+        (
+            put_count,
+            get_count,
+            put_blocked_time,
+            get_blocked_time,
+            drop_count,
+            batch_size_histogram,
+        ) = self.__metrics.read()
+
+        # Only shared memory queues see the serialized items
+        put_bytes = None
+        get_bytes = None
+        partition_put_counts = None
+        partition_depths = None
+        subscriber_depths = None
+        if isinstance(self.queue, shared_memory_queue.SharedMemoryQueue):
+            put_bytes, get_bytes = self.queue.get_byte_counts()
+        elif isinstance(self.queue, broadcast_queue.BroadcastQueue):
+            put_bytes, get_bytes = self.queue.get_byte_counts()
+            depths = self.queue.get_subscriber_depths()
+            subscriber_depths = {
+                name: depths[index]
+                for name, (index, _) in self.__names_to_subscriber.items()
+                if index in depths
+            }
+        elif isinstance(self.queue, partitioned_queue.PartitionedQueue):
+            put_bytes, get_bytes = self.queue.get_byte_counts()
+            partition_put_counts = self.queue.get_partition_put_counts()
+            partition_depths = self.queue.get_partition_depths()
+
+        reorder_occupancy = None
+        reorder_max_occupancy = None
+        reorder_release_count = None
+        reorder_wait_time = None
+        reorder_skip_count = None
+        if self.__reorder_buffer is not None:
+            (
+                reorder_occupancy,
+                reorder_max_occupancy,
+                reorder_release_count,
+                reorder_wait_time,
+                reorder_skip_count,
+            ) = self.__metrics.read_reorder()
+
+        return queue_metrics_data.QueueMetricsData.create(
+            self.queue_property.name,
+            put_count,
+            get_count,
+            put_bytes,
+            get_bytes,
+            self.get_depth(),
+            put_blocked_time,
+            get_blocked_time,
+            drop_count,
+            batch_size_histogram,
+            partition_put_counts,
+            partition_depths,
+            reorder_occupancy,
+            reorder_max_occupancy,
+            reorder_release_count,
+            reorder_wait_time,
+            reorder_skip_count,
+            subscriber_depths,
+        )
+
+    def subscribe(
+        self, name: str, mp_context: multiprocessing.context.BaseContext | None = None
+    ) -> tuple[True, "QueueWrapper"] | tuple[False, None]:
+        """
+        Called by the worker manager for each worker group with this broadcast queue as an input
+        queue. The subscriber receives every item put from now on, and holds back the producers
+        while it is max_size items behind.
+
+        name: Name of the subscriber, such as the name of the worker group.
+        mp_context: Multiprocessing context of the processes using the queue. None is the default
+            context.
+
+        Return: Success, queue of the subscriber.
+        """
+        if not isinstance(self.queue, broadcast_queue.BroadcastQueue):
+            print(f"ERROR: Only broadcast queues can be subscribed to: {self.queue_property.name}")
+            return False, None
+
+        if name in self.__names_to_subscriber:
+            print(f"ERROR: Queue {self.queue_property.name} already has subscriber: {name}")
+            return False, None
+
+        result, end_of_stream = end_of_stream_counter.EndOfStreamCounter.create(mp_context)
+        if not result:
+            print(f"ERROR: Failed to create end of stream counter: {self.queue_property.name}")
+            return False, None
+
+        # Get Pylance to stop complaining
+        assert end_of_stream is not None
+
+        result, subscriber_queue = self.queue.subscribe()
+        if not result:
+            print(f"ERROR: Failed to subscribe {name} to queue: {self.queue_property.name}")
+            return False, None
+
+        # Get Pylance to stop complaining
+        assert subscriber_queue is not None
+
+        index = subscriber_queue.get_subscriber()
+
+        # Get Pylance to stop complaining
+        assert index is not None
+
+        self.__names_to_subscriber[name] = (index, end_of_stream)
+
+        return True, QueueWrapper(
+            QueueWrapper.__create_key,
+            self.queue_property,
+            subscriber_queue,
+            self.__metrics,
+            end_of_stream,
+            self.__frame_serializer,
+            self.__sequence_counter,
+            None,
+            self.__tracer,
+        )
+
+    def unsubscribe(self, name: str) -> None:
+        """
+        Remove a subscriber of a broadcast queue, so it no longer holds back the producers.
+
+        name: Name of the subscriber.
+        """
+        if name not in self.__names_to_subscriber:
+            return
+
+        # Get Pylance to stop complaining
+        assert isinstance(self.queue, broadcast_queue.BroadcastQueue)
+
+        index, _ = self.__names_to_subscriber.pop(name)
+        self.queue.unsubscribe(index)
+
+    def set_partition_consumer_count(self, count: int) -> None:
+        """
+        Called by the worker manager while no consumer is holding an item. Consumer i of a
+        partitioned queue gets from the partitions p with p % count == i.
+
+        count: Number of threads and coroutine calls of the workers getting from the queue. Must be
+            greater than 0.
+        """
+        if isinstance(self.queue, partitioned_queue.PartitionedQueue):
+            self.queue.set_consumer_count(count)
+
+    def add_batch(self, size: int) -> None:
+        """
+        Record the size of a batch formed from the items got, in the metrics of the queue.
+
+        size: Number of items in the batch. Must be greater than 0.
+        """
+        self.__metrics.add_batch(size)
+
+    def put(
+        self, item: object, timeout: float | None = None, priority: int = 0, key: object = None
+    ) -> bool:
+        """
+        Put an item into the queue, following the overflow policy of the queue when it is full.
+
+        item: Item to put.
+        timeout: Seconds to wait for space. None waits forever. Block with timeout waits at most
+            the overflow timeout, and the drop policies do not wait.
+        priority: Priority level of the item, from 0 to priority_levels - 1 of the queue property.
+            Items of a higher level are received first.
+        key: Key of the item for partitioned queues, such as a device or session ID. Items with
+            the same key are received in order by one worker. None spreads the items over the
+            partitions.
+
+        Return: Success. False if the item was dropped or the priority is out of range.
+        """
+        if not self.__check_priority(priority):
+            return False
+
+        sequences = self.__take_sequences(1)
+        return self.__put_encoded(self.__encode(item, priority, key, sequences[0]), timeout)
+
+    def __put_encoded(self, item: object, timeout: float | None) -> bool:
+        """
+        Put an encoded item, following the overflow policy of the queue.
+        """
+        overflow_policy = self.queue_property.overflow_policy
+        if overflow_policy in QueueWrapper.__REPLACING_POLICIES:
+            return self.__put_replacing(
+                item, overflow_policy == queue_property_data.OverflowPolicy.LATEST_VALUE
+            )
+
+        timeout, is_drop = self.__get_overflow_timeout(timeout)
+        return self.__put_waiting(item, timeout, is_drop)
+
+    def get(self, timeout: float | None = None) -> tuple[True, object] | tuple[False, None]:
+        """
+        Get an item from the queue. End of stream markers are counted and skipped. Reorder queues
+        release the items in sequence number order.
+
+        timeout: Seconds to wait for an item. None waits forever.
+
+        Return: Success, item. False without waiting once the stream has ended during a drain.
+        """
+        if self.__tracer is not None:
+            self.__end_trace(self.__tracer)
+
+        pending = self.__pop_pending(1)
+        if len(pending) > 0:
+            return True, self.__carry_sequence(pending[0])
+
+        result, released = self.__get_sequenced(timeout)
+        if not result:
+            return False, None
+
+        # Get Pylance to stop complaining
+        assert released is not None
+
+        return True, self.__carry_sequence(released)
+
+    def __pop_pending(self, max_items: int) -> list[tuple[int | None, object]]:
+        """
+        Take the items got by waits of get_async() that were cancelled, and carry their trace.
+
+        max_items: Maximum number of items.
+
+        Return: Sequence number and item of each item, in the order they were got.
+        """
+        released_items = []
+        while len(released_items) < max_items:
+            try:
+                released, trace = self.__pending_items.popleft()
+            except IndexError:
+                break
+
+            if trace is not None and trace[0] != tracer.UNTRACED:
+                QueueWrapper.__current_trace.set(trace)
+
+            released_items.append(released)
+
+        return released_items
+
+    def __keep_pending(self, context: contextvars.Context, future: asyncio.Future) -> None:
+        """
+        Keep the item got by a wait of get_async() that was cancelled.
+
+        context: Context the wait ran in.
+        future: Finished wait.
+        """
+        if future.cancelled() or future.exception() is not None:
+            return
+
+        result, released = future.result()
+        if result:
+            self.__pending_items.append((released, context.get(QueueWrapper.__current_trace)))
+
+    def __get_sequenced(
+        self, timeout: float | None
+    ) -> tuple[True, tuple[int | None, object]] | tuple[False, None]:
+        """
+        Get a decoded item, through the reorder buffer for reorder queues.
+
+        Return: Success, sequence number and item.
+        """
+        if self.__reorder_buffer is not None:
+            return self.__get_reordered(self.__reorder_buffer, timeout)
+
+        result, item = self.__get_encoded(timeout)
+        if not result:
+            return False, None
+
+        return True, self.__decode_sequenced(item)
+
+    def __get_reordered(
+        self, buffer: reorder_buffer.ReorderBuffer, timeout: float | None
+    ) -> tuple[True, tuple[int | None, object]] | tuple[False, None]:
+        """
+        Get items into the reorder buffer until it releases one.
+
+        Return: Success, sequence number and item.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            # No more items arrive once the stream is complete
+            result, released = buffer.pop(time.monotonic(), self.__is_stream_complete())
+            if result:
+                return True, released
+
+            # Only wait until a missing number is skipped
+            wait_time = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+            gap_deadline = buffer.get_gap_deadline()
+            if gap_deadline is not None:
+                gap_wait_time = max(gap_deadline - time.monotonic(), 0.0)
+                wait_time = gap_wait_time if wait_time is None else min(wait_time, gap_wait_time)
+
+            result, item = self.__get_encoded(wait_time)
+            if result:
+                sequence, item = self.__decode_sequenced(item)
+                buffer.add(sequence, item, time.monotonic())
+                continue
+
+            if self.is_end_of_stream():
+                return False, None
+
+            if deadline is not None and time.monotonic() >= deadline:
+                # A missing number may have been skipped during the wait
+                return buffer.pop(time.monotonic(), False)
+
+    def __get_encoded(self, timeout: float | None) -> tuple[True, object] | tuple[False, None]:
+        """
+        Get an encoded item. End of stream markers are counted and skipped.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        blocked_time = 0.0
+
+        while True:
+            if self.__check_end_of_stream():
+                self.__metrics.add_get(0, blocked_time)
+                return False, None
+
+            # Only time the wait when the queue is empty
+            try:
+                item = self.queue.get(False)
+            except queue.Empty:
+                remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+                start_time = time.perf_counter()
+                result, item = self.__get_blocking(remaining)
+                blocked_time += time.perf_counter() - start_time
+                if not result:
+                    self.__metrics.add_get(0, blocked_time)
+                    return False, None
+
+            if isinstance(item, end_of_stream_counter.EndOfStream):
+                self.__end_of_stream.add()
+
+                # Flush the reorder buffer before the stream ends
+                if self.__reorder_buffer is not None and self.__is_stream_complete():
+                    self.__metrics.add_get(0, blocked_time)
+                    return False, None
+
+                continue
+
+            self.__metrics.add_get(1, blocked_time)
+            return True, item
+
+    async def put_async(
+        self, item: object, timeout: float | None = None, priority: int = 0, key: object = None
+    ) -> bool:
+        """
+        Put an item into the queue without blocking the event loop.
+
+        item: Item to put.
+        timeout: Seconds to wait for space. None waits forever.
+        priority: Priority level of the item, same as put().
+        key: Key of the item, same as put().
+
+        Return: Success. False if the item was dropped or the priority is out of range.
+        """
+        # The drop policies do not wait
+        if self.queue_property.overflow_policy not in QueueWrapper.__WAITING_POLICIES:
+            return self.put(item, timeout, priority, key)
+
+        if not self.__check_priority(priority):
+            return False
+
+        sequences = self.__take_sequences(1)
+        item = self.__encode(item, priority, key, sequences[0])
+        timeout, is_drop = self.__get_overflow_timeout(timeout)
+
+        # Only leave the event loop when the queue is full
+        if self.__put_waiting(item, 0.0, False):
+            return True
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait_time = QueueWrapper.__get_wait_time(deadline)
+            if await asyncio.to_thread(self.__put_waiting, item, wait_time, False):
+                return True
+
+            if deadline is not None and time.monotonic() >= deadline:
+                if is_drop:
+                    self.__metrics.add_drop(1)
+
+                return False
+
+    async def get_async(
+        self, timeout: float | None = None
+    ) -> tuple[True, object] | tuple[False, None]:
+        """
+        Get an item from the queue without blocking the event loop. End of stream markers are
+        counted and skipped.
+
+        timeout: Seconds to wait for an item. None waits forever.
+
+        Return: Success, item. False without waiting once the stream has ended during a drain.
+            If the call is cancelled while a thread is getting an item, the item is kept and
+            returned by the next get.
+        """
+        # Only leave the event loop when the queue is empty
+        result, item = self.get(0.0)
+        if result or self.is_end_of_stream():
+            return result, item
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait_time = QueueWrapper.__get_wait_time(deadline)
+            # Keep the context of the thread to carry the trace
+            context = contextvars.copy_context()
+            future = asyncio.get_running_loop().run_in_executor(
+                None, context.run, self.__get_sequenced, wait_time
+            )
+            try:
+                result, released = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # The thread is not stopped, so keep the item it gets
+                future.add_done_callback(functools.partial(self.__keep_pending, context))
+                raise
+
+            if result:
+                # Get Pylance to stop complaining
+                assert released is not None
+
+                if self.__tracer is not None:
+                    QueueWrapper.__current_trace.set(context.get(QueueWrapper.__current_trace))
+
+                return True, self.__carry_sequence(released)
+
+            # The thread runs in a copy of the context, so check again in this one
+            if self.__check_end_of_stream():
+                return False, None
+
+            if deadline is not None and time.monotonic() >= deadline:
+                return False, None
+
+    @staticmethod
+    def __get_wait_time(deadline: float | None) -> float:
+        """
+        Return: Seconds of the next wait in an executor thread.
+        """
+        if deadline is None:
+            return QueueWrapper.ASYNC_WAIT_PERIOD
+
+        return min(QueueWrapper.ASYNC_WAIT_PERIOD, max(deadline - time.monotonic(), 0.0))
+
+    def put_many(
+        self, items: list, timeout: float | None = None, priority: int = 0, key: object = None
+    ) -> int:
+        """
+        Put a batch of items into the queue in a single transfer.
+
+        items: Items to put, in order.
+        timeout: Seconds to wait for space. None waits forever. Follows the overflow policy like
+            put().
+        priority: Priority level of all items, same as put().
+        key: Key of all items, same as put().
+
+        Return: Number of items put, which is a prefix of items. The rest were dropped if the
+            overflow policy drops new items. 0 if the priority is out of range.
+        """
+        if len(items) == 0 or not self.__check_priority(priority):
+            return 0
+
+        sequences = self.__take_sequences(len(items))
+        return self.__put_many_encoded(
+            [
+                self.__encode(item, priority, key, sequence)
+                for item, sequence in zip(items, sequences)
+            ],
+            timeout,
+        )
+
+    def __put_many_encoded(self, items: list, timeout: float | None) -> int:
+        """
+        Put encoded items in order, following the overflow policy of the queue.
+
+        Return: Number of items put.
+        """
+        overflow_policy = self.queue_property.overflow_policy
+        if overflow_policy in QueueWrapper.__REPLACING_POLICIES:
+            for item in items:
+                self.__put_replacing(
+                    item, overflow_policy == queue_property_data.OverflowPolicy.LATEST_VALUE
+                )
+
+            return len(items)
+
+        timeout, is_drop = self.__get_overflow_timeout(timeout)
+
+        # Only time the wait when the queue is full
+        count = self.__put_many(items, False, None)
+        if count == len(items):
+            self.__metrics.add_put(count, 0.0)
+            return count
+
+        blocked_time = 0.0
+        if timeout is None or timeout > 0.0:
+            start_time = time.perf_counter()
+            count += self.__put_many(items[count:], True, timeout)
+            blocked_time = time.perf_counter() - start_time
+
+        self.__metrics.add_put(count, blocked_time)
+        if is_drop:
+            self.__metrics.add_drop(len(items) - count)
+
+        return count
+
+    def get_many(self, max_items: int, timeout: float | None = None) -> list[object]:
+        """
+        Get a batch of items from the queue in a single transfer. End of stream markers are
+        counted and skipped.
+
+        max_items: Maximum number of items in the batch. Must be greater than 0.
+        timeout: Seconds to wait for the batch to fill. None waits until the batch is full.
+
+        Return: Items in order. A partial batch (or empty) if the timeout is reached or the stream
+            has ended during a drain.
+        """
+        if max_items <= 0:
+            return []
+
+        # Items of a batch do not share a sequence number
+        if self.__is_sequenced:
+            QueueWrapper.__current_sequence.set(None)
+
+        # The batch carries the trace of its last traced item
+        if self.__tracer is not None:
+            self.__end_trace(self.__tracer)
+
+        # Items got by waits of get_async() that were cancelled come first
+        items = [released[1] for released in self.__pop_pending(max_items)]
+        if len(items) == max_items:
+            return items
+
+        if self.__reorder_buffer is not None:
+            return items + self.__get_many_reordered(max_items - len(items), timeout)
+
+        return items + self.__get_many_unordered(max_items - len(items), timeout)
+
+    def __get_many_unordered(self, max_items: int, timeout: float | None) -> list[object]:
+        """
+        Get a batch of items in the order of the underlying queue.
+        """
+        # Only time the wait for the batch to fill
+        items = self.__skip_end_of_stream(self.__get_many(max_items, False, None))
+        if len(items) == max_items or self.__check_end_of_stream():
+            self.__metrics.add_get(len(items), 0.0)
+            return items
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        start_time = time.perf_counter()
+        while len(items) < max_items and not self.__check_end_of_stream():
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+            batch = self.__get_many(max_items - len(items), True, remaining)
+            items += self.__skip_end_of_stream(batch)
+
+            # Timed out
+            if len(batch) == 0:
+                break
+
+        self.__metrics.add_get(len(items), time.perf_counter() - start_time)
+
+        return items
+
+    def __get_many_reordered(self, max_items: int, timeout: float | None) -> list[object]:
+        """
+        Get items released by the reorder buffer until the batch is full or the timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        items: list[object] = []
+        while len(items) < max_items:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+            result, released = self.__get_sequenced(remaining)
+            if not result:
+                break
+
+            # Get Pylance to stop complaining
+            assert released is not None
+
+            items.append(released[1])
+
+        return items
+
+    def begin_end_of_stream(self, producer_count: int) -> None:
+        """
+        Called by the worker manager when a drain begins.
+
+        producer_count: Number of workers that put a marker into this queue when they exit.
+        """
+        self.__end_of_stream.begin(producer_count)
+        for _, end_of_stream in self.__names_to_subscriber.values():
+            end_of_stream.begin(producer_count)
+
+    def reset_end_of_stream(self) -> None:
+        """
+        Called by the worker manager before workers start, so that the queue and its subscribers
+        are not ended by the last drain.
+        """
+        self.__end_of_stream.reset()
+        for _, end_of_stream in self.__names_to_subscriber.values():
+            end_of_stream.reset()
+
+    def put_end_of_stream(self, timeout: float | None = None) -> bool:
+        """
+        Put an end of stream marker into the queue. Markers have the lowest priority level.
+
+        timeout: Seconds to wait for space. None waits forever.
+
+        Return: Success.
+        """
+        return self.__put_blocking(
+            self.__encode(end_of_stream_counter.EndOfStream(), 0, None, None), timeout
+        )
+
+    def is_end_of_stream(self) -> bool:
+        """
+        Return: Whether a get in this thread, or in this asyncio task, found that all producers
+            have sent their marker and the queue is empty.
+        """
+        return self.__get_ended_queue_key() in QueueWrapper.__ended_queue_keys.get()
+
+    def __get_ended_queue_key(self) -> tuple[object, int]:
+        """
+        Return: Key of the queue in the set of ended queues, for the current run.
+        """
+        return self.__end_of_stream_key, self.__end_of_stream.get_generation()
+
+    def __check_end_of_stream(self) -> bool:
+        """
+        Return: Whether the stream has ended: all producers have sent their marker and the queue
+            and its reorder buffer are empty. Items put by other processes are still received.
+        """
+        if not self.__is_stream_complete():
+            return False
+
+        if self.__reorder_buffer is not None and self.__reorder_buffer.get_occupancy() > 0:
+            return False
+
+        ended_queue_key = self.__get_ended_queue_key()
+        ended_queue_keys = QueueWrapper.__ended_queue_keys.get()
+        if ended_queue_key not in ended_queue_keys:
+            QueueWrapper.__ended_queue_keys.set(ended_queue_keys | {ended_queue_key})
+
+        return True
+
+    def __is_stream_complete(self) -> bool:
+        """
+        Return: Whether all producers have sent their marker and the queue is empty.
+        """
+        return self.__end_of_stream.is_complete() and self.get_depth() == 0
+
+    def __skip_end_of_stream(self, items: list[object]) -> list[object]:
+        """
+        Count the markers in a batch.
+
+        Return: Items without markers.
+        """
+        filtered_items = [
+            self.__decode(item)
+            for item in items
+            if not isinstance(item, end_of_stream_counter.EndOfStream)
+        ]
+        for _ in range(0, len(items) - len(filtered_items)):
+            self.__end_of_stream.add()
+
+        return filtered_items
+
+    def __check_priority(self, priority: int) -> bool:
+        """
+        Return: Whether the priority is a level of the queue.
+        """
+        if 0 <= priority < self.queue_property.priority_levels:
+            return True
+
+        print(f"ERROR: Priority {priority} out of range for queue: {self.queue_property.name}")
+        return False
+
+    def __take_sequences(self, count: int) -> list[int | None]:
+        """
+        Number the items of a put. Queues that stamp take the next numbers from the sequence
+        counter, reorder queues use the number of the item last got.
+
+        count: Number of items.
+
+        Return: Sequence number of each item.
+        """
+        if self.__sequence_counter is None:
+            sequence = None
+            if self.__is_sequenced:
+                sequence = QueueWrapper.__current_sequence.get()
+
+            return [sequence] * count
+
+        first_sequence = self.__sequence_counter.take(count)
+        return list(range(first_sequence, first_sequence + count))
+
+    def __carry_sequence(self, released: tuple[int | None, object]) -> object:
+        """
+        Keep the sequence number of an item got for the puts that follow.
+
+        Return: Item.
+        """
+        sequence, item = released
+        if self.__is_sequenced:
+            QueueWrapper.__current_sequence.set(sequence)
+
+        return item
+
+    def __trace(self, item_tracer: tracer.Tracer, item: object) -> object:
+        """
+        Attach the trace carried by this thread or asyncio task, or sample a new trace if it has
+        not got an item.
+
+        Return: Traced item, or the item if it is not traced.
+        """
+        current_trace = QueueWrapper.__current_trace.get()
+        if current_trace is None:
+            trace_id = item_tracer.sample()
+        else:
+            trace_id = current_trace[0]
+
+        if trace_id == tracer.UNTRACED:
+            return item
+
+        return tracer.TracedItem(trace_id, time.monotonic(), item)
+
+    def __carry_trace(self, item_tracer: tracer.Tracer, item: tracer.TracedItem) -> object:
+        """
+        Record the wait of a traced item got from the queue, and keep its trace for the puts that
+        follow.
+
+        Return: Item.
+        """
+        get_time = time.monotonic()
+        item_tracer.add_wait(self.queue_property.name, item.trace_id, item.put_time, get_time)
+        QueueWrapper.__current_trace.set((item.trace_id, get_time, self.queue_property.name))
+
+        return item.item
+
+    def __end_trace(self, item_tracer: tracer.Tracer) -> None:
+        """
+        Record the time spent on the traced item last got in this thread or asyncio task.
+        """
+        current_trace = QueueWrapper.__current_trace.get()
+        if current_trace is not None and current_trace[0] != tracer.UNTRACED:
+            trace_id, get_time, queue_name = current_trace
+            item_tracer.add_process(queue_name, trace_id, get_time, time.monotonic())
+
+        QueueWrapper.__current_trace.set((tracer.UNTRACED, 0.0, ""))
+
+    @staticmethod
+    def reset_context() -> None:
+        """
+        Called by the worker before the target function runs. A forked worker starts with the
+        context of the thread that started it, so forget the queues it found ended and the
+        sequence number and trace of the item it got last.
+        """
+        QueueWrapper.__ended_queue_keys.set(frozenset())
+        QueueWrapper.__current_sequence.set(None)
+        QueueWrapper.__current_trace.set(None)
+
+    def flush_trace(self) -> None:
+        """
+        Called by the worker when it exits. Write the trace events of this process to a file.
+        """
+        if self.__tracer is not None:
+            self.__end_trace(self.__tracer)
+            self.__tracer.flush()
+
+    def __encode(self, item: object, priority: int, key: object, sequence: int | None) -> object:
+        """
+        Serialize the item for the manager backend, pair it with the sequence number for queues
+        with sequence numbers, then with the priority for priority queues or with the key for
+        partitioned queues. Markers are not serialized nor numbered.
+        """
+        is_marker = isinstance(item, end_of_stream_counter.EndOfStream)
+        if self.__frame_serializer is not None and not is_marker:
+            # The queue proxy pickles with a protocol that does not support views
+            item = [bytearray(frame) for frame in self.__frame_serializer.dumps(item)]
+
+        if self.__is_sequenced and not is_marker:
+            item = sequence, item
+
+        if self.__tracer is not None and self.__is_trace_carried and not is_marker:
+            item = self.__trace(self.__tracer, item)
+
+        if self.__is_priority:
+            return priority, item
+
+        if self.__is_partitioned:
+            return key, item
+
+        return item
+
+    def __decode(self, item: object) -> object:
+        """
+        Deserialize an item from __encode().
+        """
+        return self.__decode_sequenced(item)[1]
+
+    def __decode_sequenced(self, item: object) -> tuple[int | None, object]:
+        """
+        Deserialize an item from __encode().
+
+        Return: Sequence number, None if the queue does not have sequence numbers, and item.
+        """
+        if self.__tracer is not None and isinstance(item, tracer.TracedItem):
+            item = self.__carry_trace(self.__tracer, item)
+
+        sequence = None
+        if self.__is_sequenced:
+            sequence, item = item  # type: ignore
+
+        if self.__frame_serializer is None:
+            return sequence, item
+
+        return sequence, self.__frame_serializer.loads(item)  # type: ignore
+
+    def __get_overflow_timeout(self, timeout: float | None) -> tuple[float | None, bool]:
+        """
+        Apply the block with timeout and drop newest policies to the timeout of a put.
+
+        Return: Seconds to wait for space, whether an item that does not fit is dropped.
+        """
+        match self.queue_property.overflow_policy:
+            case queue_property_data.OverflowPolicy.DROP_NEWEST:
+                return 0.0, True
+            case queue_property_data.OverflowPolicy.BLOCK_TIMEOUT:
+                overflow_timeout = self.queue_property.overflow_timeout
+                # Get Pylance to stop complaining
+                assert overflow_timeout is not None
+
+                # A shorter timeout of the caller is not a drop
+                if timeout is None or timeout >= overflow_timeout:
+                    return overflow_timeout, True
+
+                return timeout, False
+            case _:
+                return timeout, False
+
+    def __put_waiting(self, item: object, timeout: float | None, is_drop: bool) -> bool:
+        """
+        Put an encoded item, waiting for space until the timeout.
+
+        is_drop: Whether an item that does not fit is counted as dropped.
+        """
+        # Only time the wait when the queue is full
+        try:
+            self.queue.put(item, False)
+        except queue.Full:
+            pass
+        else:
+            self.__metrics.add_put(1, 0.0)
+            return True
+
+        result = False
+        blocked_time = 0.0
+        if timeout is None or timeout > 0.0:
+            start_time = time.perf_counter()
+            result = self.__put_blocking(item, timeout)
+            blocked_time = time.perf_counter() - start_time
+
+        self.__metrics.add_put(1 if result else 0, blocked_time)
+        if not result and is_drop:
+            self.__metrics.add_drop(1)
+
+        return result
+
+    def __put_replacing(self, item: object, is_latest: bool) -> bool:
+        """
+        Put an encoded item without waiting, dropping the oldest items to make space.
+
+        is_latest: Whether all items in the queue are dropped, not only as many as needed.
+
+        Return: True.
+        """
+        drop_count = 0
+        while True:
+            if is_latest:
+                drop_count += self.__discard(None)
+
+            try:
+                self.queue.put(item, False)
+            except queue.Full:
+                # Another producer may have filled the space, try again
+                if not is_latest:
+                    drop_count += self.__discard(1)
+
+                continue
+
+            break
+
+        self.__metrics.add_put(1, 0.0)
+        self.__metrics.add_drop(drop_count)
+
+        return True
+
+    def __discard(self, max_items: int | None) -> int:
+        """
+        Remove items from the queue without waiting. End of stream markers are counted as received
+        instead of dropped.
+
+        max_items: Maximum number of items to remove. None removes all items.
+
+        Return: Number of items dropped.
+        """
+        drop_count = 0
+        removed_count = 0
+        while max_items is None or removed_count < max_items:
+            try:
+                item = self.queue.get(False)
+            except queue.Empty:
+                break
+
+            removed_count += 1
+            if isinstance(item, end_of_stream_counter.EndOfStream):
+                self.__end_of_stream.add()
+            else:
+                drop_count += 1
+
+        return drop_count
+
+    def __put_blocking(self, item: object, timeout: float | None) -> bool:
+        """
+        Put without counting.
+        """
+        try:
+            self.queue.put(item, True, timeout)
+        except queue.Full:
+            return False
+
+        return True
+
+    def __get_blocking(self, timeout: float | None) -> tuple[True, object] | tuple[False, None]:
+        """
+        Get without counting.
+        """
+        try:
+            item = self.queue.get(True, timeout)
+        except queue.Empty:
+            return False, None
+
+        return True, item
+
+    def __put_many(self, items: list, block: bool, timeout: float | None) -> int:
+        """
+        Put many without counting.
+        """
+        if self.__is_batch_native:
+            return self.queue.put_many(items, block, timeout)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        count = 0
+        for item in items:
+            if block:
+                remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+                if not self.__put_blocking(item, remaining):
+                    break
+            else:
+                try:
+                    self.queue.put(item, False)
+                except queue.Full:
+                    break
+
+            count += 1
+
+        return count
+
+    def __get_many(self, max_items: int, block: bool, timeout: float | None) -> list[object]:
+        """
+        Get many without counting.
+        """
+        if self.__is_batch_native:
+            return self.queue.get_many(max_items, block, timeout)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        items = []
+        while len(items) < max_items:
+            # Only wait for the first item, so get_many() checks for the end of the stream between
+            # items that arrive one at a time
+            if block and len(items) == 0:
+                remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+                result, item = self.__get_blocking(remaining)
+                if not result:
+                    break
+            else:
+                try:
+                    item = self.queue.get(False)
+                except queue.Empty:
+                    break
+
+            items.append(item)
+
+        return items
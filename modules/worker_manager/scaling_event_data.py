@@ -0,0 +1,48 @@
+"""
+Scaling event data.
+"""
+
+
+class ScalingEventData:
+    """
+    A worker group was scaled up or down.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls, group_name: str, time: float, old_count: int, new_count: int, depth: int
+    ) -> tuple[True, "ScalingEventData"] | tuple[False, None]:
+        """
+        group_name: Name of the worker group.
+        time: Time of the event from time.monotonic().
+        old_count: Number of workers before the event.
+        new_count: Number of workers after the event.
+        depth: Total number of items in the input queues of the group when sampled.
+
+        Return: Success, object.
+        """
+        return True, ScalingEventData(
+            cls.__create_key, group_name, time, old_count, new_count, depth
+        )
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        group_name: str,
+        time: float,
+        old_count: int,
+        new_count: int,
+        depth: int,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is ScalingEventData.__create_key, "Use create() method"
+
+        self.group_name = group_name
+        self.time = time
+        self.old_count = old_count
+        self.new_count = new_count
+        self.depth = depth
@@ -0,0 +1,90 @@
+"""
+Scaling policy data.
+"""
+
+
+class ScalingPolicyData:
+    """
+    When to add or retire workers of a group based on the depth of its input queues.
+
+    The depth is the total number of items in the input queues, divided by the number of workers.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        min_count: int,
+        max_count: int,
+        scale_up_depth: float,
+        scale_down_depth: float,
+        sample_count: int,
+        cooldown: float,
+    ) -> tuple[True, "ScalingPolicyData"] | tuple[False, None]:
+        """
+        min_count: Minimum number of workers. Must be greater than 0.
+        max_count: Maximum number of workers. Must be at least min_count.
+        scale_up_depth: A worker is added when the depth is above this.
+        scale_down_depth: A worker is retired when the depth is at or below this.
+            Must be less than scale_up_depth, the gap between them is the hysteresis band.
+        sample_count: Number of consecutive samples beyond a threshold required to scale. Must be greater than 0.
+        cooldown: Seconds after a scaling event before the group can scale again. Must not be negative.
+
+        Return: Success, object.
+        """
+        if min_count <= 0:
+            print("ERROR: Minimum worker count must be greater than 0")
+            return False, None
+
+        if max_count < min_count:
+            print("ERROR: Maximum worker count must be at least the minimum")
+            return False, None
+
+        if scale_down_depth < 0.0:
+            print("ERROR: Scale down depth cannot be negative")
+            return False, None
+
+        if scale_up_depth <= scale_down_depth:
+            print("ERROR: Scale up depth must be greater than scale down depth")
+            return False, None
+
+        if sample_count <= 0:
+            print("ERROR: Sample count must be greater than 0")
+            return False, None
+
+        if cooldown < 0.0:
+            print("ERROR: Cooldown cannot be negative")
+            return False, None
+
+        return True, ScalingPolicyData(
+            cls.__create_key,
+            min_count,
+            max_count,
+            scale_up_depth,
+            scale_down_depth,
+            sample_count,
+            cooldown,
+        )
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        min_count: int,
+        max_count: int,
+        scale_up_depth: float,
+        scale_down_depth: float,
+        sample_count: int,
+        cooldown: float,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is ScalingPolicyData.__create_key, "Use create() method"
+
+        self.min_count = min_count
+        self.max_count = max_count
+        self.scale_up_depth = scale_up_depth
+        self.scale_down_depth = scale_down_depth
+        self.sample_count = sample_count
+        self.cooldown = cooldown
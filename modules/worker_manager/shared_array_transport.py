@@ -0,0 +1,312 @@
+"""
+Zero-copy NumPy array transport.
+"""
+
+import multiprocessing.context
+import multiprocessing.shared_memory
+import os
+import queue
+import weakref
+
+import numpy as np
+
+from . import queue_wrapper
+from .private import shared_memory_queue
+
+
+class SharedArrayHandle:
+    """
+    Location of an array in a shared memory slot. This is what goes through the queue.
+    """
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls, slot_index: int, offset: int, shape: tuple[int, ...], dtype: str
+    ) -> tuple[True, "SharedArrayHandle"] | tuple[False, None]:
+        """
+        slot_index: Index of the slot in the pool.
+        offset: Byte offset of the slot in the shared memory.
+        shape: Shape of the array.
+        dtype: NumPy data type string of the array.
+
+        Return: Success, object.
+        """
+        return True, SharedArrayHandle(cls.__create_key, slot_index, offset, shape, dtype)
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        slot_index: int,
+        offset: int,
+        shape: tuple[int, ...],
+        dtype: str,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is SharedArrayHandle.__create_key, "Use create() method"
+
+        self.slot_index = slot_index
+        self.offset = offset
+        self.shape = shape
+        self.dtype = dtype
+
+
+class SharedArrayTransport:
+    """
+    Sends NumPy arrays through a queue without copying them through the queue.
+
+    The producer writes the array into a free slot of a shared memory pool and only the handle
+    goes through the queue. The consumer gets a read-only view of the slot and must release the
+    handle when done, which recycles the slot.
+
+    Pass the transport to the workers in the target arguments. Like multiprocessing queues, it can
+    only be passed to a child process as an argument when the process is started.
+    """
+
+    # Slots are aligned for SIMD loads
+    __SLOT_ALIGNMENT = 64
+    # Slot indices are small integers
+    __FREE_LIST_SLOT_SIZE = 32
+
+    __create_key = object()
+
+    @classmethod
+    def create(
+        cls,
+        queue_handles: queue_wrapper.QueueWrapper,
+        slot_count: int,
+        slot_size: int,
+        mp_context: multiprocessing.context.BaseContext | None = None,
+    ) -> tuple[True, "SharedArrayTransport"] | tuple[False, None]:
+        """
+        queue_handles: Queue for the handles.
+        slot_count: Number of arrays that can be in flight. Must be greater than 0.
+        slot_size: Maximum size of an array in bytes. Must be greater than 0.
+        mp_context: Multiprocessing context of the processes using the transport. None is the
+            default context.
+
+        Return: Success, object.
+        """
+        if slot_count <= 0:
+            print("ERROR: Slot count must be greater than 0")
+            return False, None
+
+        if slot_size <= 0:
+            print("ERROR: Slot size must be greater than 0")
+            return False, None
+
+        alignment = cls.__SLOT_ALIGNMENT
+        slot_stride = (slot_size + alignment - 1) // alignment * alignment
+
+        try:
+            shared_memory = multiprocessing.shared_memory.SharedMemory(
+                create=True, size=slot_count * slot_stride
+            )
+        except OSError as e:
+            print(f"ERROR: Failed to allocate shared memory: {e}")
+            return False, None
+
+        result, free_slots = shared_memory_queue.SharedMemoryQueue.create(
+            slot_count, cls.__FREE_LIST_SLOT_SIZE, mp_context
+        )
+        if not result:
+            print("ERROR: Failed to create free slot list")
+            SharedArrayTransport.__release(shared_memory, os.getpid())
+            return False, None
+
+        # Get Pylance to stop complaining
+        assert free_slots is not None
+
+        count = free_slots.put_many(list(range(0, slot_count)), False)
+        assert count == slot_count
+
+        return True, SharedArrayTransport(
+            cls.__create_key, queue_handles, shared_memory, free_slots, slot_size, slot_stride
+        )
+
+    def __init__(
+        self,
+        class_private_create_key: object,
+        queue_handles: queue_wrapper.QueueWrapper,
+        shared_memory: multiprocessing.shared_memory.SharedMemory,
+        free_slots: shared_memory_queue.SharedMemoryQueue,
+        slot_size: int,
+        slot_stride: int,
+    ) -> None:
+        """
+        Private constructor, use create() method.
+        """
+        assert class_private_create_key is SharedArrayTransport.__create_key, "Use create() method"
+
+        self.queue_handles = queue_handles
+
+        self.__shared_memory = shared_memory
+        self.__free_slots = free_slots
+        self.__slot_size = slot_size
+        self.__slot_stride = slot_stride
+
+        # Only the creating process releases the shared memory
+        self.__finalizer = weakref.finalize(
+            self, SharedArrayTransport.__release, shared_memory, os.getpid()
+        )
+
+    @staticmethod
+    def __release(
+        shared_memory: multiprocessing.shared_memory.SharedMemory, owner_pid: int
+    ) -> None:
+        """
+        Close the shared memory, and unlink it if this is the creating process.
+        """
+        try:
+            shared_memory.close()
+        except BufferError:
+            # Views are still alive, the mapping is released with them
+            pass
+
+        if os.getpid() == owner_pid:
+            shared_memory.unlink()
+
+    def __getstate__(self) -> dict:
+        """
+        Pickle by shared memory name, the child process attaches to the same pool.
+        """
+        return {
+            "queue_handles": self.queue_handles,
+            "name": self.__shared_memory.name,
+            "free_slots": self.__free_slots,
+            "slot_size": self.__slot_size,
+            "slot_stride": self.__slot_stride,
+        }
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Attach to the shared memory of the parent.
+        """
+        self.queue_handles = state["queue_handles"]
+        self.__shared_memory = multiprocessing.shared_memory.SharedMemory(name=state["name"])
+        self.__free_slots = state["free_slots"]
+        self.__slot_size = state["slot_size"]
+        self.__slot_stride = state["slot_stride"]
+
+        # Owner PID of 0 never matches, so attached processes only close
+        self.__finalizer = weakref.finalize(
+            self, SharedArrayTransport.__release, self.__shared_memory, 0
+        )
+
+    def __view(self, handle: SharedArrayHandle, is_writable: bool) -> np.ndarray:
+        """
+        Array view of the slot.
+        """
+        buffer = self.__shared_memory.buf
+        if not is_writable:
+            # Unlike clearing the writeable flag, the view cannot be made writable again
+            buffer = buffer.toreadonly()
+
+        count = int(np.prod(handle.shape, dtype=np.int64))
+        return np.frombuffer(buffer, handle.dtype, count, handle.offset).reshape(handle.shape)
+
+    def acquire(
+        self, shape: tuple[int, ...], dtype: "np.typing.DTypeLike", timeout: float | None = None
+    ) -> tuple[True, SharedArrayHandle, np.ndarray] | tuple[False, None, None]:
+        """
+        Reserve a free slot for the producer to write an array into directly.
+
+        shape: Shape of the array.
+        dtype: Data type of the array.
+        timeout: Seconds to wait for a free slot. None waits forever.
+
+        Return: Success, handle, writable view of the slot.
+        """
+        dtype = np.dtype(dtype)
+        size = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+        if size > self.__slot_size:
+            print(f"ERROR: Array of {size} bytes exceeds slot size {self.__slot_size}")
+            return False, None, None
+
+        try:
+            slot_index = self.__free_slots.get(True, timeout)
+        except queue.Empty:
+            return False, None, None
+
+        result, handle = SharedArrayHandle.create(
+            slot_index, slot_index * self.__slot_stride, tuple(shape), dtype.str
+        )
+        assert result
+        assert handle is not None
+
+        return True, handle, self.__view(handle, True)
+
+    def send(self, handle: SharedArrayHandle, timeout: float | None = None) -> bool:
+        """
+        Send a handle from acquire() to the consumer. The producer must not write to it afterwards.
+
+        handle: Handle of the written slot.
+        timeout: Seconds to wait for space in the queue. None waits forever.
+
+        Return: Success. On failure the slot is still owned by the producer.
+        """
+        return self.queue_handles.put(handle, timeout)
+
+    def put(self, array: np.ndarray, timeout: float | None = None) -> bool:
+        """
+        Copy the array into a free slot and send it. Use acquire() and send() to avoid the copy.
+
+        array: Array to send.
+        timeout: Seconds to wait for a free slot, and then again for space in the queue.
+
+        Return: Success.
+        """
+        result, handle, view = self.acquire(array.shape, array.dtype, timeout)
+        if not result:
+            return False
+
+        # Get Pylance to stop complaining
+        assert handle is not None
+        assert view is not None
+
+        np.copyto(view, array)
+
+        result = self.send(handle, timeout)
+        if not result:
+            self.release(handle)
+            return False
+
+        return True
+
+    def get(
+        self, timeout: float | None = None
+    ) -> tuple[True, SharedArrayHandle, np.ndarray] | tuple[False, None, None]:
+        """
+        Receive an array without copying.
+
+        timeout: Seconds to wait for an array. None waits forever.
+
+        Return: Success, handle, read-only view of the slot. Release the handle when done with the
+            view.
+        """
+        result, handle = self.queue_handles.get(timeout)
+        if not result:
+            return False, None, None
+
+        # Get Pylance to stop complaining
+        assert handle is not None
+
+        return True, handle, self.__view(handle, False)
+
+    def release(self, handle: SharedArrayHandle) -> None:
+        """
+        Return the slot to the pool. Views of the slot must not be used afterwards.
+
+        handle: Handle from get(), or from acquire() if it was not sent.
+        """
+        self.__free_slots.put(handle.slot_index)
+
+    def close(self) -> None:
+        """
+        Release the shared memory in this process. The transport must not be used afterwards.
+        """
+        self.__free_slots.close()
+        self.__finalizer()
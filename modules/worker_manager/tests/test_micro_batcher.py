@@ -0,0 +1,188 @@
+"""
+Test micro batcher.
+"""
+
+import multiprocessing as mp
+import threading
+import time
+
+import pytest
+
+from modules.worker_manager import micro_batcher
+from modules.worker_manager import queue_property_data
+from modules.worker_manager import queue_wrapper
+from modules.worker_manager import worker_controller
+from modules.worker_manager.private import worker_sync_manager
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture
+def input_queue() -> queue_wrapper.QueueWrapper:  # type: ignore
+    """
+    In-process queue with max size 20.
+    """
+    result, queue_property = queue_property_data.QueuePropertyData.create(
+        "queue", 20, queue_property_data.QueueBackend.IN_PROCESS
+    )
+    assert result
+    assert queue_property is not None
+
+    with worker_sync_manager.WorkerSyncManager() as mp_manager:
+        result, input_queue = queue_wrapper.QueueWrapper.create(mp_manager, queue_property)
+        assert result
+        assert input_queue is not None
+
+        yield input_queue  # type: ignore
+
+
+@pytest.fixture
+def controller() -> worker_controller.WorkerController:  # type: ignore
+    """
+    Worker controller.
+    """
+    result, controller = worker_controller.WorkerController.create(2, mp.get_context())
+    assert result
+    assert controller is not None
+
+    yield controller  # type: ignore
+
+
+def create_batcher(
+    input_queue: queue_wrapper.QueueWrapper, max_batch_size: int, max_wait_time: float
+) -> micro_batcher.MicroBatcher:
+    """
+    Micro batcher of the input queue.
+    """
+    result, batcher = micro_batcher.MicroBatcher.create(input_queue, max_batch_size, max_wait_time)
+    assert result
+    assert batcher is not None
+
+    return batcher
+
+
+class TestCreate:
+    """
+    Test create() method.
+    """
+
+    def test_max_batch_size_zero(self, input_queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        Max batch size must be greater than 0.
+        """
+        result, batcher = micro_batcher.MicroBatcher.create(input_queue, 0, 1.0)
+
+        assert not result
+        assert batcher is None
+
+    def test_max_wait_time_negative(self, input_queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        Max wait time must not be negative.
+        """
+        result, batcher = micro_batcher.MicroBatcher.create(input_queue, 4, -1.0)
+
+        assert not result
+        assert batcher is None
+
+
+class TestBatches:
+    """
+    Test batches() method.
+    """
+
+    def test_size_and_wait(
+        self,
+        input_queue: queue_wrapper.QueueWrapper,
+        controller: worker_controller.WorkerController,
+    ) -> None:
+        """
+        Full batches are yielded immediately, a partial batch after the max wait time.
+        """
+        batcher = create_batcher(input_queue, 4, 0.05)
+        assert input_queue.put_many(list(range(0, 10))) == 10
+
+        batches = batcher.batches(controller)
+        assert next(batches) == [0, 1, 2, 3]
+        assert next(batches) == [4, 5, 6, 7]
+
+        start_time = time.monotonic()
+        assert next(batches) == [8, 9]
+        assert 0.05 <= time.monotonic() - start_time < 1.0
+
+        controller.request_exit()
+        assert len(list(batches)) == 0
+
+        result, metrics = input_queue.get_metrics()
+        assert result
+        assert metrics is not None
+
+        assert metrics.batch_size_histogram[:3] == [0, 1, 2]
+        assert sum(metrics.batch_size_histogram) == 3
+
+    def test_flush_on_exit(
+        self,
+        input_queue: queue_wrapper.QueueWrapper,
+        controller: worker_controller.WorkerController,
+    ) -> None:
+        """
+        A partial batch is yielded without waiting when the worker should exit.
+        """
+        batcher = create_batcher(input_queue, 10, 60.0)
+        assert input_queue.put_many([0, 1]) == 2
+
+        timer = threading.Timer(0.1, controller.request_exit)
+        timer.start()
+
+        start_time = time.monotonic()
+        assert list(batcher.batches(controller)) == [[0, 1]]
+        assert time.monotonic() - start_time < 1.0
+
+        timer.join()
+
+    def test_flush_on_pause(
+        self,
+        input_queue: queue_wrapper.QueueWrapper,
+        controller: worker_controller.WorkerController,
+    ) -> None:
+        """
+        A partial batch is yielded without waiting before the worker pauses.
+        """
+        batcher = create_batcher(input_queue, 10, 3.0)
+        assert input_queue.put_many([0, 1]) == 2
+
+        timer = threading.Timer(0.1, controller.request_pause)
+        timer.start()
+        # Otherwise a held batch waits forever
+        resume_timer = threading.Timer(1.5, controller.request_resume)
+        resume_timer.start()
+
+        start_time = time.monotonic()
+        assert next(batcher.batches(controller)) == [0, 1]
+        assert time.monotonic() - start_time < 1.0
+
+        resume_timer.cancel()
+        timer.join()
+        assert controller.get_state() == worker_controller.WorkerState.RUNNING
+
+    def test_drain(
+        self,
+        input_queue: queue_wrapper.QueueWrapper,
+        controller: worker_controller.WorkerController,
+    ) -> None:
+        """
+        All items are yielded before the input queue ends.
+        """
+        batcher = create_batcher(input_queue, 2, 60.0)
+        controller.set_input_queues([input_queue])
+        input_queue.begin_end_of_stream(1)
+
+        assert input_queue.put_many([0, 1, 2]) == 3
+        assert input_queue.put_end_of_stream()
+        controller.request_drain()
+
+        start_time = time.monotonic()
+        assert list(batcher.batches(controller)) == [[0, 1], [2]]
+        assert time.monotonic() - start_time < 1.0
@@ -62,3 +62,375 @@ class TestCreate:
 
         assert not result
         assert queue_property is None
+
+    def test_slot_size_zero(self) -> None:
+        """
+        Zero slot_size.
+        """
+        name = "abc"
+        max_size = 5
+
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            name, max_size, queue_property_data.QueueBackend.SHARED_MEMORY, 0
+        )
+
+        assert not result
+        assert queue_property is None
+
+    def test_custom_serializer_missing_decode(self) -> None:
+        """
+        Custom serializer without decode.
+        """
+        name = "abc"
+        max_size = 5
+
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            name,
+            max_size,
+            serializer_kind=queue_property_data.SerializerKind.CUSTOM,
+            encode=str.encode,
+        )
+
+        assert not result
+        assert queue_property is None
+
+    def test_encode_without_custom_serializer(self) -> None:
+        """
+        Encode and decode for a serializer that does not use them.
+        """
+        name = "abc"
+        max_size = 5
+
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            name,
+            max_size,
+            serializer_kind=queue_property_data.SerializerKind.BYTES,
+            encode=str.encode,
+            decode=bytes.decode,
+        )
+
+        assert not result
+        assert queue_property is None
+
+    def test_block_timeout_missing_timeout(self) -> None:
+        """
+        Block with timeout without an overflow timeout.
+        """
+        name = "abc"
+        max_size = 5
+
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            name,
+            max_size,
+            overflow_policy=queue_property_data.OverflowPolicy.BLOCK_TIMEOUT,
+        )
+
+        assert not result
+        assert queue_property is None
+
+    def test_overflow_timeout_negative(self) -> None:
+        """
+        Overflow timeout must not be negative.
+        """
+        name = "abc"
+        max_size = 5
+
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            name,
+            max_size,
+            overflow_policy=queue_property_data.OverflowPolicy.BLOCK_TIMEOUT,
+            overflow_timeout=-1.0,
+        )
+
+        assert not result
+        assert queue_property is None
+
+    def test_overflow_timeout_without_block_timeout(self) -> None:
+        """
+        Overflow timeout for a policy that does not use it.
+        """
+        name = "abc"
+        max_size = 5
+
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            name,
+            max_size,
+            overflow_policy=queue_property_data.OverflowPolicy.DROP_NEWEST,
+            overflow_timeout=1.0,
+        )
+
+        assert not result
+        assert queue_property is None
+
+    def test_priority_levels_zero(self) -> None:
+        """
+        Priority levels must be greater than 0.
+        """
+        name = "abc"
+        max_size = 5
+
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            name, max_size, priority_levels=0
+        )
+
+        assert not result
+        assert queue_property is None
+
+    def test_priority_shared_memory(self) -> None:
+        """
+        Shared memory backend does not support priority levels.
+        """
+        name = "abc"
+        max_size = 5
+
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            name, max_size, queue_property_data.QueueBackend.SHARED_MEMORY, priority_levels=2
+        )
+
+        assert not result
+        assert queue_property is None
+
+    def test_priority_drop_oldest(self) -> None:
+        """
+        Drop oldest does not support priority levels.
+        """
+        name = "abc"
+        max_size = 5
+
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            name,
+            max_size,
+            overflow_policy=queue_property_data.OverflowPolicy.DROP_OLDEST,
+            priority_levels=2,
+        )
+
+        assert not result
+        assert queue_property is None
+
+    def test_starvation_limit_without_priority(self) -> None:
+        """
+        Starvation limit for a FIFO queue.
+        """
+        name = "abc"
+        max_size = 5
+
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            name, max_size, starvation_limit=2
+        )
+
+        assert not result
+        assert queue_property is None
+
+    def test_partition_count_zero(self) -> None:
+        """
+        Partition count must be greater than 0.
+        """
+        name = "abc"
+        max_size = 5
+
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            name, max_size, partition_count=0
+        )
+
+        assert not result
+        assert queue_property is None
+
+    def test_partitions_with_priority(self) -> None:
+        """
+        Partitions do not support priority levels.
+        """
+        name = "abc"
+        max_size = 5
+
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            name, max_size, priority_levels=2, partition_count=2
+        )
+
+        assert not result
+        assert queue_property is None
+
+    def test_partitions_latest_value(self) -> None:
+        """
+        Latest value does not support partitions.
+        """
+        name = "abc"
+        max_size = 5
+
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            name,
+            max_size,
+            overflow_policy=queue_property_data.OverflowPolicy.LATEST_VALUE,
+            partition_count=2,
+        )
+
+        assert not result
+        assert queue_property is None
+
+    def test_reorder_buffer_size_zero(self) -> None:
+        """
+        Reorder buffer size must be greater than 0.
+        """
+        name = "abc"
+        max_size = 5
+
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            name,
+            max_size,
+            sequence_mode=queue_property_data.SequenceMode.REORDER,
+            reorder_buffer_size=0,
+        )
+
+        assert not result
+        assert queue_property is None
+
+    def test_reorder_gap_timeout_negative(self) -> None:
+        """
+        Reorder gap timeout must not be negative.
+        """
+        name = "abc"
+        max_size = 5
+
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            name,
+            max_size,
+            sequence_mode=queue_property_data.SequenceMode.REORDER,
+            reorder_gap_timeout=-1.0,
+        )
+
+        assert not result
+        assert queue_property is None
+
+    def test_sequence_shared_memory_bytes(self) -> None:
+        """
+        Shared memory queues only number items with the pickle serializers.
+        """
+        name = "abc"
+        max_size = 5
+
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            name,
+            max_size,
+            queue_property_data.QueueBackend.SHARED_MEMORY,
+            serializer_kind=queue_property_data.SerializerKind.BYTES,
+            sequence_mode=queue_property_data.SequenceMode.STAMP,
+        )
+
+        assert not result
+        assert queue_property is None
+
+
+class TestProcess:
+    """
+    Test create() method with the process backend.
+    """
+
+    def test_priority(self) -> None:
+        """
+        Process backend does not support priority levels.
+        """
+        name = "abc"
+        max_size = 5
+
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            name, max_size, queue_property_data.QueueBackend.PROCESS, priority_levels=2
+        )
+
+        assert not result
+        assert queue_property is None
+
+    def test_latest_value(self) -> None:
+        """
+        Process backend does not support dropping items in the queue.
+        """
+        name = "abc"
+        max_size = 5
+
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            name,
+            max_size,
+            queue_property_data.QueueBackend.PROCESS,
+            overflow_policy=queue_property_data.OverflowPolicy.LATEST_VALUE,
+        )
+
+        assert not result
+        assert queue_property is None
+
+
+class TestBroadcast:
+    """
+    Test create() method with the broadcast backend.
+    """
+
+    def test_normal(self) -> None:
+        """
+        Normal.
+        """
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            "abc", 5, queue_property_data.QueueBackend.BROADCAST, max_subscriber_count=2
+        )
+
+        assert result
+        assert queue_property is not None
+        assert queue_property.max_subscriber_count == 2
+
+    def test_partitions(self) -> None:
+        """
+        Broadcast backend does not support partitions.
+        """
+        name = "abc"
+        max_size = 5
+
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            name, max_size, queue_property_data.QueueBackend.BROADCAST, partition_count=2
+        )
+
+        assert not result
+        assert queue_property is None
+
+    def test_reorder(self) -> None:
+        """
+        Broadcast backend does not support reorder.
+        """
+        name = "abc"
+        max_size = 5
+
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            name,
+            max_size,
+            queue_property_data.QueueBackend.BROADCAST,
+            sequence_mode=queue_property_data.SequenceMode.REORDER,
+        )
+
+        assert not result
+        assert queue_property is None
+
+    def test_drop_oldest(self) -> None:
+        """
+        Broadcast backend does not support dropping items in the queue.
+        """
+        name = "abc"
+        max_size = 5
+
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            name,
+            max_size,
+            queue_property_data.QueueBackend.BROADCAST,
+            overflow_policy=queue_property_data.OverflowPolicy.DROP_OLDEST,
+        )
+
+        assert not result
+        assert queue_property is None
+
+    def test_max_subscriber_count_zero(self) -> None:
+        """
+        Zero max subscriber count.
+        """
+        name = "abc"
+        max_size = 5
+
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            name, max_size, queue_property_data.QueueBackend.BROADCAST, max_subscriber_count=0
+        )
+
+        assert not result
+        assert queue_property is None
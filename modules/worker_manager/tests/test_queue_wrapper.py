@@ -0,0 +1,1154 @@
+"""
+Test queue wrapper.
+"""
+
+import asyncio
+import contextvars
+import json
+import multiprocessing as mp
+import os
+import time
+
+import numpy as np
+import pytest
+
+from modules.worker_manager import queue_metrics_data
+from modules.worker_manager import queue_property_data
+from modules.worker_manager import queue_wrapper
+from modules.worker_manager.private import tracer
+from modules.worker_manager.private import worker_sync_manager
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+@pytest.fixture(params=["plain_manager", "batch_manager", "shared_memory", "in_process", "process"])
+def queue(request: pytest.FixtureRequest) -> queue_wrapper.QueueWrapper:  # type: ignore
+    """
+    Queue with max size 5 for each kind of underlying queue.
+    """
+    backend = queue_property_data.QueueBackend.MANAGER
+    if request.param == "shared_memory":
+        backend = queue_property_data.QueueBackend.SHARED_MEMORY
+    elif request.param == "in_process":
+        backend = queue_property_data.QueueBackend.IN_PROCESS
+    elif request.param == "process":
+        backend = queue_property_data.QueueBackend.PROCESS
+
+    result, queue_property = queue_property_data.QueuePropertyData.create("queue", 5, backend)
+    assert result
+    assert queue_property is not None
+
+    if request.param == "plain_manager":
+        mp_manager = mp.Manager()
+    else:
+        mp_manager = worker_sync_manager.WorkerSyncManager()
+
+    with mp_manager:
+        result, queue = queue_wrapper.QueueWrapper.create(mp_manager, queue_property)
+        assert result
+        assert queue is not None
+
+        yield queue  # type: ignore
+
+
+@pytest.fixture(params=["manager", "shared_memory", "in_process"])
+def overflow_queues(
+    request: pytest.FixtureRequest,
+) -> dict[queue_property_data.OverflowPolicy, queue_wrapper.QueueWrapper]:  # type: ignore
+    """
+    Queue with max size 3 for each overflow policy, for each backend.
+    """
+    backend = queue_property_data.QueueBackend.MANAGER
+    if request.param == "shared_memory":
+        backend = queue_property_data.QueueBackend.SHARED_MEMORY
+    elif request.param == "in_process":
+        backend = queue_property_data.QueueBackend.IN_PROCESS
+
+    with worker_sync_manager.WorkerSyncManager() as mp_manager:
+        queues = {}
+        for overflow_policy in queue_property_data.OverflowPolicy:
+            overflow_timeout = None
+            if overflow_policy == queue_property_data.OverflowPolicy.BLOCK_TIMEOUT:
+                overflow_timeout = 0.05
+
+            result, queue_property = queue_property_data.QueuePropertyData.create(
+                "queue",
+                3,
+                backend,
+                overflow_policy=overflow_policy,
+                overflow_timeout=overflow_timeout,
+            )
+            assert result
+            assert queue_property is not None
+
+            result, queue = queue_wrapper.QueueWrapper.create(mp_manager, queue_property)
+            assert result
+            assert queue is not None
+
+            queues[overflow_policy] = queue
+
+        yield queues  # type: ignore
+
+
+@pytest.fixture(params=["manager", "in_process"])
+def priority_queue(request: pytest.FixtureRequest) -> queue_wrapper.QueueWrapper:  # type: ignore
+    """
+    Queue with max size 5 and 3 priority levels for each backend that supports priorities.
+    """
+    backend = queue_property_data.QueueBackend.MANAGER
+    if request.param == "in_process":
+        backend = queue_property_data.QueueBackend.IN_PROCESS
+
+    result, queue_property = queue_property_data.QueuePropertyData.create(
+        "queue", 5, backend, priority_levels=3
+    )
+    assert result
+    assert queue_property is not None
+
+    with worker_sync_manager.WorkerSyncManager() as mp_manager:
+        result, queue = queue_wrapper.QueueWrapper.create(mp_manager, queue_property)
+        assert result
+        assert queue is not None
+
+        yield queue  # type: ignore
+
+
+@pytest.fixture(params=["manager", "shared_memory", "in_process", "process"])
+def partitioned_queue(request: pytest.FixtureRequest) -> queue_wrapper.QueueWrapper:  # type: ignore
+    """
+    Queue with max size 5 and 4 partitions for each backend.
+    """
+    backend = queue_property_data.QueueBackend.MANAGER
+    if request.param == "shared_memory":
+        backend = queue_property_data.QueueBackend.SHARED_MEMORY
+    elif request.param == "in_process":
+        backend = queue_property_data.QueueBackend.IN_PROCESS
+    elif request.param == "process":
+        backend = queue_property_data.QueueBackend.PROCESS
+
+    result, queue_property = queue_property_data.QueuePropertyData.create(
+        "queue", 5, backend, partition_count=4
+    )
+    assert result
+    assert queue_property is not None
+
+    with worker_sync_manager.WorkerSyncManager() as mp_manager:
+        result, queue = queue_wrapper.QueueWrapper.create(mp_manager, queue_property)
+        assert result
+        assert queue is not None
+
+        yield queue  # type: ignore
+
+
+@pytest.fixture
+def broadcast_queue() -> queue_wrapper.QueueWrapper:  # type: ignore
+    """
+    Broadcast queue with max size 3.
+    """
+    result, queue_property = queue_property_data.QueuePropertyData.create(
+        "queue", 3, queue_property_data.QueueBackend.BROADCAST
+    )
+    assert result
+    assert queue_property is not None
+
+    with mp.Manager() as mp_manager:
+        result, queue = queue_wrapper.QueueWrapper.create(mp_manager, queue_property)
+        assert result
+        assert queue is not None
+
+        yield queue  # type: ignore
+
+
+@pytest.fixture(params=["manager", "shared_memory", "in_process", "process"])
+def sequenced_queues(
+    request: pytest.FixtureRequest,
+) -> tuple[queue_wrapper.QueueWrapper, queue_wrapper.QueueWrapper]:  # type: ignore
+    """
+    Queue that stamps and queue that reorders with max size 10, for each backend.
+    """
+    backend = queue_property_data.QueueBackend.MANAGER
+    if request.param == "shared_memory":
+        backend = queue_property_data.QueueBackend.SHARED_MEMORY
+    elif request.param == "in_process":
+        backend = queue_property_data.QueueBackend.IN_PROCESS
+    elif request.param == "process":
+        backend = queue_property_data.QueueBackend.PROCESS
+
+    with worker_sync_manager.WorkerSyncManager() as mp_manager:
+        queues = []
+        for sequence_mode in [
+            queue_property_data.SequenceMode.STAMP,
+            queue_property_data.SequenceMode.REORDER,
+        ]:
+            result, queue_property = queue_property_data.QueuePropertyData.create(
+                "queue",
+                10,
+                backend,
+                sequence_mode=sequence_mode,
+                reorder_buffer_size=5,
+                reorder_gap_timeout=0.1,
+            )
+            assert result
+            assert queue_property is not None
+
+            result, queue = queue_wrapper.QueueWrapper.create(mp_manager, queue_property)
+            assert result
+            assert queue is not None
+
+            queues.append(queue)
+
+        yield tuple(queues)  # type: ignore
+
+
+class TestPutGet:
+    """
+    Test put() and get() methods.
+    """
+
+    def test_normal(self, queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        Normal.
+        """
+        result = queue.put(1)
+        assert result
+
+        result, item = queue.get()
+
+        assert result
+        assert item == 1
+
+    def test_get_timeout(self, queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        Get on an empty queue.
+        """
+        result, item = queue.get(0.01)
+
+        assert not result
+        assert item is None
+
+    def test_put_timeout(self, queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        Put on a full queue.
+        """
+        for i in range(0, 5):
+            result = queue.put(i)
+            assert result
+
+        result = queue.put(5, 0.01)
+
+        assert not result
+
+
+class TestPutManyGetMany:
+    """
+    Test put_many() and get_many() methods.
+    """
+
+    def test_normal(self, queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        Normal.
+        """
+        count = queue.put_many([1, 2, 3])
+        assert count == 3
+
+        items = queue.get_many(3)
+
+        assert items == [1, 2, 3]
+
+    def test_put_partial(self, queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        Batch larger than the free space.
+        """
+        count = queue.put_many(list(range(0, 8)), 0.01)
+
+        assert count == 5
+        assert queue.get_many(8, 0.01) == list(range(0, 5))
+
+    def test_get_partial(self, queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        Fewer items than requested before the timeout.
+        """
+        count = queue.put_many([1, 2])
+        assert count == 2
+
+        items = queue.get_many(4, 0.01)
+
+        assert items == [1, 2]
+
+    def test_get_empty(self, queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        Empty queue.
+        """
+        items = queue.get_many(4, 0.01)
+
+        assert len(items) == 0
+
+    def test_interleave_single(self, queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        Batched puts can be read by single gets.
+        """
+        count = queue.put_many([1, 2])
+        assert count == 2
+
+        result, item = queue.get()
+
+        assert result
+        assert item == 1
+        assert queue.get_many(1) == [2]
+
+
+class TestAsync:
+    """
+    Test put_async() and get_async() methods.
+    """
+
+    def test_normal(self, queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        Items pass through in order.
+        """
+
+        async def run() -> list[object]:
+            assert await queue.put_async(1)
+            assert await queue.put_async(2)
+
+            return [await queue.get_async(), await queue.get_async()]
+
+        assert asyncio.run(run()) == [(True, 1), (True, 2)]
+
+    def test_timeout(self, queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        Get on an empty queue and put on a full queue.
+        """
+
+        async def run() -> tuple[bool, tuple[bool, object]]:
+            for i in range(0, 5):
+                assert await queue.put_async(i)
+
+            is_put = await queue.put_async(5, 0.1)
+            for _ in range(0, 5):
+                await queue.get_async()
+
+            return is_put, await queue.get_async(0.1)
+
+        assert asyncio.run(run()) == (False, (False, None))
+
+    def test_concurrent_waits(self, queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        Waiting coroutines do not block the event loop.
+        """
+
+        async def run() -> list[object]:
+            gets = [asyncio.create_task(queue.get_async(5.0)) for _ in range(0, 3)]
+            await asyncio.sleep(0.1)
+            assert not any(get.done() for get in gets)
+
+            for i in range(0, 3):
+                assert await queue.put_async(i)
+
+            return sorted([item for _, item in await asyncio.gather(*gets)])
+
+        assert asyncio.run(run()) == [0, 1, 2]
+
+    def test_cancelled(
+        self, queue: queue_wrapper.QueueWrapper, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """
+        An item that arrives after the get is cancelled is returned by the next get.
+        """
+        # The thread is still waiting when the item arrives
+        monkeypatch.setattr(queue_wrapper.QueueWrapper, "ASYNC_WAIT_PERIOD", 1.0)
+
+        async def run() -> tuple[object, object]:
+            asyncio.get_running_loop().call_later(0.2, queue.put, 1)
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(queue.get_async(), 0.1)
+
+            await asyncio.sleep(0.3)
+            assert await queue.put_async(2)
+
+            return await queue.get_async(1.0), await queue.get_async(1.0)
+
+        assert asyncio.run(run()) == ((True, 1), (True, 2))
+
+
+class TestMetrics:
+    """
+    Test get_metrics() method.
+    """
+
+    def test_counts(self, queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        Items put and got are counted, without blocked time when the queue is ready.
+        """
+        assert queue.put(1)
+        assert queue.put_many([2, 3, 4]) == 3
+        assert queue.get() == (True, 1)
+        assert queue.get_many(2) == [2, 3]
+
+        result, metrics = queue.get_metrics()
+        assert result
+        assert metrics is not None
+
+        assert metrics.name == "queue"
+        assert metrics.put_count == 4
+        assert metrics.get_count == 3
+        assert metrics.depth == 1
+        assert metrics.put_blocked_time == 0.0
+        # Items put into a process queue reach its pipe after the put returns
+        if queue.queue_property.backend != queue_property_data.QueueBackend.PROCESS:
+            assert metrics.get_blocked_time == 0.0
+
+        if queue.queue_property.backend == queue_property_data.QueueBackend.SHARED_MEMORY:
+            assert metrics.put_bytes is not None
+            assert metrics.get_bytes is not None
+            assert 0 < metrics.get_bytes < metrics.put_bytes
+        else:
+            assert metrics.put_bytes is None
+            assert metrics.get_bytes is None
+
+    def test_blocked_time(self, queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        Waits on a full or empty queue are timed.
+        """
+        assert queue.put_many([0, 1, 2, 3, 4]) == 5
+        assert not queue.put(5, 0.05)
+        assert queue.put_many([5], 0.05) == 0
+
+        assert len(queue.get_many(10, 0.05)) == 5
+        result, _ = queue.get(0.05)
+        assert not result
+
+        result, metrics = queue.get_metrics()
+        assert result
+        assert metrics is not None
+
+        assert metrics.put_count == 5
+        assert metrics.get_count == 5
+        assert metrics.put_blocked_time >= 0.1
+        assert metrics.get_blocked_time >= 0.1
+
+    def test_batch_size_histogram(self, queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        Batch sizes are counted in power of 2 buckets, the last bucket has no upper bound.
+        """
+        for size in [1, 2, 3, 4, 7, 8, 1_000_000]:
+            queue.add_batch(size)
+
+        result, metrics = queue.get_metrics()
+        assert result
+        assert metrics is not None
+
+        expected = [0] * queue_metrics_data.BATCH_SIZE_BUCKET_COUNT
+        expected[0] = 1
+        expected[1] = 2
+        expected[2] = 2
+        expected[3] = 1
+        expected[-1] = 1
+        assert metrics.batch_size_histogram == expected
+
+
+class TestSerializer:
+    """
+    Test serializers of the queue property.
+    """
+
+    @pytest.mark.parametrize("backend", list(queue_property_data.QueueBackend))
+    @pytest.mark.parametrize(
+        "serializer_kind, item",
+        [
+            (queue_property_data.SerializerKind.PICKLE_OUT_OF_BAND, np.arange(0, 10)),
+            (queue_property_data.SerializerKind.BYTES, b"abc"),
+            (queue_property_data.SerializerKind.CUSTOM, "abc"),
+        ],
+    )
+    def test_round_trip(
+        self,
+        backend: queue_property_data.QueueBackend,
+        serializer_kind: queue_property_data.SerializerKind,
+        item: object,
+    ) -> None:
+        """
+        Items and markers pass through single and batched transfers.
+        """
+        encode = None
+        decode = None
+        if serializer_kind == queue_property_data.SerializerKind.CUSTOM:
+            encode = str.encode
+            decode = bytes.decode
+
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            "queue", 5, backend, serializer_kind=serializer_kind, encode=encode, decode=decode
+        )
+        assert result
+        assert queue_property is not None
+
+        with worker_sync_manager.WorkerSyncManager() as mp_manager:
+            result, queue = queue_wrapper.QueueWrapper.create(mp_manager, queue_property)
+            assert result
+            assert queue is not None
+
+            # Broadcast queues are got from through a subscriber
+            consumer = queue
+            if backend == queue_property_data.QueueBackend.BROADCAST:
+                consumer = subscribe(queue, "consumer")
+
+            queue.begin_end_of_stream(1)
+
+            assert queue.put(item)
+            assert queue.put_many([item, item]) == 2
+            assert queue.put_end_of_stream()
+
+            result, received_item = consumer.get()
+            received_items = consumer.get_many(5, 1.0)
+
+            assert result
+            assert consumer.is_end_of_stream()
+            for received in [received_item] + received_items:
+                assert type(received) is type(item)
+                assert np.array_equal(received, item)  # type: ignore
+            assert len(received_items) == 2
+
+
+class TestEndOfStream:
+    """
+    Test end of stream markers.
+    """
+
+    def test_ended(self, queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        Items before the markers are received, then the stream ends without waiting.
+        """
+        queue.begin_end_of_stream(2)
+
+        assert queue.put(1)
+        assert queue.put_end_of_stream()
+        assert queue.put(2)
+        assert queue.put_end_of_stream()
+
+        assert queue.get() == (True, 1)
+        assert not queue.is_end_of_stream()
+
+        # Returns at the end of stream before the timeout
+        start_time = time.monotonic()
+        assert queue.get_many(5, 10.0) == [2]
+        assert time.monotonic() - start_time < 1.0
+        assert queue.is_end_of_stream()
+
+        result, item = queue.get()
+
+        assert not result
+        assert item is None
+
+    def test_not_draining(self, queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        Markers are skipped when no drain has begun.
+        """
+        assert queue.put_end_of_stream()
+        assert queue.put(1)
+
+        assert queue.get(0.01) == (True, 1)
+        assert not queue.is_end_of_stream()
+
+
+class TestOverflow:
+    """
+    Test overflow policies of full queues.
+    """
+
+    @staticmethod
+    def get_drop_count(queue: queue_wrapper.QueueWrapper) -> int:
+        """
+        Return: Drop count from the metrics of the queue.
+        """
+        result, metrics = queue.get_metrics()
+        assert result
+        assert metrics is not None
+
+        return metrics.drop_count
+
+    def test_block(
+        self,
+        overflow_queues: dict[queue_property_data.OverflowPolicy, queue_wrapper.QueueWrapper],
+    ) -> None:
+        """
+        A put that times out is not a drop.
+        """
+        queue = overflow_queues[queue_property_data.OverflowPolicy.BLOCK]
+
+        assert queue.put_many([0, 1, 2]) == 3
+        assert not queue.put(3, 0.01)
+
+        assert TestOverflow.get_drop_count(queue) == 0
+
+    def test_block_timeout(
+        self,
+        overflow_queues: dict[queue_property_data.OverflowPolicy, queue_wrapper.QueueWrapper],
+    ) -> None:
+        """
+        Items are dropped after the overflow timeout, even if the caller waits forever.
+        """
+        queue = overflow_queues[queue_property_data.OverflowPolicy.BLOCK_TIMEOUT]
+
+        assert queue.put_many([0, 1, 2]) == 3
+
+        start_time = time.monotonic()
+        assert not queue.put(3)
+        assert time.monotonic() - start_time >= 0.05
+        assert queue.put_many([4, 5]) == 0
+        # A shorter timeout of the caller is not a drop
+        assert not queue.put(6, 0.0)
+
+        assert TestOverflow.get_drop_count(queue) == 3
+        assert queue.get_many(5, 0.0) == [0, 1, 2]
+
+    def test_drop_newest(
+        self,
+        overflow_queues: dict[queue_property_data.OverflowPolicy, queue_wrapper.QueueWrapper],
+    ) -> None:
+        """
+        New items are dropped without waiting.
+        """
+        queue = overflow_queues[queue_property_data.OverflowPolicy.DROP_NEWEST]
+
+        assert queue.put_many([0, 1]) == 2
+
+        start_time = time.monotonic()
+        assert queue.put_many([2, 3, 4]) == 1
+        assert not queue.put(5)
+        assert time.monotonic() - start_time < 1.0
+
+        assert TestOverflow.get_drop_count(queue) == 3
+        assert queue.get_many(5, 0.0) == [0, 1, 2]
+
+    def test_drop_oldest(
+        self,
+        overflow_queues: dict[queue_property_data.OverflowPolicy, queue_wrapper.QueueWrapper],
+    ) -> None:
+        """
+        The oldest items are dropped to make space.
+        """
+        queue = overflow_queues[queue_property_data.OverflowPolicy.DROP_OLDEST]
+
+        assert queue.put_many([0, 1, 2, 3]) == 4
+        assert queue.put(4)
+
+        assert TestOverflow.get_drop_count(queue) == 2
+        assert queue.get_many(5, 0.0) == [2, 3, 4]
+
+    def test_latest_value(
+        self,
+        overflow_queues: dict[queue_property_data.OverflowPolicy, queue_wrapper.QueueWrapper],
+    ) -> None:
+        """
+        Only the latest item is kept.
+        """
+        queue = overflow_queues[queue_property_data.OverflowPolicy.LATEST_VALUE]
+
+        assert queue.put_many([0, 1, 2]) == 3
+        assert queue.put(3)
+        assert queue.put(4)
+
+        assert TestOverflow.get_drop_count(queue) == 4
+        assert queue.get_many(5, 0.0) == [4]
+
+    def test_async(
+        self,
+        overflow_queues: dict[queue_property_data.OverflowPolicy, queue_wrapper.QueueWrapper],
+    ) -> None:
+        """
+        Async puts follow the overflow policy.
+        """
+        block_timeout_queue = overflow_queues[queue_property_data.OverflowPolicy.BLOCK_TIMEOUT]
+        drop_oldest_queue = overflow_queues[queue_property_data.OverflowPolicy.DROP_OLDEST]
+
+        async def run() -> list[bool]:
+            results = []
+            for item in range(0, 4):
+                results.append(await block_timeout_queue.put_async(item))
+                results.append(await drop_oldest_queue.put_async(item))
+
+            return results
+
+        assert asyncio.run(run()) == [True] * 6 + [False, True]
+
+        assert TestOverflow.get_drop_count(block_timeout_queue) == 1
+        assert TestOverflow.get_drop_count(drop_oldest_queue) == 1
+        assert drop_oldest_queue.get_many(5, 0.0) == [1, 2, 3]
+
+    def test_end_of_stream_kept(
+        self,
+        overflow_queues: dict[queue_property_data.OverflowPolicy, queue_wrapper.QueueWrapper],
+    ) -> None:
+        """
+        A marker removed to make space is not a drop and still ends the stream.
+        """
+        queue = overflow_queues[queue_property_data.OverflowPolicy.LATEST_VALUE]
+        queue.begin_end_of_stream(1)
+
+        assert queue.put(0)
+        assert queue.put_end_of_stream()
+        assert queue.put(1)
+
+        assert TestOverflow.get_drop_count(queue) == 1
+        assert queue.get() == (True, 1)
+
+        result, _ = queue.get(1.0)
+        assert not result
+        assert queue.is_end_of_stream()
+
+
+class TestPriority:
+    """
+    Test queues with priority levels.
+    """
+
+    def test_order(self, priority_queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        Urgent items overtake bulk items, FIFO within a level.
+        """
+        assert priority_queue.put_many([0, 1]) == 2
+        assert priority_queue.put(2, priority=2)
+
+        async def run() -> bool:
+            return await priority_queue.put_async(3, priority=1)
+
+        assert asyncio.run(run())
+        assert priority_queue.put(4, priority=2)
+
+        assert priority_queue.get() == (True, 2)
+        assert priority_queue.get_many(4, 0.0) == [4, 3, 0, 1]
+
+    def test_priority_out_of_range(self, priority_queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        Priority must be a level of the queue.
+        """
+        assert not priority_queue.put(0, priority=3)
+        assert not priority_queue.put(0, priority=-1)
+        assert priority_queue.put_many([0, 1], priority=3) == 0
+
+        assert priority_queue.get_depth() == 0
+
+    def test_end_of_stream(self, priority_queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        Items of all levels are received before the stream ends.
+        """
+        priority_queue.begin_end_of_stream(1)
+
+        assert priority_queue.put(0)
+        assert priority_queue.put_end_of_stream()
+        assert priority_queue.put(1, priority=1)
+
+        assert priority_queue.get_many(5, 1.0) == [1, 0]
+        assert priority_queue.is_end_of_stream()
+
+    def test_plain_manager(self) -> None:
+        """
+        Manager without priority queues.
+        """
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            "queue", 5, priority_levels=2
+        )
+        assert result
+        assert queue_property is not None
+
+        with mp.Manager() as mp_manager:
+            result, queue = queue_wrapper.QueueWrapper.create(mp_manager, queue_property)
+
+        assert not result
+        assert queue is None
+
+
+class TestPartition:
+    """
+    Test queues partitioned by key.
+    """
+
+    def test_order_per_key(self, partitioned_queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        Items of a key stay in order.
+        """
+        for i in range(0, 3):
+            assert partitioned_queue.put(("a", i), key="a")
+            assert partitioned_queue.put(("b", i), key="b")
+
+        async def run() -> bool:
+            return await partitioned_queue.put_async(("a", 3), key="a")
+
+        assert asyncio.run(run())
+        assert partitioned_queue.put_many([("b", 3), ("b", 4)], key="b") == 2
+
+        items = partitioned_queue.get_many(9, 1.0)
+
+        assert [item for item in items if item[0] == "a"] == [("a", i) for i in range(0, 4)]
+        assert [item for item in items if item[0] == "b"] == [("b", i) for i in range(0, 5)]
+
+    def test_metrics(self, partitioned_queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        Items put into each partition and the skew.
+        """
+        assert partitioned_queue.put_many([0, 1, 2], key=1) == 3
+        assert partitioned_queue.put(3, key=2)
+
+        result, metrics = partitioned_queue.get_metrics()
+        assert result
+        assert metrics is not None
+
+        assert metrics.partition_put_counts == [0, 3, 1, 0]
+        assert metrics.partition_depths == [0, 3, 1, 0]
+        assert metrics.partition_skew == 3.0
+        assert metrics.put_count == 4
+
+    def test_not_partitioned(self, queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        Keys are ignored and no partition metrics.
+        """
+        assert queue.put(0, key="a")
+
+        result, metrics = queue.get_metrics()
+        assert result
+        assert metrics is not None
+
+        assert metrics.partition_put_counts is None
+        assert metrics.partition_skew is None
+        assert queue.get() == (True, 0)
+
+    def test_end_of_stream(self, partitioned_queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        Items of all partitions are received before the stream ends.
+        """
+        partitioned_queue.begin_end_of_stream(2)
+
+        assert partitioned_queue.put_end_of_stream()
+        assert partitioned_queue.put_many([0, 1], key=3) == 2
+        assert partitioned_queue.put_end_of_stream()
+
+        assert partitioned_queue.get_many(5, 1.0) == [0, 1]
+        assert partitioned_queue.is_end_of_stream()
+
+
+def relay_reversed(
+    stamp_queue: queue_wrapper.QueueWrapper, reorder_queue: queue_wrapper.QueueWrapper, count: int
+) -> None:
+    """
+    Get items and put them in reverse order, like a parallel stage finishing out of order.
+    """
+    contexts = []
+    for _ in range(0, count):
+        context = contextvars.copy_context()
+        result, item = context.run(stamp_queue.get)
+        assert result
+
+        contexts.append((context, item))
+
+    for context, item in reversed(contexts):
+        assert context.run(reorder_queue.put, item)
+
+
+class TestSequence:
+    """
+    Test queues with sequence numbers.
+    """
+
+    def test_reorder(
+        self, sequenced_queues: tuple[queue_wrapper.QueueWrapper, queue_wrapper.QueueWrapper]
+    ) -> None:
+        """
+        Items are released in the order they entered the stamp queue.
+        """
+        stamp_queue, reorder_queue = sequenced_queues
+
+        assert stamp_queue.put_many([0, 1, 2]) == 3
+        assert stamp_queue.put(3)
+        relay_reversed(stamp_queue, reorder_queue, 4)
+
+        assert reorder_queue.get_many(4, 1.0) == [0, 1, 2, 3]
+
+        result, metrics = reorder_queue.get_metrics()
+        assert result
+        assert metrics is not None
+
+        assert metrics.reorder_occupancy == 0
+        assert metrics.reorder_max_occupancy == 4
+        assert metrics.reorder_skip_count == 0
+        assert metrics.reorder_mean_wait_time is not None
+
+        result, metrics = stamp_queue.get_metrics()
+        assert result
+        assert metrics is not None
+
+        assert metrics.reorder_occupancy is None
+
+    def test_gap(
+        self, sequenced_queues: tuple[queue_wrapper.QueueWrapper, queue_wrapper.QueueWrapper]
+    ) -> None:
+        """
+        A dropped item is skipped after the gap timeout.
+        """
+        stamp_queue, reorder_queue = sequenced_queues
+
+        assert stamp_queue.put_many([0, 1, 2]) == 3
+        assert stamp_queue.get() == (True, 0)
+        relay_reversed(stamp_queue, reorder_queue, 2)
+
+        start_time = time.monotonic()
+        assert reorder_queue.get(1.0) == (True, 1)
+        assert time.monotonic() - start_time >= 0.1
+        assert reorder_queue.get(0.0) == (True, 2)
+
+        result, metrics = reorder_queue.get_metrics()
+        assert result
+        assert metrics is not None
+
+        assert metrics.reorder_skip_count == 1
+
+    def test_async(
+        self, sequenced_queues: tuple[queue_wrapper.QueueWrapper, queue_wrapper.QueueWrapper]
+    ) -> None:
+        """
+        Sequence numbers are carried by coroutines.
+        """
+        stamp_queue, reorder_queue = sequenced_queues
+
+        async def relay(delay: float) -> None:
+            result, item = await stamp_queue.get_async()
+            assert result
+
+            await asyncio.sleep(delay)
+            assert await reorder_queue.put_async(item)
+
+        async def run() -> None:
+            assert await stamp_queue.put_async(0)
+            assert await stamp_queue.put_async(1)
+            await asyncio.gather(relay(0.05), relay(0.0))
+
+        asyncio.run(run())
+
+        assert reorder_queue.get_many(2, 1.0) == [0, 1]
+
+    def test_end_of_stream(
+        self, sequenced_queues: tuple[queue_wrapper.QueueWrapper, queue_wrapper.QueueWrapper]
+    ) -> None:
+        """
+        Held back items are flushed when the stream ends.
+        """
+        stamp_queue, reorder_queue = sequenced_queues
+        reorder_queue.begin_end_of_stream(1)
+
+        assert stamp_queue.put_many([0, 1]) == 2
+        assert stamp_queue.get() == (True, 0)
+        relay_reversed(stamp_queue, reorder_queue, 1)
+        assert reorder_queue.put_end_of_stream()
+
+        # Flushed before the gap timeout
+        start_time = time.monotonic()
+        assert reorder_queue.get(1.0) == (True, 1)
+        assert time.monotonic() - start_time < 0.1
+
+        assert not reorder_queue.is_end_of_stream()
+        assert reorder_queue.get(1.0) == (False, None)
+        assert reorder_queue.is_end_of_stream()
+
+
+def subscribe(queue: queue_wrapper.QueueWrapper, name: str) -> queue_wrapper.QueueWrapper:
+    """
+    Return: Queue of a new subscriber.
+    """
+    result, subscriber = queue.subscribe(name)
+    assert result
+    assert subscriber is not None
+
+    return subscriber
+
+
+class TestBroadcast:
+    """
+    Test broadcast queues.
+    """
+
+    def test_every_subscriber(self, broadcast_queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        Each subscriber gets every item, and the metrics show the depth of each.
+        """
+        first = subscribe(broadcast_queue, "first")
+        second = subscribe(broadcast_queue, "second")
+
+        assert broadcast_queue.put_many([0, 1]) == 2
+        assert broadcast_queue.put(2)
+
+        assert first.get_many(3, 0.0) == [0, 1, 2]
+        assert second.get(0.0) == (True, 0)
+
+        result, metrics = broadcast_queue.get_metrics()
+        assert result
+        assert metrics is not None
+
+        assert metrics.subscriber_depths == {"first": 0, "second": 2}
+        assert metrics.depth == 2
+        assert metrics.put_count == 3
+        assert metrics.get_count == 4
+
+    def test_duplicate_name(self, broadcast_queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        A name subscribes once.
+        """
+        subscribe(broadcast_queue, "first")
+
+        result, subscriber = broadcast_queue.subscribe("first")
+
+        assert not result
+        assert subscriber is None
+
+    def test_not_broadcast(self, queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        Other backends cannot be subscribed to.
+        """
+        result, subscriber = queue.subscribe("first")
+
+        assert not result
+        assert subscriber is None
+
+    def test_unsubscribe(self, broadcast_queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        An unsubscribed subscriber no longer holds back the producers.
+        """
+        subscribe(broadcast_queue, "first")
+        assert broadcast_queue.put_many([0, 1, 2]) == 3
+        assert not broadcast_queue.put(3, 0.0)
+
+        broadcast_queue.unsubscribe("first")
+
+        assert broadcast_queue.put(3, 0.0)
+
+    def test_end_of_stream(self, broadcast_queue: queue_wrapper.QueueWrapper) -> None:
+        """
+        Each subscriber counts the markers and ends on its own.
+        """
+        first = subscribe(broadcast_queue, "first")
+        second = subscribe(broadcast_queue, "second")
+        broadcast_queue.begin_end_of_stream(1)
+
+        assert broadcast_queue.put(0)
+        assert broadcast_queue.put_end_of_stream()
+
+        assert first.get_many(5, 1.0) == [0]
+        assert first.is_end_of_stream()
+        assert not second.is_end_of_stream()
+        assert second.get(1.0) == (True, 0)
+        assert second.get(1.0) == (False, None)
+        assert second.is_end_of_stream()
+
+
+def create_traced_queue(
+    name: str,
+    backend: queue_property_data.QueueBackend,
+    serializer_kind: queue_property_data.SerializerKind,
+    item_tracer: tracer.Tracer,
+) -> queue_wrapper.QueueWrapper:
+    """
+    Return: Queue with max size 5 that traces its items.
+    """
+    result, queue_property = queue_property_data.QueuePropertyData.create(
+        name, 5, backend, serializer_kind=serializer_kind
+    )
+    assert result
+    assert queue_property is not None
+
+    result, queue = queue_wrapper.QueueWrapper.create(None, queue_property, item_tracer=item_tracer)
+    assert result
+    assert queue is not None
+
+    return queue
+
+
+def relay(first: queue_wrapper.QueueWrapper, second: queue_wrapper.QueueWrapper) -> None:
+    """
+    Put an item into the first queue, relay it to the second queue like a worker, and get it.
+    """
+    assert first.put(b"item")
+    result, item = first.get(1.0)
+    assert result
+    assert second.put(item)
+    assert second.get(1.0) == (True, b"item")
+    # Ends the span of the item got from the second queue
+    assert second.get(0.0) == (False, None)
+
+
+def load_trace_events(item_tracer: tracer.Tracer, tmp_path: str) -> list[dict]:
+    """
+    Return: Events recorded by the tracer.
+    """
+    assert item_tracer.flush()
+    output_path = os.path.join(tmp_path, "merged.json")
+    assert tracer.merge_traces(item_tracer.get_directory(), output_path)
+
+    with open(output_path, encoding="utf-8") as file:
+        return json.load(file)["traceEvents"]
+
+
+class TestTrace:
+    """
+    Test tracing items through queues.
+    """
+
+    @pytest.mark.parametrize(
+        "backend",
+        [
+            queue_property_data.QueueBackend.IN_PROCESS,
+            queue_property_data.QueueBackend.SHARED_MEMORY,
+        ],
+    )
+    def test_carried(self, backend: queue_property_data.QueueBackend, tmp_path: str) -> None:
+        """
+        The trace of an item is carried to the item put after getting it.
+        """
+        result, item_tracer = tracer.Tracer.create(str(tmp_path), 1.0)
+        assert result
+        assert item_tracer is not None
+
+        first = create_traced_queue(
+            "first", backend, queue_property_data.SerializerKind.PICKLE, item_tracer
+        )
+        second = create_traced_queue(
+            "second", backend, queue_property_data.SerializerKind.PICKLE, item_tracer
+        )
+
+        # Nothing got in a new context, like a new worker
+        contextvars.Context().run(relay, first, second)
+
+        events = load_trace_events(item_tracer, tmp_path)
+        waits = [event for event in events if event["ph"] == "b"]
+        processes = [event for event in events if event["ph"] == "X"]
+        assert [event["name"] for event in waits] == ["first", "second"]
+        assert waits[0]["id"] == waits[1]["id"]
+        assert len(processes) == 2
+        assert {event["args"]["trace_id"] for event in processes} == {waits[0]["id"]}
+        assert [event["args"]["queue"] for event in processes] == ["first", "second"]
+
+    def test_not_carried(self, tmp_path: str) -> None:
+        """
+        Shared memory queues with other serializers hold the items without a trace.
+        """
+        result, item_tracer = tracer.Tracer.create(str(tmp_path), 1.0)
+        assert result
+        assert item_tracer is not None
+
+        first = create_traced_queue(
+            "first",
+            queue_property_data.QueueBackend.SHARED_MEMORY,
+            queue_property_data.SerializerKind.BYTES,
+            item_tracer,
+        )
+        second = create_traced_queue(
+            "second",
+            queue_property_data.QueueBackend.SHARED_MEMORY,
+            queue_property_data.SerializerKind.BYTES,
+            item_tracer,
+        )
+
+        contextvars.Context().run(relay, first, second)
+
+        assert item_tracer.flush()
+        assert len(os.listdir(tmp_path)) == 0
@@ -0,0 +1,71 @@
+"""
+Test scaling policy.
+"""
+
+from modules.worker_manager import scaling_policy_data
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+class TestCreate:
+    """
+    Test create() method.
+    """
+
+    def test_normal(self) -> None:
+        """
+        Normal.
+        """
+        result, scaling_policy = scaling_policy_data.ScalingPolicyData.create(
+            1, 4, 8.0, 1.0, 3, 2.0
+        )
+
+        assert result
+        assert scaling_policy is not None
+
+    def test_min_count_zero(self) -> None:
+        """
+        Zero min_count.
+        """
+        result, scaling_policy = scaling_policy_data.ScalingPolicyData.create(
+            0, 4, 8.0, 1.0, 3, 2.0
+        )
+
+        assert not result
+        assert scaling_policy is None
+
+    def test_max_count_below_min(self) -> None:
+        """
+        max_count less than min_count.
+        """
+        result, scaling_policy = scaling_policy_data.ScalingPolicyData.create(
+            4, 2, 8.0, 1.0, 3, 2.0
+        )
+
+        assert not result
+        assert scaling_policy is None
+
+    def test_no_hysteresis_band(self) -> None:
+        """
+        scale_up_depth not greater than scale_down_depth.
+        """
+        result, scaling_policy = scaling_policy_data.ScalingPolicyData.create(
+            1, 4, 1.0, 1.0, 3, 2.0
+        )
+
+        assert not result
+        assert scaling_policy is None
+
+    def test_sample_count_zero(self) -> None:
+        """
+        Zero sample_count.
+        """
+        result, scaling_policy = scaling_policy_data.ScalingPolicyData.create(
+            1, 4, 8.0, 1.0, 0, 2.0
+        )
+
+        assert not result
+        assert scaling_policy is None
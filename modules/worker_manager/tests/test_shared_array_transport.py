@@ -0,0 +1,168 @@
+"""
+Test shared array transport.
+"""
+
+import multiprocessing as mp
+
+import pytest
+
+from modules.worker_manager import queue_property_data
+from modules.worker_manager import queue_wrapper
+
+np = pytest.importorskip("numpy")
+
+# Skipped if NumPy is not installed
+# pylint: disable-next=wrong-import-position,wrong-import-order
+from modules.worker_manager import shared_array_transport
+
+
+# Test functions use test fixture signature names and access class privates
+# No enable
+# pylint: disable=protected-access,redefined-outer-name
+
+
+@pytest.fixture
+def transport() -> shared_array_transport.SharedArrayTransport:  # type: ignore
+    """
+    Transport with 2 slots of 1 KiB.
+    """
+    result, queue_property = queue_property_data.QueuePropertyData.create(
+        "handles", 2, queue_property_data.QueueBackend.SHARED_MEMORY
+    )
+    assert result
+    assert queue_property is not None
+
+    result, queue = queue_wrapper.QueueWrapper.create(None, queue_property)  # type: ignore
+    assert result
+    assert queue is not None
+
+    result, transport = shared_array_transport.SharedArrayTransport.create(queue, 2, 1024)
+    assert result
+    assert transport is not None
+
+    yield transport  # type: ignore
+
+    transport.close()
+
+
+def producer(transport: shared_array_transport.SharedArrayTransport, count: int) -> None:
+    """
+    Send count arrays filled with their index.
+    """
+    for i in range(0, count):
+        result, handle, view = transport.acquire((4, 4), np.float64)
+        assert result
+
+        view[:] = i
+
+        result = transport.send(handle)
+        assert result
+
+
+class TestCreate:
+    """
+    Test create() method.
+    """
+
+    def test_slot_count_zero(self) -> None:
+        """
+        Zero slot_count.
+        """
+        result, transport = shared_array_transport.SharedArrayTransport.create(
+            None, 0, 1024  # type: ignore
+        )
+
+        assert not result
+        assert transport is None
+
+
+class TestPutGet:
+    """
+    Test put(), get() and release() methods.
+    """
+
+    def test_normal(self, transport: shared_array_transport.SharedArrayTransport) -> None:
+        """
+        Normal.
+        """
+        array = np.arange(12, dtype=np.int32).reshape(3, 4)
+
+        result = transport.put(array)
+        assert result
+
+        result, handle, view = transport.get()
+
+        assert result
+        assert handle is not None
+        assert np.array_equal(view, array)
+        assert not view.flags.writeable
+
+        transport.release(handle)
+
+    def test_read_only(self, transport: shared_array_transport.SharedArrayTransport) -> None:
+        """
+        The view cannot be changed or made writable again.
+        """
+        result = transport.put(np.zeros((2, 2), dtype=np.float32))
+        assert result
+
+        result, handle, view = transport.get()
+        assert result
+        assert handle is not None
+        assert view is not None
+
+        with pytest.raises(ValueError):
+            view[0, 0] = 1.0
+
+        with pytest.raises(ValueError):
+            view.setflags(write=True)
+
+        assert np.array_equal(view, np.zeros((2, 2), dtype=np.float32))
+
+        transport.release(handle)
+
+    def test_too_large(self, transport: shared_array_transport.SharedArrayTransport) -> None:
+        """
+        Array does not fit in a slot.
+        """
+        result = transport.put(np.zeros(1024, dtype=np.float64))
+
+        assert not result
+
+    def test_pool_exhausted(self, transport: shared_array_transport.SharedArrayTransport) -> None:
+        """
+        Slots are only recycled on release.
+        """
+        for _ in range(0, 2):
+            result = transport.put(np.zeros(4))
+            assert result
+
+        result = transport.put(np.zeros(4), 0.01)
+        assert not result
+
+        result, handle, _ = transport.get()
+        assert result
+        assert handle is not None
+
+        transport.release(handle)
+
+        result = transport.put(np.zeros(4), 0.01)
+        assert result
+
+    def test_cross_process(self, transport: shared_array_transport.SharedArrayTransport) -> None:
+        """
+        Arrays written by a child process.
+        """
+        count = 10
+        process = mp.Process(target=producer, args=(transport, count))
+        process.start()
+
+        for i in range(0, count):
+            result, handle, view = transport.get(5)
+            assert result
+            assert handle is not None
+            assert np.all(view == i)
+
+            transport.release(handle)
+
+        process.join()
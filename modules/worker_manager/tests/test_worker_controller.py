@@ -0,0 +1,205 @@
+"""
+Test worker controller.
+"""
+
+import asyncio
+import multiprocessing as mp
+import threading
+import time
+
+import pytest
+
+from modules.worker_manager import worker_controller
+
+
+# Test functions use test fixture signature names
+# No enable
+# pylint: disable=redefined-outer-name
+
+
+@pytest.fixture
+def controller() -> worker_controller.WorkerController:  # type: ignore
+    """
+    Worker controller.
+    """
+    result, controller = worker_controller.WorkerController.create(2, mp.get_context())
+    assert result
+    assert controller is not None
+
+    yield controller  # type: ignore
+
+
+class TestWorkerController:
+    """
+    Test check_pause_and_exit() and the request methods.
+    """
+
+    def test_run(self, controller: worker_controller.WorkerController) -> None:
+        """
+        Worker keeps running without requests.
+        """
+        assert controller.check_pause_and_exit()
+        assert controller.get_state() == worker_controller.WorkerState.RUNNING
+
+    def test_exit(self, controller: worker_controller.WorkerController) -> None:
+        """
+        Worker exits on request.
+        """
+        controller.request_exit()
+
+        assert not controller.check_pause_and_exit()
+        assert controller.get_state() == worker_controller.WorkerState.EXITING
+
+    def test_pause_resume(self, controller: worker_controller.WorkerController) -> None:
+        """
+        Worker blocks while paused and continues on resume.
+        """
+        controller.request_pause()
+
+        results = []
+        thread = threading.Thread(target=lambda: results.append(controller.check_pause_and_exit()))
+        thread.start()
+
+        thread.join(0.1)
+        assert thread.is_alive()
+        assert controller.get_state() == worker_controller.WorkerState.PAUSED
+
+        controller.request_resume()
+        thread.join(1.0)
+
+        assert not thread.is_alive()
+        assert results == [True]
+        assert controller.get_state() == worker_controller.WorkerState.RUNNING
+
+    def test_exit_while_paused(self, controller: worker_controller.WorkerController) -> None:
+        """
+        Paused worker exits on request.
+        """
+        controller.request_pause()
+
+        results = []
+        thread = threading.Thread(target=lambda: results.append(controller.check_pause_and_exit()))
+        thread.start()
+
+        thread.join(0.1)
+        assert thread.is_alive()
+
+        controller.request_exit()
+        thread.join(1.0)
+
+        assert not thread.is_alive()
+        assert results == [False]
+
+    def test_pause_resume_async(self, controller: worker_controller.WorkerController) -> None:
+        """
+        Paused coroutine worker waits without blocking the event loop.
+        """
+        controller.request_pause()
+
+        async def run() -> bool:
+            check = asyncio.create_task(controller.check_pause_and_exit_async())
+            await asyncio.sleep(0.1)
+            assert not check.done()
+
+            controller.request_resume()
+            return await check
+
+        assert asyncio.run(run())
+        assert controller.get_state() == worker_controller.WorkerState.RUNNING
+
+    def test_drain_without_inputs(self, controller: worker_controller.WorkerController) -> None:
+        """
+        Worker without input queues exits on drain.
+        """
+        controller.request_drain()
+
+        assert controller.is_draining()
+        assert not controller.check_pause_and_exit()
+
+        # Exit replaces drain
+        controller.request_exit()
+        assert not controller.is_draining()
+
+    def test_heartbeat(self, controller: worker_controller.WorkerController) -> None:
+        """
+        Check updates the heartbeat.
+        """
+        heartbeat = controller.get_heartbeat()
+
+        time.sleep(0.01)
+        assert controller.check_pause_and_exit()
+
+        assert controller.get_heartbeat() > heartbeat
+
+    def test_reset(self, controller: worker_controller.WorkerController) -> None:
+        """
+        Reset clears a pause so the worker can be started again.
+        """
+        controller.request_pause()
+        controller.reset()
+
+        assert controller.check_pause_and_exit()
+
+        controller.request_pause()
+        controller.request_resume()
+
+        assert controller.check_pause_and_exit()
+
+
+class TestMessages:
+    """
+    Test messages between the worker manager and the worker.
+    """
+
+    def test_max_size_zero(self) -> None:
+        """
+        Max size must be greater than 0.
+        """
+        result, controller = worker_controller.WorkerController.create(0, mp.get_context())
+
+        assert not result
+        assert controller is None
+
+    def test_to_worker(self, controller: worker_controller.WorkerController) -> None:
+        """
+        Messages from the manager arrive in order and are bounded by max size.
+        """
+        assert controller.send_to_worker("a")
+        assert controller.send_to_worker("b")
+        # Full
+        assert not controller.send_to_worker("c")
+
+        assert controller.receive_from_manager(1.0) == (True, "a")
+        assert controller.send_to_worker("c")
+
+        assert controller.receive_from_manager(1.0) == (True, "b")
+        assert controller.receive_from_manager(1.0) == (True, "c")
+        assert controller.receive_from_manager(0.0) == (False, None)
+
+    def test_to_manager(self, controller: worker_controller.WorkerController) -> None:
+        """
+        Messages from the worker arrive in order and are bounded by max size.
+        """
+        assert controller.send_to_manager(1)
+        assert controller.send_to_manager(2)
+        # Full
+        assert not controller.send_to_manager(3)
+
+        assert controller.receive_from_worker(1.0) == (True, 1)
+        assert controller.receive_from_worker(1.0) == (True, 2)
+        assert controller.receive_from_worker(0.0) == (False, None)
+
+    def test_reset_discards(self, controller: worker_controller.WorkerController) -> None:
+        """
+        Reset discards pending messages and frees their slots.
+        """
+        assert controller.send_to_worker("a")
+        assert controller.send_to_worker("b")
+        assert controller.send_to_manager(1)
+
+        controller.reset()
+
+        assert controller.receive_from_manager(0.0) == (False, None)
+        assert controller.receive_from_worker(0.0) == (False, None)
+        assert controller.send_to_worker("c")
+        assert controller.send_to_worker("d")
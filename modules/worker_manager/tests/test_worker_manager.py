@@ -2,10 +2,17 @@
 Test worker manager.
 """
 
+import asyncio
+import json
+import os
+import sys
+import time
+
 import pytest
 
 from modules.worker_manager import queue_property_data
 from modules.worker_manager import queue_wrapper
+from modules.worker_manager import scaling_policy_data
 from modules.worker_manager import worker_controller
 from modules.worker_manager import worker_manager
 from modules.worker_manager import worker_property_data
@@ -16,6 +23,246 @@ from modules.worker_manager import worker_property_data
 # pylint: disable=protected-access,redefined-outer-name
 
 
+def sleeper_worker(period: float, controller: worker_controller.WorkerController) -> None:
+    """
+    Sleeps until stopped.
+    """
+    while controller.check_pause_and_exit():
+        time.sleep(period)
+
+
+# Stub function.
+# pylint: disable=unused-argument
+def idle_consumer_worker(
+    input_queue_1: queue_wrapper.QueueWrapper, controller: worker_controller.WorkerController
+) -> None:
+    """
+    Sleeps until stopped without consuming.
+    """
+    while controller.check_pause_and_exit():
+        time.sleep(0.01)
+
+
+# pylint: enable=unused-argument
+
+
+def crashing_worker(controller: worker_controller.WorkerController) -> None:
+    """
+    Exits with an error soon after starting.
+    """
+    for _ in range(0, 5):
+        if not controller.check_pause_and_exit():
+            return
+
+        time.sleep(0.01)
+
+    sys.exit(1)
+
+
+def affinity_worker(
+    output_queue_1: queue_wrapper.QueueWrapper, controller: worker_controller.WorkerController
+) -> None:
+    """
+    Sends the CPUs it may run on, then sleeps until stopped.
+    """
+    output_queue_1.put(sorted(os.sched_getaffinity(0)))
+
+    while controller.check_pause_and_exit():
+        time.sleep(0.01)
+
+
+def counter_worker(
+    stage_1: queue_wrapper.QueueWrapper, controller: worker_controller.WorkerController
+) -> None:
+    """
+    Sends 0, 1, 2, ... until stopped.
+    """
+    i = 0
+    while controller.check_pause_and_exit():
+        if stage_1.put(i, 0.01):
+            i += 1
+            time.sleep(0.001)
+
+
+def keyed_counter_worker(
+    stage_2: queue_wrapper.QueueWrapper, controller: worker_controller.WorkerController
+) -> None:
+    """
+    Sends (key, i) for 8 keys in turn until stopped.
+    """
+    i = 0
+    while controller.check_pause_and_exit():
+        if stage_2.put((i % 8, i), 0.01, key=i % 8):
+            i += 1
+            time.sleep(0.001)
+
+
+def relay_worker(
+    stage_1: queue_wrapper.QueueWrapper,
+    stage_2: queue_wrapper.QueueWrapper,
+    controller: worker_controller.WorkerController,
+) -> None:
+    """
+    Forwards items, retrying while the output is full.
+    """
+    while controller.check_pause_and_exit():
+        result, item = stage_1.get(0.01)
+        if not result:
+            continue
+
+        while controller.check_pause_and_exit():
+            if stage_2.put(item, 0.01):
+                break
+
+
+def copy_relay_worker(
+    stage_1: queue_wrapper.QueueWrapper,
+    result: queue_wrapper.QueueWrapper,
+    controller: worker_controller.WorkerController,
+) -> None:
+    """
+    Forwards items to the result queue, retrying while it is full.
+    """
+    relay_worker(stage_1, result, controller)
+
+
+def jitter_relay_worker(
+    stage_1: queue_wrapper.QueueWrapper,
+    stage_2: queue_wrapper.QueueWrapper,
+    controller: worker_controller.WorkerController,
+) -> None:
+    """
+    Forwards items after a delay that varies by item, so parallel workers finish out of order.
+    """
+    while controller.check_pause_and_exit():
+        is_item, item = stage_1.get(0.01)
+        if not is_item:
+            continue
+
+        time.sleep(0.001 * (item % 5))
+        stage_2.put(item)
+
+
+def slow_relay_worker(
+    stage_1: queue_wrapper.QueueWrapper,
+    result: queue_wrapper.QueueWrapper,
+    controller: worker_controller.WorkerController,
+) -> None:
+    """
+    Forwards items after a delay, so it is still holding an item when a drain begins.
+    """
+    while controller.check_pause_and_exit():
+        is_item, item = stage_1.get(0.01)
+        if not is_item:
+            continue
+
+        time.sleep(0.01)
+        result.put(item)
+
+
+def last_relay_worker(
+    stage_2: queue_wrapper.QueueWrapper,
+    result: queue_wrapper.QueueWrapper,
+    controller: worker_controller.WorkerController,
+) -> None:
+    """
+    Second relay, groups are named after their function.
+    """
+    relay_worker(stage_2, result, controller)
+
+
+def keyed_relay_worker(
+    stage_2: queue_wrapper.QueueWrapper,
+    result: queue_wrapper.QueueWrapper,
+    controller: worker_controller.WorkerController,
+) -> None:
+    """
+    Forwards items, only checking the controller between items.
+    """
+    while controller.check_pause_and_exit():
+        is_item, item = stage_2.get(0.01)
+        if is_item:
+            result.put(item)
+
+
+async def async_relay_worker(
+    period: float,
+    stage_1: queue_wrapper.QueueWrapper,
+    result: queue_wrapper.QueueWrapper,
+    controller: worker_controller.WorkerController,
+) -> None:
+    """
+    Forwards items after waiting on simulated I/O.
+    """
+    while await controller.check_pause_and_exit_async():
+        is_item, item = await stage_1.get_async(0.01)
+        if not is_item:
+            continue
+
+        await asyncio.sleep(period)
+
+        while await controller.check_pause_and_exit_async():
+            if await result.put_async(item, 0.01):
+                break
+
+
+def jitter_keyed_relay_worker(
+    stage_2: queue_wrapper.QueueWrapper,
+    result: queue_wrapper.QueueWrapper,
+    controller: worker_controller.WorkerController,
+) -> None:
+    """
+    Forwards items, with a delay for every other item of key 7, so threads sharing a key would
+    finish out of order.
+    """
+    while controller.check_pause_and_exit():
+        is_item, item = stage_2.get(0.01)
+        if not is_item:
+            continue
+
+        if item[1] % 16 == 7:
+            time.sleep(0.02)
+
+        while controller.check_pause_and_exit():
+            if result.put(item, 0.01):
+                break
+
+
+async def async_keyed_relay_worker(
+    stage_2: queue_wrapper.QueueWrapper,
+    result: queue_wrapper.QueueWrapper,
+    controller: worker_controller.WorkerController,
+) -> None:
+    """
+    Forwards items, with a delay for every other item of key 7, so calls sharing a key would
+    finish out of order.
+    """
+    while await controller.check_pause_and_exit_async():
+        is_item, item = await stage_2.get_async(0.01)
+        if not is_item:
+            continue
+
+        if item[1] % 16 == 7:
+            await asyncio.sleep(0.02)
+
+        while await controller.check_pause_and_exit_async():
+            if await result.put_async(item, 0.01):
+                break
+
+
+# Stub function.
+# pylint: disable=unused-argument
+def hung_worker(controller: worker_controller.WorkerController) -> None:
+    """
+    Never checks the controller.
+    """
+    while True:
+        time.sleep(0.01)
+
+
+# pylint: enable=unused-argument
+
+
 @pytest.fixture
 def manager_empty() -> worker_manager.WorkerManager:  # type: ignore
     """
@@ -188,6 +435,110 @@ def worker_properties() -> list[worker_property_data.WorkerPropertyData]:  # typ
     yield [worker_property_1, worker_property_2]  # type: ignore
 
 
+class TestCreate:
+    """
+    Test create() method.
+    """
+
+    def test_unknown_start_method(self) -> None:
+        """
+        Start method does not exist.
+        """
+        result, manager = worker_manager.WorkerManager.create(5, "abc")
+
+        assert not result
+        assert manager is None
+
+    def test_preload_without_forkserver(self) -> None:
+        """
+        Preloaded modules with a start method other than forkserver.
+        """
+        result, manager = worker_manager.WorkerManager.create(5, "spawn", ["json"])
+
+        assert not result
+        assert manager is None
+
+
+class TestManagerLess:
+    """
+    Test the worker manager without the manager server.
+    """
+
+    def test_manager_queue(self) -> None:
+        """
+        Manager queues require the manager server.
+        """
+        result, manager = worker_manager.WorkerManager.create(5, is_manager_server=False)
+        assert result
+        assert manager is not None
+
+        result, queue_property = queue_property_data.QueuePropertyData.create("1", 5)
+        assert result
+        assert queue_property is not None
+
+        count_added = manager.add_queues([queue_property])
+
+        assert count_added == 0
+
+    def test_no_items_lost(self) -> None:
+        """
+        Every item sent by the source reaches the last queue through process queues.
+        """
+        result, manager = worker_manager.WorkerManager.create(5, is_manager_server=False)
+        assert result
+        assert manager is not None
+
+        queue_properties = []
+        for name, max_size in [("stage_1", 5), ("stage_2", 5), ("result", 100_000)]:
+            result, queue_property = queue_property_data.QueuePropertyData.create(
+                name, max_size, queue_property_data.QueueBackend.PROCESS
+            )
+            assert result
+            assert queue_property is not None
+
+            queue_properties.append(queue_property)
+
+        count_added = manager.add_queues(queue_properties)
+        assert count_added == 3
+
+        result, counter_property = worker_property_data.WorkerPropertyData.create(
+            1, counter_worker, (), [], ["stage_1"]
+        )
+        assert result
+        assert counter_property is not None
+
+        result, relay_property = worker_property_data.WorkerPropertyData.create(
+            2, relay_worker, (), ["stage_1"], ["stage_2"]
+        )
+        assert result
+        assert relay_property is not None
+
+        result, relay_property_2 = worker_property_data.WorkerPropertyData.create(
+            1, last_relay_worker, (), ["stage_2"], ["result"]
+        )
+        assert result
+        assert relay_property_2 is not None
+
+        count_added = manager.add_worker_groups(
+            [counter_property, relay_property, relay_property_2]
+        )
+        assert count_added == 3
+
+        result = manager.start_all(10.0)
+        assert result
+
+        time.sleep(0.2)
+
+        result, _ = manager.drain_all(10.0)
+        assert result
+
+        queue = manager._WorkerManager__names_to_queue["result"]
+        items = queue.get_many(100_000, 0.0)
+
+        assert len(items) > 0
+        assert sorted(items) == list(range(0, len(items)))
+
+
 class TestAddQueues:
     """
     Test add_queues() method.
@@ -205,6 +556,20 @@ class TestAddQueues:
 
         assert count_added == len(queue_properties)
 
+    def test_shared_memory_backend(self, manager_empty: worker_manager.WorkerManager) -> None:
+        """
+        Queue backed by shared memory.
+        """
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            "shared", 5, queue_property_data.QueueBackend.SHARED_MEMORY
+        )
+        assert result
+        assert queue_property is not None
+
+        count_added = manager_empty.add_queues([queue_property])
+
+        assert count_added == 1
+
     def test_empty(self, manager_empty: worker_manager.WorkerManager) -> None:
         """
         Empty queue_properties.
@@ -245,6 +610,33 @@ class TestAddQueues:
         assert count_added == 0
 
 
+class TestGetMetrics:
+    """
+    Test get_metrics() method.
+    """
+
+    def test_normal(
+        self,
+        manager_empty: worker_manager.WorkerManager,
+        queue_properties: list[queue_property_data.QueuePropertyData],
+    ) -> None:
+        """
+        Metrics for each queue.
+        """
+        count_added = manager_empty.add_queues(queue_properties)
+        assert count_added == len(queue_properties)
+
+        queue = manager_empty._WorkerManager__names_to_queue["1"]
+        assert queue.put(0)
+
+        names_to_metrics = manager_empty.get_metrics()
+
+        assert list(names_to_metrics.keys()) == ["1", "2"]
+        assert names_to_metrics["1"].put_count == 1
+        assert names_to_metrics["1"].depth == 1
+        assert names_to_metrics["2"].put_count == 0
+
+
 class TestAddWorkerGroups:
     """
     Test add_worker_groups method.
@@ -327,3 +719,1311 @@ class TestAddWorkerGroups:
         count_added = manager_with_input_queues_only.add_worker_groups(worker_properties)
 
         assert count_added == 1
+
+
+@pytest.fixture
+def manager_with_sleepers(
+    manager_empty: worker_manager.WorkerManager,
+) -> worker_manager.WorkerManager:  # type: ignore
+    """
+    Worker manager with a group of 3 sleeping workers.
+    """
+    result, worker_property = worker_property_data.WorkerPropertyData.create(
+        3, sleeper_worker, (0.01,), [], []
+    )
+    assert result
+    assert worker_property is not None
+
+    count_added = manager_empty.add_worker_groups([worker_property])
+    assert count_added == 1
+
+    yield manager_empty  # type: ignore
+
+    manager_empty.stop_all(1.0)
+
+
+class TestStartStop:
+    """
+    Test start_all(), stop_all(), start_group(), stop_group() and join_all() methods.
+    """
+
+    def test_all(self, manager_with_sleepers: worker_manager.WorkerManager) -> None:
+        """
+        Start and stop all groups.
+        """
+        result, startup_time = manager_with_sleepers.get_startup_time()
+        assert not result
+        assert startup_time is None
+
+        result = manager_with_sleepers.start_all(10.0)
+        assert result
+
+        result, startup_time = manager_with_sleepers.get_startup_time()
+        assert result
+        assert startup_time is not None
+        assert startup_time > 0.0
+
+        result = manager_with_sleepers.join_all(0.01)
+        assert not result
+
+        result, stop_time = manager_with_sleepers.get_stop_time()
+        assert not result
+        assert stop_time is None
+
+        result = manager_with_sleepers.stop_all(5.0)
+        assert result
+
+        result, stop_time = manager_with_sleepers.get_stop_time()
+        assert result
+        assert stop_time is not None
+        assert stop_time < 5.0
+
+        result = manager_with_sleepers.join_all(0.01)
+        assert result
+
+    def test_group(self, manager_with_sleepers: worker_manager.WorkerManager) -> None:
+        """
+        Start and stop one group, then restart it.
+        """
+        result = manager_with_sleepers.start_group("sleeper_worker", 10.0)
+        assert result
+
+        result = manager_with_sleepers.stop_group("sleeper_worker", 5.0)
+        assert result
+
+        result = manager_with_sleepers.start_group("sleeper_worker", 10.0)
+        assert result
+
+        result = manager_with_sleepers.stop_group("sleeper_worker", 5.0)
+        assert result
+
+    def test_start_twice(self, manager_with_sleepers: worker_manager.WorkerManager) -> None:
+        """
+        Workers that are running cannot be started again.
+        """
+        result = manager_with_sleepers.start_all(10.0)
+        assert result
+
+        result = manager_with_sleepers.start_all(10.0)
+        assert not result
+
+    def test_group_not_exist(self, manager_with_sleepers: worker_manager.WorkerManager) -> None:
+        """
+        Group name does not exist.
+        """
+        result = manager_with_sleepers.start_group("abc", 10.0)
+        assert not result
+
+        result = manager_with_sleepers.stop_group("abc", 1.0)
+        assert not result
+
+        result, latency = manager_with_sleepers.pause_group("abc", 1.0)
+        assert not result
+        assert latency is None
+
+        result, latency = manager_with_sleepers.resume_group("abc", 1.0)
+        assert not result
+        assert latency is None
+
+    @pytest.mark.parametrize("start_method", ["spawn", "forkserver"])
+    def test_start_method(self, start_method: str) -> None:
+        """
+        Workers started with other start methods.
+        """
+        result, manager = worker_manager.WorkerManager.create(5, start_method)
+        assert result
+        assert manager is not None
+
+        result, worker_property = worker_property_data.WorkerPropertyData.create(
+            2, sleeper_worker, (0.01,), [], []
+        )
+        assert result
+        assert worker_property is not None
+
+        count_added = manager.add_worker_groups([worker_property])
+        assert count_added == 1
+
+        result = manager.start_all(30.0)
+        assert result
+
+        result = manager.stop_all(5.0)
+        assert result
+
+
+class TestDrain:
+    """
+    Test drain_all() method.
+    """
+
+    def test_no_items_lost(self, manager_empty: worker_manager.WorkerManager) -> None:
+        """
+        Every item sent by the source reaches the last queue.
+        """
+        queue_properties = []
+        for name, max_size in [("stage_1", 5), ("stage_2", 5), ("result", 100_000)]:
+            result, queue_property = queue_property_data.QueuePropertyData.create(name, max_size)
+            assert result
+            assert queue_property is not None
+
+            queue_properties.append(queue_property)
+
+        count_added = manager_empty.add_queues(queue_properties)
+        assert count_added == 3
+
+        result, counter_property = worker_property_data.WorkerPropertyData.create(
+            1, counter_worker, (), [], ["stage_1"]
+        )
+        assert result
+        assert counter_property is not None
+
+        result, relay_property = worker_property_data.WorkerPropertyData.create(
+            2, relay_worker, (), ["stage_1"], ["stage_2"]
+        )
+        assert result
+        assert relay_property is not None
+
+        result, relay_property_2 = worker_property_data.WorkerPropertyData.create(
+            1, last_relay_worker, (), ["stage_2"], ["result"]
+        )
+        assert result
+        assert relay_property_2 is not None
+
+        count_added = manager_empty.add_worker_groups(
+            [counter_property, relay_property, relay_property_2]
+        )
+        assert count_added == 3
+
+        result = manager_empty.start_all(10.0)
+        assert result
+
+        time.sleep(0.2)
+
+        result, drain_time = manager_empty.drain_all(10.0)
+        assert result
+        assert drain_time is not None
+        assert drain_time < 10.0
+
+        queue = manager_empty._WorkerManager__names_to_queue["result"]
+        items = queue.get_many(100_000, 0.0)
+
+        assert len(items) > 0
+        assert sorted(items) == list(range(0, len(items)))
+
+    def test_restart(self, manager_empty: worker_manager.WorkerManager) -> None:
+        """
+        A group started again after a drain runs normally and drains again without losing items.
+        """
+        queue_properties = []
+        for name, max_size in [("stage_1", 100), ("result", 100_000)]:
+            result, queue_property = queue_property_data.QueuePropertyData.create(name, max_size)
+            assert result
+            assert queue_property is not None
+
+            queue_properties.append(queue_property)
+
+        count_added = manager_empty.add_queues(queue_properties)
+        assert count_added == 2
+
+        result, relay_property = worker_property_data.WorkerPropertyData.create(
+            1, slow_relay_worker, (), ["stage_1"], ["result"]
+        )
+        assert result
+        assert relay_property is not None
+
+        count_added = manager_empty.add_worker_groups([relay_property])
+        assert count_added == 1
+
+        names_to_queue = manager_empty._WorkerManager__names_to_queue
+        stage_1 = names_to_queue["stage_1"]
+        result_queue = names_to_queue["result"]
+
+        for run in range(0, 2):
+            result = manager_empty.start_group("slow_relay_worker", 10.0)
+            assert result
+
+            # The stream of the last drain has not ended the new run
+            start_time = time.monotonic()
+            assert result_queue.get(0.1) == (False, None)
+            assert time.monotonic() - start_time >= 0.1
+            assert not result_queue.is_end_of_stream()
+
+            items = list(range(run * 50, run * 50 + 50))
+            assert stage_1.put_many(items) == 50
+
+            result, _ = manager_empty.drain_all(10.0)
+            assert result
+
+            assert stage_1.get_depth() == 0
+            assert result_queue.get_many(100_000, 0.0) == items
+
+
+class TestAsync:
+    """
+    Test coroutine target functions.
+    """
+
+    def test_concurrency(self, manager_empty: worker_manager.WorkerManager) -> None:
+        """
+        One process handles many items waiting on I/O at the same time.
+        """
+        item_count = 200
+        period = 0.1
+
+        queue_properties = []
+        # Room for the end of stream marker
+        for name, max_size in [("stage_1", item_count), ("result", item_count + 1)]:
+            result, queue_property = queue_property_data.QueuePropertyData.create(name, max_size)
+            assert result
+            assert queue_property is not None
+
+            queue_properties.append(queue_property)
+
+        count_added = manager_empty.add_queues(queue_properties)
+        assert count_added == 2
+
+        result, relay_property = worker_property_data.WorkerPropertyData.create(
+            1, async_relay_worker, (period,), ["stage_1"], ["result"], concurrency=50
+        )
+        assert result
+        assert relay_property is not None
+
+        count_added = manager_empty.add_worker_groups([relay_property])
+        assert count_added == 1
+
+        stage_1 = manager_empty._WorkerManager__names_to_queue["stage_1"]
+        assert stage_1.put_many(list(range(0, item_count))) == item_count
+
+        result = manager_empty.start_all(10.0)
+        assert result
+
+        result, drain_time = manager_empty.drain_all(10.0)
+        assert result
+        assert drain_time is not None
+        # One item at a time takes item_count * period
+        assert drain_time < item_count * period / 4
+
+        queue = manager_empty._WorkerManager__names_to_queue["result"]
+        items = queue.get_many(item_count, 0.0)
+
+        assert sorted(items) == list(range(0, item_count))
+
+
+class TestExecutionMode:
+    """
+    Test thread workers.
+    """
+
+    def run_pipeline(
+        self,
+        manager: worker_manager.WorkerManager,
+        backend: queue_property_data.QueueBackend,
+        execution_mode: worker_property_data.ExecutionMode,
+        thread_count: int,
+    ) -> None:
+        """
+        Runs counter -> relay -> last relay and checks that no items are lost on drain.
+        """
+        queue_properties = []
+        for name, max_size in [("stage_1", 5), ("stage_2", 5), ("result", 100_000)]:
+            result, queue_property = queue_property_data.QueuePropertyData.create(
+                name, max_size, backend
+            )
+            assert result
+            assert queue_property is not None
+
+            queue_properties.append(queue_property)
+
+        count_added = manager.add_queues(queue_properties)
+        assert count_added == 3
+
+        worker_properties = []
+        for count, target_function, input_queue_names, output_queue_names in [
+            (1, counter_worker, [], ["stage_1"]),
+            (2, relay_worker, ["stage_1"], ["stage_2"]),
+            (1, last_relay_worker, ["stage_2"], ["result"]),
+        ]:
+            result, worker_property = worker_property_data.WorkerPropertyData.create(
+                count,
+                target_function,
+                (),
+                input_queue_names,
+                output_queue_names,
+                execution_mode=execution_mode,
+                thread_count=thread_count if count > 1 else 1,
+            )
+            assert result
+            assert worker_property is not None
+
+            worker_properties.append(worker_property)
+
+        count_added = manager.add_worker_groups(worker_properties)
+        assert count_added == 3
+
+        result = manager.start_all(10.0)
+        assert result
+
+        time.sleep(0.2)
+
+        result, _ = manager.drain_all(10.0)
+        assert result
+
+        queue = manager._WorkerManager__names_to_queue["result"]
+        items = queue.get_many(100_000, 0.0)
+
+        assert len(items) > 0
+        assert sorted(items) == list(range(0, len(items)))
+
+    def test_thread_in_process_queues(self, manager_empty: worker_manager.WorkerManager) -> None:
+        """
+        Thread workers connected by in-process queues.
+        """
+        self.run_pipeline(
+            manager_empty,
+            queue_property_data.QueueBackend.IN_PROCESS,
+            worker_property_data.ExecutionMode.THREAD,
+            1,
+        )
+
+    def test_threads_in_processes(self, manager_empty: worker_manager.WorkerManager) -> None:
+        """
+        Several threads in each worker process share the controller.
+        """
+        self.run_pipeline(
+            manager_empty,
+            queue_property_data.QueueBackend.SHARED_MEMORY,
+            worker_property_data.ExecutionMode.THREADS_IN_PROCESSES,
+            4,
+        )
+
+    def test_in_process_queue_for_process(
+        self, manager_empty: worker_manager.WorkerManager
+    ) -> None:
+        """
+        In-process queues cannot connect processes.
+        """
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            "output_queue_1", 5, queue_property_data.QueueBackend.IN_PROCESS
+        )
+        assert result
+        assert queue_property is not None
+
+        count_added = manager_empty.add_queues([queue_property])
+        assert count_added == 1
+
+        result, worker_property = worker_property_data.WorkerPropertyData.create(
+            1, affinity_worker, (), [], ["output_queue_1"]
+        )
+        assert result
+        assert worker_property is not None
+
+        count_added = manager_empty.add_worker_groups([worker_property])
+        assert count_added == 0
+
+
+class TestPauseResume:
+    """
+    Test pause_group() and resume_group() methods.
+    """
+
+    def test_pause_resume(self, manager_with_sleepers: worker_manager.WorkerManager) -> None:
+        """
+        Pause and resume a group, then stop it while paused.
+        """
+        result = manager_with_sleepers.start_all(10.0)
+        assert result
+
+        result, latency = manager_with_sleepers.pause_group("sleeper_worker", 5.0)
+        assert result
+        assert latency is not None
+        assert latency < 5.0
+
+        result, latency = manager_with_sleepers.resume_group("sleeper_worker", 5.0)
+        assert result
+        assert latency is not None
+        assert latency < 5.0
+
+        result, _ = manager_with_sleepers.pause_group("sleeper_worker", 5.0)
+        assert result
+
+        # Paused workers exit on request
+        result = manager_with_sleepers.stop_all(5.0)
+        assert result
+
+
+class TestSupervise:
+    """
+    Test supervise() and get_restart_counts() methods.
+    """
+
+    @pytest.mark.parametrize(
+        "execution_mode",
+        [worker_property_data.ExecutionMode.PROCESS, worker_property_data.ExecutionMode.THREAD],
+    )
+    def test_restart_crashed(
+        self,
+        manager_empty: worker_manager.WorkerManager,
+        execution_mode: worker_property_data.ExecutionMode,
+    ) -> None:
+        """
+        Crashed worker is restarted after a delay.
+        """
+        result, worker_property = worker_property_data.WorkerPropertyData.create(
+            1, crashing_worker, (), [], [], execution_mode=execution_mode
+        )
+        assert result
+        assert worker_property is not None
+
+        count_added = manager_empty.add_worker_groups([worker_property])
+        assert count_added == 1
+
+        # Not running
+        assert manager_empty.supervise(None) == 0
+
+        result = manager_empty.start_all(10.0)
+        assert result
+
+        result = manager_empty.join_all(5.0)
+        assert result
+
+        # First delay
+        assert manager_empty.supervise(None) == 0
+        time.sleep(0.2)
+        assert manager_empty.supervise(None) == 1
+
+        assert manager_empty.get_restart_counts() == {"crashing_worker": 1}
+
+        result = manager_empty.join_all(5.0)
+        assert result
+
+        # Second delay is longer
+        assert manager_empty.supervise(None) == 0
+        time.sleep(0.1)
+        assert manager_empty.supervise(None) == 0
+        time.sleep(0.2)
+        assert manager_empty.supervise(None) == 1
+
+        assert manager_empty.get_restart_counts() == {"crashing_worker": 2}
+
+        manager_empty.stop_all(1.0)
+
+    def test_restart_hung(self, manager_empty: worker_manager.WorkerManager) -> None:
+        """
+        Worker without heartbeat is terminated and restarted, healthy workers are not.
+        """
+        result, hung_property = worker_property_data.WorkerPropertyData.create(
+            1, hung_worker, (), [], []
+        )
+        assert result
+        assert hung_property is not None
+
+        result, sleeper_property = worker_property_data.WorkerPropertyData.create(
+            2, sleeper_worker, (0.01,), [], []
+        )
+        assert result
+        assert sleeper_property is not None
+
+        count_added = manager_empty.add_worker_groups([hung_property, sleeper_property])
+        assert count_added == 2
+
+        result = manager_empty.start_all(10.0)
+        assert result
+
+        time.sleep(0.3)
+
+        # Terminated
+        assert manager_empty.supervise(0.2) == 0
+        time.sleep(0.2)
+        assert manager_empty.supervise(0.2) == 1
+
+        assert manager_empty.get_restart_counts() == {"hung_worker": 1, "sleeper_worker": 0}
+
+        result = manager_empty.stop_all(0.1)
+        assert not result
+
+
+@pytest.mark.skipif(not hasattr(os, "sched_setaffinity"), reason="Requires CPU affinity")
+class TestAffinity:
+    """
+    Test CPU sets of worker groups.
+    """
+
+    @pytest.mark.parametrize(
+        "affinity_mode",
+        [worker_property_data.AffinityMode.SPREAD, worker_property_data.AffinityMode.BLOCK],
+    )
+    def test_pinned(
+        self,
+        manager_with_queues: worker_manager.WorkerManager,
+        affinity_mode: worker_property_data.AffinityMode,
+    ) -> None:
+        """
+        Workers run on their CPU set.
+        """
+        cpu = min(worker_property_data.get_available_cpus())
+
+        result, worker_property = worker_property_data.WorkerPropertyData.create(
+            2, affinity_worker, (), [], ["output_queue_1"], None, [cpu], affinity_mode
+        )
+        assert result
+        assert worker_property is not None
+
+        count_added = manager_with_queues.add_worker_groups([worker_property])
+        assert count_added == 1
+
+        result = manager_with_queues.start_all(10.0)
+        assert result
+
+        queue = manager_with_queues._WorkerManager__names_to_queue["output_queue_1"]
+        assert queue.get_many(2, 5.0) == [[cpu], [cpu]]
+
+        result = manager_with_queues.stop_all(5.0)
+        assert result
+
+    def test_failed(
+        self, manager_with_queues: worker_manager.WorkerManager, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """
+        A worker that fails to set its CPU set exits with an error.
+        """
+
+        def fail_affinity(pid: int, cpu_set: list[int]) -> None:
+            raise OSError(f"Invalid CPU set for {pid}: {cpu_set}")
+
+        # Thread workers see the patched function
+        monkeypatch.setattr(os, "sched_setaffinity", fail_affinity)
+
+        cpu = min(worker_property_data.get_available_cpus())
+
+        result, worker_property = worker_property_data.WorkerPropertyData.create(
+            1,
+            affinity_worker,
+            (),
+            [],
+            ["output_queue_1"],
+            None,
+            [cpu],
+            execution_mode=worker_property_data.ExecutionMode.THREAD,
+        )
+        assert result
+        assert worker_property is not None
+
+        count_added = manager_with_queues.add_worker_groups([worker_property])
+        assert count_added == 1
+
+        result = manager_with_queues.start_all(10.0)
+        assert not result
+
+        group = manager_with_queues._WorkerManager__names_to_worker_group["affinity_worker"]
+        exitcodes = [worker.get_exitcode() for worker in group.get_workers()]
+        assert exitcodes[0] not in (None, 0)
+
+    def test_oversubscribed(
+        self, manager_empty: worker_manager.WorkerManager, capsys: pytest.CaptureFixture
+    ) -> None:
+        """
+        Two workers pinned to the same core.
+        """
+        cpu = min(worker_property_data.get_available_cpus())
+
+        result, worker_property = worker_property_data.WorkerPropertyData.create(
+            2, sleeper_worker, (0.01,), [], [], None, [cpu]
+        )
+        assert result
+        assert worker_property is not None
+
+        count_added = manager_empty.add_worker_groups([worker_property])
+        assert count_added == 1
+
+        assert f"WARNING: Cores have more than one worker: [{cpu}]" in capsys.readouterr().out
+
+
+class TestAutoscale:
+    """
+    Test autoscale() method.
+    """
+
+    def test_scale_up_and_down(self, manager_with_queues: worker_manager.WorkerManager) -> None:
+        """
+        Group scales up while the input queue is deep and down when it is empty.
+        """
+        result, scaling_policy = scaling_policy_data.ScalingPolicyData.create(
+            1, 3, 1.0, 0.0, 1, 0.0
+        )
+        assert result
+        assert scaling_policy is not None
+
+        result, worker_property = worker_property_data.WorkerPropertyData.create(
+            1, idle_consumer_worker, (), ["input_queue_1"], [], scaling_policy
+        )
+        assert result
+        assert worker_property is not None
+
+        count_added = manager_with_queues.add_worker_groups([worker_property])
+        assert count_added == 1
+
+        # Not running
+        assert manager_with_queues.autoscale(1.0) == 0
+
+        result = manager_with_queues.start_all(10.0)
+        assert result
+
+        queue = manager_with_queues._WorkerManager__names_to_queue["input_queue_1"]
+        count = queue.put_many([0, 1, 2, 3, 4])
+        assert count == 5
+
+        assert manager_with_queues.autoscale(1.0) == 1
+        assert manager_with_queues.autoscale(1.0) == 1
+        # Maximum
+        assert manager_with_queues.autoscale(1.0) == 0
+
+        assert len(queue.get_many(5)) == 5
+
+        assert manager_with_queues.autoscale(1.0) == 1
+
+        events = manager_with_queues.get_scaling_events()
+        assert [(event.old_count, event.new_count) for event in events] == [(1, 2), (2, 3), (3, 2)]
+        assert events[0].depth == 5
+
+        result = manager_with_queues.stop_all(5.0)
+        assert result
+
+    def test_monitor(self, manager_empty: worker_manager.WorkerManager) -> None:
+        """
+        Monitor thread starts and stops.
+        """
+        result = manager_empty.start_monitor(0.01, 1.0)
+        assert result
+
+        result = manager_empty.start_monitor(0.01, 1.0)
+        assert not result
+
+        time.sleep(0.05)
+
+        manager_empty.stop_monitor()
+
+
+class TestPartition:
+    """
+    Test worker groups with a partitioned input queue.
+    """
+
+    def test_second_group(self, manager_empty: worker_manager.WorkerManager) -> None:
+        """
+        Partitioned queues are divided among the workers of one group.
+        """
+        queue_properties = []
+        for name, partition_count in [("stage_1", 2), ("stage_2", 1), ("result", 1)]:
+            result, queue_property = queue_property_data.QueuePropertyData.create(
+                name, 5, partition_count=partition_count
+            )
+            assert result
+            assert queue_property is not None
+
+            queue_properties.append(queue_property)
+
+        count_added = manager_empty.add_queues(queue_properties)
+        assert count_added == 3
+
+        result, relay_property = worker_property_data.WorkerPropertyData.create(
+            1, relay_worker, (), ["stage_1"], ["stage_2"]
+        )
+        assert result
+        assert relay_property is not None
+
+        result, async_relay_property = worker_property_data.WorkerPropertyData.create(
+            1, async_relay_worker, (0.0,), ["stage_1"], ["result"]
+        )
+        assert result
+        assert async_relay_property is not None
+
+        count_added = manager_empty.add_worker_groups([relay_property, async_relay_property])
+        assert count_added == 1
+
+    def test_order_per_key(self, manager_empty: worker_manager.WorkerManager) -> None:
+        """
+        Items of each key keep their order through a group that scales up and down.
+        """
+        queue_properties = []
+        for name, max_size, partition_count in [("stage_2", 5, 4), ("result", 100_000, 1)]:
+            result, queue_property = queue_property_data.QueuePropertyData.create(
+                name, max_size, partition_count=partition_count
+            )
+            assert result
+            assert queue_property is not None
+
+            queue_properties.append(queue_property)
+
+        count_added = manager_empty.add_queues(queue_properties)
+        assert count_added == 2
+
+        result, counter_property = worker_property_data.WorkerPropertyData.create(
+            1, keyed_counter_worker, (), [], ["stage_2"]
+        )
+        assert result
+        assert counter_property is not None
+
+        result, relay_property = worker_property_data.WorkerPropertyData.create(
+            2, keyed_relay_worker, (), ["stage_2"], ["result"]
+        )
+        assert result
+        assert relay_property is not None
+
+        count_added = manager_empty.add_worker_groups([counter_property, relay_property])
+        assert count_added == 2
+
+        result = manager_empty.start_all(10.0)
+        assert result
+
+        group = manager_empty._WorkerManager__names_to_worker_group["keyed_relay_worker"]
+        time.sleep(0.1)
+        assert group.add_worker()
+        time.sleep(0.1)
+        assert group.retire_worker(5.0)
+        assert group.retire_worker(5.0)
+        time.sleep(0.1)
+
+        result, _ = manager_empty.drain_all(10.0)
+        assert result
+
+        queue = manager_empty._WorkerManager__names_to_queue["result"]
+        items = queue.get_many(100_000, 0.0)
+
+        assert len(items) > 0
+        assert sorted(i for _, i in items) == list(range(0, len(items)))
+        for key in range(0, 8):
+            sequence = [i for item_key, i in items if item_key == key]
+            assert sequence == sorted(sequence)
+
+        metrics = manager_empty.get_metrics()["stage_2"]
+        assert metrics.partition_put_counts is not None
+        assert sum(metrics.partition_put_counts) >= len(items)
+
+    @pytest.mark.parametrize(
+        "target_function,execution_mode,thread_count,concurrency",
+        [
+            (
+                jitter_keyed_relay_worker,
+                worker_property_data.ExecutionMode.THREADS_IN_PROCESSES,
+                2,
+                1,
+            ),
+            (async_keyed_relay_worker, worker_property_data.ExecutionMode.PROCESS, 1, 2),
+        ],
+    )
+    def test_order_per_consumer(
+        self,
+        manager_empty: worker_manager.WorkerManager,
+        target_function: "(...) -> object",  # type: ignore
+        execution_mode: worker_property_data.ExecutionMode,
+        thread_count: int,
+        concurrency: int,
+    ) -> None:
+        """
+        Each thread and coroutine call of a worker owns its own partitions.
+        """
+        queue_properties = []
+        for name, max_size, partition_count in [("stage_2", 5, 2), ("result", 100_000, 1)]:
+            result, queue_property = queue_property_data.QueuePropertyData.create(
+                name, max_size, partition_count=partition_count
+            )
+            assert result
+            assert queue_property is not None
+
+            queue_properties.append(queue_property)
+
+        count_added = manager_empty.add_queues(queue_properties)
+        assert count_added == 2
+
+        result, counter_property = worker_property_data.WorkerPropertyData.create(
+            1, keyed_counter_worker, (), [], ["stage_2"]
+        )
+        assert result
+        assert counter_property is not None
+
+        result, relay_property = worker_property_data.WorkerPropertyData.create(
+            1,
+            target_function,
+            (),
+            ["stage_2"],
+            ["result"],
+            concurrency=concurrency,
+            execution_mode=execution_mode,
+            thread_count=thread_count,
+        )
+        assert result
+        assert relay_property is not None
+
+        count_added = manager_empty.add_worker_groups([counter_property, relay_property])
+        assert count_added == 2
+
+        result = manager_empty.start_all(10.0)
+        assert result
+
+        time.sleep(0.3)
+
+        result, _ = manager_empty.drain_all(10.0)
+        assert result
+
+        queue = manager_empty._WorkerManager__names_to_queue["result"]
+        items = queue.get_many(100_000, 0.0)
+
+        assert len(items) > 0
+        for key in range(0, 8):
+            sequence = [i for item_key, i in items if item_key == key]
+            assert sequence == sorted(sequence)
+
+
+@pytest.fixture
+def manager_with_reorder(
+    manager_empty: worker_manager.WorkerManager,
+) -> worker_manager.WorkerManager:  # type: ignore
+    """
+    Worker manager with a counter, a parallel stage of 3 workers that finish out of order, and a
+    relay that restores the source order.
+    """
+    queue_properties = []
+    for name, max_size, sequence_mode in [
+        ("stage_1", 5, queue_property_data.SequenceMode.STAMP),
+        ("stage_2", 5, queue_property_data.SequenceMode.REORDER),
+        ("result", 100_000, queue_property_data.SequenceMode.NONE),
+    ]:
+        result, queue_property = queue_property_data.QueuePropertyData.create(
+            name, max_size, sequence_mode=sequence_mode, reorder_gap_timeout=10.0
+        )
+        assert result
+        assert queue_property is not None
+
+        queue_properties.append(queue_property)
+
+    count_added = manager_empty.add_queues(queue_properties)
+    assert count_added == 3
+
+    result, counter_property = worker_property_data.WorkerPropertyData.create(
+        1, counter_worker, (), [], ["stage_1"]
+    )
+    assert result
+    assert counter_property is not None
+
+    result, relay_property = worker_property_data.WorkerPropertyData.create(
+        3, jitter_relay_worker, (), ["stage_1"], ["stage_2"]
+    )
+    assert result
+    assert relay_property is not None
+
+    result, relay_property_2 = worker_property_data.WorkerPropertyData.create(
+        1, last_relay_worker, (), ["stage_2"], ["result"]
+    )
+    assert result
+    assert relay_property_2 is not None
+
+    count_added = manager_empty.add_worker_groups(
+        [counter_property, relay_property, relay_property_2]
+    )
+    assert count_added == 3
+
+    yield manager_empty  # type: ignore
+
+    manager_empty.stop_all(1.0)
+
+
+class TestReorder:
+    """
+    Test restoring the source order after a parallel stage.
+    """
+
+    def test_multiple_consumers(self, manager_empty: worker_manager.WorkerManager) -> None:
+        """
+        Reorder queues are the input of a single worker.
+        """
+        queue_properties = []
+        for name, sequence_mode in [
+            ("stage_2", queue_property_data.SequenceMode.REORDER),
+            ("result", queue_property_data.SequenceMode.NONE),
+        ]:
+            result, queue_property = queue_property_data.QueuePropertyData.create(
+                name, 5, sequence_mode=sequence_mode
+            )
+            assert result
+            assert queue_property is not None
+
+            queue_properties.append(queue_property)
+
+        count_added = manager_empty.add_queues(queue_properties)
+        assert count_added == 2
+
+        result, relay_property = worker_property_data.WorkerPropertyData.create(
+            2, last_relay_worker, (), ["stage_2"], ["result"]
+        )
+        assert result
+        assert relay_property is not None
+
+        count_added = manager_empty.add_worker_groups([relay_property])
+        assert count_added == 0
+
+    def test_source_order(self, manager_with_reorder: worker_manager.WorkerManager) -> None:
+        """
+        Items leave the parallel stage out of order and reach the last queue in source order.
+        """
+        result = manager_with_reorder.start_all(10.0)
+        assert result
+
+        time.sleep(0.3)
+
+        result, _ = manager_with_reorder.drain_all(10.0)
+        assert result
+
+        queue = manager_with_reorder._WorkerManager__names_to_queue["result"]
+        items = queue.get_many(100_000, 0.0)
+
+        assert len(items) > 0
+        assert items == list(range(0, len(items)))
+
+        metrics = manager_with_reorder.get_metrics()["stage_2"]
+        assert metrics.reorder_skip_count == 0
+        assert metrics.reorder_max_occupancy is not None
+        assert metrics.reorder_max_occupancy > 0
+
+    def test_restart(self, manager_with_reorder: worker_manager.WorkerManager) -> None:
+        """
+        A restarted consumer continues after the last number released, while the numbers of the
+        stamp queue keep counting.
+        """
+        queue = manager_with_reorder._WorkerManager__names_to_queue["result"]
+        for _ in range(0, 2):
+            result = manager_with_reorder.start_all(10.0)
+            assert result
+
+            time.sleep(0.3)
+
+            result, _ = manager_with_reorder.drain_all(10.0)
+            assert result
+
+            items = queue.get_many(100_000, 0.0)
+
+            assert len(items) > 0
+            assert items == list(range(0, len(items)))
+
+        metrics = manager_with_reorder.get_metrics()["stage_2"]
+        assert metrics.reorder_skip_count == 0
+
+
+class TestBroadcast:
+    """
+    Test worker groups subscribed to a broadcast queue.
+    """
+
+    def test_every_group(self, manager_empty: worker_manager.WorkerManager) -> None:
+        """
+        Each group receives every item, and the workers of a group share them.
+        """
+        queue_properties = []
+        for name, max_size, backend in [
+            ("stage_1", 5, queue_property_data.QueueBackend.BROADCAST),
+            ("stage_2", 100_000, queue_property_data.QueueBackend.MANAGER),
+            ("result", 100_000, queue_property_data.QueueBackend.MANAGER),
+        ]:
+            result, queue_property = queue_property_data.QueuePropertyData.create(
+                name, max_size, backend
+            )
+            assert result
+            assert queue_property is not None
+
+            queue_properties.append(queue_property)
+
+        count_added = manager_empty.add_queues(queue_properties)
+        assert count_added == 3
+
+        result, counter_property = worker_property_data.WorkerPropertyData.create(
+            1, counter_worker, (), [], ["stage_1"]
+        )
+        assert result
+        assert counter_property is not None
+
+        result, relay_property = worker_property_data.WorkerPropertyData.create(
+            2, relay_worker, (), ["stage_1"], ["stage_2"]
+        )
+        assert result
+        assert relay_property is not None
+
+        result, copy_property = worker_property_data.WorkerPropertyData.create(
+            1, copy_relay_worker, (), ["stage_1"], ["result"]
+        )
+        assert result
+        assert copy_property is not None
+
+        count_added = manager_empty.add_worker_groups(
+            [counter_property, relay_property, copy_property]
+        )
+        assert count_added == 3
+
+        result = manager_empty.start_all(10.0)
+        assert result
+
+        time.sleep(0.3)
+
+        result, _ = manager_empty.drain_all(10.0)
+        assert result
+
+        names_to_queue = manager_empty._WorkerManager__names_to_queue
+        relayed_items = names_to_queue["stage_2"].get_many(100_000, 0.0)
+        copied_items = names_to_queue["result"].get_many(100_000, 0.0)
+
+        assert len(copied_items) > 0
+        assert copied_items == list(range(0, len(copied_items)))
+        assert sorted(relayed_items) == copied_items
+
+        metrics = manager_empty.get_metrics()["stage_1"]
+        assert metrics.subscriber_depths == {"relay_worker": 0, "copy_relay_worker": 0}
+        assert metrics.get_count == 2 * metrics.put_count
+
+
+class TestTrace:
+    """
+    Test tracing items through the workers.
+    """
+
+    def test_not_enabled(self, manager_empty: worker_manager.WorkerManager, tmp_path: str) -> None:
+        """
+        Export requires a trace directory.
+        """
+        result = manager_empty.export_trace(os.path.join(tmp_path, "trace.json"))
+
+        assert not result
+
+    def test_export(self, tmp_path: str) -> None:
+        """
+        Sampled items are traced from the source through each queue and worker.
+        """
+        result, manager = worker_manager.WorkerManager.create(
+            5, trace_directory=os.path.join(tmp_path, "traces"), trace_sample_rate=1.0
+        )
+        assert result
+        assert manager is not None
+
+        queue_properties = []
+        for name, max_size in [("stage_1", 5), ("stage_2", 100_000)]:
+            result, queue_property = queue_property_data.QueuePropertyData.create(name, max_size)
+            assert result
+            assert queue_property is not None
+
+            queue_properties.append(queue_property)
+
+        count_added = manager.add_queues(queue_properties)
+        assert count_added == 2
+
+        result, counter_property = worker_property_data.WorkerPropertyData.create(
+            1, counter_worker, (), [], ["stage_1"]
+        )
+        assert result
+        assert counter_property is not None
+
+        result, relay_property = worker_property_data.WorkerPropertyData.create(
+            2, relay_worker, (), ["stage_1"], ["stage_2"]
+        )
+        assert result
+        assert relay_property is not None
+
+        count_added = manager.add_worker_groups([counter_property, relay_property])
+        assert count_added == 2
+
+        result = manager.start_all(10.0)
+        assert result
+
+        time.sleep(0.2)
+
+        result, _ = manager.drain_all(10.0)
+        assert result
+
+        items = manager._WorkerManager__names_to_queue["stage_2"].get_many(100_000, 0.0)
+        assert len(items) > 0
+
+        output_path = os.path.join(tmp_path, "trace.json")
+        result = manager.export_trace(output_path)
+        assert result
+
+        with open(output_path, encoding="utf-8") as file:
+            events = json.load(file)["traceEvents"]
+
+        waits = {}
+        for event in events:
+            if event["ph"] == "b":
+                waits.setdefault(event["id"], []).append(event["name"])
+
+        assert len(waits) == len(items)
+        assert all(sorted(names) == ["stage_1", "stage_2"] for names in waits.values())
+
+        processes = [event for event in events if event["ph"] == "X"]
+        assert {event["name"] for event in processes} == {"relay_worker"}
+        # Events are recorded by the getters, the main process and each relay worker
+        assert len({event["pid"] for event in events}) == 3
+
+    def test_restart(self, tmp_path: str) -> None:
+        """
+        Workers forked after the main process got items still sample, each hop of a trace is
+        written once, and only the last run is exported.
+        """
+        result, manager = worker_manager.WorkerManager.create(
+            5, "fork", trace_directory=os.path.join(tmp_path, "traces"), trace_sample_rate=1.0
+        )
+        assert result
+        assert manager is not None
+
+        queue_properties = []
+        for name, max_size in [("stage_1", 5), ("stage_2", 100_000)]:
+            result, queue_property = queue_property_data.QueuePropertyData.create(name, max_size)
+            assert result
+            assert queue_property is not None
+
+            queue_properties.append(queue_property)
+
+        count_added = manager.add_queues(queue_properties)
+        assert count_added == 2
+
+        result, counter_property = worker_property_data.WorkerPropertyData.create(
+            1, counter_worker, (), [], ["stage_1"]
+        )
+        assert result
+        assert counter_property is not None
+
+        result, relay_property = worker_property_data.WorkerPropertyData.create(
+            1, relay_worker, (), ["stage_1"], ["stage_2"]
+        )
+        assert result
+        assert relay_property is not None
+
+        count_added = manager.add_worker_groups([counter_property, relay_property])
+        assert count_added == 2
+
+        stage_2 = manager._WorkerManager__names_to_queue["stage_2"]
+        # Sets the trace of this thread before the workers are forked
+        assert stage_2.get(0.0) == (False, None)
+
+        item_count = 0
+        for _ in range(0, 2):
+            result = manager.start_all(10.0)
+            assert result
+
+            time.sleep(0.2)
+
+            result, _ = manager.drain_all(10.0)
+            assert result
+
+            # Records events in this process, which are copied into the workers of the next run
+            items = stage_2.get_many(100_000, 0.0)
+            assert len(items) > 0
+            item_count = len(items)
+
+        output_path = os.path.join(tmp_path, "trace.json")
+        result = manager.export_trace(output_path)
+        assert result
+
+        with open(output_path, encoding="utf-8") as file:
+            events = json.load(file)["traceEvents"]
+
+        waits = {}
+        for event in events:
+            if event["ph"] == "b":
+                waits.setdefault(event["id"], []).append(event["name"])
+
+        assert len(waits) == item_count
+        assert all(sorted(names) == ["stage_1", "stage_2"] for names in waits.values())
+
+
+class TestProfile:
+    """
+    Test profiling worker groups.
+    """
+
+    def test_not_profiled(self, manager_with_queues: worker_manager.WorkerManager) -> None:
+        """
+        Groups without a profile directory have no profile.
+        """
+        result, worker_property = worker_property_data.WorkerPropertyData.create(
+            1, sleeper_worker, (0.01,), [], []
+        )
+        assert result
+        assert worker_property is not None
+
+        count_added = manager_with_queues.add_worker_groups([worker_property])
+        assert count_added == 1
+
+        result, stats = manager_with_queues.get_profile("sleeper_worker")
+
+        assert not result
+        assert stats is None
+
+    @pytest.mark.parametrize(
+        "execution_mode,thread_count",
+        [
+            (worker_property_data.ExecutionMode.PROCESS, 1),
+            (worker_property_data.ExecutionMode.THREADS_IN_PROCESSES, 2),
+        ],
+    )
+    def test_merged(
+        self,
+        manager_empty: worker_manager.WorkerManager,
+        execution_mode: worker_property_data.ExecutionMode,
+        thread_count: int,
+        tmp_path: str,
+    ) -> None:
+        """
+        The profiles of all workers of a group in the last run are merged, and other groups are not
+        profiled.
+        """
+        queue_properties = []
+        for name, max_size in [("stage_1", 5), ("stage_2", 100_000)]:
+            result, queue_property = queue_property_data.QueuePropertyData.create(name, max_size)
+            assert result
+            assert queue_property is not None
+
+            queue_properties.append(queue_property)
+
+        count_added = manager_empty.add_queues(queue_properties)
+        assert count_added == 2
+
+        result, counter_property = worker_property_data.WorkerPropertyData.create(
+            1, counter_worker, (), [], ["stage_1"]
+        )
+        assert result
+        assert counter_property is not None
+
+        result, relay_property = worker_property_data.WorkerPropertyData.create(
+            2,
+            relay_worker,
+            (),
+            ["stage_1"],
+            ["stage_2"],
+            execution_mode=execution_mode,
+            thread_count=thread_count,
+            profile_directory=str(tmp_path),
+        )
+        assert result
+        assert relay_property is not None
+
+        count_added = manager_empty.add_worker_groups([counter_property, relay_property])
+        assert count_added == 2
+
+        # The profiles of the first run are not merged into the second
+        for _ in range(0, 2):
+            result = manager_empty.start_all(10.0)
+            assert result
+
+            time.sleep(0.2)
+
+            result, _ = manager_empty.drain_all(10.0)
+            assert result
+
+            # One profile for each thread of each worker
+            assert len(os.listdir(os.path.join(tmp_path, "relay_worker"))) == 2 * thread_count
+            assert os.listdir(tmp_path) == ["relay_worker"]
+
+            result, stats = manager_empty.get_profile("relay_worker")
+            assert result
+            assert stats is not None
+
+            relay_call_count = sum(
+                call_count
+                for (_, _, name), (_, call_count, _, _, _) in stats.stats.items()  # type: ignore
+                if name == "relay_worker"
+            )
+            assert relay_call_count == 2 * thread_count
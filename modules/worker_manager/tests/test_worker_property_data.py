@@ -2,6 +2,7 @@
 Test queue property.
 """
 
+from modules.worker_manager import scaling_policy_data
 from modules.worker_manager import worker_property_data
 
 
@@ -16,6 +17,12 @@ def stub() -> None:
     """
 
 
+async def async_stub() -> None:
+    """
+    Stub coroutine function.
+    """
+
+
 class TestCreate:
     """
     Test create() method.
@@ -59,3 +66,141 @@ class TestCreate:
 
         assert not result
         assert worker_property is None
+
+    def test_count_outside_scaling_policy(self) -> None:
+        """
+        Count above the maximum of the scaling policy.
+        """
+        result, scaling_policy = scaling_policy_data.ScalingPolicyData.create(
+            1, 4, 8.0, 1.0, 3, 2.0
+        )
+        assert result
+        assert scaling_policy is not None
+
+        result, worker_property = worker_property_data.WorkerPropertyData.create(
+            5, stub, (), [], [], scaling_policy
+        )
+
+        assert not result
+        assert worker_property is None
+
+    def test_cpu_set_empty(self) -> None:
+        """
+        Empty CPU set.
+        """
+        result, worker_property = worker_property_data.WorkerPropertyData.create(
+            1, stub, (), [], [], None, []
+        )
+
+        assert not result
+        assert worker_property is None
+
+    def test_cpu_set_duplicate(self) -> None:
+        """
+        Same CPU twice.
+        """
+        cpu = min(worker_property_data.get_available_cpus())
+
+        result, worker_property = worker_property_data.WorkerPropertyData.create(
+            1, stub, (), [], [], None, [cpu, cpu]
+        )
+
+        assert not result
+        assert worker_property is None
+
+    def test_cpu_set_unavailable(self) -> None:
+        """
+        CPU that this process cannot run on.
+        """
+        cpu = max(worker_property_data.get_available_cpus()) + 1
+
+        result, worker_property = worker_property_data.WorkerPropertyData.create(
+            1, stub, (), [], [], None, [cpu]
+        )
+
+        assert not result
+        assert worker_property is None
+
+    def test_concurrency(self) -> None:
+        """
+        Concurrent calls of a coroutine function.
+        """
+        result, worker_property = worker_property_data.WorkerPropertyData.create(
+            1, async_stub, (), [], [], concurrency=100
+        )
+
+        assert result
+        assert worker_property is not None
+
+    def test_concurrency_zero(self) -> None:
+        """
+        Zero concurrency.
+        """
+        result, worker_property = worker_property_data.WorkerPropertyData.create(
+            1, async_stub, (), [], [], concurrency=0
+        )
+
+        assert not result
+        assert worker_property is None
+
+    def test_concurrency_not_coroutine(self) -> None:
+        """
+        Concurrency of a function that is not a coroutine function.
+        """
+        result, worker_property = worker_property_data.WorkerPropertyData.create(
+            1, stub, (), [], [], concurrency=2
+        )
+
+        assert not result
+        assert worker_property is None
+
+    def test_thread_count(self) -> None:
+        """
+        Threads in each worker process.
+        """
+        result, worker_property = worker_property_data.WorkerPropertyData.create(
+            2,
+            stub,
+            (),
+            [],
+            [],
+            execution_mode=worker_property_data.ExecutionMode.THREADS_IN_PROCESSES,
+            thread_count=8,
+        )
+
+        assert result
+        assert worker_property is not None
+
+    def test_thread_count_zero(self) -> None:
+        """
+        Zero threads.
+        """
+        result, worker_property = worker_property_data.WorkerPropertyData.create(
+            1,
+            stub,
+            (),
+            [],
+            [],
+            execution_mode=worker_property_data.ExecutionMode.THREADS_IN_PROCESSES,
+            thread_count=0,
+        )
+
+        assert not result
+        assert worker_property is None
+
+    def test_thread_count_without_processes(self) -> None:
+        """
+        Thread count of thread workers.
+        """
+        result, worker_property = worker_property_data.WorkerPropertyData.create(
+            1,
+            stub,
+            (),
+            [],
+            [],
+            execution_mode=worker_property_data.ExecutionMode.THREAD,
+            thread_count=2,
+        )
+
+        assert not result
+        assert worker_property is None
@@ -2,23 +2,61 @@
 For worker control.
 """
 
-import multiprocessing as mp
-import multiprocessing.managers
+import asyncio
+import enum
+import multiprocessing.context
+import time
 
+from . import queue_wrapper
 
+
+class WorkerCommand(enum.IntEnum):
+    """
+    Command from the worker manager to the worker.
+    """
+
+    RUN = 0
+    PAUSE = 1
+    EXIT = 2
+    # Exit once all input queues have ended
+    DRAIN = 3
+
+
+class WorkerState(enum.IntEnum):
+    """
+    State the worker acknowledged in its last check.
+    """
+
+    RUNNING = 0
+    PAUSED = 1
+    EXITING = 2
+
+
+# Synchronization objects shared with the worker
+# pylint: disable-next=too-many-instance-attributes
 class WorkerController:
     """
     The worker uses this to communicate with the worker manager.
+
+    The worker calls check_pause_and_exit() once per loop iteration. The command is a flag in shared
+    memory, so the check is a single memory read when there is nothing to do. The check also writes
+    the time to a heartbeat in shared memory, which the worker manager reads to find hung workers.
+
+    Messages are sent through a duplex pipe owned by the controller instead of through the
+    multiprocessing manager, so workers do not add objects to the manager server.
     """
 
     __create_key = object()
 
     @classmethod
     def create(
-        cls, mp_manager: multiprocessing.managers.SyncManager, max_size: int
+        cls,
+        max_size: int,
+        mp_context: multiprocessing.context.BaseContext,
     ) -> tuple[True, "WorkerController"] | tuple[False, None]:
         """
-        max_size: Maximum number of items that can be held in the queue. Must be greater than 0.
+        max_size: Maximum number of messages pending in each direction. Must be greater than 0.
+        mp_context: Multiprocessing context of the worker.
 
         Return: Success, object.
         """
@@ -26,23 +64,266 @@ class WorkerController:
             print("ERROR: Queue max size must be greater than 0")
             return False, None
 
-        return True, WorkerController(cls.__create_key, mp_manager, max_size)
+        return True, WorkerController(cls.__create_key, max_size, mp_context)
 
     def __init__(
         self,
         class_private_create_key: object,
-        mp_manager: multiprocessing.managers.SyncManager,
         max_size: int,
+        mp_context: multiprocessing.context.BaseContext,
     ) -> None:
         """
         Private constructor, use create() method.
         """
         assert class_private_create_key is WorkerController.__create_key, "Use create() method"
 
-        # TODO: Start using these
-        # pylint: disable=unused-private-member
-        self.__pause = mp.BoundedSemaphore(1)
+        # Held by the manager while the worker is paused
+        self.__pause = mp_context.BoundedSemaphore(1)
+
+        self.__manager_connection, self.__worker_connection = mp_context.Pipe(True)
+        # Pipes are unbounded, so each direction holds a slot per pending message
+        self.__manager_to_worker_slots = mp_context.BoundedSemaphore(max_size)
+        self.__worker_to_manager_slots = mp_context.BoundedSemaphore(max_size)
+
+        self.__ready = mp_context.Event()
+
+        # Only written by the manager
+        self.__command = mp_context.RawValue("i", WorkerCommand.RUN)
+        # Only written by the worker
+        self.__state = mp_context.RawValue("i", WorkerState.RUNNING)
+        # Time from time.monotonic() of the last check, which is system wide
+        self.__heartbeat = mp_context.RawValue("d", time.monotonic())
+
+        # Only set in the worker process
+        self.__input_queues: list[queue_wrapper.QueueWrapper] = []
+
+    def check_pause_and_exit(self) -> bool:
+        """
+        Called by the worker once per loop iteration. Blocks while the worker is paused.
+
+        During a drain, returns False once a get on each input queue of the worker found it ended,
+        so the worker is not holding an item. Gets are tracked per thread and per asyncio task.
+        A worker without input queues exits immediately.
+
+        Return: False if the worker should exit.
+        """
+        self.__heartbeat.value = time.monotonic()
+
+        if self.__command.value == WorkerCommand.RUN:
+            return True
+
+        while True:
+            command = self.__command.value
+            if command == WorkerCommand.RUN:
+                self.__state.value = WorkerState.RUNNING
+                return True
+
+            if command == WorkerCommand.EXIT:
+                self.__state.value = WorkerState.EXITING
+                return False
+
+            if command == WorkerCommand.DRAIN:
+                if all(queue.is_end_of_stream() for queue in self.__input_queues):
+                    self.__state.value = WorkerState.EXITING
+                    return False
+
+                self.__state.value = WorkerState.RUNNING
+                return True
+
+            self.__state.value = WorkerState.PAUSED
+
+            # The manager releases the semaphore on resume and on exit
+            self.__pause.acquire()
+            self.__pause.release()
+
+    async def check_pause_and_exit_async(self) -> bool:
+        """
+        Called by a coroutine worker instead of check_pause_and_exit(). Waits while the worker is
+        paused without blocking the event loop.
+
+        Return: False if the worker should exit.
+        """
+        if self.__command.value != WorkerCommand.PAUSE:
+            return self.check_pause_and_exit()
+
+        # Waiting for the resume blocks the thread, which runs in a copy of the context so the
+        # input queues are checked for this task
+        return await asyncio.to_thread(self.check_pause_and_exit)
+
+    def set_input_queues(self, input_queues: list[queue_wrapper.QueueWrapper]) -> None:
+        """
+        Called in the worker process before the target function runs.
+
+        input_queues: Input queues of the worker, the same objects as passed to the target function.
+        """
+        self.__input_queues = input_queues
+
+    def notify_ready(self) -> None:
+        """
+        Called in the worker process before the target function runs.
+        """
+        self.__heartbeat.value = time.monotonic()
+        self.__ready.set()
+
+    def is_ready(self, timeout: float) -> bool:
+        """
+        Called by the worker manager.
+
+        timeout: Seconds to wait for the worker to be ready.
+
+        Return: Whether the worker is ready.
+        """
+        return self.__ready.wait(timeout)
+
+    def reset(self) -> None:
+        """
+        Called by the worker manager before the worker is started again.
+        """
+        if self.__command.value == WorkerCommand.PAUSE:
+            self.__pause.release()
+
+        self.__command.value = WorkerCommand.RUN
+        self.__state.value = WorkerState.RUNNING
+        # Startup counts towards the heartbeat timeout
+        self.__heartbeat.value = time.monotonic()
+        self.__ready.clear()
+
+        # Discard messages left over from the previous run
+        while self.__worker_connection.poll():
+            self.__worker_connection.recv()
+            self.__manager_to_worker_slots.release()
+
+        while self.__manager_connection.poll():
+            self.__manager_connection.recv()
+            self.__worker_to_manager_slots.release()
+
+    def request_pause(self) -> None:
+        """
+        Called by the worker manager. The worker pauses at its next check.
+        """
+        if self.__command.value != WorkerCommand.RUN:
+            return
+
+        self.__pause.acquire()
+        self.__command.value = WorkerCommand.PAUSE
+
+    def request_resume(self) -> None:
+        """
+        Called by the worker manager. A paused worker resumes immediately.
+        """
+        if self.__command.value != WorkerCommand.PAUSE:
+            return
+
+        self.__command.value = WorkerCommand.RUN
+        self.__pause.release()
+
+    def request_drain(self) -> None:
+        """
+        Called by the worker manager. The worker returns from its target function once its input
+        queues have ended, also if it is paused.
+        """
+        previous_command = self.__command.value
+        if previous_command == WorkerCommand.EXIT:
+            return
+
+        self.__command.value = WorkerCommand.DRAIN
+
+        if previous_command == WorkerCommand.PAUSE:
+            self.__pause.release()
+
+    def is_pause_requested(self) -> bool:
+        """
+        Return: Whether the next check of the worker pauses it.
+        """
+        return self.__command.value == WorkerCommand.PAUSE
+
+    def is_draining(self) -> bool:
+        """
+        Return: Whether a drain was requested and not replaced by an exit request.
+        """
+        return self.__command.value == WorkerCommand.DRAIN
+
+    def request_exit(self) -> None:
+        """
+        Called by the worker manager. The worker returns from its target function at its next
+        check, also if it is paused.
+        """
+        previous_command = self.__command.value
+        self.__command.value = WorkerCommand.EXIT
+
+        if previous_command == WorkerCommand.PAUSE:
+            self.__pause.release()
+
+    def get_state(self) -> WorkerState:
+        """
+        Called by the worker manager.
+
+        Return: State the worker acknowledged in its last check.
+        """
+        return WorkerState(self.__state.value)
+
+    def get_heartbeat(self) -> float:
+        """
+        Called by the worker manager.
+
+        Return: Time from time.monotonic() of the last check by the worker, or of the last reset.
+        """
+        return self.__heartbeat.value
+
+    def send_to_worker(self, item: object) -> bool:
+        """
+        Called by the worker manager. Does not block.
+
+        item: Picklable message.
+
+        Return: Whether the message was sent, False if max_size messages are pending.
+        """
+        if not self.__manager_to_worker_slots.acquire(False):
+            return False
+
+        self.__manager_connection.send(item)
+        return True
+
+    def receive_from_manager(self, timeout: float) -> tuple[True, object] | tuple[False, None]:
+        """
+        Called by the worker.
+
+        timeout: Seconds to wait for a message.
+
+        Return: Success, message.
+        """
+        if not self.__worker_connection.poll(timeout):
+            return False, None
+
+        item = self.__worker_connection.recv()
+        self.__manager_to_worker_slots.release()
+        return True, item
+
+    def send_to_manager(self, item: object) -> bool:
+        """
+        Called by the worker. Does not block.
+
+        item: Picklable message.
+
+        Return: Whether the message was sent, False if max_size messages are pending.
+        """
+        if not self.__worker_to_manager_slots.acquire(False):
+            return False
+
+        self.__worker_connection.send(item)
+        return True
+
+    def receive_from_worker(self, timeout: float) -> tuple[True, object] | tuple[False, None]:
+        """
+        Called by the worker manager.
+
+        timeout: Seconds to wait for a message.
+
+        Return: Success, message.
+        """
+        if not self.__manager_connection.poll(timeout):
+            return False, None
 
-        self.__manager_to_worker_queue = mp_manager.Queue(max_size)
-        self.__worker_to_manager_queue = mp_manager.Queue(max_size)
-        # pylint: enable=unused-private-member
+        item = self.__manager_connection.recv()
+        self.__worker_to_manager_slots.release()
+        return True, item
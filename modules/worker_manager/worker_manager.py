@@ -3,15 +3,26 @@ Worker manager.
 """
 
 import multiprocessing as mp
+import multiprocessing.context
 import multiprocessing.managers
+import pstats
+import threading
+import time
 
+from . import queue_metrics_data
 from . import queue_property_data
 from . import queue_wrapper
+from . import scaling_event_data
 from . import worker_property_data
 from .private import process_property_data
+from .private import profiler
+from .private import tracer
 from .private import worker_group
+from .private import worker_sync_manager
 
 
+# The worker manager is the interface of the library, and holds the state of each feature
+# pylint: disable-next=too-many-instance-attributes,too-many-public-methods
 class WorkerManager:
     """
     Starts and monitors workers.
@@ -23,9 +34,22 @@ class WorkerManager:
     def create(
         cls,
         controller_max_size: int,
+        start_method: str | None = None,
+        preload_modules: list[str] | None = None,
+        is_manager_server: bool = True,
+        trace_directory: str | None = None,
+        trace_sample_rate: float = 0.01,
     ) -> tuple[True, "WorkerManager"] | tuple[False, None]:
         """
-        controller_max_size: Maximum number of items that can be held in each of the worker controllers' queues. Must be greater than 0.
+        controller_max_size: Maximum number of messages pending in each direction of each worker controller. Must be greater than 0.
+        start_method: Multiprocessing start method of the workers and the manager server: "fork", "spawn", or "forkserver". None is the platform default.
+        preload_modules: Modules the fork server imports once so that workers forked from it do not import them again. Only used with "forkserver".
+            The fork server is shared by the whole program and is started once, so this must be set before any process is started with "forkserver".
+        is_manager_server: Whether to start the manager server process, which is only used by queues with the manager backend.
+            Without it, the manager starts faster and no extra process runs, and queues use the process, shared memory, broadcast, or in-process backends, which are passed to the workers when they start.
+        trace_directory: Directory for the trace files of the items sampled by the queues, written by each worker when it exits. None does not trace.
+            The files are merged into one timeline by export_trace().
+        trace_sample_rate: Fraction of the items put by sources that are traced through every queue and worker they pass, from 0.0 to 1.0.
 
         Return: Success, object.
         """
@@ -33,15 +57,44 @@ class WorkerManager:
             print("ERROR: Queue max size must be greater than 0")
             return False, None
 
-        mp_manager = mp.Manager()
+        try:
+            mp_context = mp.get_context(start_method)
+        except ValueError as e:
+            print(f"ERROR: Unsupported start method: {e}")
+            return False, None
+
+        if preload_modules is not None:
+            if mp_context.get_start_method() != "forkserver":
+                print("ERROR: Preloaded modules require the forkserver start method")
+                return False, None
+
+            mp_context.set_forkserver_preload(preload_modules)
+
+        item_tracer = None
+        if trace_directory is not None:
+            result, item_tracer = tracer.Tracer.create(trace_directory, trace_sample_rate)
+            if not result:
+                print("ERROR: Failed to create tracer")
+                return False, None
+
+        mp_manager = None
+        if is_manager_server:
+            mp_manager = worker_sync_manager.WorkerSyncManager(ctx=mp_context)
+            # The manager server lives as long as the worker manager
+            # pylint: disable-next=consider-using-with
+            mp_manager.start()
 
-        return True, WorkerManager(cls.__create_key, mp_manager, controller_max_size)
+        return True, WorkerManager(
+            cls.__create_key, mp_manager, mp_context, controller_max_size, item_tracer
+        )
 
     def __init__(
         self,
         class_private_create_key: object,
-        mp_manager: multiprocessing.managers.SyncManager,
+        mp_manager: multiprocessing.managers.SyncManager | None,
+        mp_context: multiprocessing.context.BaseContext,
         controller_max_size: int,
+        item_tracer: tracer.Tracer | None,
     ) -> None:
         """
         Private constructor, use create() method.
@@ -49,11 +102,26 @@ class WorkerManager:
         assert class_private_create_key is WorkerManager.__create_key, "Use create() method"
 
         self.__mp_manager = mp_manager
+        self.__mp_context = mp_context
+        self.__tracer = item_tracer
 
         self.__names_to_queue: dict[str, queue_wrapper.QueueWrapper] = {}
 
         self.__controller_max_size = controller_max_size
         self.__names_to_worker_group: dict[str, worker_group.WorkerGroup] = {}
+        # Partitioned and reorder queue names to the name of the only worker group getting from them
+        self.__exclusive_names_to_worker_group_name: dict[str, str] = {}
+
+        self.__startup_time: float | None = None
+        self.__stop_time: float | None = None
+
+        # Worker groups are changed by both the caller and the monitor thread
+        self.__lock = threading.RLock()
+
+        self.__scaling_events: list[scaling_event_data.ScalingEventData] = []
+
+        self.__monitor_thread: threading.Thread | None = None
+        self.__monitor_stop_event = threading.Event()
 
     def add_queues(self, queue_properties: list[queue_property_data.QueuePropertyData]) -> int:
         """
@@ -76,6 +144,8 @@ class WorkerManager:
             result, queue = queue_wrapper.QueueWrapper.create(
                 self.__mp_manager,
                 queue_property,
+                self.__mp_context,
+                self.__tracer,
             )
             if not result:
                 print(f"ERROR: Failed to create queue: {queue_name}")
@@ -89,6 +159,44 @@ class WorkerManager:
 
         return count_added
 
+    def get_metrics(self) -> dict[str, queue_metrics_data.QueueMetricsData]:
+        """
+        Sample the counters of all queues. The counters are in shared memory, so only the depth of
+        manager queues is requested from the manager server.
+
+        Return: Metrics for each queue name.
+        """
+        names_to_metrics = {}
+        for name, queue in self.__names_to_queue.items():
+            result, metrics = queue.get_metrics()
+            if not result:
+                print(f"ERROR: Failed to get metrics of queue: {name}")
+                continue
+
+            names_to_metrics[name] = metrics
+
+        return names_to_metrics
+
+    def export_trace(self, output_path: str) -> bool:
+        """
+        Merge the trace files of all processes into one file in Chrome trace format, which can be
+        opened in chrome://tracing or Perfetto. Workers write their trace files when they exit, so
+        call this after the workers are stopped or drained.
+
+        output_path: Path of the merged file. Must not match trace_*.json in the trace directory.
+
+        Return: Success.
+        """
+        if self.__tracer is None:
+            print("ERROR: Tracing is not enabled")
+            return False
+
+        # Items got by this process, such as from the last queue
+        if not self.__tracer.flush():
+            return False
+
+        return tracer.merge_traces(self.__tracer.get_directory(), output_path)
+
     def add_worker_groups(
         self, worker_properties: list[worker_property_data.WorkerPropertyData]
     ) -> int:
@@ -109,8 +217,41 @@ class WorkerManager:
 
             count_added += 1
 
+        if count_added > 0:
+            self.__warn_oversubscription()
+
         return count_added
 
+    def __warn_oversubscription(self) -> None:
+        """
+        Warn when the workers of all groups need more cores than are available. A worker without a
+        CPU set counts as an equal share of every available core.
+        """
+        available_cpus = worker_property_data.get_available_cpus()
+        workers = self.__get_all_workers()
+
+        if len(workers) > len(available_cpus):
+            print(
+                f"WARNING: {len(workers)} workers oversubscribe {len(available_cpus)} available cores"
+            )
+
+        if all(worker.get_cpu_set() is None for worker in workers):
+            return
+
+        cpus_to_load = {cpu: 0.0 for cpu in available_cpus}
+        for worker in workers:
+            cpu_set = worker.get_cpu_set()
+            if cpu_set is None:
+                cpu_set = list(available_cpus)
+
+            for cpu in cpu_set:
+                cpus_to_load[cpu] += 1.0 / len(cpu_set)
+
+        # Tolerance for the sum of fractions
+        oversubscribed_cpus = [cpu for cpu, load in cpus_to_load.items() if load > 1.0 + 1e-9]
+        if len(oversubscribed_cpus) > 0:
+            print(f"WARNING: Cores have more than one worker: {sorted(oversubscribed_cpus)}")
+
     def __add_worker_group(self, worker_property: worker_property_data.WorkerPropertyData) -> bool:
         """
         worker_property: Property data of the worker to be added.
@@ -146,33 +287,127 @@ class WorkerManager:
         # Get Pylance to stop complaining
         assert output_queues is not None
 
+        # The partitions are divided among the threads and coroutine calls of the workers of one
+        # group
+        partition_names = [
+            queue.queue_property.name
+            for queue in input_queues
+            if queue.queue_property.partition_count > 1
+        ]
+        # The reorder buffer is in the process of the consumer
+        reorder_names = [
+            queue.queue_property.name
+            for queue in input_queues
+            if queue.queue_property.sequence_mode == queue_property_data.SequenceMode.REORDER
+        ]
+        for name in partition_names + reorder_names:
+            if name in self.__exclusive_names_to_worker_group_name:
+                print(
+                    f"ERROR: Queue {name} is already the input of worker group: {self.__exclusive_names_to_worker_group_name[name]}"
+                )
+                return False
+
+        max_count = worker_property.count
+        if worker_property.scaling_policy is not None:
+            max_count = worker_property.scaling_policy.max_count
+
+        is_single_consumer = (
+            max_count == 1
+            and worker_property.concurrency == 1
+            and worker_property.thread_count == 1
+        )
+        if len(reorder_names) > 0 and not is_single_consumer:
+            print(
+                f"ERROR: Reorder queues require a single worker and a single thread: {worker_name}"
+            )
+            return False
+
+        if worker_property.execution_mode != worker_property_data.ExecutionMode.THREAD and any(
+            queue.queue_property.backend == queue_property_data.QueueBackend.IN_PROCESS
+            for queue in input_queues + output_queues
+        ):
+            print(f"ERROR: In-process queues are only for thread workers: {worker_name}")
+            return False
+
+        profile_directory = None
+        if worker_property.profile_directory is not None:
+            result, profile_directory = profiler.create_group_directory(
+                worker_property.profile_directory, worker_name
+            )
+            if not result:
+                print(f"ERROR: Failed to create profile directory for: {worker_name}")
+                return False
+
+        # Each group gets from a broadcast queue through its own subscription
+        broadcast_queues = [
+            queue
+            for queue in input_queues
+            if queue.queue_property.backend == queue_property_data.QueueBackend.BROADCAST
+        ]
+        for i, queue in enumerate(input_queues):
+            if queue not in broadcast_queues:
+                continue
+
+            result, subscriber_queue = queue.subscribe(worker_name, self.__mp_context)
+            if not result:
+                print(f"ERROR: Failed to subscribe worker group to its input queues: {worker_name}")
+                self.__unsubscribe(broadcast_queues, worker_name)
+                return False
+
+            # Get Pylance to stop complaining
+            assert subscriber_queue is not None
+
+            input_queues[i] = subscriber_queue
+
         result, process_property = process_property_data.ProcessPropertyData.create(
             worker_property.target_function,
             worker_property.target_arguments,
             input_queues,
             output_queues,
+            worker_property.cpu_set,
+            worker_property.affinity_mode,
+            worker_property.concurrency,
+            worker_property.execution_mode,
+            worker_property.thread_count,
+            profile_directory,
         )
         if not result:
             print(f"ERROR: Failed to create worker properties: {worker_name}")
+            self.__unsubscribe(broadcast_queues, worker_name)
             return False
 
         # Get Pylance to stop complaining
         assert process_property is not None
 
         result, group = worker_group.WorkerGroup.create(
-            worker_property.count, process_property, self.__mp_manager, self.__controller_max_size
+            worker_property.count,
+            process_property,
+            self.__controller_max_size,
+            self.__mp_context,
+            worker_property.scaling_policy,
         )
         if not result:
             print(f"ERROR: Failed to create workers: {worker_name}")
+            self.__unsubscribe(broadcast_queues, worker_name)
             return False
 
         # Get Pylance to stop complaining
         assert group is not None
 
         self.__names_to_worker_group[worker_name] = group
+        for name in partition_names + reorder_names:
+            self.__exclusive_names_to_worker_group_name[name] = worker_name
 
         return True
 
+    @staticmethod
+    def __unsubscribe(queues: list[queue_wrapper.QueueWrapper], worker_name: str) -> None:
+        """
+        Remove the subscriptions of a worker group that failed to be created.
+        """
+        for queue in queues:
+            queue.unsubscribe(worker_name)
+
     @staticmethod
     def __get_queues(
         names_to_queue: dict[str, queue_wrapper.QueueWrapper], names: list[str]
@@ -190,3 +425,421 @@ class WorkerManager:
             queues.append(queue)
 
         return True, queues
+
+    def __get_worker_group(
+        self, name: str
+    ) -> tuple[True, worker_group.WorkerGroup] | tuple[False, None]:
+        """
+        Get the worker group given its name.
+        """
+        if not name in self.__names_to_worker_group:
+            print(f"ERROR: Worker group does not exist: {name}")
+            return False, None
+
+        return True, self.__names_to_worker_group[name]
+
+    def __get_all_workers(self) -> list[worker_group.Worker]:
+        """
+        Get the workers of all groups.
+        """
+        return [
+            worker
+            for group in self.__names_to_worker_group.values()
+            for worker in group.get_workers()
+        ]
+
+    def start_all(self, ready_timeout: float | None = None) -> bool:
+        """
+        Start the workers of all groups concurrently and wait for them to be ready.
+        The time taken is available from get_startup_time().
+
+        ready_timeout: Seconds to wait for all workers to be ready. None waits while they are alive.
+
+        Return: Success.
+        """
+        with self.__lock:
+            self.__reset_end_of_stream()
+            self.__clear_traces(None)
+
+            workers = self.__get_all_workers()
+            for group in self.__names_to_worker_group.values():
+                WorkerManager.__clear_profiles(group)
+                group.set_running(True)
+
+            start_time = time.monotonic()
+            result = worker_group.WorkerGroup.start_workers(workers, ready_timeout)
+            if not result:
+                print("ERROR: Failed to start all worker groups")
+                return False
+
+            self.__startup_time = time.monotonic() - start_time
+
+        return True
+
+    def start_group(self, name: str, ready_timeout: float | None = None) -> bool:
+        """
+        Start the workers of a group concurrently and wait for them to be ready.
+        The time taken is available from get_startup_time().
+
+        name: Name of the worker group, which is the name of the target function.
+        ready_timeout: Seconds to wait for all workers to be ready. None waits while they are alive.
+
+        Return: Success.
+        """
+        result, group = self.__get_worker_group(name)
+        if not result:
+            return False
+
+        # Get Pylance to stop complaining
+        assert group is not None
+
+        with self.__lock:
+            self.__reset_end_of_stream()
+            self.__clear_traces(name)
+            WorkerManager.__clear_profiles(group)
+
+            start_time = time.monotonic()
+            result = group.start(ready_timeout)
+            if not result:
+                print(f"ERROR: Failed to start worker group: {name}")
+                return False
+
+            self.__startup_time = time.monotonic() - start_time
+
+        return True
+
+    def __reset_end_of_stream(self) -> None:
+        """
+        End the last drain of all queues, so that the workers started again do not see their
+        input queues as ended.
+        """
+        for queue in self.__names_to_queue.values():
+            queue.reset_end_of_stream()
+
+    def __clear_traces(self, name: str | None) -> None:
+        """
+        Remove the trace files of the last run, so that export_trace() only merges the workers
+        started now.
+
+        name: Name of the worker group started. None starts all groups, which also removes the
+            events of this process.
+        """
+        if self.__tracer is None:
+            return
+
+        if name is None:
+            self.__tracer.flush()
+
+        tracer.clear_traces(self.__tracer.get_directory(), name)
+
+    @staticmethod
+    def __clear_profiles(group: worker_group.WorkerGroup) -> None:
+        """
+        Remove the profiles of the last run of a group, so that get_profile() only merges the
+        workers started now.
+        """
+        profile_directory = group.get_profile_directory()
+        if profile_directory is not None:
+            profiler.clear_profiles(profile_directory)
+
+    def stop_all(self, timeout: float) -> bool:
+        """
+        Stop the workers of all groups. Workers exit at their next check of the controller.
+        The time taken is available from get_stop_time().
+
+        timeout: Seconds to wait for the workers to exit on request before they are terminated.
+
+        Return: Whether all workers exited on request before the timeout.
+        """
+        with self.__lock:
+            workers = self.__get_all_workers()
+            for group in self.__names_to_worker_group.values():
+                group.set_running(False)
+
+            start_time = time.monotonic()
+            result = worker_group.WorkerGroup.stop_workers(workers, timeout)
+            self.__stop_time = time.monotonic() - start_time
+
+        return result
+
+    def stop_group(self, name: str, timeout: float) -> bool:
+        """
+        Stop the workers of a group. Workers exit at their next check of the controller.
+        The time taken is available from get_stop_time().
+
+        name: Name of the worker group, which is the name of the target function.
+        timeout: Seconds to wait for the workers to exit on request before they are terminated.
+
+        Return: Whether all workers exited on request before the timeout.
+        """
+        result, group = self.__get_worker_group(name)
+        if not result:
+            return False
+
+        # Get Pylance to stop complaining
+        assert group is not None
+
+        with self.__lock:
+            start_time = time.monotonic()
+            result = group.stop(timeout)
+            self.__stop_time = time.monotonic() - start_time
+
+        return result
+
+    def drain_all(self, timeout: float) -> tuple[True, float] | tuple[False, None]:
+        """
+        Stop all groups without losing queued items. Workers without input queues exit at their next
+        check of the controller. Every other worker exits once all producers of its input queues
+        have exited and the queues are empty. A worker puts an end of stream marker into each of
+        its output queues when it exits.
+
+        Workers must get from their input queues through QueueWrapper with a timeout, and only
+        items put by the workers of this manager are waited for.
+
+        timeout: Seconds to wait for all workers to exit. Workers still running are then stopped.
+
+        Return: Success, seconds until all workers exited.
+        """
+        with self.__lock:
+            start_time = time.monotonic()
+
+            queues_to_producer_count = {id(queue): 0 for queue in self.__names_to_queue.values()}
+            for group in self.__names_to_worker_group.values():
+                alive_count = sum(1 for worker in group.get_workers() if worker.is_alive())
+                for queue in group.get_output_queues():
+                    queues_to_producer_count[id(queue)] += alive_count
+
+            for queue in self.__names_to_queue.values():
+                queue.begin_end_of_stream(queues_to_producer_count[id(queue)])
+
+            workers = self.__get_all_workers()
+            for worker in workers:
+                worker.get_controller().request_drain()
+
+            for group in self.__names_to_worker_group.values():
+                group.set_running(False)
+
+            result = worker_group.WorkerGroup.join_workers(workers, timeout)
+            if not result:
+                print("ERROR: Workers did not drain before the timeout, stopping")
+                worker_group.WorkerGroup.stop_workers(workers, 0.0)
+                return False, None
+
+            return True, time.monotonic() - start_time
+
+    def pause_group(self, name: str, timeout: float) -> tuple[True, float] | tuple[False, None]:
+        """
+        Pause the workers of a group. Workers pause at their next check of the controller.
+
+        name: Name of the worker group, which is the name of the target function.
+        timeout: Seconds to wait for the workers to acknowledge.
+
+        Return: Success, seconds until all running workers paused.
+        """
+        result, group = self.__get_worker_group(name)
+        if not result:
+            return False, None
+
+        # Get Pylance to stop complaining
+        assert group is not None
+
+        with self.__lock:
+            start_time = time.monotonic()
+            result = group.pause(timeout)
+            if not result:
+                print(f"ERROR: Workers did not pause: {name}")
+                return False, None
+
+            return True, time.monotonic() - start_time
+
+    def resume_group(self, name: str, timeout: float) -> tuple[True, float] | tuple[False, None]:
+        """
+        Resume the paused workers of a group.
+
+        name: Name of the worker group, which is the name of the target function.
+        timeout: Seconds to wait for the workers to acknowledge.
+
+        Return: Success, seconds until all running workers resumed.
+        """
+        result, group = self.__get_worker_group(name)
+        if not result:
+            return False, None
+
+        # Get Pylance to stop complaining
+        assert group is not None
+
+        with self.__lock:
+            start_time = time.monotonic()
+            result = group.resume(timeout)
+            if not result:
+                print(f"ERROR: Workers did not resume: {name}")
+                return False, None
+
+            return True, time.monotonic() - start_time
+
+    def join_all(self, timeout: float | None = None) -> bool:
+        """
+        Wait for the workers of all groups to exit.
+
+        timeout: Seconds to wait in total. None waits forever.
+
+        Return: Whether all workers have exited.
+        """
+        with self.__lock:
+            workers = self.__get_all_workers()
+
+        return worker_group.WorkerGroup.join_workers(workers, timeout)
+
+    def get_profile(self, name: str) -> tuple[True, pstats.Stats] | tuple[False, None]:
+        """
+        Merge the profiles of all workers of a group. Workers write their profiles when they exit,
+        so call this after the group is stopped or drained.
+
+        name: Name of the worker group, which is the name of the target function.
+
+        Return: Success, statistics of the group, which can be sorted and printed, or written with
+            dump_stats() for other viewers.
+        """
+        result, group = self.__get_worker_group(name)
+        if not result:
+            return False, None
+
+        # Get Pylance to stop complaining
+        assert group is not None
+
+        profile_directory = group.get_profile_directory()
+        if profile_directory is None:
+            print(f"ERROR: Worker group is not profiled: {name}")
+            return False, None
+
+        return profiler.merge_profiles(profile_directory)
+
+    def get_startup_time(self) -> tuple[True, float] | tuple[False, None]:
+        """
+        Return: Success, seconds from the last start_all() or start_group() call until all its
+            workers were ready.
+        """
+        if self.__startup_time is None:
+            return False, None
+
+        return True, self.__startup_time
+
+    def get_stop_time(self) -> tuple[True, float] | tuple[False, None]:
+        """
+        Return: Success, seconds from the last stop_all() or stop_group() call until all its
+            workers exited.
+        """
+        if self.__stop_time is None:
+            return False, None
+
+        return True, self.__stop_time
+
+    def autoscale(self, retire_timeout: float) -> int:
+        """
+        Sample the depth of the input queues of each running group with a scaling policy, and add
+        or retire workers. Called periodically by the monitor, see start_monitor().
+        Events are available from get_scaling_events().
+
+        retire_timeout: Seconds to wait for a retired worker to exit on request before it is terminated.
+
+        Return: Number of groups that were scaled.
+        """
+        count_scaled = 0
+        with self.__lock:
+            for group in self.__names_to_worker_group.values():
+                result, event = group.autoscale(time.monotonic(), retire_timeout)
+                if not result:
+                    continue
+
+                # Get Pylance to stop complaining
+                assert event is not None
+
+                self.__scaling_events.append(event)
+                count_scaled += 1
+
+        return count_scaled
+
+    def get_scaling_events(self) -> list[scaling_event_data.ScalingEventData]:
+        """
+        Return: All scaling events so far, oldest first.
+        """
+        with self.__lock:
+            return list(self.__scaling_events)
+
+    def supervise(self, heartbeat_timeout: float | None) -> int:
+        """
+        Restart workers of running groups that crashed or stopped responding. Each worker that
+        keeps failing waits twice as long as before until it is restarted.
+        Called periodically by the monitor, see start_monitor().
+
+        heartbeat_timeout: Seconds without a check of the controller after which a running worker
+            is terminated and restarted. Must be longer than the startup of a worker.
+            None only restarts workers that exited with a non-zero exit code.
+
+        Return: Number of workers restarted.
+        """
+        count_restarted = 0
+        with self.__lock:
+            for group in self.__names_to_worker_group.values():
+                count_restarted += group.supervise(time.monotonic(), heartbeat_timeout)
+
+        return count_restarted
+
+    def get_restart_counts(self) -> dict[str, int]:
+        """
+        Return: Number of restarts by supervise() so far, for each group name.
+        """
+        with self.__lock:
+            return {
+                name: group.get_restart_count()
+                for name, group in self.__names_to_worker_group.items()
+            }
+
+    def start_monitor(
+        self, period: float, retire_timeout: float, heartbeat_timeout: float | None = None
+    ) -> bool:
+        """
+        Start a thread in this process that periodically runs supervise() and autoscale().
+
+        period: Seconds between samples. Must be greater than 0.
+        retire_timeout: Seconds to wait for a retired worker to exit on request before it is terminated.
+        heartbeat_timeout: For supervise().
+
+        Return: Success.
+        """
+        if period <= 0.0:
+            print("ERROR: Monitor period must be greater than 0")
+            return False
+
+        if self.__monitor_thread is not None:
+            print("ERROR: Monitor is already running")
+            return False
+
+        self.__monitor_stop_event.clear()
+        self.__monitor_thread = threading.Thread(
+            target=self.__monitor, args=(period, retire_timeout, heartbeat_timeout), daemon=True
+        )
+        self.__monitor_thread.start()
+
+        return True
+
+    def stop_monitor(self) -> None:
+        """
+        Stop the monitor thread if it is running.
+        """
+        if self.__monitor_thread is None:
+            return
+
+        self.__monitor_stop_event.set()
+        self.__monitor_thread.join()
+        self.__monitor_thread = None
+
+    def __monitor(
+        self, period: float, retire_timeout: float, heartbeat_timeout: float | None
+    ) -> None:
+        """
+        Monitor thread.
+        """
+        while not self.__monitor_stop_event.wait(period):
+            self.supervise(heartbeat_timeout)
+            self.autoscale(retire_timeout)
@@ -2,7 +2,49 @@
 Worker property data.
 """
 
+import enum
+import inspect
+import os
 
+from . import scaling_policy_data
+
+
+class AffinityMode(enum.Enum):
+    """
+    How the workers of a group are placed on its CPU set.
+    """
+
+    # Worker i is pinned to CPU i of the set, wrapping around
+    SPREAD = "spread"
+    # Every worker may run on any CPU of the set
+    BLOCK = "block"
+
+
+class ExecutionMode(enum.Enum):
+    """
+    What each worker of a group runs in.
+    """
+
+    # Each worker is a process
+    PROCESS = "process"
+    # Each worker is a thread in the process of the worker manager
+    THREAD = "thread"
+    # Each worker is a process running several threads, which share the worker controller
+    THREADS_IN_PROCESSES = "threads_in_processes"
+
+
+def get_available_cpus() -> set[int]:
+    """
+    Return: CPUs this process may run on.
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return os.sched_getaffinity(0)
+
+    return set(range(0, os.cpu_count() or 1))
+
+
+# One attribute per property of the worker group
+# pylint: disable-next=too-many-instance-attributes
 class WorkerPropertyData:
     """
     Properties about the worker.
@@ -18,9 +60,17 @@ class WorkerPropertyData:
         target_arguments: tuple,
         input_queue_names: list[str],
         output_queue_names: list[str],
+        scaling_policy: scaling_policy_data.ScalingPolicyData | None = None,
+        cpu_set: list[int] | None = None,
+        affinity_mode: AffinityMode = AffinityMode.SPREAD,
+        concurrency: int = 1,
+        execution_mode: ExecutionMode = ExecutionMode.PROCESS,
+        thread_count: int = 1,
+        profile_directory: str | None = None,
     ) -> tuple[True, "WorkerPropertyData"] | tuple[False, None]:
         """
         count: Number of workers. Must be greater than 0.
+            Initial number of workers if there is a scaling policy, must be within its minimum and maximum.
         target_function: Function to run. The function signature is expected to be:
             target_function(
                 target_arguments[0],
@@ -38,14 +88,68 @@ class WorkerPropertyData:
                 worker_controller,
             )
             All queues are multiprocessing queues.
+            If the function is a coroutine function, each worker process runs it in its own event
+            loop, and the function should use the async methods of the queues and worker controller.
         target_arguments: Arguments for the function. Can be empty.
         input_queue_names: Names of the input queues. Can be empty.
         output_queue_names: Names of the output queues. Can be empty.
+        scaling_policy: Scales the number of workers with the depth of the input queues. None is a fixed number of workers.
+        cpu_set: CPUs the workers run on, set with os.sched_setaffinity() when each worker starts. None does not set the affinity.
+            Must be available to this process. Not supported on platforms without os.sched_setaffinity().
+        affinity_mode: How the workers are placed on the CPU set.
+        concurrency: Number of concurrent calls of a coroutine target function in each worker. Must be greater than 0.
+            Must be 1 if the target function is not a coroutine function.
+        execution_mode: What each worker runs in. Thread workers can use in-process queues, and the CPU set pins each thread.
+        thread_count: Number of threads in each worker process, each calling the target function. Must be greater than 0.
+            Must be 1 unless the execution mode is threads in processes.
+        profile_directory: Directory for the cProfile profiles of the workers, in a subdirectory named after the group. None does not profile.
+            Each thread calling the target function writes its profile when the function returns or raises, so terminated workers write no profile.
+            The profiles of the last start are merged by WorkerManager.get_profile(). The profiles of earlier runs are removed when the group starts.
         """
         if count <= 0:
             print("ERROR: No workers")
             return False, None
 
+        if scaling_policy is not None and not (
+            scaling_policy.min_count <= count <= scaling_policy.max_count
+        ):
+            print("ERROR: Worker count is outside of the scaling policy bounds")
+            return False, None
+
+        if concurrency <= 0:
+            print("ERROR: Concurrency must be greater than 0")
+            return False, None
+
+        if concurrency > 1 and not inspect.iscoroutinefunction(target_function):
+            print("ERROR: Concurrency requires a coroutine target function")
+            return False, None
+
+        if thread_count <= 0:
+            print("ERROR: Thread count must be greater than 0")
+            return False, None
+
+        if thread_count > 1 and execution_mode != ExecutionMode.THREADS_IN_PROCESSES:
+            print("ERROR: Thread count requires the threads in processes execution mode")
+            return False, None
+
+        if cpu_set is not None:
+            if not hasattr(os, "sched_setaffinity"):
+                print("ERROR: CPU affinity is not supported on this platform")
+                return False, None
+
+            if len(cpu_set) == 0:
+                print("ERROR: CPU set is empty")
+                return False, None
+
+            if len(set(cpu_set)) != len(cpu_set):
+                print("ERROR: CPU set has duplicates")
+                return False, None
+
+            unavailable_cpus = set(cpu_set) - get_available_cpus()
+            if len(unavailable_cpus) > 0:
+                print(f"ERROR: CPUs are not available: {sorted(unavailable_cpus)}")
+                return False, None
+
         return True, WorkerPropertyData(
             cls.__create_key,
             count,
@@ -53,6 +157,13 @@ class WorkerPropertyData:
             target_arguments,
             input_queue_names,
             output_queue_names,
+            scaling_policy,
+            cpu_set,
+            affinity_mode,
+            concurrency,
+            execution_mode,
+            thread_count,
+            profile_directory,
         )
 
     def __init__(
@@ -63,6 +174,13 @@ class WorkerPropertyData:
         target_arguments: tuple,
         input_queue_names: list[str],
         output_queue_names: list[str],
+        scaling_policy: scaling_policy_data.ScalingPolicyData | None,
+        cpu_set: list[int] | None,
+        affinity_mode: AffinityMode,
+        concurrency: int,
+        execution_mode: ExecutionMode,
+        thread_count: int,
+        profile_directory: str | None,
     ) -> None:
         """
         Private constructor, use create() method.
@@ -74,3 +192,10 @@ class WorkerPropertyData:
         self.target_arguments = target_arguments
         self.input_queue_names = input_queue_names
         self.output_queue_names = output_queue_names
+        self.scaling_policy = scaling_policy
+        self.cpu_set = cpu_set
+        self.affinity_mode = affinity_mode
+        self.concurrency = concurrency
+        self.execution_mode = execution_mode
+        self.thread_count = thread_count
+        self.profile_directory = profile_directory